@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+
+# python helper_scripts/benchmark_dom_reconciliation.py --elements=3000 --repeat=3
+#
+# Compares the accessibility tree DOM reconciliation of the original __fetch_dom_info, one page.evaluate of
+# BASELINE_JS per element, against the chunked batch used by get_detailed_accessibility_tree now, on a large
+# local fixture page.
+# Run it from an environment where hercules itself runs (same .env), the module reads the global config.
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from playwright.async_api import async_playwright
+from testzeus_hercules.utils.get_detailed_accessibility_tree import fetch_elements_attributes
+
+ATTRIBUTES = ["name", "aria-label", "placeholder", "md", "id", "for", "data-testid", "title", "aria-controls", "aria-describedby"]
+TAGS_TO_IGNORE = ["head", "style", "script", "link", "meta", "noscript", "template", "iframe", "g", "main", "c-wiz", "svg", "path"]
+IDS_TO_IGNORE = ["agentDriveAutoOverlay"]
+
+# The per-element snippet __fetch_dom_info evaluated for every md before the reconciliation was batched, verbatim from
+# testzeus_hercules/utils/get_detailed_accessibility_tree.py at 998824d.
+BASELINE_JS = """
+    (input_params) => {
+        const should_fetch_inner_text = input_params.should_fetch_inner_text;
+        const md = input_params.md;
+        const attributes = input_params.attributes;
+        const tags_to_ignore = input_params.tags_to_ignore;
+        const ids_to_ignore = input_params.ids_to_ignore;
+
+        // Helper function to search for an element by md across DOM, shadow DOMs, and iframes
+        const findElementByMd = (parent, md) => {
+            // Look in the parent context (can be document or shadow root)
+            const element = parent.querySelector(`[md="${md}"]`);
+
+            if (element) {
+                return element; // Found in parent context
+            }
+
+            // If the element is not found, try looking inside shadow DOMs and iframes
+            const elements = parent.querySelectorAll('*');
+            for (const el of elements) {
+                // Check for shadow DOM
+                if (el.shadowRoot) {
+                    const shadowElement = findElementByMd(el.shadowRoot, md);
+                    if (shadowElement) {
+                        return shadowElement; // Found in shadow DOM
+                    }
+                }
+                // Check for iframes
+                if (el.tagName.toLowerCase() === 'iframe') {
+                    let iframeDocument;
+                    try {
+                        iframeDocument = el.contentDocument || el.contentWindow.document;
+                    } catch (e) {
+                        // Cannot access cross-origin iframe; skip to the next element
+                        continue;
+                    }
+                    if (iframeDocument) {
+                        const iframeElement = findElementByMd(iframeDocument, md);
+                        if (iframeElement) {
+                            return iframeElement; // Found in iframe
+                        }
+                    }
+                }
+            }
+
+            return null; // Not found
+        };
+
+        // Start the search in the document (regular DOM)
+        const element = findElementByMd(document, md);
+
+        if (!element) {
+            console.log(`No element found with md: ${md}`);
+            return null;
+        }
+
+        if (ids_to_ignore.includes(element.id)) {
+            console.log(`Ignoring element with id: ${element.id}`, element);
+            return null;
+        }
+
+        if (tags_to_ignore.includes(element.tagName.toLowerCase()) || element.tagName.toLowerCase() === "option") {
+            return null;
+        }
+
+        let attributes_to_values = {
+            'tag': element.tagName.toLowerCase() // Always include the tag name
+        };
+
+        if (element.hasAttribute('aria-describedby')) {
+            const describedbyId = element.getAttribute('aria-describedby');
+            const describedElement = findElementById(document, describedbyId);
+            if (describedElement) {
+                attributes_to_values['tooltip'] = describedElement.innerText || describedElement.textContent;
+            }
+        }
+
+        if (element.tagName.toLowerCase() === 'input') {
+            attributes_to_values['tag_type'] = element.type;
+        } else if (element.tagName.toLowerCase() === 'select') {
+            attributes_to_values["md"] = element.getAttribute('md');
+            attributes_to_values["role"] = "combobox";
+            attributes_to_values["options"] = [];
+
+            for (const option of element.options) {
+                let option_attributes_to_values = {
+                    "md": option.getAttribute('md'),
+                    "text": option.text,
+                    "value": option.value,
+                    "selected": option.selected
+                };
+                attributes_to_values["options"].push(option_attributes_to_values);
+            }
+            return attributes_to_values;
+        }
+
+        for (const attribute of attributes) {
+            let value = element.getAttribute(attribute);
+
+            if (value) {
+                attributes_to_values[attribute] = value;
+            }
+        }
+
+        if (should_fetch_inner_text && element.innerText) {
+            attributes_to_values['description'] = element.innerText;
+        }
+
+        let role = element.getAttribute('role');
+        if (role === 'listbox' || element.tagName.toLowerCase() === 'ul') {
+            let children = element.children;
+            let filtered_children = Array.from(children).filter(child => child.getAttribute('role') === 'option');
+            console.log("Listbox or ul found: ", filtered_children);
+            let attributes_to_include = ['md', 'role', 'aria-label', 'value'];
+            attributes_to_values["additional_info"] = [];
+
+            for (const child of children) {
+                let children_attributes_to_values = {};
+
+                for (let attr of child.attributes) {
+                    if (attributes_to_include.includes(attr.name)) {
+                        children_attributes_to_values[attr.name] = attr.value;
+                    }
+                }
+
+                attributes_to_values["additional_info"].push(children_attributes_to_values);
+            }
+        }
+
+        const minimalKeys = ['tag', 'md'];
+        const hasMoreThanMinimalKeys = Object.keys(attributes_to_values).length > minimalKeys.length;
+
+        if (!hasMoreThanMinimalKeys) {
+            for (const backupAttribute of input_params.backup_attributes) {
+                let value = element.getAttribute(backupAttribute);
+                if (value) {
+                    attributes_to_values[backupAttribute] = value;
+                }
+            }
+
+            if (Object.keys(attributes_to_values).length <= minimalKeys.length) {
+                if (element.tagName.toLowerCase() === 'button') {
+                    attributes_to_values["md"] = element.getAttribute('md');
+                    attributes_to_values["role"] = "button";
+                    attributes_to_values["additional_info"] = [];
+                    let children = element.children;
+                    let attributes_to_exclude = ['width', 'height', 'path', 'class', 'viewBox', 'md'];
+
+                    if (element.innerText.trim() === '') {
+                        for (const child of children) {
+                            let children_attributes_to_values = {};
+
+                            for (let attr of child.attributes) {
+                                if (!attributes_to_exclude.includes(attr.name)) {
+                                    children_attributes_to_values[attr.name] = attr.value;
+                                }
+                            }
+
+                            attributes_to_values["additional_info"].push(children_attributes_to_values);
+                        }
+                        console.log("Button with no text and no attributes: ", attributes_to_values);
+                        return attributes_to_values;
+                    }
+                }
+
+                return null;
+            }
+        }
+
+        return attributes_to_values;
+    }
+"""
+
+
+def build_fixture(elements: int) -> str:
+    """
+    Build a page with the given number of md tagged elements, a mix of inputs, buttons, links,
+    selects and list items, some of them inside a shadow root and a same-origin iframe.
+    """
+    rows: List[str] = []
+    for i in range(1, elements + 1):
+        kind = i % 5
+        if kind == 0:
+            rows.append(f'<input md="{i}" aria-keyshortcuts="{i}" name="field{i}" placeholder="Field {i}" type="text">')
+        elif kind == 1:
+            rows.append(f'<button md="{i}" aria-keyshortcuts="{i}" title="Button {i}">Button {i}</button>')
+        elif kind == 2:
+            rows.append(f'<a md="{i}" aria-keyshortcuts="{i}" href="#a{i}" aria-label="Link {i}">Link {i}</a>')
+        elif kind == 3:
+            rows.append(f'<select md="{i}" aria-keyshortcuts="{i}"><option>One</option><option>Two</option></select>')
+        else:
+            rows.append(f'<ul md="{i}" aria-keyshortcuts="{i}" role="listbox"><li role="option">Item {i}</li></ul>')
+
+    shadow_start = elements + 1
+    iframe_start = elements + 101
+    shadow = "".join(f'<button md="{shadow_start + i}" aria-keyshortcuts="{shadow_start + i}">Shadow {i}</button>' for i in range(100))
+    iframe = "".join(f'<input md="{iframe_start + i}" aria-keyshortcuts="{iframe_start + i}" name="frame{i}">' for i in range(100))
+    return f"""
+        <html><body>
+            <div>{''.join(rows)}</div>
+            <div id="host"></div>
+            <iframe id="frame" srcdoc='{iframe}'></iframe>
+            <script>document.getElementById("host").attachShadow({{mode: "open"}}).innerHTML = `{shadow}`;</script>
+        </body></html>
+    """
+
+
+def build_requests(total: int) -> List[Tuple[int, bool]]:
+    """Every md of the fixture, as leaf nodes of the accessibility tree would request them."""
+    return [(md, True) for md in range(1, total + 1)]
+
+
+async def fetch_one_by_one(page: Any, requests: List[Tuple[int, bool]]) -> Dict[Tuple[int, bool], Any]:
+    """The original reconciliation: one page.evaluate of BASELINE_JS per element."""
+    result: Dict[Tuple[int, bool], Any] = {}
+    for md, should_fetch_inner_text in requests:
+        result[(md, should_fetch_inner_text)] = await page.evaluate(
+            BASELINE_JS,
+            {
+                "md": md,
+                "attributes": ATTRIBUTES,
+                "backup_attributes": [],
+                "should_fetch_inner_text": should_fetch_inner_text,
+                "tags_to_ignore": TAGS_TO_IGNORE,
+                "ids_to_ignore": IDS_TO_IGNORE,
+            },
+        )
+    return result
+
+
+async def fetch_batched(page: Any, requests: List[Tuple[int, bool]]) -> Dict[Tuple[int, bool], Any]:
+    """The current reconciliation, in the default chunks of get_detailed_accessibility_tree."""
+    return await fetch_elements_attributes(page, requests, ATTRIBUTES, [], TAGS_TO_IGNORE, IDS_TO_IGNORE)
+
+
+async def measure(
+    fetch: Callable[[Any, List[Tuple[int, bool]]], Awaitable[Dict[Tuple[int, bool], Any]]], page: Any, requests: List[Tuple[int, bool]], repeat: int
+) -> Tuple[float, Dict[Tuple[int, bool], Any]]:
+    best = float("inf")
+    result: Dict[Tuple[int, bool], Any] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await fetch(page, requests)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+async def run(elements: int, repeat: int, browser_type: str) -> None:
+    async with async_playwright() as pw:
+        browser = await getattr(pw, browser_type).launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(build_fixture(elements))
+        await page.wait_for_function("document.getElementById('frame').contentDocument.querySelector('input') !== null")
+
+        requests = build_requests(elements + 200)
+        per_node_time, per_node_result = await measure(fetch_one_by_one, page, requests, repeat)
+        batched_time, batched_result = await measure(fetch_batched, page, requests, repeat)
+        await browser.close()
+
+    found = sum(1 for value in batched_result.values() if value)
+    print(f"elements: {len(requests)} ({found} reconciled), best of {repeat}")
+    print(f"baseline, one evaluate per element: {per_node_time:.3f}s")
+    print(f"batched evaluate:                   {batched_time:.3f}s ({per_node_time / max(batched_time, 1e-9):.1f}x faster)")
+    print(f"identical results: {per_node_result == batched_result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DOM reconciliation of the accessibility tree.")
+    parser.add_argument("--elements", type=int, default=3000, help="Number of md tagged elements in the light DOM of the fixture page")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs per strategy, the best run is reported")
+    parser.add_argument("--browser", default="chromium", choices=["chromium", "firefox", "webkit"], help="Browser to run the fixture in")
+    args = parser.parse_args()
+    asyncio.run(run(args.elements, args.repeat, args.browser))
+
+
+if __name__ == "__main__":
+    main()
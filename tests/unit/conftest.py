@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+# The config manager is built when testzeus_hercules is first imported and exits without an LLM configuration.
+# Unit tests never call an LLM: a placeholder configuration is set for the import only, unless one is already set.
+# The import also writes the telemetry installation_id.txt in the working directory, which is a temporary one meanwhile.
+_saved_env = dict(os.environ)
+_saved_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="hercules_unit_"))
+os.environ.update({"IS_TEST_ENV": "true", "AUTO_MODE": "1", "ENABLE_TELEMETRY": "0"})
+os.environ.setdefault("PROJECT_SOURCE_ROOT", tempfile.mkdtemp(prefix="hercules_unit_"))
+if not os.environ.get("LLM_MODEL_NAME") and not os.environ.get("AGENTS_LLM_CONFIG_FILE"):
+    os.environ.update({"LLM_MODEL_NAME": "gpt-4o", "LLM_MODEL_API_KEY": "unit-test"})
+import testzeus_hercules  # noqa: E402,F401
+
+os.chdir(_saved_cwd)
+os.environ.clear()
+os.environ.update(_saved_env)
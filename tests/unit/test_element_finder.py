@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, List, Tuple
+
+import pytest
+from playwright.async_api import Error
+from testzeus_hercules.utils.js_helper import call_with_element_finder, get_js_with_element_finder
+from testzeus_hercules.utils.page_helpers import HELPERS_MISSING, PAGE_HELPERS_JS
+
+FIND_JS = """(selector) => {
+    /*INJECT_FIND_ELEMENT_IN_SHADOW_DOM*/
+    return findElementInShadowDOMAndIframes(document, selector);
+}"""
+
+
+class FakeFrame:
+    """A document that only has the helper library once PAGE_HELPERS_JS was evaluated in it."""
+
+    def __init__(self, installed: bool = False, error: str = "") -> None:
+        self.installed = installed
+        self.error = error
+        self.calls: List[Tuple[str, str, Any]] = []
+
+    async def _run(self, kind: str, expression: str, arg: Any = None) -> Any:
+        self.calls.append((kind, expression, arg))
+        if expression == PAGE_HELPERS_JS:
+            self.installed = True
+            return None
+        if self.error:
+            raise Error(self.error)
+        if "window.__hercules" in expression and not self.installed:
+            raise Error(f"Error: {HELPERS_MISSING}\n    at findElementInShadowDOMAndIframes")
+        return f"{kind} result for {arg}"
+
+    async def evaluate(self, expression: str, arg: Any = None) -> Any:
+        return await self._run("evaluate", expression, arg)
+
+    async def evaluate_handle(self, expression: str, arg: Any = None) -> Any:
+        return await self._run("evaluate_handle", expression, arg)
+
+
+def test_finder_shim_reports_a_missing_library() -> None:
+    js = get_js_with_element_finder(FIND_JS)
+    assert "/*INJECT_FIND_ELEMENT_IN_SHADOW_DOM*/" not in js
+    assert "if (!window.__hercules)" in js
+    assert HELPERS_MISSING in js
+
+
+def test_library_is_installed_and_the_action_retried() -> None:
+    frame = FakeFrame()
+    assert asyncio.run(call_with_element_finder(frame, FIND_JS, "[md='12']")) == "evaluate result for [md='12']"
+    assert [call[1] == PAGE_HELPERS_JS for call in frame.calls] == [False, True, False]
+
+
+def test_handles_go_through_evaluate_handle() -> None:
+    frame = FakeFrame()
+    assert asyncio.run(call_with_element_finder(frame, FIND_JS, "#checkout", handle=True)) == "evaluate_handle result for #checkout"
+    assert [kind for kind, _, _ in frame.calls] == ["evaluate_handle", "evaluate", "evaluate_handle"]
+
+
+def test_installed_library_costs_a_single_round_trip() -> None:
+    frame = FakeFrame(installed=True)
+    asyncio.run(call_with_element_finder(frame, FIND_JS, "#checkout"))
+    assert len(frame.calls) == 1
+
+
+def test_other_errors_are_raised_without_installing() -> None:
+    frame = FakeFrame(error="Error: Element not found: #checkout")
+    with pytest.raises(Error, match="Element not found"):
+        asyncio.run(call_with_element_finder(frame, FIND_JS, "#checkout"))
+    assert len(frame.calls) == 1
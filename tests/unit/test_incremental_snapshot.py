@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from playwright.async_api import Error, Page, async_playwright
+from testzeus_hercules.utils.page_helpers import call_page_helper
+
+SIGNUP_PAGE = """
+<html>
+  <body>
+    <h1>Sign up</h1>
+    <form>
+      <input id="email" type="text">
+      <textarea id="bio"></textarea>
+      <button type="button">Create account</button>
+    </form>
+  </body>
+</html>
+"""
+
+
+async def _snapshot(page: Page) -> Dict[str, Any]:
+    """Incremental snapshot, the way do_get_accessibility_info takes it with INCREMENTAL_DOM_SNAPSHOT=true."""
+    await call_page_helper(page, "injectAttributes", True)
+    return await call_page_helper(page, "accessibilityTree", True)
+
+
+def _nodes(node: Dict[str, Any], tag: str) -> List[Dict[str, Any]]:
+    found = [node] if node.get("tag") == tag else []
+    for child in node.get("children", []):
+        found.extend(_nodes(child, tag))
+    return found
+
+
+def _name(snapshot: Dict[str, Any], tag: str) -> Optional[str]:
+    return _nodes(snapshot["tree"], tag)[0].get("name")
+
+
+async def _snapshots_around(change: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Snapshot the sign up page, run change on it, and snapshot it again."""
+    async with async_playwright() as playwright:
+        try:
+            browser = await playwright.chromium.launch()
+        except Error as e:
+            pytest.skip(f"Chromium is not available: {e}")
+        try:
+            page = await browser.new_page()
+            await page.expose_function("dom_mutation_change_detected", lambda changes: None)
+            await page.set_content(SIGNUP_PAGE)
+            await call_page_helper(page, "addMutationObserver")
+            before = await _snapshot(page)
+            if change == "fill":
+                await page.fill("#email", "jane@example.com")
+            elif change == "type":
+                await page.click("#bio")
+                await page.keyboard.type("QA lead")
+            elif change == "controlled":
+                # what frameworks with controlled inputs do: set the value property, then notify through an input event
+                await page.evaluate("() => { const email = document.getElementById('email'); email.value = 'jane@example.com'; email.dispatchEvent(new Event('input', { bubbles: true })); }")
+            after = await _snapshot(page)
+        finally:
+            await browser.close()
+    return before, after
+
+
+def test_fill_is_seen_by_the_next_incremental_snapshot() -> None:
+    before, after = asyncio.run(_snapshots_around("fill"))
+    assert before["refreshed"] is None
+    assert _name(before, "input") is None
+    assert after["refreshed"] is not None, "the second snapshot should reuse the first one"
+    assert _name(after, "input") == "jane@example.com"
+
+
+def test_typed_text_is_seen_by_the_next_incremental_snapshot() -> None:
+    before, after = asyncio.run(_snapshots_around("type"))
+    assert _name(before, "textarea") is None
+    assert after["refreshed"] is not None
+    assert _name(after, "textarea") == "QA lead"
+
+
+def test_controlled_input_value_is_seen_by_the_next_incremental_snapshot() -> None:
+    _, after = asyncio.run(_snapshots_around("controlled"))
+    assert after["refreshed"] is not None
+    assert _name(after, "input") == "jane@example.com"
+    assert _name(after, "button") == "Create account"
@@ -0,0 +1,154 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from testzeus_hercules.utils import llm_cache
+from testzeus_hercules.utils.llm_cache import LLMResponseCache, build_cache_key, normalize_observation
+
+
+def _request(observation: str, prompt: str = "Click the checkout button", model: str = "gpt-4o") -> Dict[str, Any]:
+    messages: List[Dict[str, Any]] = [
+        {"role": "system", "content": "You are a browser navigation agent."},
+        {"role": "user", "content": prompt},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": "call_1", "function": {"name": "get_page_text", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": "call_1", "content": observation},
+    ]
+    return {"model": model, "messages": messages, "temperature": 0}
+
+
+def _key(observation: str, **kwargs: Any) -> str:
+    return build_cache_key(_request(observation, **kwargs))[0]
+
+
+def test_whitespace_does_not_change_the_key() -> None:
+    assert _key("Order  summary\n\n  Total: 42 EUR") == _key("Order summary Total: 42 EUR")
+
+
+def test_uuids_and_datetimes_do_not_change_the_key() -> None:
+    first = _key("session 1b4e28ba-2fa1-11d2-883f-0016d3cca427 rendered at 2026-10-18T14:08:25Z")
+    second = _key("session 6fa459ea-ee8a-3ca4-894e-db77e160355e rendered at 2026-10-19 09:01:02.123+02:00")
+    assert first == second
+
+
+def test_current_epoch_timestamps_do_not_change_the_key() -> None:
+    now = int(time.time())
+    assert _key(f"ts={now} ms={now * 1000}") == _key(f"ts={now - 3600} ms={(now - 60) * 1000}")
+
+
+@pytest.mark.parametrize(
+    "first,second",
+    [
+        ("Order number 1029384756123", "Order number 1029384756124"),
+        ("Call 4155550123", "Call 4155550124"),
+        ("Account 9876543210987654", "Account 9876543210987655"),
+        ("Card 4111111111111111", "Card 4111111111111112"),
+        ("Record 1000000001", "Record 1000000002"),
+    ],
+)
+def test_different_ids_give_different_keys(first: str, second: str) -> None:
+    """Numbers that are not a timestamp of the years around now identify the page state, they are kept."""
+    assert _key(first) != _key(second)
+
+
+def test_prompt_model_and_tools_are_part_of_the_key() -> None:
+    base = _request("page")
+    with_tools = dict(base, tools=[{"type": "function", "function": {"name": "click"}}])
+    assert build_cache_key(base)[0] != build_cache_key(with_tools)[0]
+    assert _key("page", prompt="Click the login button") != _key("page")
+    key, model = build_cache_key(_request("page", model="gpt-4o-mini"))
+    assert model == "gpt-4o-mini"
+    assert key != _key("page")
+
+
+def test_normalize_observation() -> None:
+    now_ms = int(time.time() * 1000)
+    assert normalize_observation(f"  a\n b  {now_ms} 1029384756123 ") == "a b <timestamp> 1029384756123"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(llm_cache.time, "time", fake)
+    return fake
+
+
+def _cache_path(tmp_path: Path) -> str:
+    return os.path.join(tmp_path, "cache", "llm_cache.sqlite")
+
+
+def _raw_key(name: str) -> str:
+    return json.dumps(_request(name))
+
+
+def test_get_set_and_metrics(tmp_path: Path) -> None:
+    with LLMResponseCache(_cache_path(tmp_path), "project") as cache:
+        assert cache.get(_raw_key("a")) is None
+        cache.set(_raw_key("a"), {"choices": ["clicked"]})
+        assert cache.get(_raw_key("a")) == {"choices": ["clicked"]}
+        assert cache.metrics() == {"namespace": "project", "hits": 1, "misses": 1, "hit_rate": 0.5, "writes": 1, "evicted": 0}
+        cache.reset_metrics()
+        assert cache.metrics()["hits"] == 0
+
+
+def test_namespaces_do_not_share_entries(tmp_path: Path) -> None:
+    path = _cache_path(tmp_path)
+    LLMResponseCache(path, "first").set(_raw_key("a"), "response")
+    assert LLMResponseCache(path, "second").get(_raw_key("a")) is None
+    assert LLMResponseCache(path, "first").get(_raw_key("a")) == "response"
+
+
+def test_expired_entries_are_evicted(tmp_path: Path, clock: FakeClock) -> None:
+    cache = LLMResponseCache(_cache_path(tmp_path), "project", max_age=60)
+    cache.set(_raw_key("old"), "old response")
+    cache.set(_raw_key("read late"), "response")
+    clock.now += 30
+    cache.set(_raw_key("recent"), "recent response")
+    clock.now += 45
+
+    assert cache.get(_raw_key("read late")) is None
+    assert cache.evicted == 1
+    cache.close()
+
+    # reopening evicts what expired meanwhile
+    reopened = LLMResponseCache(_cache_path(tmp_path), "project", max_age=60)
+    assert reopened.get(_raw_key("recent")) == "recent response"
+    assert reopened.evicted == 1
+    assert reopened.get(_raw_key("old")) is None
+
+
+def test_least_recently_used_entries_are_evicted_beyond_max_bytes(tmp_path: Path, clock: FakeClock) -> None:
+    path = _cache_path(tmp_path)
+    cache = LLMResponseCache(path, "project")
+    for name in ("a", "b", "c"):
+        cache.set(_raw_key(name), "x" * 1000)
+        clock.now += 1
+    clock.now += 1
+    assert cache.get(_raw_key("a")) is not None  # a is now the most recently used
+    cache.close()
+
+    entry_size = len(llm_cache.pickle.dumps("x" * 1000, protocol=llm_cache.pickle.HIGHEST_PROTOCOL))
+    limited = LLMResponseCache(path, "project", max_bytes=2 * entry_size)
+    assert limited.get(_raw_key("b")) is None
+    assert limited.evicted == 1
+    assert limited.get(_raw_key("a")) is not None
+    assert limited.get(_raw_key("c")) is not None
+    limited.close()
+
+
+def test_closed_cache_reconnects_on_demand(tmp_path: Path) -> None:
+    cache = LLMResponseCache(_cache_path(tmp_path), "project")
+    cache.set(_raw_key("a"), "response")
+    cache.close()
+    assert cache.get(_raw_key("a")) == "response"
+    cache.close()
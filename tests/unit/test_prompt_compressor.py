@@ -0,0 +1,140 @@
+import copy
+import importlib
+from typing import Any, Dict, List
+
+import pytest
+from testzeus_hercules.core.memory.prompt_compressor import ChatHistoryCompactor, count_text_tokens, message_tokens
+
+prompt_compressor = importlib.import_module("testzeus_hercules.core.memory.prompt_compressor")
+
+SNAPSHOT_WORDS = 1000
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
+    """One token per word, so budgets are exact and no tokenizer is downloaded."""
+    monkeypatch.setattr(prompt_compressor, "count_token", lambda text: len(text.split()))
+    monkeypatch.setattr(prompt_compressor, "_token_counts", prompt_compressor.OrderedDict())
+
+
+def _snapshot(i: int) -> str:
+    return f"DOM snapshot {i}\n" + " ".join(f"node{i}_{n}" for n in range(SNAPSHOT_WORDS))
+
+
+def _nav_history(exchanges: int) -> List[Dict[str, Any]]:
+    """A nav agent history: the task, then one tool call and its tool responses per exchange."""
+    messages: List[Dict[str, Any]] = [{"role": "user", "content": "Open the shop and add the cheapest item to the cart", "name": "planner_agent"}]
+    for i in range(exchanges):
+        call_id = f"call_{i}"
+        messages.append({"role": "assistant", "content": None, "tool_calls": [{"id": call_id, "type": "function", "function": {"name": "get_interactive_elements", "arguments": "{}"}}]})
+        response = {"tool_call_id": call_id, "role": "tool", "content": _snapshot(i)}
+        messages.append({"role": "tool", "content": response["content"], "tool_responses": [response]})
+    return messages
+
+
+def _tool_call_ids(message: Dict[str, Any]) -> List[str]:
+    return [call["id"] for call in message.get("tool_calls") or []]
+
+
+def _assert_pairs_intact(messages: List[Dict[str, Any]]) -> None:
+    """Every tool response follows the assistant message that called it, every call has its response."""
+    pending: List[str] = []
+    for message in messages:
+        if message["role"] == "tool":
+            answered = [response["tool_call_id"] for response in message.get("tool_responses", [])]
+            assert answered == pending
+            pending = []
+        else:
+            assert pending == []
+            pending = _tool_call_ids(message)
+    assert pending == []
+
+
+def test_recent_exchanges_are_kept_verbatim_and_older_outputs_compacted() -> None:
+    history = _nav_history(10)
+    compacted = ChatHistoryCompactor("browser_nav_agent", keep_recent=3, max_tokens=0, min_tokens=100).apply_transform(history)
+
+    assert len(compacted) == len(history)
+    assert compacted[0] == history[0]
+    assert compacted[-6:] == history[-6:]
+    for old in compacted[1:-6]:
+        if old["role"] == "tool":
+            summary = old["tool_responses"][0]["content"]
+            assert summary.startswith("[earlier output compacted: ")
+            assert summary.endswith("DOM snapshot " + old["tool_responses"][0]["tool_call_id"].split("_")[1])
+            assert old["content"] == summary
+            assert message_tokens(old) < 20
+        else:
+            assert old in history
+    _assert_pairs_intact(compacted)
+
+
+def test_the_history_of_the_agent_is_not_modified() -> None:
+    history = _nav_history(6)
+    original = copy.deepcopy(history)
+    ChatHistoryCompactor("browser_nav_agent", keep_recent=1, max_tokens=500, min_tokens=10).apply_transform(history)
+    assert history == original
+
+
+def test_small_tool_outputs_are_kept() -> None:
+    history = _nav_history(4)
+    history[2]["tool_responses"][0]["content"] = history[2]["content"] = "Clicked the add to cart button"
+    compacted = ChatHistoryCompactor("browser_nav_agent", keep_recent=1, max_tokens=0, min_tokens=100).apply_transform(history)
+    assert compacted[2] == history[2]
+
+
+@pytest.mark.parametrize("keep_recent,max_tokens", [(1, 1500), (2, 2500), (3, 3500), (4, 1200), (6, 1100)])
+def test_budget_is_respected_without_splitting_tool_calls(keep_recent: int, max_tokens: int) -> None:
+    history = _nav_history(12)
+    compactor = ChatHistoryCompactor("browser_nav_agent", keep_recent=keep_recent, max_tokens=max_tokens, min_tokens=100)
+    compacted = compactor.apply_transform(history)
+
+    total = sum(message_tokens(message) for message in compacted)
+    assert total <= max_tokens
+    assert compacted[0] == history[0]
+    assert compacted[-2:] == history[-2:]
+    assert compactor.tokens_saved == sum(message_tokens(message) for message in history) - total
+    _assert_pairs_intact(compacted)
+
+
+def test_task_and_newest_exchange_are_kept_above_the_budget() -> None:
+    """A budget below the task and the newest tool output compacts everything else, the newest output stays whole."""
+    history = _nav_history(5)
+    compacted = ChatHistoryCompactor("browser_nav_agent", keep_recent=2, max_tokens=300, min_tokens=100).apply_transform(history)
+
+    assert [message.get("tool_calls", [{}])[0].get("id") for message in compacted if message["role"] == "assistant"] == ["call_3", "call_4"]
+    assert compacted[0] == history[0]
+    assert compacted[-2:] == history[-2:]
+    assert compacted[2]["content"].startswith("[earlier output compacted: ")
+    _assert_pairs_intact(compacted)
+
+
+def test_oldest_exchanges_are_dropped_whole_when_summaries_are_not_enough() -> None:
+    history = _nav_history(40)
+    compacted = ChatHistoryCompactor("browser_nav_agent", keep_recent=2, max_tokens=2200, min_tokens=100).apply_transform(history)
+
+    assert len(compacted) < len(history)
+    assert sum(message_tokens(message) for message in compacted) <= 2200
+    assert compacted[-4:] == history[-4:]
+    assert compacted[1]["role"] == "assistant"
+    _assert_pairs_intact(compacted)
+
+
+def test_planner_history_keeps_alternating_roles() -> None:
+    """The planner has no tool calls: the answers of the nav agents are compacted and dropped with their request."""
+    history: List[Dict[str, Any]] = [{"role": "user", "content": "Feature: checkout"}]
+    for i in range(10):
+        history.append({"role": "assistant", "content": f"Step {i}: ask the browser nav agent for the cart total"})
+        history.append({"role": "user", "content": _snapshot(i)})
+    compacted = ChatHistoryCompactor("planner_agent", keep_recent=2, max_tokens=2500, min_tokens=100).apply_transform(history)
+
+    assert sum(message_tokens(message) for message in compacted) <= 2500
+    assert compacted[-4:] == history[-4:]
+    assert [message["role"] for message in compacted] == ["user"] + ["assistant", "user"] * ((len(compacted) - 1) // 2)
+
+
+def test_token_counts_are_cached_by_digest() -> None:
+    text = _snapshot(1)
+    assert count_text_tokens(text) == SNAPSHOT_WORDS + 3
+    assert count_text_tokens(text) == SNAPSHOT_WORDS + 3
+    assert list(prompt_compressor._token_counts) == [prompt_compressor.hashlib.sha256(text.encode("utf-8")).hexdigest()]
@@ -0,0 +1,149 @@
+import asyncio
+import importlib
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from testzeus_hercules.core.tools.api_calls import is_safe_http_call
+from testzeus_hercules.core.tools.tool_registry import is_read_only_call, tool
+from testzeus_hercules.utils.sequential_function_call import UserProxyAgent_SequentialFunctionExecution
+
+# the package re-exports the registry dict under the module's name
+registry = importlib.import_module("testzeus_hercules.core.tools.tool_registry")
+TOOL_DELAY = 0.2
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The tools declared by a test do not leak into the registry the agents load."""
+    monkeypatch.setattr(registry, "tool_registry", defaultdict(list))
+    monkeypatch.setattr(registry, "read_only_tools", {})
+
+
+def test_tools_are_not_read_only_by_default() -> None:
+    @tool(agent_names=["test_agent"], description="Clicks")
+    def click(selector: str) -> str:
+        return selector
+
+    assert not is_read_only_call("click", {"selector": "[md='1']"})
+    assert not is_read_only_call("unknown_tool", {})
+
+
+def test_read_only_tools_are_found_by_registry_and_function_name() -> None:
+    @tool(agent_names=["test_agent"], description="Reads the page", name="page_text", read_only=True)
+    def get_text() -> str:
+        return ""
+
+    assert is_read_only_call("page_text", {})
+    assert is_read_only_call("get_text", {})
+
+
+def test_read_only_predicate_gets_the_call_arguments() -> None:
+    @tool(agent_names=["test_agent"], description="Calls an API", read_only=is_safe_http_call)
+    def http_call(method: str, url: str) -> str:
+        return url
+
+    assert is_read_only_call("http_call", {"method": "get", "url": "/orders"})
+    assert is_read_only_call("http_call", {"method": "HEAD", "url": "/orders"})
+    assert not is_read_only_call("http_call", {"method": "POST", "url": "/orders"})
+    assert not is_read_only_call("http_call", {"url": "/orders"})
+
+
+def test_failing_predicate_means_not_read_only() -> None:
+    @tool(agent_names=["test_agent"], description="Broken", read_only=lambda arguments: arguments["missing"])
+    def broken() -> str:
+        return ""
+
+    assert not is_read_only_call("broken", {})
+
+
+class ToolCalls:
+    """Tools that sleep and record when each call ran and how many calls ran at once."""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.max_running = 0
+        self.spans: Dict[str, Tuple[float, float]] = {}
+
+    async def _run(self, call: str, delay: float) -> str:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        start = time.perf_counter()
+        await asyncio.sleep(delay)
+        self.spans[call] = (start, time.perf_counter())
+        self.running -= 1
+        return f"result of {call}"
+
+    def executor(self) -> UserProxyAgent_SequentialFunctionExecution:
+        @tool(agent_names=["test_agent"], description="Reads", read_only=True)
+        async def read_page(call: str, delay: float = TOOL_DELAY) -> str:
+            return await self._run(call, delay)
+
+        @tool(agent_names=["test_agent"], description="Writes")
+        async def fill_field(call: str, delay: float = TOOL_DELAY) -> str:
+            return await self._run(call, delay)
+
+        agent = UserProxyAgent_SequentialFunctionExecution(name="test_executor", human_input_mode="NEVER", code_execution_config=False)
+        agent.register_function({"read_page": read_page, "fill_field": fill_field})
+        return agent
+
+
+def _message(*calls: Tuple[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{"id": f"call_{i}", "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}} for i, (name, arguments) in enumerate(calls)],
+    }
+
+
+def _reply(agent: UserProxyAgent_SequentialFunctionExecution, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+    final, reply = asyncio.run(agent.a_sequential_generate_tool_calls_reply(messages=[message]))
+    assert final
+    return reply["tool_responses"]
+
+
+def test_consecutive_read_only_calls_are_gathered() -> None:
+    calls = ToolCalls()
+    agent = calls.executor()
+    start = time.perf_counter()
+    responses = _reply(agent, _message(*(("read_page", {"call": f"read {i}"}) for i in range(3))))
+    elapsed = time.perf_counter() - start
+
+    assert calls.max_running == 3
+    assert elapsed < 2 * TOOL_DELAY
+    assert [response["content"] for response in responses] == [f"result of read {i}" for i in range(3)]
+
+
+def test_a_mutating_call_breaks_the_batch() -> None:
+    calls = ToolCalls()
+    agent = calls.executor()
+    _reply(
+        agent,
+        _message(
+            ("read_page", {"call": "read 0"}),
+            ("read_page", {"call": "read 1"}),
+            ("fill_field", {"call": "fill"}),
+            ("read_page", {"call": "read 2"}),
+        ),
+    )
+
+    assert calls.max_running == 2
+    fill_start, fill_end = calls.spans["fill"]
+    assert calls.spans["read 0"][1] <= fill_start
+    assert calls.spans["read 1"][1] <= fill_start
+    assert fill_end <= calls.spans["read 2"][0]
+
+
+def test_responses_keep_the_order_of_the_calls() -> None:
+    calls = ToolCalls()
+    agent = calls.executor()
+    # the first call of the batch finishes last
+    delays = [0.3, 0.1, 0.2]
+    message = _message(*(("read_page", {"call": f"read {i}", "delay": delay}) for i, delay in enumerate(delays)))
+    responses = _reply(agent, message)
+
+    assert calls.spans["read 1"][1] < calls.spans["read 0"][1]
+    assert [response["tool_call_id"] for response in responses] == ["call_0", "call_1", "call_2"]
+    assert [response["content"] for response in responses] == ["result of read 0", "result of read 1", "result of read 2"]
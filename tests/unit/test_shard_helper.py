@@ -0,0 +1,180 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+import testzeus_hercules
+from testzeus_hercules.cli import merge
+from testzeus_hercules.utils.shard_helper import (
+    expand_result_files,
+    load_durations,
+    record_durations,
+    select_scenarios_for_shard,
+    select_shard,
+)
+
+JUNIT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="Checkout" time="42.0">
+    <testcase classname="Checkout" name="pay by card" time="30.0"/>
+    <testcase classname="Checkout" name="pay by voucher" time="12.0"/>
+  </testsuite>
+  <testsuite name="Refunds" time="3.0">
+    <testcase classname="Refunds" name="pay by card" time="3.0"/>
+  </testsuite>
+</testsuites>
+"""
+
+MERGE_SCRIPT = """
+import sys
+
+from testzeus_hercules.cli import main
+
+main()
+assert "testzeus_hercules.config" not in sys.modules, "merge imported the configuration"
+"""
+
+
+def _scenarios(count: int) -> List[Dict[str, str]]:
+    return [{"feature": "checkout", "scenario": f"scenario {i}", "output_file": f"out_{i}.xml"} for i in range(count)]
+
+
+def _shards(items: List[Dict[str, str]], shard_total: int, weights: Optional[Dict[str, float]] = None) -> List[List[Dict[str, str]]]:
+    weights = weights or {}
+    return [select_shard(items, lambda item: item["scenario"], lambda item: weights.get(item["scenario"]), shard_index, shard_total) for shard_index in range(shard_total)]
+
+
+@pytest.mark.parametrize("count,shard_total", [(0, 3), (1, 3), (7, 3), (10, 4), (5, 5), (12, 1)])
+def test_every_scenario_lands_in_exactly_one_shard(count: int, shard_total: int) -> None:
+    """The shards partition the scenarios: none is lost, none runs twice."""
+    items = _scenarios(count)
+    names = [item["scenario"] for shard in _shards(items, shard_total) for item in shard]
+    assert sorted(names) == sorted(item["scenario"] for item in items)
+    assert len(names) == len(set(names))
+
+
+def test_shards_keep_the_feature_file_order() -> None:
+    """Each shard lists its scenarios in their original order."""
+    items = _scenarios(9)
+    for shard in _shards(items, 2, {"scenario 8": 50.0, "scenario 3": 20.0}):
+        assert shard == sorted(shard, key=items.index)
+
+
+def test_same_inputs_give_the_same_assignment() -> None:
+    """Every machine computes the same partition, whatever the order the items were listed in."""
+    items = _scenarios(11)
+    weights = {f"scenario {i}": float(i % 4 + 1) for i in range(11)}
+    first = [[item["scenario"] for item in shard] for shard in _shards(items, 3, weights)]
+    second = [[item["scenario"] for item in shard] for shard in _shards(list(items), 3, dict(weights))]
+    reversed_input = [sorted(item["scenario"] for item in shard) for shard in _shards(list(reversed(items)), 3, weights)]
+    assert first == second
+    assert [sorted(shard) for shard in first] == reversed_input
+
+
+def test_greedy_balancing_uses_the_recorded_durations() -> None:
+    """The heavy scenario gets a shard of its own, the light ones share the other."""
+    items = _scenarios(4)
+    weights = {"scenario 0": 1.0, "scenario 1": 1.0, "scenario 2": 100.0, "scenario 3": 1.0}
+    shards = [[item["scenario"] for item in shard] for shard in _shards(items, 2, weights)]
+    assert ["scenario 2"] in shards
+    assert ["scenario 0", "scenario 1", "scenario 3"] in shards
+
+
+def test_without_history_scenarios_are_dealt_round_robin() -> None:
+    """Unknown durations all get the same weight, so shard sizes differ by at most one."""
+    sizes = [len(shard) for shard in _shards(_scenarios(10), 3)]
+    assert max(sizes) - min(sizes) <= 1
+
+
+def test_invalid_shard_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        select_shard(_scenarios(2), lambda item: item["scenario"], lambda item: None, 2, 2)
+
+
+def test_record_durations_feeds_the_next_partition(tmp_path: Path) -> None:
+    """Durations recorded from a JUnit result balance the scenarios of the next run."""
+    junit_file = os.path.join(tmp_path, "result.xml")
+    durations_file = os.path.join(tmp_path, "history", "durations.json")
+    with open(junit_file, "w", encoding="utf-8") as f:
+        f.write(JUNIT_XML)
+
+    record_durations(junit_file, durations_file)
+
+    durations = load_durations(durations_file)
+    assert durations["suites"] == {"Checkout": 42.0, "Refunds": 3.0}
+    assert durations["testcases"] == {"Checkout::pay by card": 30.0, "Checkout::pay by voucher": 12.0, "Refunds::pay by card": 3.0}
+    with open(durations_file, encoding="utf-8") as f:
+        assert json.load(f)["testcases"]["Checkout::pay by card"] == 30.0
+
+    feats = [{"feature": "Checkout", "scenario": name, "output_file": ""} for name in ("pay by card", "pay by voucher", "pay later")]
+    shards = [[feat["scenario"] for feat in select_scenarios_for_shard(feats, i, 2, durations_file)] for i in range(2)]
+    assert ["pay by card"] in shards
+
+
+def test_same_named_scenarios_of_different_features_keep_their_own_durations(tmp_path: Path) -> None:
+    """A scenario is weighted by the duration recorded for its own feature, not by a namesake's."""
+    durations_file = os.path.join(tmp_path, "durations.json")
+    with open(durations_file, "w", encoding="utf-8") as f:
+        json.dump({"testcases": {"Checkout::pay by card": 1.0, "Refunds::pay by card": 100.0, "Refunds::refund": 1.0}, "suites": {}}, f)
+
+    feats = [{"feature": feature, "scenario": scenario, "output_file": ""} for feature, scenario in (("Checkout", "pay by card"), ("Refunds", "pay by card"), ("Refunds", "refund"))]
+    shards = [[(feat["feature"], feat["scenario"]) for feat in select_scenarios_for_shard(feats, i, 2, durations_file)] for i in range(2)]
+    assert [("Refunds", "pay by card")] in shards
+
+
+def test_load_durations_tolerates_a_missing_or_broken_file(tmp_path: Path) -> None:
+    broken = os.path.join(tmp_path, "broken.json")
+    with open(broken, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert load_durations(None) == {"testcases": {}, "suites": {}}
+    assert load_durations(os.path.join(tmp_path, "missing.json")) == {"testcases": {}, "suites": {}}
+    assert load_durations(broken) == {"testcases": {}, "suites": {}}
+
+
+def test_expand_result_files(tmp_path: Path) -> None:
+    """Globs and plain names expand to the existing files, sorted and without duplicates."""
+    for name in ("b.shard-1-of-2.xml", "a.shard-0-of-2.xml", "notes.txt"):
+        with open(os.path.join(tmp_path, name), "w", encoding="utf-8") as f:
+            f.write("<testsuites/>")
+    pattern = os.path.join(tmp_path, "*.shard-*.xml")
+    plain = os.path.join(tmp_path, "a.shard-0-of-2.xml")
+    missing = os.path.join(tmp_path, "missing.xml")
+    assert expand_result_files([pattern, plain, missing]) == [
+        os.path.join(tmp_path, "a.shard-0-of-2.xml"),
+        os.path.join(tmp_path, "b.shard-1-of-2.xml"),
+    ]
+
+
+def test_merge_combines_shard_results_and_records_durations(tmp_path: Path) -> None:
+    shard_files = []
+    for index, (name, time) in enumerate((("pay by card", "30.0"), ("pay by voucher", "12.0"))):
+        shard_files.append(os.path.join(tmp_path, f"result.shard-{index}-of-2.xml"))
+        with open(shard_files[-1], "w", encoding="utf-8") as f:
+            f.write(f'<testsuites><testsuite name="Checkout" time="{time}"><testcase classname="Checkout" name="{name}" time="{time}"/></testsuite></testsuites>')
+    merged_file = os.path.join(tmp_path, "merged", "result.xml")
+    durations_file = os.path.join(tmp_path, "durations.json")
+
+    merge(["--junit-output", merged_file, "--shard-durations-file", durations_file, os.path.join(tmp_path, "*.shard-*.xml")])
+
+    assert os.path.exists(os.path.join(tmp_path, "merged", "result.html"))
+    assert all(os.path.exists(file) for file in shard_files)
+    assert load_durations(durations_file)["testcases"] == {"Checkout::pay by card": 30.0, "Checkout::pay by voucher": 12.0}
+
+
+def test_merge_runs_without_llm_configuration(tmp_path: Path) -> None:
+    """A CI merge job has no LLM credentials: merge must not import the configuration."""
+    shard_file = os.path.join(tmp_path, "result.shard-0-of-1.xml")
+    with open(shard_file, "w", encoding="utf-8") as f:
+        f.write(JUNIT_XML)
+    env = {key: value for key, value in os.environ.items() if not key.startswith(("LLM_MODEL_", "AGENTS_LLM_CONFIG_"))}
+    package_root = os.path.dirname(os.path.dirname(testzeus_hercules.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+    completed = subprocess.run([sys.executable, "-c", MERGE_SCRIPT, "merge", "--junit-output", os.path.join(tmp_path, "merged.xml"), shard_file], cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+    assert os.path.exists(os.path.join(tmp_path, "merged.xml"))
+    assert not os.path.exists(os.path.join(tmp_path, "installation_id.txt"))
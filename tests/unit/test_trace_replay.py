@@ -0,0 +1,126 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from testzeus_hercules.core.trace_replay import _collect_md_ids, _md_id, _rewrite_md_ids, normalize_result, read_tool_calls
+
+CLICK_SELECTORS = {"css": "#checkout", "xpath": "//button[@id='checkout']", "aria": "role=button[name='Checkout']"}
+FILL_SELECTORS = {"css": "input[name='email']", "xpath": "//input[@name='email']"}
+
+# interaction_logs.ndjson of a run: the element logs of a tool precede its tool_call entry
+INTERACTION_LOG: List[Dict[str, Any]] = [
+    {"interaction_type": "navigation", "tool_name": "openurl", "success": True},
+    {
+        "interaction_type": "tool_call",
+        "agent_type": "browser_nav_executor",
+        "tool_name": "openurl",
+        "request_data": {"arguments": {"url": "https://shop.example.com"}},
+        "response_data": {"content": "Page loaded: https://shop.example.com"},
+        "success": True,
+    },
+    {"interaction_type": "click", "selector": "[md='114']", "alternative_selectors": CLICK_SELECTORS, "success": True},
+    {
+        "interaction_type": "tool_call",
+        "agent_type": "browser_nav_executor",
+        "tool_name": "click",
+        "request_data": {"arguments": {"selector": "[md='114']"}},
+        "response_data": {"content": "Clicked md=114"},
+        "success": True,
+    },
+    {"interaction_type": "fill", "selector": "[md='7']", "alternative_selectors": {"css": "#stale"}, "success": False},
+    {"interaction_type": "fill", "selector": "7", "alternative_selectors": FILL_SELECTORS, "success": True},
+    {"interaction_type": "fill", "selector": "#not-an-md", "alternative_selectors": {"css": "#x"}, "success": True},
+    {
+        "interaction_type": "tool_call",
+        "agent_type": "browser_nav_executor",
+        "tool_name": "bulk_set_slider_or_enter_text",
+        "request_data": {"arguments": {"entries": [{"query_selector": "7", "text": "a@b.c"}]}},
+        "response_data": {"content": "Filled"},
+        "success": True,
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("[md='12']", "12"),
+        ('[md="12"]', "12"),
+        ("[md=12]", "12"),
+        ("12", "12"),
+        ("  [md='3']  ", "3"),
+        ("#submit", None),
+        ("[md='12'] > span", None),
+        ("cmd=12", None),
+        (12, None),
+        (None, None),
+    ],
+)
+def test_md_id(value: Any, expected: Any) -> None:
+    assert _md_id(value) == expected
+
+
+def test_collect_md_ids_walks_nested_arguments() -> None:
+    arguments = {
+        "selector": "[md='5']",
+        "entries": [{"query_selector": "9", "text": "hello 12"}, {"query_selector": "#id", "text": "x"}],
+        "pairs": ('[md="11"]', 3),
+    }
+    assert _collect_md_ids(arguments, []) == ["5", "9", "11"]
+
+
+def test_rewrite_md_ids_keeps_the_selector_format() -> None:
+    arguments = {
+        "selector": "[md='5']",
+        "entries": [{"query_selector": "9", "text": "5"}, {"query_selector": "[md='77']", "text": "y"}],
+        "wait": 1.5,
+    }
+    rewritten = _rewrite_md_ids(arguments, {"5": "900001", "9": "41"})
+    assert rewritten == {
+        "selector": "[md='900001']",
+        "entries": [{"query_selector": "41", "text": "900001"}, {"query_selector": "[md='77']", "text": "y"}],
+        "wait": 1.5,
+    }
+    assert arguments["selector"] == "[md='5']"
+
+
+def test_normalize_result_ignores_md_ids_timestamps_and_whitespace() -> None:
+    assert normalize_result("Clicked  md=114\n") == normalize_result("Clicked md=2201")
+    assert normalize_result("Element [md='12'] filled") == normalize_result("Element [md='900004'] filled")
+    assert normalize_result("") == ""
+    assert normalize_result(None) == ""  # type: ignore
+
+
+@pytest.mark.parametrize("first,second", [("cmd=12", "cmd=13"), ("rmd: 3", "rmd: 4"), ("Clicked md=1", "Filled md=1")])
+def test_normalize_result_keeps_other_numbers(first: str, second: str) -> None:
+    assert normalize_result(first) != normalize_result(second)
+
+
+@pytest.fixture
+def interaction_log(tmp_path: Path) -> str:
+    path = os.path.join(tmp_path, "interaction_logs.ndjson")
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in INTERACTION_LOG:
+            f.write(json.dumps(entry) + "\n")
+        f.write("{truncated line\n")
+    return path
+
+
+def test_read_tool_calls_attributes_element_logs_to_the_next_tool_call(interaction_log: str) -> None:
+    steps = read_tool_calls(interaction_log)
+
+    assert [step["tool"] for step in steps] == ["openurl", "click", "bulk_set_slider_or_enter_text"]
+    assert steps[0] == {
+        "agent": "browser_nav_executor",
+        "tool": "openurl",
+        "arguments": {"url": "https://shop.example.com"},
+        "result": "Page loaded: https://shop.example.com",
+        "success": True,
+        "selectors": {},
+    }
+    assert steps[1]["selectors"] == {"114": CLICK_SELECTORS}
+    # failed element logs and selectors without an md are not attributed
+    assert steps[2]["selectors"] == {"7": FILL_SELECTORS}
+    assert steps[2]["arguments"] == {"entries": [{"query_selector": "7", "text": "a@b.c"}]}
@@ -1 +1,7 @@
-from testzeus_hercules import core  # type: ignore # noqa: F401
+import sys
+
+from testzeus_hercules.cli import is_utility_command
+
+# utility sub-commands only handle result files, they must not load the agents and their LLM configuration
+if not is_utility_command(sys.argv):
+    from testzeus_hercules import core  # type: ignore # noqa: F401
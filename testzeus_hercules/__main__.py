@@ -1,10 +1,14 @@
 import asyncio
 import json
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 import aiofiles
 from junit2htmlreport.runner import run as prepare_html
+from testzeus_hercules.cli import main as cli_main
 from testzeus_hercules.config import get_global_conf, set_global_conf
+from testzeus_hercules.core.browser_pool import BrowserPool
 from testzeus_hercules.core.runner import SingleCommandInputRunner
 from testzeus_hercules.telemetry import EventData, EventType, add_event
 from testzeus_hercules.utils.gherkin_helper import (
@@ -13,62 +17,51 @@ from testzeus_hercules.utils.gherkin_helper import (
 )
 from testzeus_hercules.utils.junit_helper import JUnitXMLGenerator, build_junit_xml
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.shard_helper import (
+    get_shard_suffix,
+    select_scenarios_for_shard,
+    select_test_dirs_for_shard,
+)
 
 
-async def sequential_process() -> None:
+async def run_scenario(feat: dict, dont_close_browser: bool) -> str:
     """
-    sequential_process function to process feature files, run test cases, and generate JUnit XML results.
+    Run a single scenario and build its JUnit XML result.
 
-    This function performs the following steps:
-    1. Processes the feature file to get a list of features.
-    2. Retrieves the input Gherkin file path and extracts the feature file name.
-    3. Initializes an empty list to store test results.
-    4. Constructs the final result file name for the JUnit XML output.
-    5. Iterates over each feature in the list of features:
-        a. Extracts the file path, feature name, and scenario ID.
-        b. Serializes the feature file into a command.
-        c. Logs the start of the test case execution.
-        d. Runs the test case using SingleCommandInputRunner.
-        e. Collects the test result, execution time, and cost metrics.
-        f. Parses the JSON content from the runner's chat history.
-        g. Logs the completion of the test case.
-        h. Builds the JUnit XML for the test case and appends it to the results list.
-    6. Merges all JUnit XML results into a single file.
-    7. Logs the location of the final result file.
-    """
-    dont_close_browser = get_global_conf().get_dont_close_browser()
-    list_of_feats = await process_feature_file(dont_append_header=dont_close_browser)
-    input_gherkin_file_path = get_global_conf().get_input_gherkin_file_path()
-    # get name of the feature file using os package
-    feature_file_name = os.path.basename(input_gherkin_file_path)
+    The scenario's stake_id is bound as the default test id of the current task, so when
+    scenarios run concurrently every one of them resolves its own proofs, logs and browser.
 
-    result_of_tests = []
+    Args:
+        feat (dict): Entry returned by process_feature_file with feature, scenario and output_file.
+        dont_close_browser (bool): Keep the browser open after the run.
 
-    add_event(EventType.RUN, EventData(detail="Total Runs: " + str(len(list_of_feats))))
-    for feat in list_of_feats:
-        file_path = feat["output_file"]
-        feature_name = feat["feature"]
-        scenario = feat["scenario"]
-        # sanatise stake_id
-        stake_id = scenario.replace(" ", "_").replace(":", "_").replace("/", "_").replace("\\", "_").replace(".", "_")
-
-        # TODO: remove the following set default hack later.
-        get_global_conf().set_default_test_id(stake_id)
-
-        cmd = await serialize_feature_file(file_path)
-
-        logger.info(f"Running testcase: {stake_id}")
-        logger.info(f"testcase details: {cmd}")
-        runner = SingleCommandInputRunner(
-            stake_id=stake_id,
-            command=cmd,
-            dont_terminate_browser_after_run=dont_close_browser,
-        )
+    Returns:
+        str: Path of the JUnit XML file built for the scenario.
+    """
+    file_path = feat["output_file"]
+    feature_name = feat["feature"]
+    scenario = feat["scenario"]
+    # sanatise stake_id
+    stake_id = scenario.replace(" ", "_").replace(":", "_").replace("/", "_").replace("\\", "_").replace(".", "_")
+
+    # TODO: remove the following set default hack later.
+    get_global_conf().set_default_test_id(stake_id)
+
+    cmd = await serialize_feature_file(file_path)
+
+    logger.info(f"Running testcase: {stake_id}")
+    logger.info(f"testcase details: {cmd}")
+    runner = SingleCommandInputRunner(
+        stake_id=stake_id,
+        command=cmd,
+        dont_terminate_browser_after_run=dont_close_browser,
+    )
+    runner_result = {}
+    cost_metrics = {}
+    llm_cache_metrics = None
+    try:
         await runner.start()
 
-        runner_result = {}
-        cost_metrics = {}
-
         if get_global_conf().get_token_verbose():
             # Parse usage and sum across all agents based on keys
             for ag_name, agent in runner.simple_hercules.agents_map.items():
@@ -96,55 +89,145 @@ async def sequential_process() -> None:
                             # For unexpected keys, just add them as-is
                             cost_metrics[ag_name][key] = cost_metrics.get(key, 0) + value
 
-        execution_time = runner.execution_time
-
-        if runner.result and runner.result.summary:
-            s_rr = runner.result.summary
-            json_content = s_rr.replace("```json\n", "").replace("\n```", "").strip()
-            try:
-                runner_result = json.loads(json_content)
-            except json.JSONDecodeError:
-                logger.error(f"Failed to decode JSON: {json_content}")
-
-        logger.info(f"Run completed for testcase: {scenario}")
-        if cost_metrics:
-            logger.info(f"Test run cost is : {cost_metrics}")
-
-        result_of_tests.append(
-            await build_junit_xml(
-                runner_result,
-                execution_time,
-                cost_metrics,
-                feature_name,
-                scenario,
-                feature_file_path=file_path,
-                output_file_path="",
-                proofs_path=get_global_conf().get_proof_path(runner.browser_manager.stake_id),
-                proofs_screenshot_path=runner.browser_manager._screenshots_dir,
-                proofs_video_path=runner.browser_manager.get_latest_video_path(),
-                network_logs_path=runner.browser_manager.request_response_log_file,
-                logs_path=get_global_conf().get_source_log_folder_path(stake_id),
-                planner_thoughts_path=get_global_conf().get_source_log_folder_path(stake_id) + "/chat_messages.json",
-            )
-        )
+        if runner.simple_hercules and runner.simple_hercules.llm_cache:
+            llm_cache_metrics = runner.simple_hercules.llm_cache.metrics()
+            logger.info(f"LLM cache: {llm_cache_metrics}")
+    finally:
+        # usage has been read, or the scenario failed: either way the agent graph can serve the next scenario
+        if runner.simple_hercules:
+            runner.simple_hercules.release()
+
+    execution_time = runner.execution_time
 
-    final_result_file_name = f"{get_global_conf().get_junit_xml_base_path()}/{feature_file_name}_result.xml"
+    if runner.result and runner.result.summary:
+        s_rr = runner.result.summary
+        json_content = s_rr.replace("```json\n", "").replace("\n```", "").strip()
+        try:
+            runner_result = json.loads(json_content)
+        except json.JSONDecodeError:
+            logger.error(f"Failed to decode JSON: {json_content}")
+
+    logger.info(f"Run completed for testcase: {scenario}")
+    if cost_metrics:
+        logger.info(f"Test run cost is : {cost_metrics}")
+
+    return await build_junit_xml(
+        runner_result,
+        execution_time,
+        cost_metrics,
+        feature_name,
+        scenario,
+        feature_file_path=file_path,
+        output_file_path="",
+        proofs_path=get_global_conf().get_proof_path(runner.browser_manager.stake_id),
+        proofs_screenshot_path=runner.browser_manager._screenshots_dir,
+        proofs_video_path=runner.browser_manager.get_latest_video_path(),
+        network_logs_path=runner.browser_manager.request_response_log_file,
+        logs_path=get_global_conf().get_source_log_folder_path(stake_id),
+        planner_thoughts_path=get_global_conf().get_source_log_folder_path(stake_id) + "/chat_messages.json",
+        llm_cache_metrics=llm_cache_metrics,
+    )
+
+
+async def run_scenarios_in_parallel(list_of_feats: list, dont_close_browser: bool, workers: int) -> list[str]:
+    """
+    Run scenarios on a bounded pool of asyncio workers.
+
+    Every scenario runs in its own task, so the test id bound by run_scenario stays local to it.
+    Results are returned in the order of list_of_feats regardless of completion order.
+
+    Args:
+        list_of_feats (list): Entries returned by process_feature_file.
+        dont_close_browser (bool): Keep the browsers open after the run.
+        workers (int): Maximum number of scenarios running at the same time.
+
+    Returns:
+        list[str]: JUnit XML file paths, one per scenario, in input order.
+    """
+    semaphore = asyncio.Semaphore(workers)
+
+    async def bounded_run(feat: dict) -> str:
+        async with semaphore:
+            return await run_scenario(feat, dont_close_browser)
+
+    tasks = [asyncio.create_task(bounded_run(feat)) for feat in list_of_feats]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    failures = [res for res in results if isinstance(res, BaseException)]
+    for failure in failures:
+        logger.error(f"Scenario execution failed: {failure}")
+    if failures:
+        raise failures[0]
+    return list(results)
+
+
+async def sequential_process(shard_scenarios: bool = True) -> str:
+    """
+    sequential_process function to process feature files, run test cases, and generate JUnit XML results.
+
+    This function performs the following steps:
+    1. Processes the feature file to get a list of features.
+    2. Retrieves the input Gherkin file path and extracts the feature file name.
+    3. Initializes an empty list to store test results.
+    4. Constructs the final result file name for the JUnit XML output.
+    5. Runs every scenario with run_scenario, one after the other or on PARALLEL_WORKERS
+       concurrent workers, collecting the JUnit XML of each test case in feature file order.
+    6. Merges all JUnit XML results into a single file.
+    7. Logs the location of the final result file.
+
+    When SHARD_TOTAL > 1 and shard_scenarios is set, only the scenarios of this shard are run and the
+    result file carries the shard suffix, ready to be combined by the merge command.
+
+    Args:
+        shard_scenarios (bool): Apply scenario sharding, off when bulk test directories are sharded instead.
+
+    Returns:
+        str: Path of the merged JUnit XML result file.
+    """
+    dont_close_browser = get_global_conf().get_dont_close_browser()
+    list_of_feats = await process_feature_file(dont_append_header=dont_close_browser)
+    input_gherkin_file_path = get_global_conf().get_input_gherkin_file_path()
+    # get name of the feature file using os package
+    feature_file_name = os.path.basename(input_gherkin_file_path)
+
+    result_of_tests = []
+
+    shard_index, shard_total = get_global_conf().get_shard()
+    shard_suffix = ""
+    if shard_scenarios and shard_total > 1:
+        list_of_feats = select_scenarios_for_shard(list_of_feats, shard_index, shard_total, get_global_conf().get_shard_durations_file())
+        shard_suffix = get_shard_suffix(shard_index, shard_total)
+
+    add_event(EventType.RUN, EventData(detail="Total Runs: " + str(len(list_of_feats))))
+    workers = get_global_conf().get_parallel_workers()
+    if workers > 1 and len(list_of_feats) > 1:
+        logger.info(f"Running {len(list_of_feats)} testcases on {workers} parallel workers")
+        result_of_tests = await run_scenarios_in_parallel(list_of_feats, dont_close_browser, workers)
+    else:
+        for feat in list_of_feats:
+            result_of_tests.append(await run_scenario(feat, dont_close_browser))
+
+    final_result_file_name = f"{get_global_conf().get_junit_xml_base_path()}/{feature_file_name}_result{shard_suffix}.xml"
 
     await JUnitXMLGenerator.merge_junit_xml(result_of_tests, final_result_file_name)
     logger.info(f"Results published in junitxml file: {final_result_file_name}")
 
     # building html from junitxml
-    final_result_html_file_name = f"{get_global_conf().get_junit_xml_base_path()}/{feature_file_name}_result.html"
+    final_result_html_file_name = f"{get_global_conf().get_junit_xml_base_path()}/{feature_file_name}_result{shard_suffix}.html"
     prepare_html([final_result_file_name, final_result_html_file_name])
     logger.info(f"Results published in html file: {final_result_html_file_name}")
+    return final_result_file_name
 
 
-async def process_test_directory(test_dir: str) -> None:
+async def process_test_directory(test_dir: str) -> str:
     """
     Process a single test directory by updating config paths and running sequential_process
 
     Args:
         test_dir (str): Path to the test directory to process
+
+    Returns:
+        str: Path of the merged JUnit XML result file of the directory.
     """
     # Update config paths for this test directory
     test_dir_name = os.path.basename(test_dir)
@@ -157,7 +240,77 @@ async def process_test_directory(test_dir: str) -> None:
     # Update the singleton config
     set_global_conf(test_config, override=True)
     logger.info(f"Processing test directory: {test_dir}")
-    await sequential_process()
+    # bulk runs shard test directories, not the scenarios inside them
+    return await sequential_process(shard_scenarios=False)
+
+
+def process_test_directory_in_worker(test_dir: str) -> str:
+    """
+    Entry point of a bulk worker process, runs one test directory in a fresh event loop.
+
+    Every worker is its own interpreter, so the config singleton and the browser/agent
+    state touched by process_test_directory are private to the directory being run.
+
+    Args:
+        test_dir (str): Path to the test directory to process
+
+    Returns:
+        str: Path of the merged JUnit XML result file of the directory.
+    """
+
+    async def run_and_close_browser_pool() -> str:
+        try:
+            return await process_test_directory(test_dir)
+        finally:
+            await BrowserPool.close_instance()
+
+    return asyncio.run(run_and_close_browser_pool())
+
+
+async def process_test_directories_in_pool(test_dirs: list[str], workers: int) -> int:
+    """
+    Fan test directories out to a pool of worker processes and aggregate their results.
+
+    The JUnit XML of every directory is kept in place and additionally merged, in test_dirs order,
+    into a bulk result (XML and HTML) under the output folder of the parent process.
+
+    Args:
+        test_dirs (list[str]): Paths of the test directories to process
+        workers (int): Size of the process pool
+
+    Returns:
+        int: Exit status, 0 when every directory completed and 1 otherwise.
+    """
+    loop = asyncio.get_running_loop()
+    # spawn gives every directory a clean interpreter, no forked event loop or browser state
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [loop.run_in_executor(pool, process_test_directory_in_worker, test_dir) for test_dir in test_dirs]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+    exit_status = 0
+    result_files = []
+    for test_dir, result in zip(test_dirs, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Bulk execution failed for test folder {test_dir}: {result}")
+            exit_status = 1
+        elif result and os.path.exists(result):
+            result_files.append(result)
+        else:
+            logger.error(f"No results produced for test folder: {test_dir}")
+            exit_status = 1
+
+    if result_files:
+        output_dir = os.path.join(get_global_conf().get_project_source_root(), "output", get_global_conf().timestamp)
+        os.makedirs(output_dir, exist_ok=True)
+        shard_suffix = get_shard_suffix(*get_global_conf().get_shard())
+        bulk_result_file_name = os.path.join(output_dir, f"bulk_result{shard_suffix}.xml")
+        await JUnitXMLGenerator.merge_junit_xml(result_files, bulk_result_file_name, keep_input_files=True)
+        logger.info(f"Bulk results published in junitxml file: {bulk_result_file_name}")
+
+        bulk_result_html_file_name = os.path.join(output_dir, f"bulk_result{shard_suffix}.html")
+        prepare_html([bulk_result_file_name, bulk_result_html_file_name])
+        logger.info(f"Bulk results published in html file: {bulk_result_html_file_name}")
+    return exit_status
 
 
 async def a_main() -> None:
@@ -231,29 +384,45 @@ async def a_main() -> None:
             """
         )
 
-    # Check bulk execution flag instead of directory existence
-    if get_global_conf().should_execute_bulk():
-        project_base = get_global_conf().get_project_source_root()
-        tests_dir = os.path.join(project_base, "tests")
-
-        if os.path.isdir(tests_dir) and os.listdir(tests_dir):
-            logger.info(f"Bulk execution: Processing tests directory at {tests_dir}")
-
-            for test_folder in os.listdir(tests_dir):
-                test_dir = os.path.join(tests_dir, test_folder)
-                if os.path.isdir(test_dir):
-                    logger.info(f"Processing test folder: {test_folder}")
+    try:
+        # Check bulk execution flag instead of directory existence
+        if get_global_conf().should_execute_bulk():
+            project_base = get_global_conf().get_project_source_root()
+            tests_dir = os.path.join(project_base, "tests")
+
+            if os.path.isdir(tests_dir) and os.listdir(tests_dir):
+                logger.info(f"Bulk execution: Processing tests directory at {tests_dir}")
+
+                test_dirs = [os.path.join(tests_dir, test_folder) for test_folder in sorted(os.listdir(tests_dir))]
+                test_dirs = [test_dir for test_dir in test_dirs if os.path.isdir(test_dir)]
+                shard_index, shard_total = get_global_conf().get_shard()
+                if shard_total > 1:
+                    test_dirs = select_test_dirs_for_shard(test_dirs, shard_index, shard_total, get_global_conf().get_shard_durations_file())
+
+                bulk_workers = get_global_conf().get_bulk_workers()
+                if bulk_workers > 1:
+                    logger.info(f"Processing {len(test_dirs)} test folders on {bulk_workers} worker processes")
+                    exit_status = await process_test_directories_in_pool(test_dirs, bulk_workers)
+                    if exit_status:
+                        exit(exit_status)
+                    return
+
+                for test_dir in test_dirs:
+                    logger.info(f"Processing test folder: {os.path.basename(test_dir)}")
                     await process_test_directory(test_dir)
+            else:
+                logger.error(
+                    "Bulk execution requested but no tests directory found at: %s",
+                    tests_dir,
+                )
+                exit(1)
         else:
-            logger.error(
-                "Bulk execution requested but no tests directory found at: %s",
-                tests_dir,
-            )
-            exit(1)
-    else:
-        # Single test case execution
-        logger.info("Single test execution mode")
-        await sequential_process()
+            # Single test case execution
+            logger.info("Single test execution mode")
+            await sequential_process()
+    finally:
+        # the warm browser pool (if any) lives as long as the process
+        await BrowserPool.close_instance()
 
 
 def main() -> None:
@@ -261,4 +430,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":  # pragma: no cover
-    main()
+    cli_main()
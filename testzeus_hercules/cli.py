@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+
+from junit2htmlreport.runner import run as prepare_html
+from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.shard_helper import (
+    expand_result_files,
+    merge_junit_files,
+    record_durations,
+)
+
+# Sub-commands that do not run agents, dispatched before the agents and the configuration (which requires an LLM) are imported
+UTILITY_COMMANDS = ["merge"]
+
+
+def is_utility_command(argv: list[str]) -> bool:
+    """Return whether the command line runs a utility sub-command such as merge."""
+    return len(argv) > 1 and argv[1] in UTILITY_COMMANDS
+
+
+def merge(argv: list[str]) -> None:
+    """
+    merge sub-command, combines the partial JUnit XML files written by the shards of a run.
+
+    Usage: testzeus-hercules merge --junit-output <merged.xml> [--shard-durations-file <durations.json>] <result files or glob patterns>...
+
+    The merged XML is written with its HTML report next to it, and when a durations file is given (or
+    SHARD_DURATIONS_FILE is set) the scenario durations are recorded there to balance the next sharded run.
+
+    Args:
+        argv (list[str]): Arguments following the merge sub-command.
+    """
+    parser = argparse.ArgumentParser(prog="testzeus-hercules merge", description="Merge partial JUnit XML results of sharded runs")
+    parser.add_argument("files", nargs="+", help="JUnit XML files or glob patterns to merge")
+    parser.add_argument("--junit-output", type=str, required=True, help="Path of the merged JUnit XML file")
+    parser.add_argument("--shard-durations-file", type=str, default=os.environ.get("SHARD_DURATIONS_FILE"), help="JSON file of historical durations to update")
+    args = parser.parse_args(argv)
+
+    result_files = [file for file in expand_result_files(args.files) if os.path.abspath(file) != os.path.abspath(args.junit_output)]
+    if not result_files:
+        logger.error(f"No JUnit XML files found to merge in: {args.files}")
+        exit(1)
+
+    output_dir = os.path.dirname(args.junit_output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    logger.info(f"Merging {len(result_files)} JUnit XML files")
+    merge_junit_files(result_files).write(args.junit_output)
+    logger.info(f"Results published in junitxml file: {args.junit_output}")
+
+    html_file_name = os.path.splitext(args.junit_output)[0] + ".html"
+    prepare_html([args.junit_output, html_file_name])
+    logger.info(f"Results published in html file: {html_file_name}")
+
+    if args.shard_durations_file:
+        record_durations(args.junit_output, args.shard_durations_file)
+
+
+def main() -> None:
+    """Entry point of the testzeus-hercules command."""
+    if is_utility_command(sys.argv):
+        merge(sys.argv[2:])
+        return
+    from testzeus_hercules.__main__ import main as run_main
+
+    run_main()
@@ -3,9 +3,12 @@
 import argparse
 import json
 import os
-from typing import Any, Dict, List, Literal, Optional, Union
+import sys
+from contextvars import ContextVar
+from typing import Any, Dict, List, Literal, Optional, Set, Union
 
 from dotenv import load_dotenv
+from testzeus_hercules.cli import is_utility_command
 from testzeus_hercules.utils.logger import logger
 from testzeus_hercules.utils.timestamp_helper import get_timestamp_str
 
@@ -57,9 +60,14 @@ class BaseConfigManager:
         # Initialize instance variables
         self.timestamp: str = TS
         self.paths: PathsDict = {}
+        # trace directories already created, so resolving a path does not hit the filesystem again
+        self._created_dirs: Set[str] = set()
         self._config: ConfigDict = config_dict.copy()
         self._ignore_env: bool = ignore_env
         self._default_test_id: str = "default"
+        # Scenario-local override of the default test id, so that concurrently
+        # running scenarios (asyncio tasks) each resolve their own paths.
+        self._current_test_id: ContextVar[Optional[str]] = ContextVar(f"hercules_test_id_{id(self)}", default=None)
 
         # 1) Possibly load .env if not in test environment
         is_test_env = os.environ.get("IS_TEST_ENV", "false").lower() == "true"
@@ -77,7 +85,8 @@ class BaseConfigManager:
             self._merge_from_env()
 
         # 4) Perform the same LLM checks as your original code
-        self._check_llm_config()
+        if not self._is_utility_command():
+            self._check_llm_config()
 
         # 5) Provide or finalize certain defaults
         #    (some might have been overridden by env/arguments)
@@ -115,6 +124,10 @@ class BaseConfigManager:
     # Internal Helpers
     # -------------------------------------------------------------------------
 
+    def _is_utility_command(self) -> bool:
+        """Return whether the process was started for a utility sub-command such as merge."""
+        return not self._ignore_env and is_utility_command(sys.argv)
+
     def _parse_arguments(self) -> None:
         """
         Parse Hercules-specific command-line arguments
@@ -216,6 +229,36 @@ class BaseConfigManager:
             help="Execute tests in bulk from tests directory",
             required=False,
         )
+        parser.add_argument(
+            "--bulk-workers",
+            type=int,
+            help="Number of worker processes used to execute test directories in bulk mode",
+            required=False,
+        )
+        parser.add_argument(
+            "--parallel",
+            type=int,
+            help="Number of scenarios to execute concurrently",
+            required=False,
+        )
+        parser.add_argument(
+            "--shard-index",
+            type=int,
+            help="Zero based index of the shard of scenarios (or bulk test directories) to run",
+            required=False,
+        )
+        parser.add_argument(
+            "--shard-total",
+            type=int,
+            help="Total number of shards the scenarios (or bulk test directories) are split into",
+            required=False,
+        )
+        parser.add_argument(
+            "--shard-durations-file",
+            type=str,
+            help="JSON file with historical durations used to balance shards, updated by the merge command",
+            required=False,
+        )
         parser.add_argument(
             "--reuse-vector-db",
             action="store_true",
@@ -242,6 +285,33 @@ class BaseConfigManager:
             help="Specific browser version to use (e.g., '114', '115.0.1', 'latest')",
             required=False,
         )
+        parser.add_argument(
+            "--browser-pool",
+            action="store_true",
+            help="Keep one browser per worker process and hand out pre-created contexts to scenarios",
+            required=False,
+        )
+        parser.add_argument(
+            "--network-mode",
+            type=str,
+            choices=["live", "record", "replay"],
+            help="Record the network traffic of each scenario to a HAR file, or replay it from a previously recorded one",
+            required=False,
+        )
+        parser.add_argument(
+            "--replay-mode",
+            type=str,
+            choices=["off", "record", "replay"],
+            help="Record the tool calls of passing runs, or replay them without the LLM until the first step that diverges",
+            required=False,
+        )
+        parser.add_argument(
+            "--capture-mode",
+            type=str,
+            choices=["screenshots", "screencast"],
+            help="Capture proofs as per-action screenshots (and video), or from a Chromium screencast kept in memory",
+            required=False,
+        )
         parser.add_argument(
             "--enable-ublock",
             action="store_true",
@@ -311,6 +381,16 @@ class BaseConfigManager:
             os.environ["EXECUTE_BULK"] = "true"
         if args.reuse_vector_db:
             os.environ["REUSE_VECTOR_DB"] = "true"
+        if args.bulk_workers is not None:
+            os.environ["BULK_WORKERS"] = str(args.bulk_workers)
+        if args.shard_index is not None:
+            os.environ["SHARD_INDEX"] = str(args.shard_index)
+        if args.shard_total is not None:
+            os.environ["SHARD_TOTAL"] = str(args.shard_total)
+        if args.shard_durations_file:
+            os.environ["SHARD_DURATIONS_FILE"] = args.shard_durations_file
+        if args.parallel is not None:
+            os.environ["PARALLEL_WORKERS"] = str(args.parallel)
 
         # Browser options
         if args.browser_channel:
@@ -319,6 +399,14 @@ class BaseConfigManager:
             os.environ["BROWSER_PATH"] = args.browser_path
         if args.browser_version:
             os.environ["BROWSER_VERSION"] = args.browser_version
+        if args.browser_pool:
+            os.environ["BROWSER_POOL"] = "true"
+        if args.network_mode:
+            os.environ["NETWORK_MODE"] = args.network_mode
+        if args.replay_mode:
+            os.environ["REPLAY_MODE"] = args.replay_mode
+        if args.capture_mode:
+            os.environ["CAPTURE_MODE"] = args.capture_mode
         if args.enable_ublock:
             os.environ["ENABLE_UBLOCK_EXTENSION"] = "true"
         if args.disable_ublock:
@@ -388,18 +476,65 @@ class BaseConfigManager:
             "GEO_PROVIDER",
             "GEO_API_KEY",
             "EXECUTE_BULK",
+            "BULK_WORKERS",
+            "PARALLEL_WORKERS",
+            "SHARD_INDEX",
+            "SHARD_TOTAL",
+            "SHARD_DURATIONS_FILE",
             "USE_DYNAMIC_LTM",
             "REUSE_VECTOR_DB",
+            "REUSE_AGENTS",
+            "LLM_CACHE",
+            "LLM_CACHE_PATH",
+            "LLM_CACHE_NAMESPACE",
+            "LLM_CACHE_MAX_AGE_DAYS",
+            "LLM_CACHE_MAX_MB",
+            "CHAT_HISTORY_COMPACTION",
+            "CHAT_HISTORY_KEEP_RECENT",
+            "CHAT_HISTORY_MAX_TOKENS",
+            "CHAT_HISTORY_COMPACT_MIN_TOKENS",
             "ENABLE_BROWSER_LOGS",
             "BROWSER_CHANNEL",
             "BROWSER_VERSION",
             "BROWSER_PATH",
             "ENABLE_PLAYWRIGHT_TRACING",
             "ENABLE_BOUNDING_BOX_SCREENSHOTS",
+            "SCREENSHOT_FULL_PAGE",
+            "SCREENSHOT_FORMAT",
+            "SCREENSHOT_QUALITY",
+            "SCREENSHOT_DEDUP",
+            "CAPTURE_MODE",
+            "SCREENCAST_FPS",
+            "SCREENCAST_MAX_SIZE",
+            "SCREENCAST_BUFFER_SECONDS",
+            "SCREENCAST_ACTION_WINDOW",
             "ENABLE_UBLOCK_EXTENSION",
             "AUTO_ACCEPT_SCREEN_SHARING",
             "NO_WAIT_FOR_LOAD_STATE",
             "BROWSER_COOKIES",
+            "BROWSER_POOL",
+            "BROWSER_POOL_SIZE",
+            "INCREMENTAL_DOM_SNAPSHOT",
+            "ACCESSIBILITY_BACKEND",
+            "NETWORK_IDLE_IGNORED_URL_PATTERNS",
+            "NETWORK_IDLE_STATS",
+            "CAPTURE_LOG_COMPRESSION",
+            "CAPTURE_LOG_MAX_BYTES",
+            "CAPTURE_LOG_QUEUE_SIZE",
+            "ARTIFACT_WRITER_QUEUE_SIZE",
+            "ARTIFACT_FSYNC",
+            "NETWORK_MODE",
+            "NETWORK_HAR_DIR",
+            "REPLAY_MODE",
+            "REPLAY_TRACE_DIR",
+            "BLOCK_RESOURCE_TYPES",
+            "BLOCK_URL_PATTERNS",
+            "BLOCK_MAX_RESPONSE_BYTES",
+            "ADAPTIVE_SETTLE",
+            "SETTLE_QUIET_TIME",
+            "SETTLE_MAX_TIME",
+            "FRAME_READY_TIMEOUT",
+            "FRAME_READY_IGNORED_URL_PATTERNS",
             # Portkey-related environment variables
             "ENABLE_PORTKEY",
             "PORTKEY_API_KEY",
@@ -520,11 +655,35 @@ class BaseConfigManager:
         self._config.setdefault("GEO_API_KEY", None)
         self._config.setdefault("REACTION_DELAY_TIME", "0.1")
         self._config.setdefault("EXECUTE_BULK", "false")
+        self._config.setdefault("BULK_WORKERS", "1")
+        self._config.setdefault("PARALLEL_WORKERS", "1")
+        self._config.setdefault("SHARD_INDEX", "0")
+        self._config.setdefault("SHARD_TOTAL", "1")
+        self._config.setdefault("SHARD_DURATIONS_FILE", None)
         self._config.setdefault("ENABLE_PLAYWRIGHT_TRACING", "false")
         self._config.setdefault("REUSE_VECTOR_DB", "false")
+        self._config.setdefault("REUSE_AGENTS", "true")
+        self._config.setdefault("LLM_CACHE", "true")
+        self._config.setdefault("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite"))
+        self._config.setdefault("LLM_CACHE_NAMESPACE", None)
+        self._config.setdefault("LLM_CACHE_MAX_AGE_DAYS", "30")
+        self._config.setdefault("LLM_CACHE_MAX_MB", "1024")
+        self._config.setdefault("CHAT_HISTORY_COMPACTION", "true")
+        self._config.setdefault("CHAT_HISTORY_KEEP_RECENT", "4")
+        self._config.setdefault("CHAT_HISTORY_MAX_TOKENS", "60000")
+        self._config.setdefault("CHAT_HISTORY_COMPACT_MIN_TOKENS", "256")
         self._config.setdefault("USE_DYNAMIC_LTM", "false")
         self._config.setdefault("ENABLE_BROWSER_LOGS", "false")
         self._config.setdefault("ENABLE_BOUNDING_BOX_SCREENSHOTS", "false")
+        self._config.setdefault("SCREENSHOT_FULL_PAGE", "false")
+        self._config.setdefault("SCREENSHOT_FORMAT", "png")
+        self._config.setdefault("SCREENSHOT_QUALITY", "80")
+        self._config.setdefault("SCREENSHOT_DEDUP", "identical")
+        self._config.setdefault("CAPTURE_MODE", "screenshots")
+        self._config.setdefault("SCREENCAST_FPS", "2")
+        self._config.setdefault("SCREENCAST_MAX_SIZE", "1280x720")
+        self._config.setdefault("SCREENCAST_BUFFER_SECONDS", "60")
+        self._config.setdefault("SCREENCAST_ACTION_WINDOW", "2")
         self._config.setdefault("AUTO_ACCEPT_SCREEN_SHARING", "true")
 
         self._config.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "python")
@@ -535,6 +694,29 @@ class BaseConfigManager:
         self._config.setdefault("BROWSER_PATH", None)  # Default to system browser
         self._config.setdefault("BROWSER_VERSION", None)  # Default to latest version
         self._config.setdefault("BROWSER_COOKIES", None)  # Default to no cookies
+        self._config.setdefault("BROWSER_POOL", "false")
+        self._config.setdefault("BROWSER_POOL_SIZE", "2")
+        self._config.setdefault("INCREMENTAL_DOM_SNAPSHOT", "false")
+        self._config.setdefault("ACCESSIBILITY_BACKEND", "js")
+        self._config.setdefault("NETWORK_IDLE_IGNORED_URL_PATTERNS", "")
+        self._config.setdefault("NETWORK_IDLE_STATS", "true")
+        self._config.setdefault("CAPTURE_LOG_COMPRESSION", "none")
+        self._config.setdefault("CAPTURE_LOG_MAX_BYTES", "0")
+        self._config.setdefault("CAPTURE_LOG_QUEUE_SIZE", "10000")
+        self._config.setdefault("ARTIFACT_WRITER_QUEUE_SIZE", "10000")
+        self._config.setdefault("ARTIFACT_FSYNC", "flush")
+        self._config.setdefault("NETWORK_MODE", "live")
+        self._config.setdefault("NETWORK_HAR_DIR", None)  # Default to the proofs folder of the scenario
+        self._config.setdefault("REPLAY_MODE", "off")
+        self._config.setdefault("REPLAY_TRACE_DIR", None)  # Default to the proofs folder of the scenario
+        self._config.setdefault("BLOCK_RESOURCE_TYPES", "")
+        self._config.setdefault("BLOCK_URL_PATTERNS", "")
+        self._config.setdefault("BLOCK_MAX_RESPONSE_BYTES", "0")
+        self._config.setdefault("ADAPTIVE_SETTLE", "true")
+        self._config.setdefault("SETTLE_QUIET_TIME", "0.05")
+        self._config.setdefault("SETTLE_MAX_TIME", "1.0")
+        self._config.setdefault("FRAME_READY_TIMEOUT", "0.5")
+        self._config.setdefault("FRAME_READY_IGNORED_URL_PATTERNS", "")
 
         if self._config["MODE"] == "debug":
             self.timestamp = "0"
@@ -603,13 +785,14 @@ class BaseConfigManager:
 
     def set_default_test_id(self, test_id: str = "running_interactive") -> None:
         self._default_test_id = test_id
+        self._current_test_id.set(test_id)
         self._config["DEFAULT_TEST_ID"] = test_id
 
     def reset_default_test_id(self) -> None:
         self.set_default_test_id("default")
 
     def get_default_test_id(self) -> str:
-        return self._default_test_id
+        return self._current_test_id.get() or self._default_test_id
 
     def get_dont_close_browser(self) -> bool:
         return self._config["DONT_CLOSE_BROWSER"].lower().strip() == "true"
@@ -655,6 +838,78 @@ class BaseConfigManager:
     def should_take_screenshots(self) -> bool:
         return self._config["TAKE_SCREENSHOTS"].lower().strip() == "true"
 
+    def should_take_full_page_screenshots(self) -> bool:
+        """Return whether proof screenshots capture the whole page instead of the viewport"""
+        return self._config.get("SCREENSHOT_FULL_PAGE", "false").lower().strip() == "true"
+
+    def get_screenshot_format(self) -> str:
+        """Get the image format proof screenshots are written in: 'png', 'jpeg' or 'webp'"""
+        image_format = (self._config.get("SCREENSHOT_FORMAT") or "png").lower().strip()
+        if image_format == "jpg":
+            return "jpeg"
+        if image_format not in ("png", "jpeg", "webp"):
+            logger.warning(f"Invalid SCREENSHOT_FORMAT value: {image_format}, falling back to png")
+            return "png"
+        return image_format
+
+    def get_screenshot_quality(self) -> int:
+        """Get the quality (1-100) of jpeg and webp proof screenshots"""
+        try:
+            return min(100, max(1, int(self._config.get("SCREENSHOT_QUALITY", "80"))))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid SCREENSHOT_QUALITY value: {self._config.get('SCREENSHOT_QUALITY')}, falling back to 80")
+            return 80
+
+    def get_screenshot_dedup(self) -> str:
+        """Get which proof screenshots are skipped as duplicates of the previous one: 'off', 'identical' or 'perceptual'"""
+        mode = (self._config.get("SCREENSHOT_DEDUP") or "identical").lower().strip()
+        if mode not in ("off", "identical", "perceptual"):
+            logger.warning(f"Invalid SCREENSHOT_DEDUP value: {mode}, falling back to identical")
+            return "identical"
+        return mode
+
+    def get_capture_mode(self) -> str:
+        """Get how proofs are captured: 'screenshots' (per action, plus video) or 'screencast' (Chromium frame buffer)"""
+        mode = (self._config.get("CAPTURE_MODE") or "screenshots").lower().strip()
+        if mode not in ("screenshots", "screencast"):
+            logger.warning(f"Invalid CAPTURE_MODE value: {mode}, falling back to screenshots")
+            return "screenshots"
+        return mode
+
+    def get_screencast_fps(self) -> float:
+        """Get the maximum frames per second of the screencast"""
+        try:
+            return max(0.1, float(self._config.get("SCREENCAST_FPS", "2")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid SCREENCAST_FPS value: {self._config.get('SCREENCAST_FPS')}, falling back to 2")
+            return 2.0
+
+    def get_screencast_max_size(self) -> tuple[int, int]:
+        """Get the maximum width and height of the screencast frames"""
+        size = self._config.get("SCREENCAST_MAX_SIZE") or "1280x720"
+        try:
+            width, height = (int(v) for v in size.lower().split("x"))
+            return max(1, width), max(1, height)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid SCREENCAST_MAX_SIZE value: {size}, falling back to 1280x720")
+            return 1280, 720
+
+    def get_screencast_buffer_seconds(self) -> float:
+        """Get how many seconds of screencast frames are kept in memory"""
+        try:
+            return max(1.0, float(self._config.get("SCREENCAST_BUFFER_SECONDS", "60")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid SCREENCAST_BUFFER_SECONDS value: {self._config.get('SCREENCAST_BUFFER_SECONDS')}, falling back to 60")
+            return 60.0
+
+    def get_screencast_action_window(self) -> float:
+        """Get how many seconds of screencast frames before each tool action are persisted"""
+        try:
+            return max(0.0, float(self._config.get("SCREENCAST_ACTION_WINDOW", "2")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid SCREENCAST_ACTION_WINDOW value: {self._config.get('SCREENCAST_ACTION_WINDOW')}, falling back to 2")
+            return 2.0
+
     def get_browser_type(self) -> str:
         return self._config["BROWSER_TYPE"]
 
@@ -668,10 +923,76 @@ class BaseConfigManager:
         """Return the reaction delay time in seconds."""
         return float(self._config["REACTION_DELAY_TIME"])
 
+    def should_use_adaptive_settle(self) -> bool:
+        """Check if tools should wait for the page to settle after an action instead of sleeping REACTION_DELAY_TIME"""
+        return self._config.get("ADAPTIVE_SETTLE", "true").lower() == "true"
+
+    def get_settle_quiet_time(self) -> float:
+        """Return the seconds without DOM mutation and relevant requests after which a page counts as settled."""
+        try:
+            return max(0.0, float(self._config.get("SETTLE_QUIET_TIME", "0.05")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid SETTLE_QUIET_TIME value: {self._config.get('SETTLE_QUIET_TIME')}, falling back to 0.05")
+            return 0.05
+
+    def get_settle_max_time(self) -> float:
+        """Return the maximum seconds to wait for a page to settle after an action."""
+        try:
+            return max(0.0, float(self._config.get("SETTLE_MAX_TIME", "1.0")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid SETTLE_MAX_TIME value: {self._config.get('SETTLE_MAX_TIME')}, falling back to 1.0")
+            return 1.0
+
+    def get_frame_ready_timeout(self) -> float:
+        """Return the seconds a child frame is waited for before the DOM is read while it is still loading."""
+        try:
+            return max(0.0, float(self._config.get("FRAME_READY_TIMEOUT", "0.5")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid FRAME_READY_TIMEOUT value: {self._config.get('FRAME_READY_TIMEOUT')}, falling back to 0.5")
+            return 0.5
+
+    def get_frame_ready_ignored_url_patterns(self) -> List[str]:
+        """Get the URL substrings of child frames not waited for before reading the DOM, 'default' for the built-in list"""
+        patterns = self._config.get("FRAME_READY_IGNORED_URL_PATTERNS") or ""
+        return [p.strip().lower() for p in patterns.split(",") if p.strip()]
+
     def should_execute_bulk(self) -> bool:
         """Return whether tests should be executed in bulk mode"""
         return self._config["EXECUTE_BULK"].lower().strip() == "true"
 
+    def get_bulk_workers(self) -> int:
+        """Return the number of worker processes used in bulk mode (at least 1)."""
+        try:
+            return max(1, int(self._config["BULK_WORKERS"]))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid BULK_WORKERS value: {self._config['BULK_WORKERS']}, falling back to 1")
+            return 1
+
+    def get_parallel_workers(self) -> int:
+        """Return the number of scenarios to execute concurrently (at least 1)."""
+        try:
+            return max(1, int(self._config["PARALLEL_WORKERS"]))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid PARALLEL_WORKERS value: {self._config['PARALLEL_WORKERS']}, falling back to 1")
+            return 1
+
+    def get_shard(self) -> tuple[int, int]:
+        """Return (shard index, shard total) of this run, (0, 1) when not sharding."""
+        try:
+            shard_index = int(self._config["SHARD_INDEX"])
+            shard_total = int(self._config["SHARD_TOTAL"])
+        except (TypeError, ValueError):
+            logger.error(f"Invalid shard configuration: SHARD_INDEX={self._config['SHARD_INDEX']}, SHARD_TOTAL={self._config['SHARD_TOTAL']}")
+            exit(1)
+        if shard_total < 1 or not 0 <= shard_index < shard_total:
+            logger.error(f"SHARD_INDEX must be in [0, SHARD_TOTAL), got {shard_index} of {shard_total}")
+            exit(1)
+        return shard_index, shard_total
+
+    def get_shard_durations_file(self) -> Optional[str]:
+        """Return the historical durations file used to balance shards, if configured."""
+        return self._config.get("SHARD_DURATIONS_FILE")
+
     def should_enable_tracing(self) -> bool:
         """Check if Playwright tracing should be enabled"""
         return self._config.get("ENABLE_PLAYWRIGHT_TRACING", "false").lower() == "true"
@@ -680,6 +1001,69 @@ class BaseConfigManager:
         """Return whether to reuse existing vector DB or create fresh one."""
         return self._config["REUSE_VECTOR_DB"].lower().strip() == "true"
 
+    def should_reuse_agents(self) -> bool:
+        """Return whether the agent graph is built once per process and reset between scenarios."""
+        return self._config["REUSE_AGENTS"].lower().strip() == "true"
+
+    def should_use_llm_cache(self) -> bool:
+        """Return whether LLM responses are served from and stored in the LLM cache."""
+        return self._config["LLM_CACHE"].lower().strip() == "true"
+
+    def get_llm_cache_path(self) -> str:
+        """Get the path of the SQLite database of the LLM cache"""
+        return self._config.get("LLM_CACHE_PATH") or os.path.join(".cache", "llm_cache.sqlite")
+
+    def get_llm_cache_namespace(self) -> str:
+        """Get the namespace of the LLM cache entries, by default the name of the project folder"""
+        namespace = self._config.get("LLM_CACHE_NAMESPACE")
+        if namespace:
+            return namespace
+        return os.path.basename(os.path.abspath(self.get_project_source_root())) or "default"
+
+    def get_llm_cache_max_age_days(self) -> float:
+        """Get the number of days after which LLM cache entries expire, 0 to keep them forever"""
+        try:
+            return max(0.0, float(self._config.get("LLM_CACHE_MAX_AGE_DAYS", "30")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid LLM_CACHE_MAX_AGE_DAYS value: {self._config.get('LLM_CACHE_MAX_AGE_DAYS')}, falling back to 30")
+            return 30.0
+
+    def get_llm_cache_max_mb(self) -> float:
+        """Get the maximum size in MB of the LLM cache entries of the namespace, 0 for no limit"""
+        try:
+            return max(0.0, float(self._config.get("LLM_CACHE_MAX_MB", "1024")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid LLM_CACHE_MAX_MB value: {self._config.get('LLM_CACHE_MAX_MB')}, falling back to 1024")
+            return 1024.0
+
+    def should_compact_chat_history(self) -> bool:
+        """Return whether the chat history the agents send to their LLM is compacted."""
+        return self._config["CHAT_HISTORY_COMPACTION"].lower().strip() == "true"
+
+    def get_chat_history_keep_recent(self) -> int:
+        """Get the number of most recent exchanges of an agent's chat history kept verbatim"""
+        try:
+            return max(1, int(self._config.get("CHAT_HISTORY_KEEP_RECENT", "4")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid CHAT_HISTORY_KEEP_RECENT value: {self._config.get('CHAT_HISTORY_KEEP_RECENT')}, falling back to 4")
+            return 4
+
+    def get_chat_history_max_tokens(self) -> int:
+        """Get the token budget of each agent's chat history, 0 for no budget"""
+        try:
+            return max(0, int(self._config.get("CHAT_HISTORY_MAX_TOKENS", "60000")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid CHAT_HISTORY_MAX_TOKENS value: {self._config.get('CHAT_HISTORY_MAX_TOKENS')}, falling back to 60000")
+            return 60000
+
+    def get_chat_history_compact_min_tokens(self) -> int:
+        """Get the size in tokens under which an earlier tool output is kept verbatim"""
+        try:
+            return max(0, int(self._config.get("CHAT_HISTORY_COMPACT_MIN_TOKENS", "256")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid CHAT_HISTORY_COMPACT_MIN_TOKENS value: {self._config.get('CHAT_HISTORY_COMPACT_MIN_TOKENS')}, falling back to 256")
+            return 256
+
     def should_use_dynamic_ltm(self) -> bool:
         """Return whether to use dynamic LTM or static LTM."""
         return self._config["USE_DYNAMIC_LTM"].lower().strip() == "true"
@@ -700,6 +1084,121 @@ class BaseConfigManager:
         """Get the configured browser version (e.g., '114', '115.0.1', 'latest')"""
         return self._config.get("BROWSER_VERSION")
 
+    def should_use_browser_pool(self) -> bool:
+        """Check if browser contexts should come from the per-process browser pool"""
+        return self._config.get("BROWSER_POOL", "false").lower() == "true"
+
+    def get_browser_pool_size(self) -> int:
+        """Get the number of warm browser contexts kept ready by the browser pool"""
+        try:
+            return max(0, int(self._config.get("BROWSER_POOL_SIZE", "2")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid BROWSER_POOL_SIZE value: {self._config.get('BROWSER_POOL_SIZE')}, falling back to 2")
+            return 2
+
+    def should_use_incremental_dom_snapshot(self) -> bool:
+        """Check if accessibility snapshots should only recompute the subtrees changed since the previous snapshot"""
+        return self._config.get("INCREMENTAL_DOM_SNAPSHOT", "false").lower() == "true"
+
+    def get_accessibility_backend(self) -> str:
+        """Get the backend building accessibility snapshots: 'js' (in-page script) or 'cdp' (Chromium DevTools Protocol)"""
+        backend = (self._config.get("ACCESSIBILITY_BACKEND") or "js").lower().strip()
+        if backend not in ("js", "cdp"):
+            logger.warning(f"Invalid ACCESSIBILITY_BACKEND value: {backend}, falling back to js")
+            return "js"
+        return backend
+
+    def get_network_idle_ignored_url_patterns(self) -> List[str]:
+        """Get the project specific URL substrings ignored by the network idle wait, on top of the built-in ones"""
+        patterns = self._config.get("NETWORK_IDLE_IGNORED_URL_PATTERNS") or ""
+        return [p.strip().lower() for p in patterns.split(",") if p.strip()]
+
+    def should_record_network_idle_stats(self) -> bool:
+        """Check if the duration and blocking requests of each network idle wait should be written to the proofs folder"""
+        return self._config.get("NETWORK_IDLE_STATS", "true").lower() == "true"
+
+    def get_capture_log_compression(self) -> str:
+        """Get the compression of the network and console capture logs: 'none', 'gzip' or 'zstd'"""
+        compression = (self._config.get("CAPTURE_LOG_COMPRESSION") or "none").lower().strip()
+        if compression not in ("none", "gzip", "zstd"):
+            logger.warning(f"Invalid CAPTURE_LOG_COMPRESSION value: {compression}, falling back to none")
+            return "none"
+        return compression
+
+    def get_capture_log_max_bytes(self) -> int:
+        """Get the size in bytes after which a capture log file is rotated, 0 disables rotation"""
+        try:
+            return max(0, int(self._config.get("CAPTURE_LOG_MAX_BYTES", "0")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid CAPTURE_LOG_MAX_BYTES value: {self._config.get('CAPTURE_LOG_MAX_BYTES')}, rotation disabled")
+            return 0
+
+    def get_capture_log_queue_size(self) -> int:
+        """Get the maximum number of capture log entries buffered before new ones are dropped"""
+        try:
+            return max(1, int(self._config.get("CAPTURE_LOG_QUEUE_SIZE", "10000")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid CAPTURE_LOG_QUEUE_SIZE value: {self._config.get('CAPTURE_LOG_QUEUE_SIZE')}, falling back to 10000")
+            return 10000
+
+    def get_artifact_writer_queue_size(self) -> int:
+        """Get the maximum number of artifact log lines buffered before the loggers wait for the disk"""
+        try:
+            return max(1, int(self._config.get("ARTIFACT_WRITER_QUEUE_SIZE", "10000")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid ARTIFACT_WRITER_QUEUE_SIZE value: {self._config.get('ARTIFACT_WRITER_QUEUE_SIZE')}, falling back to 10000")
+            return 10000
+
+    def get_artifact_fsync(self) -> str:
+        """Get when artifact log files are fsynced: 'none', 'batch' (after every write batch) or 'flush' (at scenario end)"""
+        policy = (self._config.get("ARTIFACT_FSYNC") or "flush").lower().strip()
+        if policy not in ("none", "batch", "flush"):
+            logger.warning(f"Invalid ARTIFACT_FSYNC value: {policy}, falling back to flush")
+            return "flush"
+        return policy
+
+    def get_network_mode(self) -> str:
+        """Get the network mode of the browser context: 'live', 'record' (save a HAR) or 'replay' (serve from the HAR)"""
+        mode = (self._config.get("NETWORK_MODE") or "live").lower().strip()
+        if mode not in ("live", "record", "replay"):
+            logger.warning(f"Invalid NETWORK_MODE value: {mode}, falling back to live")
+            return "live"
+        return mode
+
+    def get_network_har_dir(self) -> Optional[str]:
+        """Get the folder holding the recorded HAR files, one <test_id>.har per scenario, None for the proofs folder"""
+        return self._config.get("NETWORK_HAR_DIR")
+
+    def get_replay_mode(self) -> str:
+        """Get the tool call replay mode: 'off', 'record' (save the traces of passing runs) or 'replay' (also replay them)"""
+        mode = (self._config.get("REPLAY_MODE") or "off").lower().strip()
+        if mode not in ("off", "record", "replay"):
+            logger.warning(f"Invalid REPLAY_MODE value: {mode}, falling back to off")
+            return "off"
+        return mode
+
+    def get_replay_trace_dir(self) -> Optional[str]:
+        """Get the folder holding the recorded tool call traces, one <test_id>.json per scenario, None for the proofs folder"""
+        return self._config.get("REPLAY_TRACE_DIR")
+
+    def get_block_resource_types(self) -> List[str]:
+        """Get the resource types (image, font, media, ...) aborted by the resource blocking policy"""
+        types = self._config.get("BLOCK_RESOURCE_TYPES") or ""
+        return [t.strip().lower() for t in types.split(",") if t.strip()]
+
+    def get_block_url_patterns(self) -> List[str]:
+        """Get the URL substrings aborted by the resource blocking policy, 'default' stands for the built-in list"""
+        patterns = self._config.get("BLOCK_URL_PATTERNS") or ""
+        return [p.strip().lower() for p in patterns.split(",") if p.strip()]
+
+    def get_block_max_response_bytes(self) -> int:
+        """Get the response size above which the resource blocking policy aborts a request, 0 disables the check"""
+        try:
+            return max(0, int(self._config.get("BLOCK_MAX_RESPONSE_BYTES", "0")))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid BLOCK_MAX_RESPONSE_BYTES value: {self._config.get('BLOCK_MAX_RESPONSE_BYTES')}, size check disabled")
+            return 0
+
     def should_take_bounding_box_screenshots(self) -> bool:
         """Check if bounding box screenshots should be enabled"""
         return self._config.get("ENABLE_BOUNDING_BOX_SCREENSHOTS", "false").lower() == "true"
@@ -748,7 +1247,7 @@ class BaseConfigManager:
         return path
 
     def get_project_temp_path(self, test_id: Optional[str] = None) -> str:
-        test_id = test_id or self._default_test_id
+        test_id = test_id or self.get_default_test_id()
         base_path = self._config["PROJECT_TEMP_PATH"]
         path = os.path.join(base_path, test_id)
         if not os.path.exists(path):
@@ -789,7 +1288,7 @@ class BaseConfigManager:
     def get_trace_path(self, stake_id: Optional[str] = None) -> PathsDict:
         """Get all trace related paths for a test run."""
         base_path = self.get_project_source_root()
-        test_id = stake_id if stake_id else self._default_test_id
+        test_id = stake_id if stake_id else self.get_default_test_id()
 
         paths: PathsDict = {
             "proofs": os.path.join(base_path, "proofs", test_id, self.timestamp),
@@ -799,7 +1298,9 @@ class BaseConfigManager:
 
         # Create directories
         for path in paths.values():
-            os.makedirs(path, exist_ok=True)
+            if path not in self._created_dirs:
+                os.makedirs(path, exist_ok=True)
+                self._created_dirs.add(path)
 
         self.paths = paths
         return paths
@@ -6,6 +6,7 @@ from typing import Any
 
 import autogen  # type: ignore
 from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.core.memory.prompt_compressor import add_text_compressor
 from testzeus_hercules.core.memory.static_ltm import get_user_ltm
 from testzeus_hercules.core.tools.tool_registry import tool_registry
 from testzeus_hercules.telemetry import EventData, EventType, add_event
@@ -63,6 +64,7 @@ class BaseNavAgent:
                 **llm_config_params,  # unpack all the name value pairs in llm_config_params as is
             },
         )
+        add_text_compressor(self.agent)
 
         self.register_tools()
 
@@ -7,6 +7,7 @@ import autogen  # type: ignore
 from autogen import ConversableAgent  # type: ignore
 from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.memory.dynamic_ltm import DynamicLTM
+from testzeus_hercules.core.memory.prompt_compressor import add_text_compressor
 from testzeus_hercules.core.memory.static_ltm import get_user_ltm
 from testzeus_hercules.core.post_process_responses import (
     final_reply_callback_planner_agent as print_message_as_planner,  # type: ignore
@@ -265,7 +266,7 @@ Available Test Data: $basic_test_information
                 **llm_config_params,  # unpack all the name value pairs in llm_config_params as is
             },
         )
-        # add_text_compressor(self.agent)
+        add_text_compressor(self.agent)
 
         def ingest_message_in_memory(
             recipient: autogen.ConversableAgent,
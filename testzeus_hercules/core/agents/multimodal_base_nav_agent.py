@@ -4,6 +4,7 @@ from typing import Any
 
 from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.agents.base_nav_agent import BaseNavAgent
+from testzeus_hercules.core.memory.prompt_compressor import add_text_compressor
 from testzeus_hercules.utils.llm_helper import MultimodalConversableAgent
 from testzeus_hercules.utils.logger import logger
 
@@ -54,5 +55,6 @@ class MultimodalBaseNavAgent(BaseNavAgent):
             },
             human_input_mode="NEVER",
         )
+        add_text_compressor(self.agent)
 
         self.register_tools()
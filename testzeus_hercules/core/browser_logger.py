@@ -5,8 +5,12 @@ import traceback
 from typing import Any, Dict, List, Optional, Union
 
 from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.utils.artifact_writer import get_artifact_writer
+from testzeus_hercules.utils.dom_helper import introspect_element
 from testzeus_hercules.utils.logger import logger
 
+LOGGED_ATTRIBUTES = ("id", "class", "name", "type", "value", "role", "aria-label")
+
 
 class BrowserLogger:
     """
@@ -16,10 +20,12 @@ class BrowserLogger:
     - sec_nav_agent: Security testing operations
     - sql_nav_agent: Database operations
 
-    Logs are stored in NDJSON format (Newline Delimited JSON).
+    Logs are stored in NDJSON format (Newline Delimited JSON). Every tool call executed by the nav executors is
+    logged as well (interaction_type 'tool_call'), this is the trace replayed by core/trace_replay.py.
     """
 
     _instance = None
+    _instances: Dict[str, "BrowserLogger"] = {}
 
     def __init__(self, proof_path: Optional[str] = None) -> None:
         """Initialize the BrowserLogger."""
@@ -37,10 +43,16 @@ class BrowserLogger:
 
     @classmethod
     def get_instance(cls, proof_path: Optional[str] = None) -> "BrowserLogger":
-        """Get or create a singleton instance of BrowserLogger."""
-        if cls._instance is None:
-            cls._instance = cls(proof_path)
-        return cls._instance
+        """Get or create the BrowserLogger for the given proof path (one per running scenario)."""
+        if proof_path is None:
+            if cls._instance is None:
+                cls._instance = cls(proof_path)
+            return cls._instance
+        if proof_path not in cls._instances:
+            cls._instances[proof_path] = cls(proof_path)
+            if cls._instance is None:
+                cls._instance = cls._instances[proof_path]
+        return cls._instances[proof_path]
 
     async def log_interaction(
         self,
@@ -79,7 +91,7 @@ class BrowserLogger:
             additional_data: Any additional data to log
         """
         # Check if logging is enabled
-        if not get_global_conf().should_enable_browser_logs():
+        if not self.is_enabled():
             return
 
         # Ensure log file is set up
@@ -117,17 +129,61 @@ class BrowserLogger:
             if additional_data:
                 log_entry["additional_data"] = additional_data
 
-            # Write the log entry as a single line JSON
-            line = json.dumps(log_entry, ensure_ascii=False) + "\n"
-
-            with open(self._log_file, "a", encoding="utf-8") as file:
-                file.write(line)
+            # Write the log entry as a single line JSON, the shared artifact writer does the file I/O
+            await get_artifact_writer().append_line_async(self._log_file, json.dumps(log_entry, ensure_ascii=False))
 
         except Exception as e:
 
             traceback.print_exc()
             logger.error(f"Failed to write interaction log: {e}")
 
+    def is_enabled(self) -> bool:
+        """Interactions are logged with ENABLE_BROWSER_LOGS, and whenever tool call traces are recorded for replay."""
+        config = get_global_conf()
+        return config.should_enable_browser_logs() or config.get_replay_mode() != "off"
+
+    def log_tool_call(
+        self,
+        agent_type: str,
+        tool_name: str,
+        arguments: Any,
+        result: str,
+        success: bool = True,
+    ) -> None:
+        """
+        Log a tool call with its arguments and result. Unlike the other log methods it can be called from sync code.
+
+        Args:
+            agent_type: Name of the executor agent that ran the tool, e.g. browser_nav_executor
+            tool_name: Name the tool is registered with
+            arguments: The arguments of the call, as parsed from the LLM tool call
+            result: The content returned to the LLM
+            success: Whether the tool executed without raising
+        """
+        if not self.is_enabled():
+            return
+
+        if not self._log_file:
+            self._setup_log_file()
+
+        try:
+            log_entry = {
+                "timestamp": time.time(),
+                "agent_type": agent_type,
+                "tool_name": tool_name,
+                "action": "tool_call",
+                "interaction_type": "tool_call",
+                "success": success,
+                "request_data": {"arguments": arguments},
+                "response_data": {"content": result},
+            }
+            get_artifact_writer().append_line(self._log_file, json.dumps(log_entry, ensure_ascii=False, default=str))
+
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to write tool call log: {e}")
+
     async def log_browser_interaction(
         self,
         tool_name: str,
@@ -259,68 +315,16 @@ class BrowserLogger:
             additional_data=additional_data,
         )
 
-    async def get_alternative_selectors(self, element: Any, page: Any) -> Dict[str, str]:
-        """Generate alternative selectors for an element."""
+    async def get_alternative_selectors(self, element: Any, page: Any, introspection: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """Generate alternative selectors for an element, from the introspect_element result when already read."""
         try:
-            selectors = {}
+            if introspection is None:
+                introspection = await introspect_element(element)
 
-            # Get XPath with improved error handling and properly scoped variables
-            xpath = await page.evaluate(
-                """(element) => {
-                try {
-                    const getXPath = (elm) => {
-                        if (!elm || !elm.nodeType) return null;
-                        
-                        const segs = [];
-                        while (elm && elm.nodeType === 1) {
-                            if (elm.hasAttribute('id')) {
-                                segs.unshift(`//*[@id="${elm.getAttribute('id')}"]`);
-                                return segs.join('/');
-                            } else {
-                                let sib = elm;
-                                let nth = 1;
-                                for (sib = sib.previousSibling; sib; sib = sib.previousSibling) {
-                                    if (sib.nodeType === 1 && sib.tagName === elm.tagName) nth++;
-                                }
-                                segs.unshift(elm.tagName.toLowerCase() + '[' + nth + ']');
-                            }
-                            elm = elm.parentNode;
-                        }
-                        return segs.length ? '/' + segs.join('/') : null;
-                    };
-                    return getXPath(element);
-                } catch (error) {
-                    console.error('XPath generation error:', error);
-                    return null;
-                }
-            }""",
-                element,
-            )
-            if xpath:
-                selectors["xpath"] = xpath
-
-            # Get ARIA selector with improved error handling
-            aria = await page.evaluate(
-                """(element) => {
-                try {
-                    if (!element || !element.nodeType) return null;
-                    
-                    if (element.getAttribute('role')) {
-                        return `[role="${element.getAttribute('role')}"]`;
-                    }
-                    if (element.getAttribute('aria-label')) {
-                        return `[aria-label="${element.getAttribute('aria-label')}"]`;
-                    }
-                    return null;
-                } catch (error) {
-                    console.error('ARIA selector generation error:', error);
-                    return null;
-                }
-            }""",
-                element,
-            )
-            if aria:
-                selectors["aria"] = aria
+            selectors = {}
+            for kind in ("xpath", "aria", "css"):
+                if introspection.get(kind):
+                    selectors[kind] = introspection[kind]
 
             return selectors
         except Exception as e:
@@ -329,21 +333,23 @@ class BrowserLogger:
             logger.error(f"Failed to generate alternative selectors: {e}")
             return {}
 
-    async def get_element_attributes(self, element: Any) -> Dict[str, str]:
-        """Get relevant attributes from an element."""
+    async def get_element_attributes(self, element: Any, introspection: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get relevant attributes from an element, from the introspect_element result when already read."""
         try:
-            attributes = {}
+            if introspection is None:
+                introspection = await introspect_element(element)
 
             # Get common attributes
-            for attr in ["id", "class", "name", "type", "value", "role", "aria-label"]:
-                value = await element.get_attribute(attr)
+            attributes: Dict[str, Any] = {}
+            for attr in LOGGED_ATTRIBUTES:
+                value = introspection["attributes"].get(attr)
                 if value:
                     attributes[attr] = value
 
-            # Get element tag
-            tag = await element.evaluate("el => el.tagName.toLowerCase()")
-            if tag:
-                attributes["tag"] = tag
+            if introspection.get("tag"):
+                attributes["tag"] = introspection["tag"]
+            if introspection.get("boundingBox"):
+                attributes["bounding_box"] = introspection["boundingBox"]
 
             return attributes
         except Exception as e:
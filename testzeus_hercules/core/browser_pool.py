@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.async_api import Browser, BrowserContext, Playwright
+from playwright.async_api import async_playwright as playwright
+from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.utils.logger import logger
+
+
+class BrowserPool:
+    """
+    Keeps one long-lived browser per worker process and a few pre-created, clean BrowserContexts.
+
+    Scenarios check a context out when their PlaywrightManager creates its browser context and
+    return it when the manager closes it. Returned contexts are closed, never handed out again, so
+    no cookies, storage or pages leak between scenarios; the pool refills itself in the background
+    with fresh contexts created from the same options. Video recording goes to a pool level folder,
+    PlaywrightManager moves the finished recording into the proofs of the scenario.
+    """
+
+    _instance: Optional["BrowserPool"] = None
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._browser_key: Optional[Tuple[Any, ...]] = None
+        self._warm_contexts: Dict[str, List[BrowserContext]] = {}
+        self._refill_tasks: Dict[str, asyncio.Task] = {}
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "BrowserPool":
+        """Get or create the BrowserPool of this process."""
+        if cls._instance is None:
+            cls._instance = cls(get_global_conf().get_browser_pool_size())
+        return cls._instance
+
+    @classmethod
+    async def close_instance(cls) -> None:
+        """Close the BrowserPool of this process, if one was created."""
+        if cls._instance is not None:
+            instance = cls._instance
+            cls._instance = None
+            await instance.close()
+
+    async def get_playwright(self) -> Playwright:
+        """Return the Playwright driver shared by every scenario of this process."""
+        if self._playwright is None:
+            self._playwright = await playwright().start()
+        return self._playwright
+
+    def is_browser_running(self) -> bool:
+        """Return whether the pooled browser is launched and still connected."""
+        return self._browser is not None and self._browser.is_connected()
+
+    def get_video_dir(self) -> str:
+        """Folder the pooled contexts record their videos to."""
+        path = os.path.join(get_global_conf().get_project_temp_path("browser_pool"), "videos")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    async def _ensure_browser(self, browser_type: str, launch_options: Dict[str, Any]) -> Browser:
+        browser_key = (
+            browser_type,
+            launch_options.get("channel"),
+            launch_options.get("executable_path"),
+            launch_options.get("headless"),
+        )
+        if self.is_browser_running() and self._browser_key == browser_key:
+            return self._browser  # type: ignore
+
+        if self._browser is not None:
+            logger.info("Browser settings changed or browser disconnected, relaunching pooled browser")
+            await self._close_warm_contexts()
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.debug(f"Failed to close previous pooled browser: {e}")
+
+        pw = await self.get_playwright()
+        logger.info(f"Launching pooled {browser_type} browser")
+        self._browser = await getattr(pw, browser_type).launch(**launch_options)
+        self._browser_key = browser_key
+        return self._browser
+
+    async def checkout_context(self, browser_type: str, launch_options: Dict[str, Any], context_options: Dict[str, Any]) -> BrowserContext:
+        """
+        Hand out a clean BrowserContext created with context_options, launching the browser if needed.
+
+        Args:
+            browser_type: Playwright browser type name (chromium, firefox, webkit).
+            launch_options: Options for BrowserType.launch, only used when the browser is (re)launched.
+            context_options: Options for Browser.new_context.
+
+        Returns:
+            BrowserContext: A context no other scenario has used.
+        """
+        options_key = json.dumps(context_options, sort_keys=True, default=str)
+        async with self._lock:
+            browser = await self._ensure_browser(browser_type, launch_options)
+            context = None
+            warm = self._warm_contexts.get(options_key, [])
+            while warm and context is None:
+                candidate = warm.pop()
+                if candidate.browser is not None and candidate.browser.is_connected():
+                    context = candidate
+            if context is None:
+                context = await browser.new_context(**context_options)
+            else:
+                logger.debug("Checked out a warm browser context from the pool")
+
+        self._schedule_refill(options_key, context_options)
+        return context
+
+    async def release_context(self, context: BrowserContext) -> None:
+        """Take a context back from a scenario, it is closed and replaced by a fresh one."""
+        try:
+            await context.close()
+        except Exception as e:
+            traceback.print_exc()
+            logger.error(f"Failed to close pooled browser context: {e}")
+
+    def _schedule_refill(self, options_key: str, context_options: Dict[str, Any]) -> None:
+        task = self._refill_tasks.get(options_key)
+        if task is not None and not task.done():
+            return
+        self._refill_tasks[options_key] = asyncio.create_task(self._refill(options_key, context_options))
+
+    async def _refill(self, options_key: str, context_options: Dict[str, Any]) -> None:
+        try:
+            while len(self._warm_contexts.get(options_key, [])) < self._size:
+                async with self._lock:
+                    if not self.is_browser_running():
+                        return
+                    context = await self._browser.new_context(**context_options)  # type: ignore
+                    self._warm_contexts.setdefault(options_key, []).append(context)
+        except Exception as e:
+            traceback.print_exc()
+            logger.error(f"Failed to pre-create pooled browser context: {e}")
+
+    async def _close_warm_contexts(self) -> None:
+        for task in self._refill_tasks.values():
+            task.cancel()
+        self._refill_tasks = {}
+        for contexts in self._warm_contexts.values():
+            for context in contexts:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"Failed to close warm browser context: {e}")
+        self._warm_contexts = {}
+
+    async def close(self) -> None:
+        """Close every warm context, the pooled browser and the Playwright driver."""
+        await self._close_warm_contexts()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.debug(f"Failed to close pooled browser: {e}")
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
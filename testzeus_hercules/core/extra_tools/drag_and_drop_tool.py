@@ -2,11 +2,17 @@ import asyncio
 import traceback
 from typing import Annotated
 
-from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_settle import wait_for_dom_quiet, wait_until_settled
+
+# Caps of the DOM quiet waits of a drag, the fixed pauses they replaced: pages animating all the time never wait longer
+DRAG_SCROLL_MAX_WAIT = 0.2
+DRAG_POINTER_MAX_WAIT = 0.3
+DRAG_STEP_MAX_WAIT = 0.1
+DRAG_HOVER_MAX_WAIT = 0.5
 
 
 @tool(
@@ -100,7 +106,7 @@ async def drag_and_drop(
         try:
             await source_element.scroll_into_view_if_needed()
             await target_element.scroll_into_view_if_needed()
-            await asyncio.sleep(0.2)  # Wait for scroll to complete
+            await wait_for_dom_quiet(page, max_wait=DRAG_SCROLL_MAX_WAIT)  # Wait for scroll to complete
 
             source_box = await source_element.bounding_box()
             target_box = await target_element.bounding_box()
@@ -117,9 +123,9 @@ async def drag_and_drop(
             # Perform drag and drop with precise mouse movements
             # 1. Move to source and start drag
             await page.mouse.move(source_x, source_y)
-            await asyncio.sleep(0.3)
+            await wait_for_dom_quiet(page, max_wait=DRAG_POINTER_MAX_WAIT)
             await page.mouse.down()
-            await asyncio.sleep(0.3)
+            await wait_for_dom_quiet(page, max_wait=DRAG_POINTER_MAX_WAIT)
 
             # 2. Drag movement with increased steps and slower motion
             steps = 20  # More steps for smoother movement
@@ -127,17 +133,15 @@ async def drag_and_drop(
                 current_x = source_x + (target_x - source_x) * (i / steps)
                 current_y = source_y + (target_y - source_y) * (i / steps)
                 await page.mouse.move(current_x, current_y)
-                await asyncio.sleep(0.1)  # Slower movement
+                await wait_for_dom_quiet(page, max_wait=DRAG_STEP_MAX_WAIT)  # Let the drag library react to each step
 
             # 3. Ensure we're over target and hold briefly
             await page.mouse.move(target_x, target_y)
-            await asyncio.sleep(0.5)  # Longer hover over target
-
-            # 4. Release drop
-            await page.mouse.up()
+            await wait_for_dom_quiet(page, max_wait=DRAG_HOVER_MAX_WAIT)  # Hover over target until the drop zone reacted
 
-            # Wait for animations and DOM updates
-            await asyncio.sleep(get_global_conf().get_delay_time())
+            # 4. Release drop, then wait for animations and DOM updates
+            async with wait_until_settled(page):
+                await page.mouse.up()
 
             return f"Successfully performed drag and drop from '{selector}' to '{target_selector}'"
 
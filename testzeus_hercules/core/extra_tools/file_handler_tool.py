@@ -77,6 +77,7 @@ def persist_findings(
         "Python object; for TXT and LOG files, returns the raw text content. Returns an error message if the "
         "operation fails."
     ),
+    read_only=True,
 )
 def recall_findings(
     file_path: Annotated[str, "The path to the file from which data should be read."],
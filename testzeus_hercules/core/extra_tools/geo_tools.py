@@ -12,6 +12,7 @@ from testzeus_hercules.utils.logger import logger
     agent_names=["browser_nav_agent", "api_nav_agent"],
     name="get_current_geo_location",
     description=("Retrieve the current geolocation"),
+    read_only=True,
 )
 async def get_current_geo_location() -> Union[str, Dict[str, str]]:
     """
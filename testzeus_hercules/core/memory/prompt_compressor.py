@@ -1,10 +1,208 @@
-from autogen import ConversableAgent
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
+from autogen import ConversableAgent  # type: ignore
+from autogen.token_count_utils import count_token  # type: ignore
+from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.utils.llm_cache import normalize_observation
+from testzeus_hercules.utils.logger import logger
 
-def add_text_compressor(agent: ConversableAgent) -> None:
+# Roles of the messages carrying tool outputs: DOM snapshots, page text, API responses
+_OBSERVATION_ROLES = ("tool", "function")
+_SUMMARY_LINE_CHARS = 160
+# Token counts of the texts seen last, keyed by digest so the DOM snapshots themselves are not kept alive
+_TOKEN_COUNTS_SIZE = 8192
+_token_counts: "OrderedDict[str, int]" = OrderedDict()
+
+
+def count_text_tokens(text: str) -> int:
+    """Tokens of a text, cached by digest since every turn recounts the same history."""
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    tokens = _token_counts.get(key)
+    if tokens is None:
+        tokens = count_token(text)
+        _token_counts[key] = tokens
+        if len(_token_counts) > _TOKEN_COUNTS_SIZE:
+            _token_counts.popitem(last=False)
+    else:
+        _token_counts.move_to_end(key)
+    return tokens
+
+
+def _content_tokens(content: Any) -> int:
+    if isinstance(content, str):
+        return count_text_tokens(content)
+    if isinstance(content, list):
+        return sum(count_text_tokens(item.get("text", "")) for item in content if isinstance(item, dict) and item.get("type") == "text")
+    return 0
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, list):
+        return "\n".join(item.get("text", "") for item in content if isinstance(item, dict) and item.get("type") == "text")
+    return content if isinstance(content, str) else ""
+
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    """Tokens the message costs in a request: its text, its tool call arguments and its tool responses."""
+    if message.get("tool_responses"):
+        # autogen sends the tool responses in place of the concatenated content of the message
+        tokens = sum(_content_tokens(response.get("content")) for response in message["tool_responses"])
+    else:
+        tokens = _content_tokens(message.get("content"))
+    for tool_call in message.get("tool_calls") or []:
+        tokens += count_text_tokens(str(tool_call.get("function", {}).get("arguments") or ""))
+    return tokens
+
+
+def summarize_content(content: Any, tokens: int) -> str:
+    """
+    Short stand-in for a message content: its first line, its size and the hash of its normalized text, so the
+    agent still sees what the output was and whether two snapshots were the same.
+    """
+    text = _content_text(content)
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    if len(first_line) > _SUMMARY_LINE_CHARS:
+        first_line = first_line[:_SUMMARY_LINE_CHARS] + "..."
+    digest = hashlib.sha1(normalize_observation(text).encode("utf-8")).hexdigest()[:12]
+    images = sum(1 for item in content if isinstance(item, dict) and item.get("type") != "text") if isinstance(content, list) else 0
+    omitted = f", {images} images omitted" if images else ""
+    return f"[earlier output compacted: {tokens} tokens, sha1 {digest}{omitted}] {first_line}"
+
+
+class ChatHistoryCompactor:
+    """
+    Keeps the chat history an agent sends to its LLM within a token budget, following autogen's MessageTransform
+    protocol (apply_transform, get_logs).
+
+    The history is split in exchanges: an assistant message and the messages answering it, up to the next assistant
+    message. Whatever precedes the first exchange (the task) is always kept, as are the last keep_recent exchanges,
+    verbatim. Older tool outputs of at least min_tokens are replaced with summarize_content(). Above max_tokens, older
+    messages of the other agents are compacted as well, then the oldest exchanges are dropped whole, so a tool call
+    never loses its response, and as a last resort the recent tool outputs but the newest are compacted.
+
+    Only the messages sent to the LLM change, the agent's own history stays complete.
+    """
+
+    def __init__(self, agent_name: str, keep_recent: int = 4, max_tokens: int = 0, min_tokens: int = 256) -> None:
+        """
+        Args:
+            agent_name (str): Name of the agent, for the logs.
+            keep_recent (int): Number of most recent exchanges kept verbatim, at least 1.
+            max_tokens (int): Token budget of the history, 0 for no budget.
+            min_tokens (int): Tool outputs smaller than this are never compacted.
+        """
+        self.agent_name = agent_name
+        self.keep_recent = max(keep_recent, 1)
+        self.max_tokens = max(max_tokens, 0)
+        self.min_tokens = max(min_tokens, 0)
+        self.turns = 0
+        self.tokens_saved = 0
+
+    def apply_transform(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the compacted history. The messages are not modified, changed ones are copied."""
+        if not messages:
+            return messages
+        tokens = [message_tokens(message) for message in messages]
+        before = sum(tokens)
+        starts = [i for i, message in enumerate(messages) if message.get("role") == "assistant"]
+        first = starts[0] if starts else len(messages)
+        recent = starts[-self.keep_recent] if self.keep_recent <= len(starts) else first
+        messages = list(messages)
+
+        for i in range(first, recent):
+            if messages[i].get("role") in _OBSERVATION_ROLES:
+                self._compact(messages, tokens, i)
+        if self.max_tokens and sum(tokens) > self.max_tokens:
+            for i in range(first, recent):
+                if sum(tokens) <= self.max_tokens:
+                    break
+                if messages[i].get("role") != "assistant":
+                    self._compact(messages, tokens, i)
+
+        dropped = 0
+        if self.max_tokens and sum(tokens) > self.max_tokens:
+            old_starts = [i for i in starts if i < recent] + [recent]
+            cut = first
+            for end in old_starts[1:]:
+                if sum(tokens) - sum(tokens[first:cut]) <= self.max_tokens:
+                    break
+                cut = end
+            dropped = cut - first
+            del messages[first:cut]
+            del tokens[first:cut]
+            recent -= dropped
+
+            if sum(tokens) > self.max_tokens:
+                newest = starts[-1] - dropped if starts else len(messages)
+                for i in range(recent, newest):
+                    if sum(tokens) <= self.max_tokens:
+                        break
+                    if messages[i].get("role") in _OBSERVATION_ROLES:
+                        self._compact(messages, tokens, i)
+                if sum(tokens) > self.max_tokens:
+                    logger.warning(f"Chat history of {self.agent_name} is {sum(tokens)} tokens after compaction, above its budget of {self.max_tokens}")
+
+        after = sum(tokens)
+        self.turns += 1
+        if after < before:
+            self.tokens_saved += before - after
+            logger.info(
+                f"Compacted the chat history of {self.agent_name} from {before} to {after} tokens ({before - after} saved, "
+                f"{dropped} messages dropped, {self.tokens_saved} saved over {self.turns} turns)"
+            )
+        return messages
+
+    def _compact(self, messages: List[Dict[str, Any]], tokens: List[int], index: int) -> None:
+        """Replace the content of the message at index, or of each of its tool responses, with its summary."""
+        message = messages[index]
+        if message.get("tool_responses"):
+            responses = [self._compact_content(response) for response in message["tool_responses"]]
+            if all(new is old for new, old in zip(responses, message["tool_responses"])):
+                return
+            compacted = dict(message, tool_responses=responses, content="\n\n".join(str(r.get("content", "")) for r in responses))
+        else:
+            compacted = self._compact_content(message)
+            if compacted is message:
+                return
+        messages[index] = compacted
+        tokens[index] = message_tokens(compacted)
+
+    def _compact_content(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        content = message.get("content")
+        tokens = _content_tokens(content)
+        if tokens == 0 or tokens < self.min_tokens:
+            return message
+        return dict(message, content=summarize_content(content, tokens))
+
+    def get_logs(self, pre_transform_messages: List[Dict[str, Any]], post_transform_messages: List[Dict[str, Any]]) -> Tuple[str, bool]:
+        before = sum(message_tokens(message) for message in pre_transform_messages)
+        after = sum(message_tokens(message) for message in post_transform_messages)
+        if after < before:
+            return f"Compacted chat history from {before} to {after} tokens ({before - after} saved)", True
+        return "Chat history was not compacted.", False
+
+
+def add_text_compressor(agent: ConversableAgent, max_tokens: Optional[int] = None) -> Optional[ChatHistoryCompactor]:
     """
-    Add a text compressor to the agent
+    Add a text compressor to the agent: the history it sends to its LLM is compacted by a ChatHistoryCompactor
+    configured from CHAT_HISTORY_* before every reply.
     Args:
         agent (ConversableAgent): The agent that needs text compression in prompts
+        max_tokens (Optional[int]): Token budget of the agent's history, CHAT_HISTORY_MAX_TOKENS if not given
+    Returns:
+        Optional[ChatHistoryCompactor]: The compactor, None when CHAT_HISTORY_COMPACTION is disabled
     """
-    return
+    config = get_global_conf()
+    if not config.should_compact_chat_history():
+        return None
+    compactor = ChatHistoryCompactor(
+        agent.name,
+        keep_recent=config.get_chat_history_keep_recent(),
+        max_tokens=config.get_chat_history_max_tokens() if max_tokens is None else max_tokens,
+        min_tokens=config.get_chat_history_compact_min_tokens(),
+    )
+    # hooked directly rather than through TransformMessages, which deep copies the whole history on every turn
+    agent.register_hook(hookable_method="process_all_messages_before_reply", hook=compactor.apply_transform)
+    return compactor
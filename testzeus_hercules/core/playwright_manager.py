@@ -21,13 +21,22 @@ from playwright.async_api import Page, Playwright
 from playwright.async_api import async_playwright as playwright
 from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.browser_logger import get_browser_logger
+from testzeus_hercules.core.browser_pool import BrowserPool
 from testzeus_hercules.core.notification_manager import NotificationManager
+from testzeus_hercules.utils.artifact_writer import get_artifact_writer
+from testzeus_hercules.utils.dom_helper import introspect_element
 from testzeus_hercules.utils.dom_mutation_observer import (
     dom_mutation_change_detected,
     handle_navigation_for_mutation_observer,
 )
-from testzeus_hercules.utils.js_helper import get_js_with_element_finder
+from testzeus_hercules.utils.js_helper import call_with_element_finder
+from testzeus_hercules.utils.log_sink import AsyncLogSink
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.network_idle import wait_for_network_idle
+from testzeus_hercules.utils.page_helpers import install_page_helpers
+from testzeus_hercules.utils.resource_blocking import ResourceBlockingPolicy
+from testzeus_hercules.utils.screencast import ScreencastRecorder
+from testzeus_hercules.utils.screenshot_writer import ScreenshotWriter
 
 # Ensures that playwright does not wait for font loading when taking screenshots.
 # Reference: https://github.com/microsoft/playwright/issues/28995
@@ -90,6 +99,11 @@ class PlaywrightManager:
     ) -> "PlaywrightManager":
         # If no stake_id provided and we have a default instance, return it
         if stake_id is None:
+            # Scenarios running concurrently each bind their own test id, prefer
+            # the instance that belongs to the currently running scenario.
+            current = cls._instances.get(get_global_conf().get_default_test_id())
+            if current is not None:
+                return current
             if cls._default_instance is None:
                 # Create default instance with stake_id "0"
                 instance = super().__new__(cls)
@@ -118,10 +132,8 @@ class PlaywrightManager:
     def get_instance(cls, stake_id: Optional[str] = None) -> "PlaywrightManager":
         """Get PlaywrightManager instance for given stake_id, or default instance if none provided."""
         if stake_id is None:
-            if cls._default_instance is None:
-                # This will create the default instance
-                return cls()
-            return cls._default_instance
+            # This resolves the current scenario's instance or the default one
+            return cls()
         if stake_id not in cls._instances:
             # This will create a new instance for this stake_id
             return cls(stake_id=stake_id)
@@ -219,6 +231,16 @@ class PlaywrightManager:
         self.browser_type = (
             browser_type or get_global_conf().get_browser_type() or "chromium"
         )
+        # The screencast replaces both the per-action screenshots and the video
+        self._use_screencast = get_global_conf().get_capture_mode() == "screencast"
+        if self._use_screencast and self.browser_type != "chromium":
+            logger.warning(
+                f"Screencast capture needs chromium, {self.browser_type} takes screenshots"
+            )
+            self._use_screencast = False
+        if self._use_screencast and self._record_video:
+            logger.info("Screencast capture enabled, video recording is turned off")
+            self._record_video = False
         self.browser_channel = (
             browser_channel or get_global_conf().get_browser_channel()
         )
@@ -268,8 +290,54 @@ class PlaywrightManager:
         # ----------------------
         self._screenshots_dir = proof_path + "/screenshots"
         self._video_dir = proof_path + "/videos"
-        self.request_response_log_file = proof_path + "/network_logs.json"
-        self.console_log_file = proof_path + "/console_logs.json"
+        # capture logs go through buffered sinks, paths carry the compression suffix
+        self._network_log_sink = AsyncLogSink(
+            proof_path + "/network_logs.json",
+            compression=get_global_conf().get_capture_log_compression(),
+            max_bytes=get_global_conf().get_capture_log_max_bytes(),
+            max_queue_size=get_global_conf().get_capture_log_queue_size(),
+        )
+        self._console_log_sink = AsyncLogSink(
+            proof_path + "/console_logs.json",
+            compression=get_global_conf().get_capture_log_compression(),
+            max_bytes=get_global_conf().get_capture_log_max_bytes(),
+            max_queue_size=get_global_conf().get_capture_log_queue_size(),
+        )
+        self.request_response_log_file = self._network_log_sink.path
+        self.console_log_file = self._console_log_sink.path
+        fps = get_global_conf().get_screencast_fps()
+        max_width, max_height = get_global_conf().get_screencast_max_size()
+        self._screencast: Optional[ScreencastRecorder] = (
+            ScreencastRecorder(
+                proof_path + "/screencast",
+                fps=fps,
+                max_width=max_width,
+                max_height=max_height,
+                quality=get_global_conf().get_screenshot_quality(),
+                buffer_seconds=get_global_conf().get_screencast_buffer_seconds(),
+                action_window=get_global_conf().get_screencast_action_window(),
+            )
+            if self._use_screencast
+            else None
+        )
+        # proof screenshots are encoded, deduplicated and written in the background
+        self._screenshot_writer = ScreenshotWriter(
+            image_format=get_global_conf().get_screenshot_format(),
+            quality=get_global_conf().get_screenshot_quality(),
+            dedup=get_global_conf().get_screenshot_dedup(),
+        )
+        # HAR record / replay, kept next to the per-run proofs so every run can reuse it
+        self._network_mode = get_global_conf().get_network_mode()
+        har_dir = get_global_conf().get_network_har_dir()
+        self._har_path = (
+            os.path.join(
+                har_dir, f"{stake_id or get_global_conf().get_default_test_id()}.har"
+            )
+            if har_dir
+            else os.path.join(os.path.dirname(proof_path), "network.har")
+        )
+        self._har_misses: Optional[List[Dict[str, str]]] = None
+        self._resource_blocking: Optional[ResourceBlockingPolicy] = None
         # Add trace directory path
         self._enable_tracing = get_global_conf().should_enable_tracing()
         self._trace_dir = None
@@ -293,6 +361,11 @@ class PlaywrightManager:
         # ----------------------
         self._playwright: Optional[Playwright] = None
         self._browser_context: Optional[BrowserContext] = None
+        # Warm browser pool, not used when attaching over CDP
+        self._use_browser_pool = (
+            get_global_conf().should_use_browser_pool() and not self.cdp_config
+        )
+        self._pooled_context = False
         self.__async_initialize_done = False
         self._latest_screenshot_bytes: Optional[bytes] = None
 
@@ -372,12 +445,17 @@ class PlaywrightManager:
 
     async def start_playwright(self) -> None:
         if not self._playwright:
-            self._playwright = await playwright().start()
+            if self._use_browser_pool:
+                self._playwright = await BrowserPool.get_instance().get_playwright()
+            else:
+                self._playwright = await playwright().start()
 
     async def stop_playwright(self) -> None:
         await self.close_browser_context()
         if self._playwright is not None:
-            await self._playwright.stop()
+            # the pooled driver outlives the scenario, BrowserPool stops it
+            if not self._use_browser_pool:
+                await self._playwright.stop()
             self._playwright = None
 
     async def prepare_extension(self) -> None:
@@ -471,6 +549,106 @@ class PlaywrightManager:
             traceback.print_exc()
             logger.error(f"Failed to start tracing for {context_type} context: {e}")
 
+    async def _setup_network_mode(self) -> None:
+        """Helper method to record the context traffic to a HAR file, or to replay it from one."""
+        if self._network_mode == "live":
+            return
+
+        try:
+            if self._network_mode == "record":
+                os.makedirs(os.path.dirname(self._har_path), exist_ok=True)
+                await self._browser_context.route_from_har(self._har_path, update=True)
+                logger.info(f"Recording network traffic to HAR: {self._har_path}")
+                return
+
+            if not os.path.exists(self._har_path):
+                logger.warning(
+                    f"No HAR recorded at {self._har_path}, running with live network"
+                )
+                return
+            self._har_misses = []
+            # registered first so it runs last, once route_from_har fell back on a miss
+            await self._browser_context.route("**/*", self._on_har_miss)
+            await self._browser_context.route_from_har(
+                self._har_path, not_found="fallback"
+            )
+            logger.info(f"Replaying network traffic from HAR: {self._har_path}")
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to set up network mode {self._network_mode}: {e}")
+
+    async def _on_har_miss(self, route: Any) -> None:
+        request = route.request
+        if self._har_misses is not None:
+            self._har_misses.append(
+                {
+                    "method": request.method,
+                    "url": request.url,
+                    "resource_type": request.resource_type,
+                }
+            )
+        await route.continue_()
+
+    def _finish_network_mode(self) -> None:
+        """Report the recorded HAR, or write the requests the replayed HAR could not serve to the proofs folder."""
+        if self._network_mode == "record" and os.path.exists(self._har_path):
+            logger.info(f"Network traffic recorded to HAR: {self._har_path}")
+        if self._har_misses is None:
+            return
+
+        try:
+            proof_path = get_global_conf().get_proof_path(test_id=self.stake_id)
+            report_file = os.path.join(proof_path, "har_misses.json")
+            with open(report_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"har": self._har_path, "misses": self._har_misses},
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+            logger.info(
+                f"{len(self._har_misses)} requests were not in the HAR and went to the network, see {report_file}"
+            )
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to write HAR miss report: {e}")
+        finally:
+            self._har_misses = None
+
+    async def _setup_resource_blocking(self) -> None:
+        """Helper method to apply the configured resource blocking policy to the browser context."""
+        config = get_global_conf()
+        policy = ResourceBlockingPolicy(
+            resource_types=config.get_block_resource_types(),
+            url_patterns=config.get_block_url_patterns(),
+            max_response_bytes=config.get_block_max_response_bytes(),
+        )
+        if not policy.enabled:
+            return
+
+        try:
+            # replayed responses come from the HAR and cost no download
+            await policy.apply(
+                self._browser_context, size_check=self._network_mode != "replay"
+            )
+            self._resource_blocking = policy
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to apply resource blocking policy: {e}")
+
+    async def _install_page_helpers(self) -> None:
+        """Helper method to register the page helper library on the browser context."""
+        try:
+            await install_page_helpers(self._browser_context)
+            logger.info("Page helpers registered for browser context")
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to register page helpers: {e}")
+
     async def create_browser_context(self) -> None:
         """
         Creates the browser context with device descriptor if any,
@@ -621,21 +799,127 @@ class PlaywrightManager:
             if self.browser_type != "chromium":
                 disable_args = []
 
-            browser_type = getattr(self._playwright, self.browser_type)
-            await self.prepare_extension()
-
-            if self._record_video:
+            if self._use_browser_pool and not user_dir:
+                await self._checkout_pooled_browser_context(disable_args)
+            elif self._record_video:
+                browser_type = getattr(self._playwright, self.browser_type)
+                await self.prepare_extension()
                 await self._launch_browser_with_video(
                     browser_type, user_dir, disable_args
                 )
             else:
+                browser_type = getattr(self._playwright, self.browser_type)
+                await self.prepare_extension()
                 await self._launch_persistent_browser(
                     browser_type, user_dir, disable_args
                 )
 
+        # Route the context through the recorded HAR before the first navigation
+        await self._setup_network_mode()
+        # Registered after the HAR routes so blocked requests never reach them
+        await self._setup_resource_blocking()
+
+        # Register the page helper library before any tool evaluates scripts in the context
+        await self._install_page_helpers()
+
         # Start tracing only once after browser context is created
         await self._start_tracing()
 
+        await self._setup_screencast()
+
+    async def _checkout_pooled_browser_context(
+        self, disable_args: Optional[List[str]] = None
+    ) -> None:
+        """
+        Take a clean context from the BrowserPool instead of launching a browser.
+        The extension is only prepared when the pooled browser has to be launched.
+        """
+        pool = BrowserPool.get_instance()
+        if not pool.is_browser_running():
+            await self.prepare_extension()
+
+        context_options: Dict[str, Any] = {}
+        if self._record_video:
+            context_options["record_video_dir"] = pool.get_video_dir()
+        context_options.update(self._build_emulation_context_options())
+
+        try:
+            self._browser_context = await pool.checkout_context(
+                self.browser_type,
+                self._build_launch_options(disable_args),
+                context_options,
+            )
+            self._pooled_context = True
+
+            # Add cookies if provided
+            await self._add_cookies_if_provided()
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to check out a pooled browser context: {e}")
+            raise e
+
+    def _build_launch_options(
+        self, disable_args: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build BrowserType.launch options (headless, args, channel, prefs, executable path).
+        """
+        disable_args = list(disable_args or [])
+        if self.browser_type == "chromium" and self._extension_path is not None:
+            disable_args.append(f"--disable-extensions-except={self._extension_path}")
+            disable_args.append(f"--load-extension={self._extension_path}")
+
+        launch_options: Dict[str, Any] = {
+            "headless": self.isheadless,
+            "args": disable_args,
+        }
+
+        # Handle browser-specific launch options
+        if self.browser_type == "chromium":
+            if self.browser_channel:
+                launch_options["channel"] = self.browser_channel
+            # Note: version is handled during installation, not at launch time
+        elif self.browser_type == "firefox":
+            firefox_prefs = {
+                "app.update.auto": False,
+                "browser.shell.checkDefaultBrowser": False,
+                "media.navigator.permission.disabled": True,
+                "permissions.default.screen": 1,
+                "media.getusermedia.window.enabled": True,
+            }
+
+            # Auto-accept screen sharing if enabled in config
+            if get_global_conf().should_auto_accept_screen_sharing():
+                firefox_prefs.update(
+                    {
+                        "permissions.default.camera": 1,  # 0=ask, 1=allow, 2=block
+                        "permissions.default.microphone": 1,
+                        "permissions.default.desktop-notification": 1,
+                        "media.navigator.streams.fake": True,
+                        "media.getusermedia.screensharing.enabled": True,
+                        "media.getusermedia.browser.enabled": True,
+                        "dom.disable_beforeunload": True,
+                        "media.autoplay.default": 0,
+                        "media.autoplay.enabled": True,
+                        "privacy.webrtc.legacyGlobalIndicator": False,
+                        "privacy.webrtc.hideGlobalIndicator": True,
+                        "permissions.default.desktop": 1,
+                    }
+                )
+
+            launch_options["firefox_user_prefs"] = firefox_prefs
+            # Note: version is handled during installation, not at launch time
+        elif self.browser_type == "webkit":
+            # WebKit doesn't support channels or direct version specification at launch
+            pass
+
+        # Add custom executable path if specified
+        if self.browser_path:
+            launch_options["executable_path"] = self.browser_path
+
+        return launch_options
+
     def _build_emulation_context_options(self) -> Dict[str, Any]:
         """
         Build context options for emulation based on device name and other settings.
@@ -703,59 +987,7 @@ class PlaywrightManager:
             user_dir = temp_user_dir
 
         try:
-            if self.browser_type == "chromium" and self._extension_path is not None:
-                disable_args.append(
-                    f"--disable-extensions-except={self._extension_path}"
-                )
-                disable_args.append(f"--load-extension={self._extension_path}")
-
-            launch_options = {
-                "headless": self.isheadless,
-                "args": disable_args or [],
-            }
-
-            # Handle browser-specific launch options
-            if self.browser_type == "chromium":
-                if self.browser_channel:
-                    launch_options["channel"] = self.browser_channel
-                # Note: version is handled during installation, not at launch time
-            elif self.browser_type == "firefox":
-                firefox_prefs = {
-                    "app.update.auto": False,
-                    "browser.shell.checkDefaultBrowser": False,
-                    "media.navigator.permission.disabled": True,
-                    "permissions.default.screen": 1,
-                    "media.getusermedia.window.enabled": True,
-                }
-
-                # Auto-accept screen sharing if enabled in config
-                if get_global_conf().should_auto_accept_screen_sharing():
-                    firefox_prefs.update(
-                        {
-                            "permissions.default.camera": 1,  # 0=ask, 1=allow, 2=block
-                            "permissions.default.microphone": 1,
-                            "permissions.default.desktop-notification": 1,
-                            "media.navigator.streams.fake": True,
-                            "media.getusermedia.screensharing.enabled": True,
-                            "media.getusermedia.browser.enabled": True,
-                            "dom.disable_beforeunload": True,
-                            "media.autoplay.default": 0,
-                            "media.autoplay.enabled": True,
-                            "privacy.webrtc.legacyGlobalIndicator": False,
-                            "privacy.webrtc.hideGlobalIndicator": True,
-                            "permissions.default.desktop": 1,
-                        }
-                    )
-
-                launch_options["firefox_user_prefs"] = firefox_prefs
-                # Note: version is handled during installation, not at launch time
-            elif self.browser_type == "webkit":
-                # WebKit doesn't support channels or direct version specification at launch
-                pass
-
-            # Add custom executable path if specified
-            if self.browser_path:
-                launch_options["executable_path"] = self.browser_path
+            launch_options = self._build_launch_options(disable_args)
 
             browser = await browser_type.launch(**launch_options)
 
@@ -1013,10 +1245,7 @@ class PlaywrightManager:
             "headers": request.headers,
             "post_data": decoded_post_data,
         }
-        # Instead of writing directly, do it via asyncio
-        asyncio.ensure_future(
-            self._write_log_entry_to_file(log_entry, self.request_response_log_file)
-        )
+        self._network_log_sink.write(log_entry)
 
     def log_response(self, response: Any) -> None:
         log_entry = {
@@ -1027,26 +1256,48 @@ class PlaywrightManager:
             "headers": response.headers,
             "body": None,
         }
-        asyncio.ensure_future(
-            self._write_log_entry_to_file(log_entry, self.request_response_log_file)
-        )
+        self._network_log_sink.write(log_entry)
 
-    async def _write_log_entry_to_file(self, log_entry: Dict, log_file: str) -> None:
-        """Write a single log entry asynchronously."""
-        try:
-            line = json.dumps(log_entry, ensure_ascii=False) + "\n"
+    async def _close_capture_logs(self) -> None:
+        """Flush the buffered network and console capture logs to disk."""
+        for sink in (self._network_log_sink, self._console_log_sink):
+            try:
+                await sink.close()
+            except Exception as e:
 
-            # We'll open the file in append mode within a thread
-            def append_line(filepath: str, text: str) -> None:
-                """Append a line to a file."""
-                with open(filepath, "a", encoding="utf-8") as file:
-                    file.write(text)
+                traceback.print_exc()
+                logger.error(f"Failed to flush capture log {sink.path}: {e}")
 
-            await asyncio.to_thread(append_line, log_file, line)
+    async def _close_screenshot_writer(self) -> None:
+        """Write the screenshots and screencast frames still queued."""
+        try:
+            await self._screenshot_writer.close()
+            if self._screencast:
+                await self._screencast.close()
         except Exception as e:
 
             traceback.print_exc()
-            logger.error(f"Failed to write request/response log to file: {e}")
+            logger.error(f"Failed to write pending screenshots: {e}")
+
+    async def _setup_screencast(self) -> None:
+        """Stream the frames of every page of the context into the screencast buffer."""
+        if not self._screencast or self._browser_context is None:
+            return
+        screencast = self._screencast
+        for page in self._browser_context.pages:
+            await screencast.attach(page)
+        self._browser_context.on(
+            "page", lambda page: asyncio.ensure_future(screencast.attach(page))
+        )
+        logger.info(f"Screencast capture enabled, frames go to {screencast.directory}")
+
+    def persist_capture_buffer(self, reason: str) -> None:
+        """
+        Persist every buffered screencast frame, e.g. when the scenario failed.
+        Nothing to do when capturing per-action screenshots.
+        """
+        if self._screencast:
+            self._screencast.persist_buffer(reason)
 
     async def get_current_url(self) -> Optional[str]:
         try:
@@ -1116,8 +1367,13 @@ class PlaywrightManager:
 
         await set_iframe_navigation_handlers()
 
+        stake_id = self.stake_id
+
+        async def scoped_dom_mutation_change_detected(changes_detected: str) -> None:
+            await dom_mutation_change_detected(changes_detected, stake_id=stake_id)
+
         await page.expose_function(
-            "dom_mutation_change_detected", dom_mutation_change_detected
+            "dom_mutation_change_detected", scoped_dom_mutation_change_detected
         )
         page.on(
             "frameattached",
@@ -1156,44 +1412,90 @@ class PlaywrightManager:
     def get_screenshots_dir(self) -> str:
         return self._screenshots_dir
 
+    async def capture_screenshot(
+        self,
+        page: Optional[Page] = None,
+        full_page: bool = False,
+        take_snapshot_timeout: int = 5000,
+    ) -> Optional[bytes]:
+        """
+        Capture a PNG screenshot of the page at CSS pixel scale without writing it.
+
+        Args:
+            page (Optional[Page]): The page to capture, the current page by default.
+            full_page (bool): Capture the whole scrollable page instead of the viewport.
+            take_snapshot_timeout (int): Timeout of the capture in milliseconds.
+
+        Returns:
+            Optional[bytes]: The PNG bytes, None if the capture failed.
+        """
+        if page is None:
+            page = await self.get_current_page()
+        try:
+            screenshot_bytes = await page.screenshot(
+                full_page=full_page,
+                timeout=take_snapshot_timeout,
+                caret="initial",
+                scale="css",
+            )
+            self._latest_screenshot_bytes = screenshot_bytes
+            return screenshot_bytes
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to capture screenshot: {e}")
+            return None
+
     async def take_screenshots(
         self,
         name: str,
         page: Optional[Page] = None,
-        full_page: bool = True,
+        full_page: Optional[bool] = None,
         include_timestamp: bool = True,
-        load_state: str = "domcontentloaded",
+        load_state: Optional[str] = None,
         take_snapshot_timeout: int = 5000,
     ) -> None:
+        """
+        Capture a proof screenshot; encoding, deduplication and writing happen in the background.
+        With the screencast capture mode, the frames around this moment are persisted instead.
+
+        Args:
+            name (str): Name of the screenshot file, without extension.
+            page (Optional[Page]): The page to capture, the current page by default.
+            full_page (Optional[bool]): Capture the whole page, SCREENSHOT_FULL_PAGE by default.
+            include_timestamp (bool): Append a timestamp to the name.
+            load_state (Optional[str]): Load state to wait for before the capture, none by default as the
+                tools already wait for the page to settle after their action.
+            take_snapshot_timeout (int): Timeout of the wait and the capture in milliseconds.
+        """
         if not self._take_screenshots:
             return
         if page is None:
             page = await self.get_current_page()
+        if self._screencast:
+            frame = await self._screencast.mark(page, name)
+            if frame:
+                self._latest_screenshot_bytes = frame
+                return
+            # the page has not painted a frame yet, fall back to a screenshot
+        if full_page is None:
+            full_page = get_global_conf().should_take_full_page_screenshots()
 
         screenshot_name = name
         if include_timestamp:
             screenshot_name += f"_{int(time.time_ns())}"
-        screenshot_name += ".png"
         screenshot_path = os.path.join(self.get_screenshots_dir(), screenshot_name)
 
-        try:
+        if load_state:
             await self.wait_for_load_state_if_enabled(
                 page=page, state=load_state, timeout=take_snapshot_timeout
             )
-            screenshot_bytes = await page.screenshot(
-                path=screenshot_path,
-                full_page=full_page,
-                timeout=take_snapshot_timeout,
-                caret="initial",
-                scale="device",
-            )
-
-            self._latest_screenshot_bytes = screenshot_bytes
-            logger.debug(f"Screenshot saved: {screenshot_path}")
-        except Exception as e:
-
-            traceback.print_exc()
-            logger.error(f"Failed to take screenshot at {screenshot_path}: {e}")
+        screenshot_bytes = await self.capture_screenshot(
+            page, full_page=full_page, take_snapshot_timeout=take_snapshot_timeout
+        )
+        if screenshot_bytes:
+            await self._screenshot_writer.submit(screenshot_path, screenshot_bytes)
+            logger.debug(f"Screenshot queued: {screenshot_path}")
 
     async def get_latest_screenshot_stream(self) -> Optional[BytesIO]:
         if not self._latest_screenshot_bytes:
@@ -1227,6 +1529,9 @@ class PlaywrightManager:
                             else:
                                 video_name = os.path.basename(video_path)
                             video_dir = os.path.dirname(video_path)
+                            if self._pooled_context:
+                                # pooled contexts record to the pool folder
+                                video_dir = self._video_dir
                             safe_url = (
                                 page.url.replace("://", "_")
                                 .replace("/", "_")
@@ -1240,7 +1545,7 @@ class PlaywrightManager:
 
                             # rename asynchronously
                             def rename_file(src, dst):
-                                os.rename(src, dst)
+                                shutil.move(src, dst)
 
                             await asyncio.to_thread(
                                 rename_file, video_path, new_video_path
@@ -1270,9 +1575,27 @@ class PlaywrightManager:
                     traceback.print_exc()
                     logger.error(f"Error stopping trace: {e}")
 
-            await self._browser_context.close()
+            if self._pooled_context:
+                await BrowserPool.get_instance().release_context(
+                    self._browser_context
+                )
+                self._pooled_context = False
+            else:
+                await self._browser_context.close()
             self._browser_context = None
 
+        # after the context is gone no more capture events arrive, write out what is buffered
+        await self._close_capture_logs()
+        await self._close_screenshot_writer()
+        self._finish_network_mode()
+        if self._resource_blocking:
+            self._resource_blocking.write_report(
+                get_global_conf().get_proof_path(test_id=self.stake_id)
+            )
+            self._resource_blocking = None
+        # interaction, API and security logs of the scenario are complete on disk
+        await get_artifact_writer().aflush()
+
     async def update_processing_state(self, processing_state: str) -> None:
         pass
 
@@ -1286,134 +1609,18 @@ class PlaywrightManager:
     # -------------------------------------------------------------------------
     async def _wait_for_stable_network(self) -> None:
         page = await self.get_current_page()
-        pending_requests = set()
-        last_activity = asyncio.get_event_loop().time()
-
-        RELEVANT_RESOURCE_TYPES = {
-            "document",
-            "stylesheet",
-            "image",
-            "font",
-            "script",
-            "iframe",
-        }
-        RELEVANT_CONTENT_TYPES = {
-            "text/html",
-            "text/css",
-            "application/javascript",
-            "image/",
-            "font/",
-            "application/json",
-        }
-        IGNORED_URL_PATTERNS = {
-            "analytics",
-            "tracking",
-            "telemetry",
-            "beacon",
-            "metrics",
-            "doubleclick",
-            "adsystem",
-            "adserver",
-            "advertising",
-            "facebook.com/plugins",
-            "platform.twitter",
-            "linkedin.com/embed",
-            "livechat",
-            "zendesk",
-            "intercom",
-            "crisp.chat",
-            "hotjar",
-            "push-notifications",
-            "onesignal",
-            "pushwoosh",
-            "heartbeat",
-            "ping",
-            "alive",
-            "webrtc",
-            "rtmp://",
-            "wss://",
-            "cloudfront.net",
-            "fastly.net",
-        }
-
-        async def on_request(request: Any) -> None:
-            if request.resource_type not in RELEVANT_RESOURCE_TYPES:
-                return
-            if request.resource_type in {
-                "websocket",
-                "media",
-                "eventsource",
-                "manifest",
-                "other",
-            }:
-                return
-            url = request.url.lower()
-            if any(p in url for p in IGNORED_URL_PATTERNS):
-                return
-            if url.startswith(("data:", "blob:")):
-                return
-            headers = request.headers
-            if headers.get("purpose") == "prefetch" or headers.get(
-                "sec-fetch-dest"
-            ) in ["video", "audio"]:
-                return
-            nonlocal last_activity
-            pending_requests.add(request)
-            last_activity = asyncio.get_event_loop().time()
-
-        async def on_response(response: Any) -> None:
-            request = response.request
-            if request not in pending_requests:
-                return
-            content_type = response.headers.get("content-type", "").lower()
-            if any(
-                t in content_type
-                for t in [
-                    "streaming",
-                    "video",
-                    "audio",
-                    "webm",
-                    "mp4",
-                    "event-stream",
-                    "websocket",
-                    "protobuf",
-                ]
-            ):
-                pending_requests.remove(request)
-                return
-            if not any(ct in content_type for ct in RELEVANT_CONTENT_TYPES):
-                pending_requests.remove(request)
-                return
-            content_length = response.headers.get("content-length")
-            if content_length and int(content_length) > 5 * 1024 * 1024:
-                pending_requests.remove(request)
-                return
-            nonlocal last_activity
-            pending_requests.remove(request)
-            last_activity = asyncio.get_event_loop().time()
-
-        page.on("request", on_request)
-        page.on("response", on_response)
-
-        try:
-            start_time = asyncio.get_event_loop().time()
-            while True:
-                await asyncio.sleep(0.1)
-                now = asyncio.get_event_loop().time()
-                if (len(pending_requests) == 0) and (
-                    (now - last_activity) >= WAIT_FOR_NETWORK_IDLE
-                ):
-                    break
-                if now - start_time > MAX_WAIT_PAGE_LOAD_TIME:
-                    logger.debug(
-                        f"Network timeout after {MAX_WAIT_PAGE_LOAD_TIME}s with {len(pending_requests)} pending requests"
-                    )
-                    break
-        finally:
-            page.remove_listener("request", on_request)
-            page.remove_listener("response", on_response)
-
-        logger.debug(f"Network stabilized for {WAIT_FOR_NETWORK_IDLE} ms")
+        config = get_global_conf()
+        await wait_for_network_idle(
+            page,
+            quiet_time=WAIT_FOR_NETWORK_IDLE,
+            max_wait=MAX_WAIT_PAGE_LOAD_TIME,
+            extra_ignored_patterns=config.get_network_idle_ignored_url_patterns(),
+            stats_dir=(
+                config.get_proof_path(test_id=self.stake_id)
+                if config.should_record_network_idle_stats()
+                else None
+            ),
+        )
 
     async def wait_for_page_and_frames_load(
         self, timeout_overwrite: Optional[float] = None
@@ -1665,8 +1872,8 @@ class PlaywrightManager:
             logger.info(
                 f"Executing JavaScript '{type_of_click}' on element with selector: {selector}"
             )
-            result: str = await page.evaluate(
-                get_js_with_element_finder(js_code), (selector, type_of_click)
+            result: str = await call_with_element_finder(
+                page, js_code, (selector, type_of_click)
             )
             logger.debug(
                 f"Executed JavaScript '{type_of_click}' on element with selector: {selector}"
@@ -1699,7 +1906,7 @@ class PlaywrightManager:
             return findElementInShadowDOMAndIframes(document, selector) !== null;
         }"""
 
-        return await page.evaluate_handle(get_js_with_element_finder(js_code), selector)
+        return await call_with_element_finder(page, js_code, selector, handle=True)
 
     async def find_element(
         self,
@@ -1733,9 +1940,7 @@ class PlaywrightManager:
             return findElementInShadowDOMAndIframes(document, selector);
         }"""
 
-        element = await page.evaluate_handle(
-            get_js_with_element_finder(js_code), selector
-        )
+        element = await call_with_element_finder(page, js_code, selector, handle=True)
         if element:
             element_handle = element.as_element()
             if element_handle:
@@ -1791,21 +1996,13 @@ class PlaywrightManager:
             # Construct screenshot name
             screenshot_name = f"{element_identifier}_{element_name or selector}_bbox_{int(datetime.now().timestamp())}"
 
-            # Take screenshot using existing method
-            await self.take_screenshots(
-                name=screenshot_name,
-                page=page,
-                full_page=True,
-                include_timestamp=False,
-            )
-
-            # Get the latest screenshot using get_latest_screenshot_stream
-            screenshot_stream = await self.get_latest_screenshot_stream()
-            if not screenshot_stream:
+            # The bounding box is relative to the viewport, so is the screenshot
+            screenshot_bytes = await self.capture_screenshot(page)
+            if not screenshot_bytes:
                 logger.error("Failed to get screenshot for bounding box overlay")
                 return
 
-            image = Image.open(screenshot_stream)
+            image = Image.open(BytesIO(screenshot_bytes))
             draw = ImageDraw.Draw(image)
 
             # Draw bounding box
@@ -1928,7 +2125,7 @@ class PlaywrightManager:
 
             # Convert back to RGB before saving as PNG
             image = image.convert("RGB")
-            image.save(screenshot_path, "PNG")
+            await asyncio.to_thread(image.save, screenshot_path, "PNG")
 
             logger.debug(f"Saved bounding box screenshot: {screenshot_path}")
 
@@ -1936,9 +2133,12 @@ class PlaywrightManager:
             browser_logger = get_browser_logger(self.get_screenshots_dir())
 
             # Get element attributes and alternative selectors for logging
-            element_attributes = await browser_logger.get_element_attributes(element)
+            introspection = await introspect_element(element)
+            element_attributes = await browser_logger.get_element_attributes(
+                element, introspection
+            )
             alternative_selectors = await browser_logger.get_alternative_selectors(
-                element, page
+                element, page, introspection
             )
 
             # Log the screenshot interaction
@@ -1999,10 +2199,8 @@ class PlaywrightManager:
             "text": msg.text,
             "location": msg.location,  # has 'url', 'lineNumber', 'columnNumber'
         }
-        # Write asynchronously to console_log_file
-        asyncio.ensure_future(
-            self._write_log_entry_to_file(log_entry, self.console_log_file)
-        )
+        # Buffered, written in batches by the console log sink
+        self._console_log_sink.write(log_entry)
 
     async def _add_cookies_if_provided(self) -> None:
         """
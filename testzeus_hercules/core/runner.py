@@ -10,6 +10,7 @@ from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.agents_llm_config_manager import AgentsLLMConfigManager
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.simple_hercules import SimpleHercules
+from testzeus_hercules.core.trace_replay import save_replay_trace
 from testzeus_hercules.utils.cli_helper import async_input  # type: ignore
 from testzeus_hercules.utils.logger import logger
 
@@ -50,6 +51,9 @@ class BaseRunner:
         self.mem_agent_config: Dict[str, Any] | None = None
         self.helper_config: Dict[str, Any] | None = None
 
+        # Seconds spent in each phase of initialize()
+        self.startup_timings: Dict[str, float] = {}
+
     async def initialize(self) -> None:
         """
         Initializes components for the system, including the Autogen wrapper and the Playwright manager.
@@ -57,6 +61,7 @@ class BaseRunner:
         if not self.stake_id:
             raise ValueError("stake_id is required")
 
+        start_time = time.perf_counter()
         config_manager = AgentsLLMConfigManager.get_instance()
         config_manager.initialize()
 
@@ -75,7 +80,10 @@ class BaseRunner:
         self.mem_agent_config = dict(mem_config)
         self.helper_config = dict(helper_config)
 
-        self.simple_hercules = await SimpleHercules.create(
+        self.startup_timings["llm_config"] = round(time.perf_counter() - start_time, 3)
+
+        start_time = time.perf_counter()
+        self.simple_hercules = await SimpleHercules.get_or_create(
             self.stake_id,
             self.planner_agent_config,
             self.nav_agent_config,
@@ -86,8 +94,15 @@ class BaseRunner:
             browser_nav_max_chat_round=self.nav_agent_number_of_rounds,
         )
 
+        self.startup_timings["simple_hercules"] = round(time.perf_counter() - start_time, 3)
+        for phase, elapsed in self.simple_hercules.startup_timings.items():
+            self.startup_timings[f"simple_hercules.{phase}"] = elapsed
+
+        start_time = time.perf_counter()
         self.browser_manager = PlaywrightManager(gui_input_mode=False, stake_id=self.stake_id)
         await self.browser_manager.async_initialize()
+        self.startup_timings["browser"] = round(time.perf_counter() - start_time, 3)
+        logger.info(f"Startup timing breakdown for {self.stake_id} (seconds): {self.startup_timings}")
 
     async def clean_up(self) -> None:
         """Clean up resources."""
@@ -206,7 +221,11 @@ class BaseRunner:
         logger.info("Shutting down...")
         if self.browser_manager:
             await self.browser_manager.stop_playwright()
-        PlaywrightManager.close_all_instances()
+        if get_global_conf().get_parallel_workers() > 1:
+            # other scenarios are still running on their own instances
+            PlaywrightManager.close_instance(self.stake_id)
+        else:
+            PlaywrightManager.close_all_instances()
         self.shutdown_event.set()
 
     async def wait_for_exit(self) -> None:
@@ -279,6 +298,22 @@ class SingleCommandInputRunner(BaseRunner):
         """
         await self.initialize()
         self.result, self.execution_time = await self.process_command(self.command)
+        passed = self.scenario_passed()
+        if self.browser_manager and not passed:
+            # keep everything the screencast saw before the failure
+            self.browser_manager.persist_capture_buffer("failure")
+        if passed and get_global_conf().get_replay_mode() != "off":
+            await save_replay_trace(self.stake_id, self.command, self.result.summary)
         if not self.dont_terminate_browser_after_run:
             _ = await self.process_command("exit")
             await self.wait_for_exit()
+
+    def scenario_passed(self) -> bool:
+        """Return whether the final summary of the run reports the scenario as passed."""
+        summary = getattr(self.result, "summary", None)
+        if not summary:
+            return False
+        try:
+            return bool(json.loads(summary.replace("```json\n", "").replace("\n```", "").strip()).get("is_passed", False))
+        except (json.JSONDecodeError, AttributeError):
+            return False
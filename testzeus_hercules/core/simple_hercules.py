@@ -3,15 +3,17 @@ import datetime
 import json
 import os
 import tempfile
+import time
 import traceback
 import uuid
+from contextlib import nullcontext
 from string import Template
 from typing import Any, Dict, Optional, Union, cast
 
 import autogen  # type: ignore
 import nest_asyncio  # type: ignore
 import openai
-from autogen import AssistantAgent, Cache
+from autogen import AssistantAgent
 from autogen.agentchat.contrib.retrieve_user_proxy_agent import RetrieveUserProxyAgent
 from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.agents.api_nav_agent import ApiNavAgent
@@ -23,14 +25,17 @@ from testzeus_hercules.core.agents.time_keeper_nav_agent import TimeKeeperNavAge
 from testzeus_hercules.core.extra_tools import *
 from testzeus_hercules.core.memory.dynamic_ltm import DynamicLTM
 from testzeus_hercules.core.memory.state_handler import store_run_data
+from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.post_process_responses import (
     final_reply_callback_planner_agent as notify_planner_messages,  # type: ignore
 )
 from testzeus_hercules.core.prompts import LLM_PROMPTS
 from testzeus_hercules.core.tools import *
 from testzeus_hercules.core.tools.get_url import geturl
+from testzeus_hercules.core.trace_replay import ToolTraceReplayer, load_replay_trace
 from testzeus_hercules.telemetry import EventData, EventType, add_event
 from testzeus_hercules.utils.detect_llm_loops import is_agent_stuck_in_loop
+from testzeus_hercules.utils.llm_cache import LLMResponseCache, create_llm_cache
 from testzeus_hercules.utils.llm_helper import (
     convert_model_config_to_autogen_format,
     create_multimodal_agent,
@@ -64,6 +69,9 @@ class SimpleHercules:
 
     """
 
+    # idle agent graphs built by get_or_create, keyed by the agent configuration they were built from
+    _agent_graph_cache: Dict[str, list["SimpleHercules"]] = {}
+
     def __init__(
         self,
         stake_id: str,
@@ -103,6 +111,10 @@ class SimpleHercules:
         self.chat_logs_dir: str = get_global_conf().get_source_log_folder_path(self.stake_id)
         self.save_chat_logs_to_files = save_chat_logs_to_files
         self.memory: Optional[DynamicLTM] = None
+        self.groupchat_manager: Optional[autogen.GroupChatManager] = None
+        self.startup_timings: Dict[str, float] = {}
+        self.in_use = False
+        self.llm_cache: Optional[LLMResponseCache] = create_llm_cache()
 
     @classmethod
     async def create(
@@ -160,6 +172,7 @@ class SimpleHercules:
         self.mem_agent_config = mem_agent_config
         self.helper_agent_config = helper_agent_config
 
+        start_time = time.perf_counter()
         self.planner_agent_model_config = convert_model_config_to_autogen_format(self.planner_agent_config["model_config_params"])
         self.browser_nav_agent_model_config = convert_model_config_to_autogen_format(self.nav_agent_config["model_config_params"])
         self.api_nav_agent_model_config = convert_model_config_to_autogen_format(self.nav_agent_config["model_config_params"])
@@ -169,7 +182,12 @@ class SimpleHercules:
         self.mem_agent_model_config = convert_model_config_to_autogen_format(self.mem_agent_config["model_config_params"])
         self.helper_agent_model_config = convert_model_config_to_autogen_format(self.helper_agent_config["model_config_params"])
 
+        self.startup_timings["model_configs"] = round(time.perf_counter() - start_time, 3)
+
+        start_time = time.perf_counter()
         self.agents_map = await self.__initialize_agents()
+        self.startup_timings["agents"] = round(time.perf_counter() - start_time, 3)
+        start_time = time.perf_counter()
 
         def trigger_nested_chat(manager: autogen.ConversableAgent) -> bool:  # type: ignore
             content: str = manager.last_message(manager.last_speaker)["content"] if isinstance(manager, autogen.GroupChatManager) else manager.last_message()["content"]
@@ -364,24 +382,136 @@ class SimpleHercules:
             groupchat=groupchat,
             llm_config=gm_llm_config,
         )  # type: ignore
+        self.groupchat_manager = manager
 
-        with Cache.disk(cache_seed=5) as cache:
-            self.agents_map["user"].register_nested_chats(
-                [
-                    {
-                        "chat_id": uuid.uuid4(),
-                        "sender": self.agents_map["user"],
-                        "recipient": manager,
-                        "message": reflection_message,
-                        "max_turns": 1,
-                        "summary_method": my_custom_summary_method,
-                    }
-                ],
-                trigger=trigger_nested_chat,
-                cache=cache,
-            )
+        self.agents_map["user"].register_nested_chats(
+            [
+                {
+                    "chat_id": uuid.uuid4(),
+                    "sender": self.agents_map["user"],
+                    "recipient": manager,
+                    "message": reflection_message,
+                    "max_turns": 1,
+                    "summary_method": my_custom_summary_method,
+                    # the group chat manager hands its cache to the nav agents for the duration of the chat
+                    "cache": self.llm_cache,
+                }
+            ],
+            trigger=trigger_nested_chat,
+            # the nav agents and their executors run on the loop of process_command, tools are awaited directly
+            use_async=True,
+        )
+        self.startup_timings["group_chat"] = round(time.perf_counter() - start_time, 3)
         return self
 
+    @classmethod
+    async def get_or_create(
+        cls,
+        stake_id: str,
+        planner_agent_config: dict[str, Any],
+        nav_agent_config: dict[str, Any],
+        mem_agent_config: dict[str, Any],
+        helper_agent_config: dict[str, Any],
+        save_chat_logs_to_files: bool = True,
+        planner_max_chat_round: int = 500,
+        browser_nav_max_chat_round: int = 10,
+    ) -> "SimpleHercules":
+        """
+        Return an idle agent graph built from the same configuration, reset for stake_id, or create a new one.
+
+        Building the agents, registering the tools and wiring the group chat is done once per process
+        and configuration; between scenarios only the chat state is reset. Graphs are not shared by
+        scenarios running at the same time, release() hands a graph back once its scenario is done.
+        Same arguments as create().
+
+        Returns:
+            SimpleHercules: An instance of SimpleHercules marked as in use.
+        """
+        config = get_global_conf()
+        # the dynamic LTM namespace is bound to the scenario the agents were built for
+        if not config.should_reuse_agents() or config.should_use_dynamic_ltm():
+            instance = await cls.create(
+                stake_id,
+                planner_agent_config,
+                nav_agent_config,
+                mem_agent_config,
+                helper_agent_config,
+                save_chat_logs_to_files=save_chat_logs_to_files,
+                planner_max_chat_round=planner_max_chat_round,
+                browser_nav_max_chat_round=browser_nav_max_chat_round,
+            )
+            instance.startup_timings["cache_hit"] = 0
+            instance.in_use = True
+            return instance
+
+        cache_key = json.dumps(
+            [
+                planner_agent_config,
+                nav_agent_config,
+                mem_agent_config,
+                helper_agent_config,
+                save_chat_logs_to_files,
+                planner_max_chat_round,
+                browser_nav_max_chat_round,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        idle_graphs = cls._agent_graph_cache.setdefault(cache_key, [])
+        for instance in idle_graphs:
+            if not instance.in_use:
+                start_time = time.perf_counter()
+                instance.in_use = True
+                await instance.reset_for_scenario(stake_id)
+                instance.startup_timings = {"reset": round(time.perf_counter() - start_time, 3), "cache_hit": 1}
+                logger.info(f"Reusing agent graph for stake_id: {stake_id}")
+                return instance
+
+        instance = await cls.create(
+            stake_id,
+            planner_agent_config,
+            nav_agent_config,
+            mem_agent_config,
+            helper_agent_config,
+            save_chat_logs_to_files=save_chat_logs_to_files,
+            planner_max_chat_round=planner_max_chat_round,
+            browser_nav_max_chat_round=browser_nav_max_chat_round,
+        )
+        instance.startup_timings["cache_hit"] = 0
+        instance.in_use = True
+        idle_graphs.append(instance)
+        return instance
+
+    async def reset_for_scenario(self, stake_id: str) -> None:
+        """
+        Prepare a previously used agent graph for a new scenario.
+
+        Builds on clean_up_plan, and additionally resets every agent (chat history, auto reply
+        counters, reply function state and LLM usage summaries) and the group chat.
+
+        Args:
+            stake_id (str): The stake_id of the new scenario.
+        """
+        self.stake_id = stake_id
+        self.timestamp = get_timestamp_str()
+        self.chat_logs_dir = get_global_conf().get_source_log_folder_path(self.stake_id)
+        await self.clean_up_plan()
+
+        for agent in self.agents_map.values():
+            if isinstance(agent, autogen.ConversableAgent):
+                agent.reset()
+        if self.groupchat_manager is not None:
+            self.groupchat_manager.reset()
+            self.groupchat_manager.groupchat.reset()
+
+    def get_executor_function_maps(self) -> Dict[str, Dict[str, Any]]:
+        """Get the tools of every executor agent, by agent name and tool name."""
+        return {name: agent.function_map for name, agent in self.agents_map.items() if isinstance(agent, UserProxyAgent_SequentialFunctionExecution)}
+
+    def release(self) -> None:
+        """Hand the agent graph back so that the next scenario can reuse it."""
+        self.in_use = False
+
     @classmethod
     def convert_model_config_to_autogen_format(cls, model_config: dict[str, str]) -> list[dict[str, Any]]:
         env_var: list[dict[str, str]] = [model_config]
@@ -907,14 +1037,26 @@ class SimpleHercules:
             current_url_prompt_segment = f"Current Page: {current_url}"
         prompt = Template(LLM_PROMPTS["COMMAND_EXECUTION_PROMPT"]).substitute(command=command, current_url_prompt_segment=current_url_prompt_segment)
 
+        if self.llm_cache:
+            self.llm_cache.reset_metrics()
+
         config = get_global_conf()
         if config.should_use_dynamic_ltm():
             # Only query memory if dynamic LTM is enabled
             mem_fetch = await self._query_memory(prompt)
             prompt += "\n\nEXTRA INFORMATION: " + mem_fetch
 
+        if config.get_replay_mode() == "replay":
+            trace = load_replay_trace(self.stake_id, command)
+            if trace:
+                replayer = ToolTraceReplayer(trace, self.get_executor_function_maps())
+                if await replayer.replay():
+                    return replayer.chat_result()
+                if replayer.replayed:
+                    prompt += "\n\nEXTRA INFORMATION: " + replayer.handoff_message(await PlaywrightManager().get_current_url())
+
         logger.info("Prompt for command: %s", prompt)
-        with Cache.disk(cache_seed=5) as cache:
+        with self.llm_cache or nullcontext() as cache:
             try:
                 if self.agents_map is None:
                     raise ValueError("Agents map is not initialized.")
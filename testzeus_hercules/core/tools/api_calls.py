@@ -190,6 +190,14 @@ async def _send_request(
 # Generic HTTP API Function Covering All Combinations
 # ------------------------------------------------------------------------------
 
+# HTTP methods without side effects on the server, their calls can run concurrently
+SAFE_HTTP_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def is_safe_http_call(arguments: Dict[str, Any]) -> bool:
+    """Tell whether a generic_http_api call only reads, from its HTTP method."""
+    return str(arguments.get("method", "")).upper() in SAFE_HTTP_METHODS
+
 
 @tool(
     agent_names=["api_nav_agent"],
@@ -208,6 +216,7 @@ async def _send_request(
         "  - headers: Additional HTTP headers (dict).\n"
         "This single function can generate any combination supported by _send_request."
     ),
+    read_only=is_safe_http_call,
 )
 async def generic_http_api(
     method: Annotated[str, "HTTP method (e.g. GET, POST, PUT, PATCH, DELETE, etc.)."],
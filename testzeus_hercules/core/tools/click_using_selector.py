@@ -9,9 +9,13 @@ from testzeus_hercules.core.browser_logger import get_browser_logger
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
-from testzeus_hercules.utils.dom_helper import get_element_outer_html
+from testzeus_hercules.utils.dom_helper import (
+    get_element_outer_html,
+    introspect_element,
+)
 from testzeus_hercules.utils.dom_mutation_observer import subscribe, unsubscribe
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_settle import wait_until_settled
 
 page_data_store = {}
 
@@ -50,13 +54,11 @@ async def click(
     # Initialize PlaywrightManager and get the active browser page
     browser_manager = PlaywrightManager()
     page = await browser_manager.get_current_page()
-    # await page.route("**/*", block_ads)
     action_on_dialog = action_on_dialog.lower() if action_on_dialog else ""
     type_of_click = type_of_click.lower() if type_of_click else "click"
 
     async def handle_dialog(dialog: Any) -> None:
         try:
-            await asyncio.sleep(0.5)
             data = get_page_data(page)
             user_input_dialog_response = data.get("user_input_dialog_response", "")
             expected_message_of_dialog = data.get("expected_message_of_dialog", "")
@@ -116,9 +118,8 @@ async def click(
 
     page = await browser_manager.get_current_page()
     page.on("dialog", handle_dialog)
-    result = await do_click(page, query_selector, wait_before_execution, type_of_click)
-
-    await asyncio.sleep(get_global_conf().get_delay_time())  # sleep to allow the mutation observer to detect changes
+    async with wait_until_settled(page):
+        result = await do_click(page, query_selector, wait_before_execution, type_of_click)
     unsubscribe(detect_dom_changes)
 
     await browser_manager.wait_for_load_state_if_enabled(page=page)
@@ -175,17 +176,19 @@ async def do_click(page: Page, selector: str, wait_before_execution: float, type
                 "detailed_message": f'Element with selector: "{selector}" is not visible, Try another element',
             }
 
-        element_tag_name = await element.evaluate("element => element.tagName.toLowerCase()")
-        element_outer_html = await get_element_outer_html(element, page, element_tag_name)
+        # one round trip for the tag, attributes and selectors reported and logged below
+        introspection = await introspect_element(element)
+        element_tag_name = introspection["tag"]
+        element_outer_html = await get_element_outer_html(element, page, element_tag_name, introspection)
 
         # Initialize selector logger with proof path
         selector_logger = get_browser_logger(get_global_conf().get_proof_path())
         # Get alternative selectors and element attributes for logging
-        alternative_selectors = await selector_logger.get_alternative_selectors(element, page)
-        element_attributes = await selector_logger.get_element_attributes(element)
+        alternative_selectors = await selector_logger.get_alternative_selectors(element, page, introspection)
+        element_attributes = await selector_logger.get_element_attributes(element, introspection)
 
         # hack for aura component in salesforce
-        element_title = (await element.get_attribute("title") or "").lower()
+        element_title = introspection["attributes"].get("title", "").lower()
         if "upload" in element_title:
             return {
                 "summary_message": "Use the click_and_upload_file tool to upload files",
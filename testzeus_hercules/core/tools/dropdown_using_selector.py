@@ -10,7 +10,10 @@ from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.press_key_combination import press_key_combination
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
-from testzeus_hercules.utils.dom_helper import get_element_outer_html
+from testzeus_hercules.utils.dom_helper import (
+    get_element_outer_html,
+    introspect_element,
+)
 from testzeus_hercules.utils.dom_mutation_observer import subscribe, unsubscribe
 from testzeus_hercules.utils.logger import logger
 
@@ -119,14 +122,15 @@ async def find_element_select_type(page: Page, selector: str) -> tuple[Optional[
 
     logger.info(f"Found selector '{selector}' to select option")
     selector_logger = get_browser_logger(get_global_conf().get_proof_path())
-    alternative_selectors = await selector_logger.get_alternative_selectors(element, page)
-    element_attributes = await selector_logger.get_element_attributes(element)
+    introspection = await introspect_element(element)
+    alternative_selectors = await selector_logger.get_alternative_selectors(element, page, introspection)
+    element_attributes = await selector_logger.get_element_attributes(element, introspection)
 
     # Get element properties to determine the best selection strategy
-    tag_name = await element.evaluate("el => el.tagName.toLowerCase()")
-    element_role = await element.evaluate("el => el.getAttribute('role') || ''")
-    element_type = await element.evaluate("el => el.type || ''")
-    element_outer_html = await get_element_outer_html(element, page)
+    tag_name = introspection["tag"]
+    element_role = introspection["attributes"].get("role", "")
+    element_type = introspection["type"]
+    element_outer_html = await get_element_outer_html(element, page, introspection=introspection)
 
     properties = {
         "tag_name": tag_name,
@@ -1,18 +1,20 @@
-import asyncio
 import inspect
 import traceback
 from dataclasses import dataclass
 from typing import Annotated, List, Tuple  # noqa: UP035
 
 from playwright.async_api import ElementHandle, Page
-from testzeus_hercules.config import get_global_conf  # Add this import
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
-from testzeus_hercules.utils.dom_helper import get_element_outer_html
+from testzeus_hercules.utils.dom_helper import (
+    get_element_outer_html,
+    introspect_element,
+)
 from testzeus_hercules.utils.dom_mutation_observer import subscribe, unsubscribe
 from testzeus_hercules.utils.js_helper import get_js_with_element_finder
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_settle import wait_until_settled
 from testzeus_hercules.utils.ui_messagetype import MessageType
 
 
@@ -50,8 +52,8 @@ async def set_date_time_value(
 
     subscribe(detect_dom_changes)
 
-    result = await do_set_date_time_value(page, selector, input_value)
-    await asyncio.sleep(get_global_conf().get_delay_time())  # sleep to allow the mutation observer to detect changes
+    async with wait_until_settled(page):
+        result = await do_set_date_time_value(page, selector, input_value)
     unsubscribe(detect_dom_changes)
 
     await browser_manager.wait_for_load_state_if_enabled(page=page)
@@ -92,13 +94,14 @@ async def do_set_date_time_value(page: Page, selector: str, input_value: str) ->
         logger.info(f"Found selector '{selector}' to set input value")
 
         # Get the element's tag name and type to determine how to interact with it
-        tag_name = await element.evaluate("el => el.tagName.toLowerCase()")
-        input_type = await element.evaluate("el => el.type")
+        introspection = await introspect_element(element)
+        tag_name = introspection["tag"]
+        input_type = introspection["type"]
 
         if tag_name == "input" and input_type in ["date", "time", "datetime-local"]:
             # For date, time, or datetime-local inputs, set the value directly
             await element.fill(input_value)
-            element_outer_html = await get_element_outer_html(element, page)
+            element_outer_html = await get_element_outer_html(element, page, introspection=introspection)
             success_msg = f"Success. Value '{input_value}' set in the input with selector '{selector}'"
             return {
                 "summary_message": success_msg,
@@ -13,10 +13,14 @@ from testzeus_hercules.core.tools.dropdown_using_selector import (
 from testzeus_hercules.core.tools.press_key_combination import press_key_combination
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
-from testzeus_hercules.utils.dom_helper import get_element_outer_html
+from testzeus_hercules.utils.dom_helper import (
+    get_element_outer_html,
+    introspect_element,
+)
 from testzeus_hercules.utils.dom_mutation_observer import subscribe, unsubscribe
-from testzeus_hercules.utils.js_helper import block_ads, get_js_with_element_finder
+from testzeus_hercules.utils.js_helper import call_with_element_finder
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_settle import wait_until_settled
 from testzeus_hercules.utils.ui_messagetype import MessageType
 
 
@@ -44,8 +48,9 @@ async def custom_fill_element(page: Page, selector: str, text_to_enter: str) ->
             return `Value set for ${selector}`;
         }"""
 
-        result = await page.evaluate(
-            get_js_with_element_finder(js_code),
+        result = await call_with_element_finder(
+            page,
+            js_code,
             {"selector": selector, "text_to_enter": text_to_enter},
         )
         logger.debug(f"custom_fill_element result: {result}")
@@ -74,7 +79,6 @@ async def entertext(
     # Create and use the PlaywrightManager
     browser_manager = PlaywrightManager()
     page = await browser_manager.get_current_page()
-    # await page.route("**/*", block_ads)
     if page is None:  # type: ignore
         return "Error: No active page found. OpenURL command opens a new page."
 
@@ -92,9 +96,9 @@ async def entertext(
 
     subscribe(detect_dom_changes)
 
-    await page.evaluate(
-        get_js_with_element_finder(
-            """
+    await call_with_element_finder(
+        page,
+        """
         (selector) => {
             /*INJECT_FIND_ELEMENT_IN_SHADOW_DOM*/
             const element = findElementInShadowDOMAndIframes(document, selector);
@@ -104,13 +108,12 @@ async def entertext(
                 console.error('Element not found:', selector);
             }
         }
-        """
-        ),
+        """,
         selector,
     )
 
-    result = await do_entertext(page, selector, text_to_enter)
-    await asyncio.sleep(get_global_conf().get_delay_time())  # sleep to allow the mutation observer to detect changes
+    async with wait_until_settled(page):
+        result = await do_entertext(page, selector, text_to_enter)
     unsubscribe(detect_dom_changes)
 
     await browser_manager.wait_for_load_state_if_enabled(page=page)
@@ -146,9 +149,10 @@ async def do_entertext(page: Page, selector: str, text_to_enter: str, use_keyboa
             return {"summary_message": error, "detailed_message": error}
         else:
             # Get element properties to determine the best selection strategy
-            tag_name = await elem.evaluate("el => el.tagName.toLowerCase()")
-            element_role = await elem.evaluate("el => el.getAttribute('role') || ''")
-            element_type = await elem.evaluate("el => el.type || ''")
+            introspection = await introspect_element(elem)
+            tag_name = introspection["tag"]
+            element_role = introspection["attributes"].get("role", "")
+            element_type = introspection["type"]
             input_roles = ["combobox", "listbox", "dropdown", "spinner", "select"]
             input_types = [
                 "range",
@@ -165,21 +169,21 @@ async def do_entertext(page: Page, selector: str, text_to_enter: str, use_keyboa
                     "tag_name": tag_name,
                     "element_role": element_role,
                     "element_type": element_type,
-                    "element_outer_html": await get_element_outer_html(elem, page),
-                    "alternative_selectors": await selector_logger.get_alternative_selectors(elem, page),
-                    "element_attributes": await selector_logger.get_element_attributes(elem),
+                    "element_outer_html": await get_element_outer_html(elem, page, introspection=introspection),
+                    "alternative_selectors": await selector_logger.get_alternative_selectors(elem, page, introspection),
+                    "element_attributes": await selector_logger.get_element_attributes(elem, introspection),
                     "selector_logger": selector_logger,
                 }
                 return await interact_with_element_select_type(page, elem, selector, text_to_enter, properties)
 
         logger.info(f"Found selector {selector} to enter text")
-        element_outer_html = await get_element_outer_html(elem, page)
+        element_outer_html = await get_element_outer_html(elem, page, introspection=introspection)
 
         # Initialize selector logger with proof path
         selector_logger = get_browser_logger(get_global_conf().get_proof_path())
         # Get alternative selectors and element attributes for logging
-        alternative_selectors = await selector_logger.get_alternative_selectors(elem, page)
-        element_attributes = await selector_logger.get_element_attributes(elem)
+        alternative_selectors = await selector_logger.get_alternative_selectors(elem, page, introspection)
+        element_attributes = await selector_logger.get_element_attributes(elem, introspection)
 
         if use_keyboard_fill:
             await elem.focus()
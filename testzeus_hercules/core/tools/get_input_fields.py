@@ -9,7 +9,10 @@ from testzeus_hercules.core.browser_logger import get_browser_logger
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
-from testzeus_hercules.utils.dom_helper import wait_for_non_loading_dom_state
+from testzeus_hercules.utils.dom_helper import (
+    describe_loading_frames,
+    wait_for_non_loading_dom_state,
+)
 from testzeus_hercules.utils.get_detailed_accessibility_tree import (
     do_get_accessibility_info,
     rename_children,
@@ -38,7 +41,7 @@ async def get_input_fields() -> Annotated[str, "DOM type dict giving all input e
         raise ValueError("No active page found. OpenURL command opens a new page.")
 
     extracted_data = ""
-    await wait_for_non_loading_dom_state(page, 1)
+    loading_frames = await wait_for_non_loading_dom_state(page, 1)
     logger.debug("Fetching DOM for input_fields")
     extracted_data = await do_get_accessibility_info(page, only_input_fields=True)
     if extracted_data is None:
@@ -109,4 +112,6 @@ async def get_input_fields() -> Annotated[str, "DOM type dict giving all input e
     # """
     #     extracted_data = extracted_data_legend + extracted_data
     extracted_data = json.dumps(extracted_data, separators=(",", ":"))
-    return extracted_data or "Its Empty, try something else"  # type: ignore
+    if not extracted_data:
+        return "Its Empty, try something else"
+    return extracted_data + describe_loading_frames(loading_frames)  # type: ignore
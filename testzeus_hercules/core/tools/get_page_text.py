@@ -8,14 +8,19 @@ from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
-from testzeus_hercules.utils.dom_helper import wait_for_non_loading_dom_state
+from testzeus_hercules.utils.dom_helper import (
+    describe_loading_frames,
+    wait_for_non_loading_dom_state,
+)
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_helpers import call_page_helper
 
 
 @tool(
     agent_names=["browser_nav_agent"],
     description="""Retrieve Text on the current page""",
     name="get_page_text",
+    read_only=True,
 )
 async def get_page_text() -> Annotated[str, "DOM content based on type to analyze and decide"]:
 
@@ -32,7 +37,7 @@ async def get_page_text() -> Annotated[str, "DOM content based on type to analyz
         raise ValueError("No active page found. OpenURL command opens a new page.")
 
     extracted_data = ""
-    await wait_for_non_loading_dom_state(page, 1)
+    loading_frames = await wait_for_non_loading_dom_state(page, 1)
 
     logger.debug("Fetching DOM for text_only")
     text_content = await get_filtered_text_content(page)
@@ -47,7 +52,9 @@ async def get_page_text() -> Annotated[str, "DOM content based on type to analyz
     elapsed_time = time.time() - start_time
     logger.info(f"Get DOM Command executed in {elapsed_time} seconds")
 
-    return extracted_data or "Its Empty, try something else"  # type: ignore
+    if not extracted_data:
+        return "Its Empty, try something else"
+    return extracted_data + describe_loading_frames(loading_frames)  # type: ignore
 
 
 def clean_text(text_content: str) -> str:
@@ -70,204 +77,5 @@ def clean_text(text_content: str) -> str:
 
 
 async def get_filtered_text_content(page: Page) -> str:
-    text_content = await page.evaluate(
-        """
-        () => {
-        const selectorsToFilter = ['#hercules-overlay'];
-        const originalStyles = [];
-
-        /**
-        * Hide elements by setting their visibility to "hidden".
-        */
-        function hideElements(root, selector) {
-            if (!root) return;
-            const elements = root.querySelectorAll(selector);
-            elements.forEach(element => {
-            originalStyles.push({
-                element,
-                originalStyle: element.style.visibility
-            });
-            element.style.visibility = 'hidden';
-            });
-        }
-
-        /**
-        * Recursively hide elements in shadow DOM.
-        */
-        function processElementsInShadowDOM(root, selector) {
-            if (!root) return;
-            hideElements(root, selector);
-
-            const allNodes = root.querySelectorAll('*');
-            allNodes.forEach(node => {
-            if (node.shadowRoot) {
-                processElementsInShadowDOM(node.shadowRoot, selector);
-            }
-            });
-        }
-
-        /**
-        * Recursively hide elements in iframes.
-        */
-        function processElementsInIframes(root, selector) {
-            if (!root) return;
-            const iframes = root.querySelectorAll('iframe');
-            iframes.forEach(iframe => {
-            try {
-                const iframeDoc = iframe.contentDocument;
-                if (iframeDoc) {
-                processElementsInShadowDOM(iframeDoc, selector);
-                processElementsInIframes(iframeDoc, selector);
-                }
-            } catch (err) {
-                console.log('Error accessing iframe content:', err);
-            }
-            });
-        }
-
-        /**
-        * Create a TreeWalker that:
-        * - Visits text nodes and element nodes
-        * - Skips (<script> and <style>) elements entirely
-        */
-        function createSkippingTreeWalker(root) {
-            return document.createTreeWalker(
-            root,
-            NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
-            {
-                acceptNode(node) {
-                if (node.nodeType === Node.ELEMENT_NODE) {
-                    const tag = node.tagName.toLowerCase();
-                    if (tag === 'script' || tag === 'style') {
-                    return NodeFilter.FILTER_REJECT; // skip <script> / <style>
-                    }
-                }
-                return NodeFilter.FILTER_ACCEPT;
-                }
-            }
-            );
-        }
-
-        /**
-        * Gets text by walking the DOM, but skipping <script> and <style>.
-        * Also recursively checks for shadow roots and iframes.
-        */
-        function getTextSkippingScriptsStyles(root) {
-            if (!root) return '';
-
-            let textContent = '';
-            const walker = createSkippingTreeWalker(root);
-
-            while (walker.nextNode()) {
-            const node = walker.currentNode;
-            
-            // If it's a text node, accumulate text
-            if (node.nodeType === Node.TEXT_NODE) {
-                textContent += node.nodeValue;
-            }
-            // If it has a shadowRoot, recurse
-            else if (node.shadowRoot) {
-                textContent += getTextSkippingScriptsStyles(node.shadowRoot);
-            }
-            }
-
-            return textContent;
-        }
-
-        /**
-        * Recursively gather text from iframes, also skipping <script> & <style>.
-        */
-        function getTextFromIframes(root) {
-            if (!root) return '';
-            let iframeText = '';
-
-            const iframes = root.querySelectorAll('iframe');
-            iframes.forEach(iframe => {
-            try {
-                const iframeDoc = iframe.contentDocument;
-                if (iframeDoc) {
-                // Grab text from iframe body, docElement, plus nested iframes
-                iframeText += getTextSkippingScriptsStyles(iframeDoc.body);
-                iframeText += getTextSkippingScriptsStyles(iframeDoc.documentElement);
-                iframeText += getTextFromIframes(iframeDoc);
-                }
-            } catch (err) {
-                console.log('Error accessing iframe content:', err);
-            }
-            });
-
-            return iframeText;
-        }
-
-        /**
-        * Collect alt texts for images (this part can remain simpler, as alt text
-        * won't appear in <script> or <style> tags anyway).
-        */
-        function getAltTextsFromShadowDOM(root) {
-            if (!root) return [];
-            let altTexts = Array.from(root.querySelectorAll('img')).map(img => img.alt);
-
-            const allNodes = root.querySelectorAll('*');
-            allNodes.forEach(node => {
-            if (node.shadowRoot) {
-                altTexts = altTexts.concat(getAltTextsFromShadowDOM(node.shadowRoot));
-            }
-            });
-            return altTexts;
-        }
-
-        function getAltTextsFromIframes(root) {
-            if (!root) return [];
-            let iframeAltTexts = [];
-
-            const iframes = root.querySelectorAll('iframe');
-            iframes.forEach(iframe => {
-            try {
-                const iframeDoc = iframe.contentDocument;
-                if (iframeDoc) {
-                iframeAltTexts = iframeAltTexts.concat(getAltTextsFromShadowDOM(iframeDoc));
-                iframeAltTexts = iframeAltTexts.concat(getAltTextsFromIframes(iframeDoc));
-                }
-            } catch (err) {
-                console.log('Error accessing iframe content:', err);
-            }
-            });
-
-            return iframeAltTexts;
-        }
-
-        // 1) Hide overlays
-        selectorsToFilter.forEach(selector => {
-            processElementsInShadowDOM(document, selector);
-            processElementsInIframes(document, selector);
-        });
-
-        // 2) Collect text from the main document
-        let textContent = getTextSkippingScriptsStyles(document.body);
-        textContent += getTextSkippingScriptsStyles(document.documentElement);
-
-        // 3) Collect text from iframes
-        textContent += getTextFromIframes(document);
-
-        // 4) Collect alt texts
-        let altTexts = getAltTextsFromShadowDOM(document);
-        altTexts = altTexts.concat(getAltTextsFromIframes(document));
-        const altTextsString = 'Other Alt Texts in the page: ' + altTexts.join(' ');
-
-        // 5) Restore hidden overlays
-        originalStyles.forEach(entry => {
-            entry.element.style.visibility = entry.originalStyle;
-        });
-
-        // 6) Return final text
-        textContent = textContent + ' ' + altTextsString;
-
-        // Optional: sanitize whitespace, if needed
-        // const sanitizeString = (input) => input.replace(/\s+/g, ' ');
-        // textContent = sanitizeString(textContent);
-
-        return textContent;
-        }
-    """
-    )
+    text_content = await call_page_helper(page, "filteredTextContent")
     return clean_text(text_content)
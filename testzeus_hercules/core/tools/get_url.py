@@ -3,7 +3,6 @@ from typing import Annotated
 
 from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
-from testzeus_hercules.utils.js_helper import block_ads
 
 
 async def geturl() -> Annotated[str, "Returns the full URL of the current active web site/page."]:
@@ -22,7 +21,6 @@ async def geturl() -> Annotated[str, "Returns the full URL of the current active
         page = await browser_manager.get_current_page()
 
         await browser_manager.wait_for_load_state_if_enabled(page=page)
-        # await page.route("**/*", block_ads)
 
         if not page:
             raise ValueError("No active page found. OpenURL command opens a new page.")
@@ -10,10 +10,14 @@ from testzeus_hercules.core.browser_logger import get_browser_logger
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
-from testzeus_hercules.utils.dom_helper import get_element_outer_html
+from testzeus_hercules.utils.dom_helper import (
+    get_element_outer_html,
+    introspect_element,
+)
 from testzeus_hercules.utils.dom_mutation_observer import subscribe  # type: ignore
 from testzeus_hercules.utils.dom_mutation_observer import unsubscribe  # type: ignore
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_settle import wait_until_settled
 
 
 @tool(
@@ -49,8 +53,8 @@ async def hover(
         dom_changes_detected = changes  # type: ignore
 
     subscribe(detect_dom_changes)
-    result = await do_hover(page, selector, wait_before_execution)
-    await asyncio.sleep(get_global_conf().get_delay_time())  # sleep to allow the mutation observer to detect changes
+    async with wait_until_settled(page):
+        result = await do_hover(page, selector, wait_before_execution)
     unsubscribe(detect_dom_changes)
 
     await browser_manager.wait_for_load_state_if_enabled(page=page)
@@ -130,14 +134,14 @@ async def do_hover(page: Page, selector: str, wait_before_execution: float) -> d
             # If the element is not visible, try to hover over it anyway
             pass
 
-        element_tag_name = await element.evaluate("element => element.tagName.toLowerCase()")
-        element_outer_html = await get_element_outer_html(element, page, element_tag_name)
+        introspection = await introspect_element(element)
+        element_outer_html = await get_element_outer_html(element, page, introspection=introspection)
 
         # Initialize selector logger with proof path
         selector_logger = get_browser_logger(get_global_conf().get_proof_path())
         # Get alternative selectors and element attributes for logging
-        alternative_selectors = await selector_logger.get_alternative_selectors(element, page)
-        element_attributes = await selector_logger.get_element_attributes(element)
+        alternative_selectors = await selector_logger.get_alternative_selectors(element, page, introspection)
+        element_attributes = await selector_logger.get_element_attributes(element, introspection)
 
         await perform_playwright_hover(element, selector)
 
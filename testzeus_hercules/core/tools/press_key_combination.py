@@ -1,15 +1,14 @@
-import asyncio
 import inspect
 import traceback
 from typing import Annotated
 
 from playwright.async_api import Page  # type: ignore
-from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.utils.dom_mutation_observer import subscribe  # type: ignore
 from testzeus_hercules.utils.dom_mutation_observer import unsubscribe  # type: ignore
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_settle import wait_until_settled
 
 
 @tool(
@@ -38,17 +37,17 @@ async def press_key_combination(
         dom_changes_detected = changes  # type: ignore
 
     subscribe(detect_dom_changes)
-    # If it's a combination, hold down the modifier keys
-    for key in keys[:-1]:  # All keys except the last one are considered modifier keys
-        await page.keyboard.down(key)
+    async with wait_until_settled(page):
+        # If it's a combination, hold down the modifier keys
+        for key in keys[:-1]:  # All keys except the last one are considered modifier keys
+            await page.keyboard.down(key)
 
-    # Press the last key in the combination
-    await page.keyboard.press(keys[-1])
+        # Press the last key in the combination
+        await page.keyboard.press(keys[-1])
 
-    # Release the modifier keys
-    for key in keys[:-1]:
-        await page.keyboard.up(key)
-    await asyncio.sleep(get_global_conf().get_delay_time())  # sleep for 100ms to allow the mutation observer to detect changes
+        # Release the modifier keys
+        for key in keys[:-1]:
+            await page.keyboard.up(key)
     unsubscribe(detect_dom_changes)
 
     await browser_manager.wait_for_load_state_if_enabled(page=page)
@@ -1,4 +1,3 @@
-import asyncio
 import inspect
 import traceback
 from dataclasses import dataclass
@@ -9,10 +8,14 @@ from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.browser_logger import get_browser_logger
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool, tool_registry
-from testzeus_hercules.utils.dom_helper import get_element_outer_html
+from testzeus_hercules.utils.dom_helper import (
+    get_element_outer_html,
+    introspect_element,
+)
 from testzeus_hercules.utils.dom_mutation_observer import subscribe, unsubscribe
-from testzeus_hercules.utils.js_helper import get_js_with_element_finder
+from testzeus_hercules.utils.js_helper import call_with_element_finder
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_settle import wait_until_settled
 from testzeus_hercules.utils.ui_messagetype import MessageType
 
 
@@ -33,9 +36,9 @@ async def custom_set_slider_value(page: Page, selector: str, value_to_set: float
     """
     selector = f"{selector}"  # Ensures the selector is treated as a string
     try:
-        result = await page.evaluate(
-            get_js_with_element_finder(
-                """
+        result = await call_with_element_finder(
+            page,
+            """
             (inputParams) => {
                 /*INJECT_FIND_ELEMENT_IN_SHADOW_DOM*/
                 const { selector, value_to_set } = inputParams;
@@ -63,8 +66,7 @@ async def custom_set_slider_value(page: Page, selector: str, value_to_set: float
                 element.dispatchEvent(changeEvent);
                 return `Value set for ${selector}`;
             }
-            """
-            ),
+            """,
             {"selector": selector, "value_to_set": value_to_set},
         )
         logger.debug(f"custom_set_slider_value result: {result}")
@@ -113,8 +115,8 @@ async def setslider(
 
     subscribe(detect_dom_changes)
 
-    result = await do_setslider(page, selector, value_float)
-    await asyncio.sleep(get_global_conf().get_delay_time())  # sleep to allow the mutation observer to detect changes
+    async with wait_until_settled(page):
+        result = await do_setslider(page, selector, value_float)
     unsubscribe(detect_dom_changes)
 
     await browser_manager.wait_for_load_state_if_enabled(page=page)
@@ -167,13 +169,14 @@ async def do_setslider(page: Page, selector: str, value_to_set: float) -> dict[s
             return {"summary_message": error, "detailed_message": error}
 
         logger.info(f"Found selector {selector} to set slider value")
-        element_outer_html = await get_element_outer_html(elem_handle, page)
+        introspection = await introspect_element(elem_handle)
+        element_outer_html = await get_element_outer_html(elem_handle, page, introspection=introspection)
 
         # Initialize selector logger with proof path
         selector_logger = get_browser_logger(get_global_conf().get_proof_path())
         # Get alternative selectors and element attributes for logging
-        alternative_selectors = await selector_logger.get_alternative_selectors(elem_handle, page)
-        element_attributes = await selector_logger.get_element_attributes(elem_handle)
+        alternative_selectors = await selector_logger.get_alternative_selectors(elem_handle, page, introspection)
+        element_attributes = await selector_logger.get_element_attributes(elem_handle, introspection)
 
         # Get slider properties before setting value
         slider_props = await elem_handle.evaluate(
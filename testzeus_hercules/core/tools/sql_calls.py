@@ -12,6 +12,7 @@ from testzeus_hercules.utils.logger import logger
     agent_names=["sql_nav_agent"],
     description="Execute a SELECT SQL query on remote db, it should be only used when the instruction request to fetch data from database.",
     name="execute_select_query_sql_async",
+    read_only=True,
 )
 async def execute_select_cte_query_sql(
     connection_string: Annotated[
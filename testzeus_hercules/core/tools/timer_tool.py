@@ -71,6 +71,7 @@ async def wait_for_duration(
     agent_names=["time_keeper_nav_agent"],
     description="Get the current timestamp in string format.",
     name="get_current_timestamp",
+    read_only=True,
 )
 async def get_current_timestamp() -> Annotated[
     Dict[str, str],
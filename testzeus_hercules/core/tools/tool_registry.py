@@ -6,6 +6,7 @@ from collections.abc import Callable
 from typing import Any
 
 from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.utils.artifact_writer import get_artifact_writer
 from testzeus_hercules.utils.logger import logger
 
 # Define the type of the functions that will be registered as tools
@@ -15,6 +16,10 @@ toolType = Callable[..., Any]
 #
 tool_registry: dict[list[dict[str, Any]]] = defaultdict(list)
 
+# Tools declared side-effect free, by name, with the predicate telling whether a call with the given arguments is
+# read-only and can run concurrently with the other read-only calls of the same LLM message
+read_only_tools: dict[str, Callable[[dict[str, Any]], bool]] = {}
+
 
 def accessibility_logger(identity: str, violations_json: dict) -> None:
     """
@@ -96,8 +101,7 @@ def accessibility_logger_json(identity: str, logging_string: str) -> None:
     identity = identity.replace("/", "").replace(":", "").lower().replace("#", "")
     proof_path = get_global_conf().get_proof_path()
     json_accessibility_dom_path = os.path.join(proof_path, "json_accessibility_dom.json")
-    with open(json_accessibility_dom_path, "a", encoding="utf-8") as file:
-        file.write(logging_string + "\n")
+    get_artifact_writer().append_line(json_accessibility_dom_path, logging_string)
 
 
 def api_logger(logging_string: str) -> None:
@@ -109,8 +113,7 @@ def api_logger(logging_string: str) -> None:
     """
     proof_path = get_global_conf().get_proof_path()
     api_logs_path = os.path.join(proof_path, "api_logs.log")
-    with open(api_logs_path, "a", encoding="utf-8") as file:
-        file.write(logging_string + "\n")
+    get_artifact_writer().append_line(api_logs_path, logging_string)
 
 
 def sec_logger(logging_string: str) -> None:
@@ -122,17 +125,23 @@ def sec_logger(logging_string: str) -> None:
     """
     proof_path = get_global_conf().get_proof_path()
     security_logs_path = os.path.join(proof_path, "security_logs.log")
-    with open(security_logs_path, "a", encoding="utf-8") as file:
-        file.write(logging_string + "\n")
+    get_artifact_writer().append_line(security_logs_path, logging_string)
 
 
-def tool(agent_names: list[str], description: str, name: str | None = None) -> Callable[[toolType], toolType]:
+def tool(
+    agent_names: list[str],
+    description: str,
+    name: str | None = None,
+    read_only: bool | Callable[[dict[str, Any]], bool] = False,
+) -> Callable[[toolType], toolType]:
     """
     Decorator for registering private tools.
 
     Parameters:
     - description: A string describing the tool's function.
     - name: Optional name to register the tool with. If not provided, the function's name will be used.
+    - read_only: True if the tool has no side effects, or a function telling it from the arguments of a call.
+      Consecutive read-only calls of one LLM message are executed concurrently.
 
     Returns:
     - A decorator function that registers the tool in the global registry.
@@ -147,6 +156,32 @@ def tool(agent_names: list[str], description: str, name: str | None = None) -> C
                     "description": description,
                 }
             )
+        if read_only:
+            predicate = read_only if callable(read_only) else lambda arguments: True
+            # the LLM calls tools by function name, the registry name is kept for lookups by it
+            for tool_name in {name or func.__name__, func.__name__}:
+                read_only_tools[tool_name] = predicate
         return func
 
     return decorator
+
+
+def is_read_only_call(tool_name: str, arguments: dict[str, Any]) -> bool:
+    """
+    Tell whether a tool call has no side effects, so that it can run concurrently with other read-only calls.
+
+    Parameters:
+    - tool_name: The name of the called tool.
+    - arguments: The arguments of the call.
+
+    Returns:
+    - bool: True if the tool was declared read-only for these arguments.
+    """
+    predicate = read_only_tools.get(tool_name)
+    if predicate is None:
+        return False
+    try:
+        return bool(predicate(arguments))
+    except Exception as e:
+        logger.warning(f"Read-only check of {tool_name} failed, running it sequentially: {e}")
+        return False
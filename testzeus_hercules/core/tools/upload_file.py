@@ -1,4 +1,3 @@
-import asyncio
 import inspect
 import traceback
 from dataclasses import dataclass
@@ -10,9 +9,13 @@ from testzeus_hercules.core.browser_logger import get_browser_logger
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
 from testzeus_hercules.core.tools.tool_registry import tool
 from testzeus_hercules.telemetry import EventData, EventType, add_event
-from testzeus_hercules.utils.dom_helper import get_element_outer_html
+from testzeus_hercules.utils.dom_helper import (
+    get_element_outer_html,
+    introspect_element,
+)
 from testzeus_hercules.utils.dom_mutation_observer import subscribe, unsubscribe
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_settle import wait_until_settled
 from testzeus_hercules.utils.ui_messagetype import MessageType
 
 # Remove UploadFileEntry TypedDict class
@@ -57,8 +60,8 @@ async def click_and_upload_file(
 
     subscribe(detect_dom_changes)
 
-    result = await click_and_upload(page, selector, file_path)
-    await asyncio.sleep(get_global_conf().get_delay_time())  # sleep for 100ms to allow the mutation observer to detect changes
+    async with wait_until_settled(page):
+        result = await click_and_upload(page, selector, file_path)
     unsubscribe(detect_dom_changes)
 
     await browser_manager.take_screenshots(f"{function_name}_end", page)
@@ -106,11 +109,12 @@ async def click_and_upload(page: Page, selector: str, file_path: str) -> dict[st
         # Initialize selector logger with proof path
         selector_logger = get_browser_logger(get_global_conf().get_proof_path())
         # Get alternative selectors and element attributes for logging
-        alternative_selectors = await selector_logger.get_alternative_selectors(element, page)
-        element_attributes = await selector_logger.get_element_attributes(element)
+        introspection = await introspect_element(element)
+        alternative_selectors = await selector_logger.get_alternative_selectors(element, page, introspection)
+        element_attributes = await selector_logger.get_element_attributes(element, introspection)
 
         # Check if element is a file input
-        element_type = await element.evaluate("el => el.type")
+        element_type = introspection["type"]
         if element_type != "file":
 
             logger.info(f"Element is not a file input. Found type: {element_type}, trying to click it and upload")
@@ -150,7 +154,7 @@ async def click_and_upload(page: Page, selector: str, file_path: str) -> dict[st
             additional_data={"file_path": file_path, "element_type": "file"},
         )
 
-        element_outer_html = await get_element_outer_html(element, page)
+        element_outer_html = await get_element_outer_html(element, page, introspection=introspection)
         success_msg = f"Success. File '{file_path}' uploaded using the input with selector '{selector}'"
         return {
             "summary_message": success_msg,
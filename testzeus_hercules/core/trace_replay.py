@@ -0,0 +1,299 @@
+import asyncio
+import inspect
+import json
+import os
+import re
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from autogen import ChatResult  # type: ignore
+from playwright.async_api import Page
+from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.core.browser_logger import get_browser_logger
+from testzeus_hercules.core.playwright_manager import PlaywrightManager
+from testzeus_hercules.utils.artifact_writer import get_artifact_writer
+from testzeus_hercules.utils.llm_cache import normalize_observation
+from testzeus_hercules.utils.logger import logger
+
+INTERACTION_LOG_FILE = "interaction_logs.ndjson"
+TRACE_FILE = "tool_trace.json"
+# md ids given to the elements re-resolved from their recorded selectors, above the ones __inject_attributes hands out
+REPLAY_MD_BASE = 900000
+_RESOLVE_ATTEMPTS = 3
+_RESOLVE_DELAY = 0.5
+_MD_SELECTOR = re.compile(r"^\s*(?:\[md=(['\"]?)(\d+)\1\]|(\d+))\s*$")
+_MD_REFERENCE = re.compile(r"(\bmd\W{0,4})\d+")
+
+
+def _md_id(value: Any) -> Optional[str]:
+    """The md id of a selector argument, given as '[md='12']' or just '12'."""
+    if not isinstance(value, str):
+        return None
+    match = _MD_SELECTOR.match(value)
+    if not match:
+        return None
+    return match.group(2) or match.group(3)
+
+
+def _collect_md_ids(value: Any, found: List[str]) -> List[str]:
+    md = _md_id(value)
+    if md:
+        found.append(md)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_md_ids(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_md_ids(item, found)
+    return found
+
+
+def _rewrite_md_ids(value: Any, mapping: Dict[str, str]) -> Any:
+    md = _md_id(value)
+    if md:
+        return value.replace(md, mapping.get(md, md))
+    if isinstance(value, dict):
+        return {key: _rewrite_md_ids(item, mapping) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_rewrite_md_ids(item, mapping) for item in value]
+    return value
+
+
+def normalize_result(content: str) -> str:
+    """Tool result without what changes between two runs on the same page state: ids, timestamps and md ids."""
+    return _MD_REFERENCE.sub(r"\1<md>", normalize_observation(content or ""))
+
+
+def get_trace_file(test_id: str) -> str:
+    """Path of the tool call trace of the scenario, next to its per-run proofs unless REPLAY_TRACE_DIR is set."""
+    config = get_global_conf()
+    trace_dir = config.get_replay_trace_dir()
+    if trace_dir:
+        return os.path.join(trace_dir, f"{test_id}.json")
+    return os.path.join(os.path.dirname(config.get_proof_path(test_id)), TRACE_FILE)
+
+
+def read_tool_calls(interaction_log: str) -> List[Dict[str, Any]]:
+    """
+    Read the tool calls of a run from its interaction log, each with the alternative selectors of the elements
+    it interacted with, keyed by md id.
+
+    Args:
+        interaction_log (str): Path of interaction_logs.ndjson.
+
+    Returns:
+        List[Dict[str, Any]]: The steps, in the order they were executed.
+    """
+    steps: List[Dict[str, Any]] = []
+    selectors: Dict[str, Dict[str, str]] = {}
+    with open(interaction_log, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("interaction_type") == "tool_call":
+                steps.append(
+                    {
+                        "agent": entry["agent_type"],
+                        "tool": entry["tool_name"],
+                        "arguments": entry.get("request_data", {}).get("arguments"),
+                        "result": entry.get("response_data", {}).get("content", ""),
+                        "success": entry.get("success", True),
+                        "selectors": selectors,
+                    }
+                )
+                selectors = {}
+            elif entry.get("success") and entry.get("alternative_selectors"):
+                # element logs of a tool precede its tool_call entry, written once the call returned
+                md = _md_id(entry.get("selector"))
+                if md:
+                    selectors[md] = entry["alternative_selectors"]
+    return steps
+
+
+async def save_replay_trace(test_id: str, command: str, summary: str) -> Optional[str]:
+    """
+    Save the tool calls of the passing run that just finished as the replay trace of the scenario.
+
+    Args:
+        test_id (str): The test id of the scenario.
+        command (str): The command of the run, a trace is only replayed for the same command.
+        summary (str): The final summary of the run, returned by a complete replay.
+
+    Returns:
+        Optional[str]: The path of the trace, None if the run logged no tool call.
+    """
+    interaction_log = os.path.join(get_global_conf().get_proof_path(test_id), INTERACTION_LOG_FILE)
+    try:
+        await get_artifact_writer().aflush()
+        if not os.path.exists(interaction_log):
+            return None
+        steps = await asyncio.to_thread(read_tool_calls, interaction_log)
+        if not steps:
+            return None
+        trace = {"command": command, "summary": summary, "recorded_at": time.time(), "source": interaction_log, "steps": steps}
+        trace_file = get_trace_file(test_id)
+        os.makedirs(os.path.dirname(trace_file), exist_ok=True)
+        with open(trace_file, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False, default=str)
+        logger.info(f"Saved the replay trace of {test_id} ({len(steps)} tool calls) to {trace_file}")
+        return trace_file
+    except Exception as e:
+
+        traceback.print_exc()
+        logger.error(f"Failed to save the replay trace of {test_id}: {e}")
+        return None
+
+
+def load_replay_trace(test_id: str, command: str) -> Optional[Dict[str, Any]]:
+    """Load the replay trace of the scenario, None if there is none or it was recorded for another command."""
+    trace_file = get_trace_file(test_id)
+    if not os.path.exists(trace_file):
+        return None
+    try:
+        with open(trace_file, encoding="utf-8") as f:
+            trace = json.load(f)
+    except Exception as e:
+
+        traceback.print_exc()
+        logger.error(f"Failed to read the replay trace {trace_file}: {e}")
+        return None
+    if trace.get("command") != command:
+        logger.info(f"Replay trace {trace_file} was recorded for another version of the scenario, not replaying it")
+        return None
+    return trace
+
+
+class ToolTraceReplayer:
+    """
+    Replays the tool calls of a passing run directly against the tools, without the planner and nav LLMs.
+
+    Each step calls the tool the executor agent ran, with the recorded arguments. md ids are handed out anew by every
+    DOM snapshot, so the elements a step interacted with are found again from their recorded alternative selectors
+    (css, xpath, aria) and the arguments are rewritten to their current md ids. Replay stops at the first step that
+    diverges: a tool that is missing or raises, an element that is not found again, or a result that differs from the
+    recorded one once ids and timestamps are normalized. The agents then take over from the current state.
+    """
+
+    def __init__(self, trace: Dict[str, Any], function_maps: Dict[str, Dict[str, Callable[..., Any]]]) -> None:
+        """
+        Args:
+            trace (Dict[str, Any]): The trace, as loaded by load_replay_trace.
+            function_maps (Dict[str, Dict[str, Callable[..., Any]]]): Function map of every executor agent, by name.
+        """
+        self.trace = trace
+        self.function_maps = function_maps
+        self.replayed: List[Dict[str, Any]] = []
+        self.divergence: Optional[str] = None
+        self._md_counter = 0
+
+    @property
+    def completed(self) -> bool:
+        return self.divergence is None and len(self.replayed) == len(self.trace["steps"])
+
+    async def replay(self) -> bool:
+        """Replay the steps until the first divergence. Returns whether every step was replayed."""
+        start_time = time.perf_counter()
+        steps = self.trace["steps"]
+        for step in steps:
+            self.divergence = await self._replay_step(step)
+            if self.divergence:
+                break
+            self.replayed.append(step)
+        elapsed = round(time.perf_counter() - start_time, 3)
+        if self.divergence:
+            logger.info(f"Replayed {len(self.replayed)}/{len(steps)} tool calls in {elapsed}s, stopped at {self.divergence}")
+        else:
+            logger.info(f"Replayed all {len(steps)} tool calls in {elapsed}s without the LLM")
+        return self.completed
+
+    async def _replay_step(self, step: Dict[str, Any]) -> Optional[str]:
+        """Run a step, returns why it diverges from the recorded run, None if it did not."""
+        name = f"{step['agent']}.{step['tool']}"
+        func = self.function_maps.get(step["agent"], {}).get(step["tool"])
+        if func is None:
+            return f"{name}: the tool is not registered"
+        arguments = step["arguments"]
+        if not isinstance(arguments, dict):
+            return f"{name}: the recorded arguments are not a JSON object"
+
+        mapping: Dict[str, str] = {}
+        for md in _collect_md_ids(arguments, []):
+            if md in step["selectors"] and md not in mapping:
+                new_md = await self._resolve(step["selectors"][md])
+                if new_md is None:
+                    return f"{name}: element md={md} not found from its recorded selectors {step['selectors'][md]}"
+                mapping[md] = new_md
+        if mapping:
+            arguments = _rewrite_md_ids(arguments, mapping)
+
+        try:
+            result = func(**arguments)
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as e:
+
+            traceback.print_exc()
+            return f"{name}: raised {e}"
+        content = result if isinstance(result, str) else json.dumps(result, ensure_ascii=False, default=str)
+        get_browser_logger(get_global_conf().get_proof_path()).log_tool_call(step["agent"], step["tool"], arguments, content)
+
+        if normalize_result(content) != normalize_result(step["result"]):
+            return f"{name}: the result differs from the recorded run"
+        return None
+
+    async def _resolve(self, selectors: Dict[str, str]) -> Optional[str]:
+        """md id of the single element matched by one of the alternative selectors, retried while the page settles."""
+        page = await PlaywrightManager().get_current_page()
+        for attempt in range(_RESOLVE_ATTEMPTS):
+            md = await self._find(page, selectors)
+            if md is not None:
+                return md
+            if attempt < _RESOLVE_ATTEMPTS - 1:
+                await asyncio.sleep(_RESOLVE_DELAY)
+        return None
+
+    async def _find(self, page: Page, selectors: Dict[str, str]) -> Optional[str]:
+        for kind in ("css", "xpath", "aria"):
+            selector = selectors.get(kind)
+            if not selector:
+                continue
+            query = f"xpath={selector}" if kind == "xpath" else selector
+            for frame in page.frames:
+                try:
+                    locator = frame.locator(query)
+                    if await locator.count() != 1:
+                        continue
+                    element = await locator.element_handle(timeout=1000)
+                    md = await element.get_attribute("md")
+                    if not md:
+                        self._md_counter += 1
+                        md = str(REPLAY_MD_BASE + self._md_counter)
+                        await element.evaluate("(element, md) => element.setAttribute('md', md)", md)
+                    return md
+                except Exception as e:
+                    logger.debug(f"Replay selector {query} failed in frame {frame.url}: {e}")
+        return None
+
+    def chat_result(self) -> ChatResult:
+        """Result of a complete replay: the final summary of the recorded run, at no LLM cost."""
+        summary = self.trace["summary"]
+        no_cost = {"total_cost": 0}
+        return ChatResult(
+            chat_history=[{"role": "assistant", "name": "planner_agent", "content": summary}],
+            summary=summary,
+            cost={"usage_including_cached_inference": no_cost, "usage_excluding_cached_inference": no_cost},
+            human_input=[],
+        )
+
+    def handoff_message(self, current_url: Optional[str]) -> str:
+        """Tells the planner which steps were already replayed, so it continues the test from the current state."""
+        steps = "\n".join(f"{i}. {step['tool']}({json.dumps(step['arguments'], ensure_ascii=False, default=str)})" for i, step in enumerate(self.replayed, 1))
+        return (
+            "The following tool calls of a previous passing run of this test were already replayed and produced the same results:\n"
+            f"{steps}\n"
+            f"Replay stopped at {self.divergence}. Current Page: {current_url}. "
+            "Continue the test from this state, without repeating what the steps above already did."
+        )
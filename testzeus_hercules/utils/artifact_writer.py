@@ -0,0 +1,196 @@
+import asyncio
+import atexit
+import os
+import queue
+import threading
+import time
+import traceback
+from typing import IO, Any, Dict, List, Optional, Set, Tuple
+
+from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.utils.logger import logger
+
+ARTIFACT_WRITER_BATCH_SIZE = 256
+ARTIFACT_FSYNC_POLICIES = ("none", "batch", "flush")
+MAX_OPEN_ARTIFACT_FILES = 64
+
+
+class ArtifactWriter:
+    """
+    Background writer for the text artifacts appended while scenarios run: interaction logs, API, security and
+    accessibility logs.
+
+    append_line() only enqueues the line, a single writer thread drains the queue in batches, groups the lines per
+    file, keeps the files open between batches and creates each folder once. Artifacts are proofs, so nothing is
+    dropped: when the disk falls behind and the queue is full, append_line() blocks until there is room again and
+    append_line_async() waits for it without blocking the event loop. flush() returns once every line enqueued before
+    it is written, and closes the files.
+    """
+
+    def __init__(self, max_queue_size: int = 10000, fsync: str = "flush") -> None:
+        """
+        Args:
+            max_queue_size (int): Maximum number of lines waiting to be written before writers are slowed down.
+            fsync (str): 'none' to leave syncing to the OS, 'batch' to fsync the files after every batch, 'flush' to
+                fsync them on flush().
+        """
+        self._queue: "queue.Queue[Tuple[Optional[str], Any]]" = queue.Queue(maxsize=max_queue_size)
+        self._fsync = fsync if fsync in ARTIFACT_FSYNC_POLICIES else "flush"
+        self._files: Dict[str, IO[str]] = {}
+        self._dirs: Set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.written = 0
+        self.batches = 0
+        self.waits = 0
+        self.write_time = 0.0
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="hercules-artifact-writer", daemon=True)
+                self._thread.start()
+
+    def _put_nowait(self, item: Tuple[Optional[str], Any]) -> bool:
+        # while someone waits for room, later lines queue up behind it so the order of the file is kept
+        if self._waiting:
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def _put_waiting(self, item: Tuple[Optional[str], Any]) -> None:
+        with self._lock:
+            self._waiting += 1
+            self.waits += 1
+            if self.waits == 1:
+                logger.warning("Artifact writer queue is full, writers wait for the disk")
+        try:
+            self._queue.put(item)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def append_line(self, path: str, line: str) -> None:
+        """Append a line to the file at path, blocking only while the queue is full. Safe from any thread."""
+        self._ensure_thread()
+        item = (path, line + "\n")
+        if not self._put_nowait(item):
+            self._put_waiting(item)
+
+    async def append_line_async(self, path: str, line: str) -> None:
+        """Append a line to the file at path, waiting off the event loop while the queue is full."""
+        self._ensure_thread()
+        item = (path, line + "\n")
+        if not self._put_nowait(item):
+            await asyncio.to_thread(self._put_waiting, item)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every line appended so far is written, then close the files (fsynced unless the policy is 'none').
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait, None to wait until done.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    async def aflush(self, timeout: Optional[float] = None) -> bool:
+        """flush() without blocking the event loop."""
+        return await asyncio.to_thread(self.flush, timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < ARTIFACT_WRITER_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            start = time.perf_counter()
+            pending: Dict[str, List[str]] = {}
+            for path, payload in batch:
+                if path is None:
+                    self._write_pending(pending)
+                    pending = {}
+                    self._close_files()
+                    payload.set()
+                else:
+                    pending.setdefault(path, []).append(payload)
+            self._write_pending(pending)
+            self.batches += 1
+            self.write_time += time.perf_counter() - start
+
+    def _open(self, path: str) -> IO[str]:
+        file = self._files.get(path)
+        if file is not None:
+            return file
+        folder = os.path.dirname(path)
+        if folder and folder not in self._dirs:
+            os.makedirs(folder, exist_ok=True)
+            self._dirs.add(folder)
+        if len(self._files) >= MAX_OPEN_ARTIFACT_FILES:
+            self._close_file(next(iter(self._files)))
+        file = open(path, "a", encoding="utf-8")
+        self._files[path] = file
+        return file
+
+    def _write_pending(self, pending: Dict[str, List[str]]) -> None:
+        for path, lines in pending.items():
+            try:
+                file = self._open(path)
+                file.write("".join(lines))
+                file.flush()
+                if self._fsync == "batch":
+                    os.fsync(file.fileno())
+                self.written += len(lines)
+            except Exception as e:
+
+                traceback.print_exc()
+                logger.error(f"Failed to write artifact {path}: {e}")
+
+    def _close_file(self, path: str) -> None:
+        file = self._files.pop(path)
+        try:
+            file.flush()
+            if self._fsync != "none":
+                os.fsync(file.fileno())
+            file.close()
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to close artifact {path}: {e}")
+
+    def _close_files(self) -> None:
+        for path in list(self._files):
+            self._close_file(path)
+        logger.debug(f"Artifact writer: {self.written} lines in {self.batches} batches, {self.waits} waits for a full queue, {self.write_time:.3f}s spent writing")
+
+
+_artifact_writer: Optional[ArtifactWriter] = None
+_artifact_writer_lock = threading.Lock()
+
+
+def get_artifact_writer() -> ArtifactWriter:
+    """Get the artifact writer shared by the loggers of the process, flushed again when the process exits."""
+    global _artifact_writer
+    if _artifact_writer is None:
+        with _artifact_writer_lock:
+            if _artifact_writer is None:
+                config = get_global_conf()
+                writer = ArtifactWriter(config.get_artifact_writer_queue_size(), config.get_artifact_fsync())
+                atexit.register(writer.flush, 5.0)
+                _artifact_writer = writer
+    return _artifact_writer
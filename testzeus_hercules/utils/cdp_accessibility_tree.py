@@ -0,0 +1,355 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import CDPSession, Page
+from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.utils.logger import logger
+
+ELEMENT_NODE = 1
+TEXT_NODE = 3
+
+# Elements that never hold rendered text, skipped when collecting the text of an element
+NON_TEXT_TAGS = {"script", "style", "noscript", "template", "head", "title", "meta", "link"}
+# Elements without a layout box that are still shown, as part of their select
+BOXLESS_VISIBLE_TAGS = {"option", "optgroup"}
+BLOCK_DISPLAYS = {"block", "flex", "grid", "list-item", "table", "table-row", "table-cell", "table-caption", "flow-root"}
+AX_HIDDEN_REASONS = {"notRendered", "ariaHiddenElement", "ariaHiddenSubtree"}
+
+INPUT_TYPE_ROLES = {
+    "button": "button",
+    "submit": "button",
+    "reset": "button",
+    "image": "button",
+    "checkbox": "checkbox",
+    "radio": "radio",
+    "range": "slider",
+    "number": "spinbutton",
+    "search": "searchbox",
+    "file": "button",
+    "color": "combobox",
+    "date": "combobox",
+    "datetime-local": "combobox",
+    "month": "combobox",
+    "time": "combobox",
+    "week": "combobox",
+    "email": "textbox",
+    "tel": "textbox",
+    "url": "textbox",
+    "password": "textbox",
+    "text": "textbox",
+    "hidden": "",
+}
+
+whitespace = re.compile(r"\s+")
+
+
+def is_chromium_page(page: Page) -> bool:
+    """Check if the page runs in a Chromium based browser, the only one exposing a CDP session."""
+    browser = page.context.browser
+    browser_type = browser.browser_type.name if browser else get_global_conf().get_browser_type()
+    return browser_type == "chromium"
+
+
+def _attributes_of(node: Dict[str, Any]) -> Dict[str, str]:
+    attributes = node.get("attributes", [])
+    return dict(zip(attributes[0::2], attributes[1::2]))
+
+
+def _clean_name(name: str) -> str:
+    return name.split("\n")[0].strip()
+
+
+class _FrameDocument:
+    """
+    DOM, layout and accessibility data of the documents served by one CDP session.
+
+    The main page session covers the top document and its same-process iframes, every cross-origin
+    (out-of-process) iframe has a session of its own.
+    """
+
+    def __init__(self, session: CDPSession) -> None:
+        self.session = session
+        self.root: Dict[str, Any] = {}
+        self.layout: Dict[int, Dict[str, str]] = {}
+        self.ax_nodes: Dict[int, Dict[str, Any]] = {}
+        self.ids: Dict[str, Dict[str, Any]] = {}
+        self.rendered: Dict[int, bool] = {}
+        self.frame_ids: List[str] = []
+
+    async def load(self) -> None:
+        self.root = (await self.session.send("DOM.getDocument", {"depth": -1, "pierce": True}))["root"]
+
+        snapshot = await self.session.send("DOMSnapshot.captureSnapshot", {"computedStyles": ["display", "visibility"]})
+        strings = snapshot["strings"]
+        for document in snapshot["documents"]:
+            backend_node_ids = document["nodes"]["backendNodeId"]
+            layout = document["layout"]
+            for node_index, styles in zip(layout["nodeIndex"], layout["styles"]):
+                self.layout[backend_node_ids[node_index]] = {
+                    "display": strings[styles[0]] if len(styles) > 0 and styles[0] >= 0 else "",
+                    "visibility": strings[styles[1]] if len(styles) > 1 and styles[1] >= 0 else "",
+                }
+
+        await self._load_ax_tree(None)
+        self._index(self.root)
+
+    async def _load_ax_tree(self, frame_id: Optional[str]) -> None:
+        params = {"frameId": frame_id} if frame_id else {}
+        try:
+            result = await self.session.send("Accessibility.getFullAXTree", params)
+        except Exception as e:
+            logger.debug(f"Accessibility.getFullAXTree failed for frame {frame_id}: {e}")
+            return
+        for ax_node in result.get("nodes", []):
+            backend_node_id = ax_node.get("backendDOMNodeId")
+            if backend_node_id is not None:
+                self.ax_nodes[backend_node_id] = ax_node
+
+    def _index(self, node: Dict[str, Any]) -> None:
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.get("nodeType") == ELEMENT_NODE:
+                element_id = _attributes_of(current).get("id")
+                if element_id and element_id not in self.ids:
+                    self.ids[element_id] = current
+                if current.get("contentDocument") is not None and current.get("frameId"):
+                    self.frame_ids.append(current["frameId"])
+            stack.extend(reversed(current.get("children", [])))
+            stack.extend(reversed(current.get("shadowRoots", [])))
+            if current.get("contentDocument") is not None:
+                stack.append(current["contentDocument"])
+
+    async def load_same_process_frames(self) -> None:
+        for frame_id in self.frame_ids:
+            await self._load_ax_tree(frame_id)
+
+    def is_rendered(self, node: Dict[str, Any]) -> bool:
+        """Whether the element or any of its descendants has a layout box, false for display: none subtrees."""
+        backend_node_id = node["backendNodeId"]
+        if backend_node_id not in self.rendered:
+            children = node.get("children", []) + [child for shadow_root in node.get("shadowRoots", []) for child in shadow_root.get("children", [])]
+            rendered = backend_node_id in self.layout or any(child.get("nodeType") == ELEMENT_NODE and self.is_rendered(child) for child in children)
+            self.rendered[backend_node_id] = rendered
+        return self.rendered[backend_node_id]
+
+    def is_hidden(self, node: Dict[str, Any], tag: str, attributes: Dict[str, str]) -> bool:
+        if attributes.get("aria-hidden") == "true":
+            return True
+        style = self.layout.get(node["backendNodeId"])
+        if style is not None:
+            return style["display"] == "none" or style["visibility"] == "hidden"
+        if tag in BOXLESS_VISIBLE_TAGS:
+            return False
+        ax_node = self.ax_nodes.get(node["backendNodeId"])
+        if ax_node and any(reason.get("name") in AX_HIDDEN_REASONS for reason in ax_node.get("ignoredReasons", [])):
+            return True
+        return not self.is_rendered(node)
+
+    def first_text_line(self, node: Dict[str, Any]) -> str:
+        """First line of the rendered text of an element, the equivalent of its innerText split on line breaks."""
+        parts: List[str] = []
+
+        def has_text() -> bool:
+            return bool("".join(parts).strip())
+
+        def walk(parent: Dict[str, Any]) -> bool:
+            for child in parent.get("children", []):
+                if child.get("nodeType") == TEXT_NODE:
+                    # Source line breaks collapse like any other white space, only blocks and <br> break lines
+                    parts.append(whitespace.sub(" ", child.get("nodeValue", "")))
+                elif child.get("nodeType") == ELEMENT_NODE:
+                    tag = child.get("localName", "")
+                    if tag in NON_TEXT_TAGS or not self.is_rendered(child):
+                        continue
+                    if tag == "br" and has_text():
+                        return True
+                    block = self.layout.get(child["backendNodeId"], {}).get("display") in BLOCK_DISPLAYS
+                    if block and has_text():
+                        return True
+                    if walk(child):
+                        return True
+                    if block and has_text():
+                        return True
+            return False
+
+        walk(node)
+        return whitespace.sub(" ", "".join(parts)).strip()
+
+
+def _get_role(tag: str, attributes: Dict[str, str]) -> str:
+    role = attributes.get("role")
+    if role:
+        return role
+    if tag == "button":
+        return "button"
+    if tag == "a" and "href" in attributes:
+        return "link"
+    if tag == "input":
+        return INPUT_TYPE_ROLES.get(attributes.get("type", "text").lower(), "textbox")
+    if tag == "select":
+        return "listbox"
+    if tag == "textarea":
+        return "textbox"
+    return ""
+
+
+class CdpAccessibilityTreeBuilder:
+    """
+    Builds the accessibility tree of a Chromium page from CDP, in the schema generateAccessibilityTree produces.
+
+    The DOM (piercing shadow roots and same-process iframes) comes from one DOM.getDocument call, visibility from
+    DOMSnapshot.captureSnapshot and accessible names from Accessibility.getFullAXTree, instead of per element
+    getComputedStyle and innerText reads in the page. Cross-origin iframes, which the page script cannot enter,
+    are read through their own CDP sessions.
+    """
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self.sessions: List[CDPSession] = []
+        self.oopif_documents: Dict[str, _FrameDocument] = {}
+
+    async def _new_document(self, session: CDPSession) -> _FrameDocument:
+        self.sessions.append(session)
+        document = _FrameDocument(session)
+        await document.load()
+        await document.load_same_process_frames()
+        return document
+
+    async def _load_out_of_process_frames(self) -> None:
+        for frame in self.page.frames:
+            if frame == self.page.main_frame:
+                continue
+            try:
+                session = await self.page.context.new_cdp_session(frame)
+            except Exception:
+                # Same-process frames share the session of their parent
+                continue
+            try:
+                frame_tree = await session.send("Page.getFrameTree")
+                self.oopif_documents[frame_tree["frameTree"]["frame"]["id"]] = await self._new_document(session)
+            except Exception as e:
+                logger.debug(f"Failed to read out-of-process frame {frame.url}: {e}")
+
+    async def build(self) -> Optional[Dict[str, Any]]:
+        """
+        Build the tree of the page.
+
+        Returns:
+            Optional[Dict[str, Any]]: The accessibility tree rooted at the body, None when the page has no body.
+        """
+        try:
+            main_document = await self._new_document(await self.page.context.new_cdp_session(self.page))
+            await self._load_out_of_process_frames()
+            body = self._find_body(main_document.root)
+            return self._process_element(main_document, body, 1) if body else None
+        finally:
+            for session in self.sessions:
+                try:
+                    await session.detach()
+                except Exception as e:
+                    logger.debug(f"Failed to detach CDP session: {e}")
+
+    @staticmethod
+    def _find_body(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for html in document.get("children", []):
+            if html.get("localName") == "html":
+                for child in html.get("children", []):
+                    if child.get("localName") == "body":
+                        return child
+        return None
+
+    def _accessible_name(self, document: _FrameDocument, node: Dict[str, Any], tag: str, attributes: Dict[str, str]) -> str:
+        ax_node = document.ax_nodes.get(node["backendNodeId"])
+        if ax_node and not ax_node.get("ignored"):
+            ax_name = ax_node.get("name", {}).get("value")
+            if isinstance(ax_name, str) and ax_name.strip():
+                return _clean_name(ax_name)
+
+        if attributes.get("aria-label"):
+            return _clean_name(attributes["aria-label"])
+        labelledby = attributes.get("aria-labelledby")
+        if labelledby and labelledby in document.ids:
+            return _clean_name(document.first_text_line(document.ids[labelledby]))
+        for attribute in ("alt", "title", "placeholder"):
+            if attributes.get(attribute):
+                return _clean_name(attributes[attribute])
+        if attributes.get("value") and tag in ("input", "textarea"):
+            return _clean_name(attributes["value"])
+        return document.first_text_line(node)
+
+    def _process_iframe(self, document: _FrameDocument, iframe: Dict[str, Any], level: int) -> Optional[Dict[str, Any]]:
+        content_document = iframe.get("contentDocument")
+        frame_document = document
+        if content_document is None:
+            frame_document = self.oopif_documents.get(iframe.get("frameId", ""))  # type: ignore
+            if frame_document is None:
+                return None
+            content_document = frame_document.root
+        body = self._find_body(content_document)
+        if body is None:
+            return None
+        iframe_tree = self._process_element(frame_document, body, level + 1)
+        if not iframe_tree:
+            return None
+        iframe_node: Dict[str, Any] = {"tag": "iframe", "role": "document", "level": level + 1, "children": [iframe_tree]}
+        iframe_md = _attributes_of(iframe).get("md")
+        if iframe_md:
+            iframe_node["md"] = iframe_md
+        return iframe_node
+
+    def _process_element(self, document: _FrameDocument, element: Dict[str, Any], level: int) -> Optional[Dict[str, Any]]:
+        tag = element.get("localName", "")
+        attributes = _attributes_of(element)
+        if document.is_hidden(element, tag, attributes):
+            return None
+
+        node: Dict[str, Any] = {}
+        if attributes.get("md"):
+            node["md"] = attributes["md"]
+        node["tag"] = tag
+        role = _get_role(tag, attributes)
+        if role:
+            node["role"] = role
+        name = self._accessible_name(document, element, tag, attributes)
+        if name:
+            node["name"] = name
+        if attributes.get("title"):
+            node["title"] = _clean_name(attributes["title"])
+        if level:
+            node["level"] = level
+
+        node["children"] = []
+        for shadow_root in element.get("shadowRoots", []):
+            for child in shadow_root.get("children", []):
+                if child.get("nodeType") == ELEMENT_NODE:
+                    child_node = self._process_element(document, child, level + 1)
+                    if child_node:
+                        node["children"].append(child_node)
+
+        for child in element.get("children", []):
+            if child.get("nodeType") != ELEMENT_NODE:
+                continue
+            if child.get("localName") == "iframe":
+                child_node = self._process_iframe(document, child, level)
+            else:
+                child_node = self._process_element(document, child, level + 1)
+            if child_node:
+                node["children"].append(child_node)
+
+        if not node.get("md") and not node.get("name") and not node["children"] and not node.get("role"):
+            return None
+        return node
+
+
+async def get_cdp_accessibility_tree(page: Page) -> Optional[Dict[str, Any]]:
+    """
+    Build the accessibility tree of a Chromium page through CDP.
+
+    Args:
+        page (Page): The page object representing the web page, 'md' attributes already injected.
+
+    Returns:
+        Optional[Dict[str, Any]]: The tree in the schema of the in-page generateAccessibilityTree.
+    """
+    return await CdpAccessibilityTreeBuilder(page).build()
@@ -1,25 +1,142 @@
 import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
-from playwright.async_api import ElementHandle, Page
+from playwright.async_api import ElementHandle, Frame, Page
+from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.network_idle import (
+    DEFAULT_IGNORED_URL_PATTERNS,
+    compile_url_patterns,
+)
+from testzeus_hercules.utils.page_helpers import call_element_helper
 
+READY_STATE_POLL_INTERVAL = 0.1
 
-async def wait_for_non_loading_dom_state(page: Page, max_wait_seconds: int) -> None:
-    end_time = asyncio.get_event_loop().time() + max_wait_seconds
-    while asyncio.get_event_loop().time() < end_time:
-        all_frames_ready = True
-        for frame in page.frames:
-            dom_state = await frame.evaluate("document.readyState")
-            if dom_state == "loading":
-                all_frames_ready = False
-                break  # Exit the loop if any frame is still loading
-        if all_frames_ready:
-            logger.debug("All frames have DOM state not 'loading'")
-            break  # Exit the outer loop if all frames are ready
-        await asyncio.sleep(0.1)
 
+async def _frame_ready_state(frame: Frame, timeout: float) -> Optional[str]:
+    """readyState of the frame, None if it did not answer within timeout or is gone."""
+    try:
+        return await asyncio.wait_for(frame.evaluate("document.readyState"), timeout=max(timeout, 0.001))
+    except asyncio.TimeoutError:
+        return None
+    except Exception as e:
+        logger.debug(f"Could not read readyState of frame {frame.url}: {e}")
+        return "detached" if frame.is_detached() else None
 
-async def get_element_outer_html(element: ElementHandle, page: Page, element_tag_name: str | None = None) -> str:
+
+async def wait_for_non_loading_dom_state(
+    page: Page,
+    max_wait_seconds: float,
+    frame_timeout: Optional[float] = None,
+    ignored_frame_patterns: Optional[List[str]] = None,
+) -> List[Dict[str, str]]:
+    """
+    Wait until no frame of the page has document.readyState 'loading', checking all frames concurrently.
+
+    The main frame is waited for up to max_wait_seconds. A child frame is given up on after frame_timeout seconds,
+    so one hung iframe (ads, embeds) does not hold the whole check, and frames whose URL contains one of the ignored
+    patterns are not checked at all.
+
+    Args:
+        page (Page): The page whose frames to check.
+        max_wait_seconds (float): Maximum seconds to wait.
+        frame_timeout (Optional[float]): Seconds a child frame is waited for, FRAME_READY_TIMEOUT by default.
+        ignored_frame_patterns (Optional[List[str]]): URL substrings of frames to skip, 'default' for the built-in list,
+            FRAME_READY_IGNORED_URL_PATTERNS by default.
+
+    Returns:
+        List[Dict[str, str]]: The frames still loading when the wait ended, with their url, name and ready_state
+            ('loading', 'unresponsive' when the frame did not answer, 'unchecked' when it attached too late).
+    """
+    config = get_global_conf()
+    frame_timeout = config.get_frame_ready_timeout() if frame_timeout is None else frame_timeout
+    patterns = config.get_frame_ready_ignored_url_patterns() if ignored_frame_patterns is None else ignored_frame_patterns
+    # 'default' stands for the analytics, ads and chat widget list the network idle wait ignores
+    patterns = [q for p in patterns for q in (DEFAULT_IGNORED_URL_PATTERNS if p == "default" else (p,))]
+    ignored = compile_url_patterns(tuple(p.lower() for p in patterns)) if patterns else None
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    end_time = start + max_wait_seconds
+
+    async def wait_for_frame(frame: Frame) -> Optional[str]:
+        deadline = end_time if frame.parent_frame is None else min(end_time, start + frame_timeout)
+        state = "unchecked"
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return state
+            ready_state = await _frame_ready_state(frame, remaining)
+            if ready_state is not None and ready_state != "loading":
+                return None
+            state = ready_state or "unresponsive"
+            await asyncio.sleep(min(READY_STATE_POLL_INTERVAL, max(0.0, deadline - loop.time())))
+
+    # every frame is polled on its own, frames attached while waiting are picked up in the next round
+    checked: set = set()
+    loading: List[Tuple[Frame, str]] = []
+    while True:
+        frames = [frame for frame in page.frames if frame not in checked and not frame.is_detached() and not (ignored and frame.parent_frame is not None and ignored.search(frame.url.lower()))]
+        if not frames:
+            break
+        checked.update(frames)
+        states = await asyncio.gather(*(wait_for_frame(frame) for frame in frames))
+        loading.extend((frame, state) for frame, state in zip(frames, states) if state is not None)
+
+    loading_frames = [{"url": frame.url, "name": frame.name, "ready_state": state} for frame, state in loading]
+    if loading_frames:
+        logger.debug(f"Frames still loading after {loop.time() - start:.2f}s: {loading_frames}")
+    else:
+        logger.debug("All frames have DOM state not 'loading'")
+    return loading_frames
+
+
+def describe_loading_frames(loading_frames: List[Dict[str, str]]) -> str:
+    """Note for the agent about the frames that were still loading when the page was read, empty if none."""
+    if not loading_frames:
+        return ""
+    urls = ", ".join(frame["url"] or frame["name"] or "about:blank" for frame in loading_frames)
+    return f"\nNote: {len(loading_frames)} frame(s) were still loading when the page was read and may be incomplete: {urls}"
+
+
+# Attributes of the opening tag returned by get_element_outer_html, in this order
+OUTER_HTML_ATTRIBUTES = (
+    "id",
+    "name",
+    "aria-label",
+    "placeholder",
+    "href",
+    "src",
+    "aria-autocomplete",
+    "role",
+    "type",
+    "data-testid",
+    "value",
+    "selected",
+    "aria-labelledby",
+    "aria-describedby",
+    "aria-haspopup",
+    "title",
+    "aria-controls",
+)
+
+
+async def introspect_element(element: ElementHandle) -> Dict[str, Any]:
+    """
+    Read everything the tools report and log about an element in a single evaluate, instead of one round trip per
+    attribute and selector.
+
+    Args:
+        element (ElementHandle): The element to describe.
+
+    Returns:
+        Dict[str, Any]: tag, type (the type property), attributes (the non empty attributes of interest), xpath, aria,
+        css and boundingBox (relative to the viewport of the element's frame).
+    """
+    return await call_element_helper(element, "introspectElement")
+
+
+async def get_element_outer_html(element: ElementHandle, page: Page, element_tag_name: str | None = None, introspection: Optional[Dict[str, Any]] = None) -> str:
     """
     Constructs the opening tag of an HTML element along with its attributes.
 
@@ -27,35 +144,19 @@ async def get_element_outer_html(element: ElementHandle, page: Page, element_tag
         element (ElementHandle): The element to retrieve the opening tag for.
         page (Page): The page object associated with the element.
         element_tag_name (str, optional): The tag name of the element. Defaults to None. If not passed, it will be retrieved from the element.
+        introspection (Dict[str, Any], optional): The result of introspect_element when the caller already has it.
 
     Returns:
         str: The opening tag of the HTML element, including a select set of attributes.
     """
-    tag_name: str = element_tag_name if element_tag_name else await page.evaluate("element => element.tagName.toLowerCase()", element)
-
-    attributes_of_interest: list[str] = [
-        "id",
-        "name",
-        "aria-label",
-        "placeholder",
-        "href",
-        "src",
-        "aria-autocomplete",
-        "role",
-        "type",
-        "data-testid",
-        "value",
-        "selected",
-        "aria-labelledby",
-        "aria-describedby",
-        "aria-haspopup",
-        "title",
-        "aria-controls",
-    ]
-    opening_tag: str = f"<{tag_name}"
+    if introspection is None:
+        introspection = await introspect_element(element)
+    tag_name: str = element_tag_name if element_tag_name else introspection["tag"]
+    attributes: Dict[str, str] = introspection["attributes"]
 
-    for attr in attributes_of_interest:
-        value: str = await element.get_attribute(attr)  # type: ignore
+    opening_tag: str = f"<{tag_name}"
+    for attr in OUTER_HTML_ATTRIBUTES:
+        value = attributes.get(attr)
         if value:
             opening_tag += f' {attr}="{value}"'
     opening_tag += ">"
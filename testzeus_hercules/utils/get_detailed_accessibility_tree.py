@@ -8,7 +8,12 @@ import aiofiles
 from playwright.async_api import Page
 from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.core.playwright_manager import PlaywrightManager
+from testzeus_hercules.utils.cdp_accessibility_tree import (
+    get_cdp_accessibility_tree,
+    is_chromium_page,
+)
 from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.page_helpers import call_page_helper
 
 space_delimited_md = re.compile(r"^[\d ]+$")
 
@@ -45,197 +50,70 @@ def is_space_delimited_md(s: str) -> bool:
     return bool(space_delimited_md.fullmatch(s))
 
 
-async def __inject_attributes(page: Page) -> None:
+async def __inject_attributes(page: Page, incremental: bool = False) -> None:
     """
     Injects 'md' and 'aria-keyshortcuts' into all DOM elements. If an element already has an 'aria-keyshortcuts',
     it renames it to 'orig-aria-keyshortcuts' before injecting the new 'aria-keyshortcuts'
     This will be captured in the accessibility tree and thus make it easier to reconcile the tree with the DOM.
     'aria-keyshortcuts' is choosen because it is not widely used aria attribute.
-    """
-
-    last_md = await page.evaluate(
-        """() => {
-            // A recursive function to handle elements in DOM, shadow DOM, and iframes
-            const processElements = (elements, idCounter) => {
-                elements.forEach(element => {
-                    // If the element has a shadowRoot, process its children too
-                    if (element.shadowRoot) {
-                        idCounter = processElements(element.shadowRoot.querySelectorAll('*'), idCounter);
-                    }
-
-                    // If the element is an iframe, process its contentDocument if accessible
-                    if (element.tagName.toLowerCase() === 'iframe') {
-                        let iframeDocument;
-                        try {
-                            // Access the iframe's document if it's same-origin
-                            iframeDocument = element.contentDocument || element.contentWindow.document;
-                        } catch (e) {
-                            // Cannot access cross-origin iframe; skip to the next element
-                            return;
-                        }
-                        if (iframeDocument) {
-                            const iframeElements = iframeDocument.querySelectorAll('*');
-                            idCounter = processElements(iframeElements, idCounter);
-                        }
-                    }
 
-                    // Check if the element is interactive (buttons, inputs, etc.)
-                    if (isInteractiveElement(element)) {
-                        const origAriaAttribute = element.getAttribute('aria-keyshortcuts');
-                        const md = `${++idCounter}`;
-                        element.setAttribute('md', md);
-                        element.setAttribute('aria-keyshortcuts', md);
-
-                        // Preserve the original aria-keyshortcuts if it exists
-                        if (origAriaAttribute) {
-                            element.setAttribute('orig-aria-keyshortcuts', origAriaAttribute);
-                        }
-                    }
-                });
-                return idCounter;
-            };
-            function isInteractiveElement(element) {
-                // Immediately return false for body tag
-                if (element.tagName.toLowerCase() === 'body') {
-                    return false;
-                }
+    When incremental is set, elements keep the 'md' they already have, and if the page still holds the previous
+    snapshot only the subtrees the mutation observer marked as dirty are visited. The dirty roots are left in
+    window.__hercules_snapshot_roots for the tree generation, null meaning a full rebuild.
 
-                // Base interactive elements and roles
-                const interactiveElements = new Set([
-                    'a', 'button', 'details', 'embed', 'input', 'label',
-                    'menu', 'menuitem', 'object', 'select', 'textarea', 'summary'
-                ]);
-
-                const interactiveRoles = new Set([
-                    'button', 'menu', 'menuitem', 'link', 'checkbox', 'radio',
-                    'slider', 'tab', 'tabpanel', 'textbox', 'combobox', 'grid',
-                    'listbox', 'option', 'progressbar', 'scrollbar', 'searchbox',
-                    'switch', 'tree', 'treeitem', 'spinbutton', 'tooltip', 'a-button-inner', 'a-dropdown-button', 'click', 
-                    'menuitemcheckbox', 'menuitemradio', 'a-button-text', 'button-text', 'button-icon', 'button-icon-only', 'button-text-icon-only', 'dropdown', 'combobox'
-                ]);
-
-                const tagName = element.tagName.toLowerCase();
-                const role = element.getAttribute('role');
-                const ariaRole = element.getAttribute('aria-role');
-                const tabIndex = element.getAttribute('tabindex');
-
-                // Add check for specific class
-                const hasAddressInputClass = element.classList.contains('address-input__container__input');
-
-                // Basic role/attribute checks
-                const hasInteractiveRole = hasAddressInputClass ||
-                    interactiveElements.has(tagName) ||
-                    interactiveRoles.has(role) ||
-                    interactiveRoles.has(ariaRole) ||
-                    (tabIndex !== null && tabIndex !== '-1' && element.parentElement?.tagName.toLowerCase() !== 'body') ||
-                    element.getAttribute('data-action') === 'a-dropdown-select' ||
-                    element.getAttribute('data-action') === 'a-dropdown-button';
-
-                if (hasInteractiveRole) return true;
-
-                // Get computed style
-                const style = window.getComputedStyle(element);
-
-                if (
-                    style.cursor === 'pointer' || 
-                    style.cursor === 'hand' ||
-                    style.cursor === 'move' ||
-                    style.cursor === 'grab' ||
-                    style.cursor === 'grabbing'
-                ) {
-                    return true;
-                }
+    Every pass also publishes window.__hercules_md_elements, a map from md to a WeakRef of its element kept current
+    by the mutation observer, which element lookups by md use instead of scanning the DOM, shadow roots and iframes.
+    """
 
-                // Check for event listeners
-                const hasClickHandler = element.onclick !== null ||
-                    element.getAttribute('onclick') !== null ||
-                    element.hasAttribute('ng-click') ||
-                    element.hasAttribute('@click') ||
-                    element.hasAttribute('v-on:click');
-
-                // Helper function to safely get event listeners
-                function getEventListeners(el) {
-                    try {
-                        // Try to get listeners using Chrome DevTools API
-                        return window.getEventListeners?.(el) || {};
-                    } catch (e) {
-                        // Fallback: check for common event properties
-                        const listeners = {};
-
-                        // List of common event types to check
-                        const eventTypes = [
-                            'click', 'mousedown', 'mouseup',
-                            'touchstart', 'touchend',
-                            'keydown', 'keyup', 'focus', 'blur'
-                        ];
-
-                        for (const type of eventTypes) {
-                            const handler = el[`on${type}`];
-                            if (handler) {
-                                listeners[type] = [{
-                                    listener: handler,
-                                    useCapture: false
-                                }];
-                            }
-                        }
+    last_md = await call_page_helper(page, "injectAttributes", incremental)
+    logger.debug(f"Added MD into {last_md} elements")
 
-                        return listeners;
-                    }
-                }
 
-                // Check for click-related events on the element itself
-                const listeners = getEventListeners(element);
-                const hasClickListeners = listeners && (
-                    listeners.click?.length > 0 ||
-                    listeners.mousedown?.length > 0 ||
-                    listeners.mouseup?.length > 0 ||
-                    listeners.touchstart?.length > 0 ||
-                    listeners.touchend?.length > 0
-                );
-
-                // Check for ARIA properties that suggest interactivity
-                const hasAriaProps = element.hasAttribute('aria-expanded') ||
-                    element.hasAttribute('aria-pressed') ||
-                    element.hasAttribute('aria-selected') ||
-                    element.hasAttribute('aria-checked');
-
-                // Check for form-related functionality
-                const isFormRelated = element.form !== undefined ||
-                    element.hasAttribute('contenteditable') ||
-                    style.userSelect !== 'none';
-
-                // Check if element is draggable
-                const isDraggable = element.draggable ||
-                    element.getAttribute('draggable') === 'true';
-
-                // Additional check to prevent body from being marked as interactive
-                if (element.tagName.toLowerCase() === 'body' || element.parentElement?.tagName.toLowerCase() === 'body') {
-                    return false;
-                }
+# Number of elements reconciled per page.evaluate round trip
+DOM_INFO_BATCH_SIZE = 500
 
-                return hasAriaProps ||
-                    // hasClickStyling ||
-                    hasClickHandler ||
-                    hasClickListeners ||
-                    // isFormRelated ||
-                    isDraggable;
-            }
 
-            // Helper function to determine if an element is interactive
-            // const isInteractiveElement = (element) => {
-            //     const interactiveTags = ['button', 'a', 'input', 'select', 'textarea'];
-            //     return interactiveTags.includes(element.tagName.toLowerCase()) || element.hasAttribute('tabindex');
-            // };
+async def fetch_elements_attributes(
+    page: Page,
+    requests: list[tuple[int, bool]],
+    attributes: list[str],
+    backup_attributes: list[str],
+    tags_to_ignore: list[str],
+    ids_to_ignore: list[str],
+    batch_size: int = DOM_INFO_BATCH_SIZE,
+) -> dict[tuple[int, bool], dict[str, Any] | None]:
+    """
+    Fetches the DOM attributes of many elements, identified by 'md', in chunked page.evaluate calls.
 
-            // Start processing the DOM
-            const allElements = document.querySelectorAll('*');
-            let id = processElements(allElements, 0);
+    Args:
+        page (Page): The page object representing the web page.
+        requests (list[tuple[int, bool]]): The (md, should_fetch_inner_text) pairs to fetch.
+        attributes (list[str]): The attributes to fetch for each element.
+        backup_attributes (list[str]): The attributes to try when none of the attributes are found.
+        tags_to_ignore (list[str]): Tags whose elements are skipped.
+        ids_to_ignore (list[str]): Ids whose elements are skipped.
+        batch_size (int): The maximum number of elements fetched per round trip.
 
-            return id;
-        };
-        """
-    )
-    logger.debug(f"Added MD into {last_md} elements")
+    Returns:
+        dict[tuple[int, bool], dict[str, Any] | None]: The attributes of each request, None when the element is missing or ignored.
+    """
+    elements_attributes: dict[tuple[int, bool], dict[str, Any] | None] = {}
+    for start in range(0, len(requests), batch_size):
+        batch = requests[start : start + batch_size]
+        results = await call_page_helper(
+            page,
+            "fetchElementsAttributes",
+            {
+                "requests": [[md, should_fetch_inner_text] for md, should_fetch_inner_text in batch],
+                "attributes": attributes,
+                "backup_attributes": backup_attributes,
+                "tags_to_ignore": tags_to_ignore,
+                "ids_to_ignore": ids_to_ignore,
+            },
+        )
+        elements_attributes.update(zip(batch, results))
+    logger.debug(f"Fetched DOM info of {len(requests)} elements in {(len(requests) + batch_size - 1) // batch_size} round trips")
+    return elements_attributes
 
 
 async def __fetch_dom_info(page: Page, accessibility_tree: dict[str, Any], only_input_fields: bool) -> dict[str, Any]:
@@ -285,30 +163,59 @@ async def __fetch_dom_info(page: Page, accessibility_tree: dict[str, Any], only_
     attributes_to_delete = ["level", "multiline", "haspopup", "id", "for"]
     ids_to_ignore = ["agentDriveAutoOverlay"]
 
-    # Recursive function to process each node in the accessibility tree
-    async def process_node(node: dict[str, Any]) -> None:
+    # Resolve the md of a node the same way for both passes, None when the node should be left as is
+    def node_md(node: dict[str, Any]) -> int | None:
+        # Use 'name' attribute from the accessibility node as 'md'
+        md_temp: str = node.get("keyshortcuts")  # type: ignore
+
+        # If the name has multiple mds, take the last one
+        if md_temp and is_space_delimited_md(md_temp):
+            # TODO: consider if we should grab each of the mds and process them separately as seperate nodes copying this node's attributes
+            md_temp = md_temp.split(" ")[-1]
+
+        # focusing on nodes with md, which is the attribute we inject
+        try:
+            md = int(md_temp)
+        except (ValueError, TypeError):
+            # logger.error(f"'name attribute contains \"{node.get('name')}\", which is not a valid numeric md. Adding node as is: {node}")
+            return None
+
+        if node["role"] == "menuitem":
+            return None
+        return md
+
+    # First pass: collect every (md, should_fetch_inner_text) pair the tree needs from the DOM
+    requests: list[tuple[int, bool]] = []
+    requests_seen: set[tuple[int, bool]] = set()
+
+    def collect_requests(node: dict[str, Any]) -> None:
         if node:
             if "children" in node:
                 for child in node["children"]:
-                    await process_node(child)
+                    collect_requests(child)
+            md = node_md(node)
+            if md:
+                # Determine if we need to fetch 'innerText' based on the absence of 'children' in the accessibility node
+                request = (md, "children" not in node)
+                if request not in requests_seen:
+                    requests_seen.add(request)
+                    requests.append(request)
 
-            # Use 'name' attribute from the accessibility node as 'md'
-            md_temp: str = node.get("keyshortcuts")  # type: ignore
+    collect_requests(accessibility_tree)
 
-            # If the name has multiple mds, take the last one
-            if md_temp and is_space_delimited_md(md_temp):
-                # TODO: consider if we should grab each of the mds and process them separately as seperate nodes copying this node's attributes
-                md_temp = md_temp.split(" ")[-1]
+    # Fetch attributes and possibly 'innerText' of all the elements in a few round trips instead of one per node
+    elements_attributes = await fetch_elements_attributes(page, requests, attributes, backup_attributes, tags_to_ignore, ids_to_ignore)
 
-            # focusing on nodes with md, which is the attribute we inject
-            try:
-                md = int(md_temp)
-            except (ValueError, TypeError):
-                # logger.error(f"'name attribute contains \"{node.get('name')}\", which is not a valid numeric md. Adding node as is: {node}")
-                return node.get("name")
+    # Second pass: recursive function to process each node in the accessibility tree
+    def process_node(node: dict[str, Any]) -> None:
+        if node:
+            if "children" in node:
+                for child in node["children"]:
+                    process_node(child)
 
-            if node["role"] == "menuitem":
-                return node.get("name")
+            md = node_md(node)
+            if md is None:
+                return
 
             if node.get("role") == "dialog" and node.get("modal") == True:  # noqa: E712
                 node["important information"] = (
@@ -316,195 +223,7 @@ async def __fetch_dom_info(page: Page, accessibility_tree: dict[str, Any], only_
                 )
 
             if md:
-                # Determine if we need to fetch 'innerText' based on the absence of 'children' in the accessibility node
-                should_fetch_inner_text = "children" not in node
-
-                js_code = """
-                    (input_params) => {
-                        const should_fetch_inner_text = input_params.should_fetch_inner_text;
-                        const md = input_params.md;
-                        const attributes = input_params.attributes;
-                        const tags_to_ignore = input_params.tags_to_ignore;
-                        const ids_to_ignore = input_params.ids_to_ignore;
-
-                        // Helper function to search for an element by md across DOM, shadow DOMs, and iframes
-                        const findElementByMd = (parent, md) => {
-                            // Look in the parent context (can be document or shadow root)
-                            const element = parent.querySelector(`[md="${md}"]`);
-
-                            if (element) {
-                                return element; // Found in parent context
-                            }
-
-                            // If the element is not found, try looking inside shadow DOMs and iframes
-                            const elements = parent.querySelectorAll('*');
-                            for (const el of elements) {
-                                // Check for shadow DOM
-                                if (el.shadowRoot) {
-                                    const shadowElement = findElementByMd(el.shadowRoot, md);
-                                    if (shadowElement) {
-                                        return shadowElement; // Found in shadow DOM
-                                    }
-                                }
-                                // Check for iframes
-                                if (el.tagName.toLowerCase() === 'iframe') {
-                                    let iframeDocument;
-                                    try {
-                                        iframeDocument = el.contentDocument || el.contentWindow.document;
-                                    } catch (e) {
-                                        // Cannot access cross-origin iframe; skip to the next element
-                                        continue;
-                                    }
-                                    if (iframeDocument) {
-                                        const iframeElement = findElementByMd(iframeDocument, md);
-                                        if (iframeElement) {
-                                            return iframeElement; // Found in iframe
-                                        }
-                                    }
-                                }
-                            }
-
-                            return null; // Not found
-                        };
-
-                        // Start the search in the document (regular DOM)
-                        const element = findElementByMd(document, md);
-
-                        if (!element) {
-                            console.log(`No element found with md: ${md}`);
-                            return null;
-                        }
-
-                        if (ids_to_ignore.includes(element.id)) {
-                            console.log(`Ignoring element with id: ${element.id}`, element);
-                            return null;
-                        }
-
-                        if (tags_to_ignore.includes(element.tagName.toLowerCase()) || element.tagName.toLowerCase() === "option") {
-                            return null;
-                        }
-
-                        let attributes_to_values = {
-                            'tag': element.tagName.toLowerCase() // Always include the tag name
-                        };
-
-                        if (element.hasAttribute('aria-describedby')) {
-                            const describedbyId = element.getAttribute('aria-describedby');
-                            const describedElement = findElementById(document, describedbyId);
-                            if (describedElement) {
-                                attributes_to_values['tooltip'] = describedElement.innerText || describedElement.textContent;
-                            }
-                        }
-                        
-                        if (element.tagName.toLowerCase() === 'input') {
-                            attributes_to_values['tag_type'] = element.type;
-                        } else if (element.tagName.toLowerCase() === 'select') {
-                            attributes_to_values["md"] = element.getAttribute('md');
-                            attributes_to_values["role"] = "combobox";
-                            attributes_to_values["options"] = [];
-
-                            for (const option of element.options) {
-                                let option_attributes_to_values = {
-                                    "md": option.getAttribute('md'),
-                                    "text": option.text,
-                                    "value": option.value,
-                                    "selected": option.selected
-                                };
-                                attributes_to_values["options"].push(option_attributes_to_values);
-                            }
-                            return attributes_to_values;
-                        }
-
-                        for (const attribute of attributes) {
-                            let value = element.getAttribute(attribute);
-
-                            if (value) {
-                                attributes_to_values[attribute] = value;
-                            }
-                        }
-
-                        if (should_fetch_inner_text && element.innerText) {
-                            attributes_to_values['description'] = element.innerText;
-                        }
-
-                        let role = element.getAttribute('role');
-                        if (role === 'listbox' || element.tagName.toLowerCase() === 'ul') {
-                            let children = element.children;
-                            let filtered_children = Array.from(children).filter(child => child.getAttribute('role') === 'option');
-                            console.log("Listbox or ul found: ", filtered_children);
-                            let attributes_to_include = ['md', 'role', 'aria-label', 'value'];
-                            attributes_to_values["additional_info"] = [];
-
-                            for (const child of children) {
-                                let children_attributes_to_values = {};
-
-                                for (let attr of child.attributes) {
-                                    if (attributes_to_include.includes(attr.name)) {
-                                        children_attributes_to_values[attr.name] = attr.value;
-                                    }
-                                }
-
-                                attributes_to_values["additional_info"].push(children_attributes_to_values);
-                            }
-                        }
-
-                        const minimalKeys = ['tag', 'md'];
-                        const hasMoreThanMinimalKeys = Object.keys(attributes_to_values).length > minimalKeys.length;
-
-                        if (!hasMoreThanMinimalKeys) {
-                            for (const backupAttribute of input_params.backup_attributes) {
-                                let value = element.getAttribute(backupAttribute);
-                                if (value) {
-                                    attributes_to_values[backupAttribute] = value;
-                                }
-                            }
-
-                            if (Object.keys(attributes_to_values).length <= minimalKeys.length) {
-                                if (element.tagName.toLowerCase() === 'button') {
-                                    attributes_to_values["md"] = element.getAttribute('md');
-                                    attributes_to_values["role"] = "button";
-                                    attributes_to_values["additional_info"] = [];
-                                    let children = element.children;
-                                    let attributes_to_exclude = ['width', 'height', 'path', 'class', 'viewBox', 'md'];
-
-                                    if (element.innerText.trim() === '') {
-                                        for (const child of children) {
-                                            let children_attributes_to_values = {};
-
-                                            for (let attr of child.attributes) {
-                                                if (!attributes_to_exclude.includes(attr.name)) {
-                                                    children_attributes_to_values[attr.name] = attr.value;
-                                                }
-                                            }
-
-                                            attributes_to_values["additional_info"].push(children_attributes_to_values);
-                                        }
-                                        console.log("Button with no text and no attributes: ", attributes_to_values);
-                                        return attributes_to_values;
-                                    }
-                                }
-
-                                return null;
-                            }
-                        }
-
-                        return attributes_to_values;
-                    }
-
-                """
-
-                # Fetch attributes and possibly 'innerText' from the DOM element by 'md'
-                element_attributes = await page.evaluate(
-                    js_code,
-                    {
-                        "md": md,
-                        "attributes": attributes,
-                        "backup_attributes": backup_attributes,
-                        "should_fetch_inner_text": should_fetch_inner_text,
-                        "tags_to_ignore": tags_to_ignore,
-                        "ids_to_ignore": ids_to_ignore,
-                    },
-                )
+                element_attributes = elements_attributes.get((md, "children" not in node))
 
                 if "keyshortcuts" in node:
                     del node["keyshortcuts"]  # remove keyshortcuts since it is not needed
@@ -555,69 +274,6 @@ async def __fetch_dom_info(page: Page, accessibility_tree: dict[str, Any], only_
                     # if node.get('role') == "textbox":
                     #    del node['role']
 
-                    if node.get("role") == "textbox":
-                        # get the id attribute of this field from the DOM
-                        if "id" in element_attributes and element_attributes["id"]:
-                            # find if there is an element in the DOM that has this id in aria-labelledby.
-                            js_code = """
-                                (inputParams) => {
-                                    const findElementByAriaLabelledBy = (parent, ariaLabelledByValue) => {
-                                        // Search in the current DOM context (can be document or shadow root)
-                                        let referencedElement = parent.querySelector(`[aria-labelledby="${ariaLabelledByValue}"]`);
-
-                                        if (referencedElement) {
-                                            return referencedElement; // Found in the current context
-                                        }
-
-                                        // Search inside shadow DOMs and iframes
-                                        const elements = parent.querySelectorAll('*');
-                                        for (const element of elements) {
-                                            // Search inside shadow DOM
-                                            if (element.shadowRoot) {
-                                                referencedElement = findElementByAriaLabelledBy(element.shadowRoot, ariaLabelledByValue);
-                                                if (referencedElement) {
-                                                    return referencedElement; // Found inside shadow DOM
-                                                }
-                                            }
-                                            // Search inside iframes
-                                            if (element.tagName.toLowerCase() === 'iframe') {
-                                                let iframeDocument;
-                                                try {
-                                                    // Access the iframe's document if it's same-origin
-                                                    iframeDocument = element.contentDocument || element.contentWindow.document;
-                                                } catch (e) {
-                                                    // Cannot access cross-origin iframe; skip to the next element
-                                                    continue;
-                                                }
-                                                if (iframeDocument) {
-                                                    referencedElement = findElementByAriaLabelledBy(iframeDocument, ariaLabelledByValue);
-                                                    if (referencedElement) {
-                                                        return referencedElement; // Found inside iframe
-                                                    }
-                                                }
-                                            }
-                                        }
-
-                                        return null; // Element not found in this context
-                                    };
-
-                                    // Start the search from the main document
-                                    const referencedElement = findElementByAriaLabelledBy(document, inputParams.aria_labelled_by_query_value);
-
-                                    if (referencedElement) {
-                                        const md = referencedElement.getAttribute('md');
-                                        if (md) {
-                                            return { "md": md, "tag": referencedElement.tagName.toLowerCase() };
-                                        }
-                                    }
-
-                                    return null;
-                                }
-
-                            """
-                        # textbox just means a text input and that is expressed well enough with the rest of the attributes returned
-                        # del node['role']
-
                 # remove attributes that are not needed once processing of a node is complete
                 for attribute_to_delete in attributes_to_delete:
                     if attribute_to_delete in node:
@@ -627,7 +283,7 @@ async def __fetch_dom_info(page: Page, accessibility_tree: dict[str, Any], only_
                 node["marked_for_deletion_by_mm"] = True
 
     # Process each node in the tree starting from the root
-    await process_node(accessibility_tree)
+    process_node(accessibility_tree)
 
     pruned_tree = __prune_tree(accessibility_tree, only_input_fields)
 
@@ -641,50 +297,7 @@ async def __cleanup_dom(page: Page) -> None:
     from 'orig-aria-keyshortcuts'.
     """
     logger.debug("Cleaning up the DOM's previous injections")
-    await page.evaluate(
-        """() => {
-            // Recursive function to process elements in DOM, shadow DOM, and iframes
-            const processElements = (parent) => {
-                // Select all elements with the 'md' attribute in the current parent (regular DOM or shadow DOM)
-                const allElements = parent.querySelectorAll('*[md]');
-
-                // Iterate through each element and process its attributes
-                allElements.forEach(element => {
-                    element.removeAttribute('aria-keyshortcuts');
-                    const origAriaLabel = element.getAttribute('orig-aria-keyshortcuts');
-                    if (origAriaLabel) {
-                        element.setAttribute('aria-keyshortcuts', origAriaLabel);
-                        element.removeAttribute('orig-aria-keyshortcuts');
-                    }
-
-                    // Check if the element has a shadow DOM and recursively process its shadow root
-                    if (element.shadowRoot) {
-                        processElements(element.shadowRoot); // Process elements inside shadow DOM
-                    }
-
-                    // Check if the element is an iframe and process its content
-                    if (element.tagName.toLowerCase() === 'iframe') {
-                        let iframeDocument;
-                        try {
-                            // Access the iframe's document if it's same-origin
-                            iframeDocument = element.contentDocument || element.contentWindow.document;
-                        } catch (e) {
-                            // Cannot access cross-origin iframe; skip to the next element
-                            return;
-                        }
-                        if (iframeDocument) {
-                            processElements(iframeDocument); // Process elements inside the iframe
-                        }
-                    }
-                });
-            };
-
-            // Start the process with the regular DOM (document)
-            processElements(document);
-        };
-
-    """
-    )
+    await call_page_helper(page, "cleanupDom")
     logger.debug("DOM cleanup complete")
 
 
@@ -921,6 +534,13 @@ async def get_element_attributes(page: Page, md: str, attributes: list[str]) ->
 
             // Helper function to recursively search for the element with the md in regular DOM, shadow DOMs, and iframes
             const findElementByMd = (parent, md) => {
+                // Use the md -> element index built by __inject_attributes when it still points to the element
+                const ref = parent === document && window.__hercules_md_elements ? window.__hercules_md_elements.get(`${md}`) : null;
+                const indexedElement = ref ? ref.deref() : null;
+                if (indexedElement && indexedElement.isConnected && indexedElement.getAttribute('md') === `${md}`) {
+                    return indexedElement;
+                }
+
                 // First, try to find the element in the current DOM context (either document, shadowRoot, or iframe document)
                 let element = parent.querySelector(`[md="${md}"]`);
                 
@@ -1011,227 +631,26 @@ async def do_get_accessibility_info(page: Page, only_input_fields: bool = False)
     Returns:
         dict[str, Any] or None: The enhanced accessibility tree as a dictionary, or None if an error occurred.
     """
-    await __inject_attributes(page)
+    incremental = get_global_conf().should_use_incremental_dom_snapshot()
+    await __inject_attributes(page, incremental)
     # accessibility_tree: dict[str, Any] = await page.accessibility.snapshot(interesting_only=True)  # type: ignore
-    js_code = """
-            () => {
-                function generateAccessibilityTree(rootElement, level) {
-                    const requiredAriaAttributesByRole = {
-                        'alert': [],
-                        'button': [],
-                        'checkbox': ['aria-checked'],
-                        'combobox': ['aria-expanded', 'aria-controls'],
-                        'dialog': [],
-                        'gridcell': [],
-                        'link': [],
-                        'listbox': ['aria-multiselectable'],
-                        'menuitemcheckbox': ['aria-checked'],
-                        'menuitemradio': ['aria-checked'],
-                        'option': ['aria-selected'],
-                        'progressbar': ['aria-valuenow'],
-                        'radio': ['aria-checked'],
-                        'scrollbar': ['aria-controls', 'aria-valuenow', 'aria-valuemin', 'aria-valuemax', 'aria-orientation'],
-                        'searchbox': [],
-                        'slider': ['aria-valuenow', 'aria-valuemin', 'aria-valuemax', 'aria-orientation'],
-                        'spinbutton': ['aria-valuenow', 'aria-valuemin', 'aria-valuemax'],
-                        'tab': ['aria-selected'],
-                        'tabpanel': [],
-                        'textbox': ['aria-multiline'],
-                        'treeitem': ['aria-expanded']
-                    };
-
-                    function isElementHidden(element) {
-                        const style = window.getComputedStyle(element);
-                        return (
-                            style.display === 'none' ||
-                            style.visibility === 'hidden' ||
-                            element.getAttribute('aria-hidden') === 'true'
-                        );
-                    }
-
-                    function getAccessibleName(element) {
-                        try {
-                            // Chromium-based accessibility API
-                            if (window.getComputedAccessibleNode) {
-                                const accessibilityInfo = window.getComputedAccessibleNode(element);
-                                console.log('accessibilityInfo:', accessibilityInfo);
-                                if (accessibilityInfo?.name) {
-                                    return cleanName(accessibilityInfo.name);
-                                }
-                            }
-                        } catch (error) {
-                            console.warn("Chromium accessibility API failed, falling back to manual method:", error);
-                        }
-
-                        // Existing manual accessibility extraction
-                        let name = element.getAttribute('aria-label');
-                        if (name) return cleanName(name);
-
-                        const labelledby = element.getAttribute('aria-labelledby');
-                        if (labelledby) {
-                            const labelElement = document.getElementById(labelledby);
-                            if (labelElement) return cleanName(labelElement.innerText);
-                        }
-
-                        if (element.alt) return cleanName(element.alt);
-                        if (element.title) return cleanName(element.title);
-                        if (element.placeholder) return cleanName(element.placeholder);
-
-                        if (
-                            element.value &&
-                            (element.tagName.toLowerCase() === 'input' || element.tagName.toLowerCase() === 'textarea')
-                        ) {
-                            return cleanName(element.value);
-                        }
-
-                        if (element.innerText) return cleanName(element.innerText);
-                        return '';
-                    }
-
-                    function cleanName(name) {
-                        if (typeof name !== 'string') {
-                            console.warn('Expected a string, but received:', name);
-                            return '';
-                        }
-                        const firstLine = name.split('\\n')[0];
-                        return firstLine.trim();
-                    }
-
-                    function getRole(element) {
-                        const role = element.getAttribute('role');
-                        if (role) return role;
-
-                        const tagName = element.tagName.toLowerCase();
-                        if (tagName === 'button') return 'button';
-                        if (tagName === 'a' && element.hasAttribute('href')) return 'link';
-                        if (tagName === 'input') {
-                            const type = element.type.toLowerCase();
-                            switch (type) {
-                                case 'button':
-                                case 'submit':
-                                case 'reset':
-                                case 'image':
-                                    return 'button';
-                                case 'checkbox':
-                                    return 'checkbox';
-                                case 'radio':
-                                    return 'radio';
-                                case 'range':
-                                    return 'slider';
-                                case 'number':
-                                    return 'spinbutton';
-                                case 'search':
-                                    return 'searchbox';
-                                case 'file':
-                                    return 'button';
-                                case 'color':
-                                case 'date':
-                                case 'datetime-local':
-                                case 'month':
-                                case 'time':
-                                case 'week':
-                                    return 'combobox';
-                                case 'email':
-                                case 'tel':
-                                case 'url':
-                                case 'password':
-                                case 'text':
-                                    return 'textbox';
-                                case 'hidden':
-                                    return '';
-                                default:
-                                    return 'textbox';
-                            }
-                        }
-
-                        if (tagName === 'select') return 'listbox';
-                        if (tagName === 'textarea') return 'textbox';
-                        return '';
-                    }
-
-                    function getRequiredAriaAttributes(element) {
-                        const role = getRole(element);
-                        return requiredAriaAttributesByRole[role] || [];
-                    }
-
-                    function processElement(element, level) {
-                        if (isElementHidden(element)) return null;
-
-                        const node = {};
-
-                        const md = element.getAttribute('md');
-                        if (md) node.md = md;
-
-                        node.tag = element.tagName.toLowerCase();
-
-                        const role = getRole(element);
-                        if (role) node.role = role;
-
-                        const name = getAccessibleName(element);
-                        if (name) node.name = name;
-
-                        const title = element.getAttribute('title');
-                        if (title) node.title = cleanName(title);
-
-                        if (level) node.level = level;
-
-                        node.children = [];
-
-                        if (element.shadowRoot) {
-                            for (const child of element.shadowRoot.children) {
-                                const childNode = processElement(child, level + 1);
-                                if (childNode) node.children.push(childNode);
-                            }
-                        }
-
-                        for (const child of element.children) {
-                            if (child.tagName.toLowerCase() === 'iframe') {
-                                try {
-                                    const iframeDoc = child.contentDocument || child.contentWindow.document;
-                                    if (iframeDoc && iframeDoc.body) {
-                                        const iframeTree = generateAccessibilityTree(iframeDoc.body, level + 1);
-                                        if (iframeTree) {
-                                            const iframeNode = {
-                                                tag: 'iframe',
-                                                role: 'document',
-                                                level: level + 1,
-                                                children: [iframeTree]
-                                            };
-                                            const iframeMd = child.getAttribute('md');
-                                            if (iframeMd) iframeNode.md = iframeMd;
-                                            node.children.push(iframeNode);
-                                        }
-                                    }
-                                } catch (e) {
-                                    // Handle cross-origin policy restrictions
-                                }
-                            } else {
-                                const childNode = processElement(child, level + 1);
-                                if (childNode) node.children.push(childNode);
-                            }
-                        }
-
-                        if (!node.md && !node.name && node.children.length === 0 && !node.role) {
-                            return null;
-                        }
-
-                        const requiredAriaAttrs = getRequiredAriaAttributes(element);
-                        for (const attr of requiredAriaAttrs) {
-                            if (!element.hasAttribute(attr)) {
-                                // Handle missing required ARIA attribute warning
-                            }
-                        }
-
-                        return node;
-                    }
-
-                    return processElement(rootElement || document.body, level || 1);
-                }
-
-                return generateAccessibilityTree();
-            }
-    """
-    accessibility_tree = await page.evaluate(js_code)
+    use_cdp = get_global_conf().get_accessibility_backend() == "cdp" and is_chromium_page(page)
+    if use_cdp:
+        try:
+            accessibility_tree = await get_cdp_accessibility_tree(page)
+            logger.debug("Accessibility snapshot built through CDP")
+        except Exception as e:
+            traceback.print_exc()
+            logger.error(f"Error while building the accessibility snapshot through CDP, falling back to the page script: {e}")
+            use_cdp = False
+
+    if not use_cdp:
+        snapshot = await call_page_helper(page, "accessibilityTree", incremental)
+        accessibility_tree = snapshot["tree"]
+        if snapshot["refreshed"] is None:
+            logger.debug("Accessibility snapshot built from the full DOM")
+        else:
+            logger.debug(f"Accessibility snapshot updated incrementally, {snapshot['refreshed']} subtrees recomputed")
 
     # logger.info("Consolidated Snapshot:", consolidated_snapshot)
     # accessibility_tree2: dict[str, Any] = await page.accessibility.snapshot(interesting_only=True)  # type: ignore
@@ -1,17 +1,13 @@
 import json
 import re
+from typing import Any, Union
 
-from playwright.async_api import Route
+from playwright.async_api import Frame, Page
 from testzeus_hercules.utils.logger import logger
-
-
-async def block_ads(route: Route) -> None:
-    # List of ad-related keywords or domains
-    ad_keywords = ["ads", "doubleclick.net", "googlesyndication", "adservice"]
-    if any(keyword in route.request.url for keyword in ad_keywords):
-        await route.abort()  # Block the ad request
-    else:
-        await route.continue_()  # Continue with other requests
+from testzeus_hercules.utils.page_helpers import (
+    HELPERS_MISSING,
+    evaluate_with_page_helpers,
+)
 
 
 def escape_js_message(message: str) -> str:
@@ -44,44 +40,16 @@ def beautify_plan_message(message: str) -> str:
     return plan_with_newlines
 
 
-FIND_ELEMENT_IN_SHADOW_DOM = """
-const findElementInShadowDOMAndIframes = (parent, selector) => {
-    // Try to find the element in the current context
-    let element = parent.querySelector(selector);
-    if (element) {
-        return element; // Element found in the current context
-    }
-
-    // Search inside shadow DOMs and iframes
-    const elements = parent.querySelectorAll('*');
-    for (const el of elements) {
-        // Search inside shadow DOMs
-        if (el.shadowRoot) {
-            element = findElementInShadowDOMAndIframes(el.shadowRoot, selector);
-            if (element) {
-                return element; // Element found in shadow DOM
-            }
-        }
-        // Search inside iframes
-        if (el.tagName.toLowerCase() === 'iframe') {
-            let iframeDocument;
-            try {
-                // Access the iframe's document if it's same-origin
-                iframeDocument = el.contentDocument || el.contentWindow.document;
-            } catch (e) {
-                // Cannot access cross-origin iframe; skip to the next element
-                continue;
-            }
-            if (iframeDocument) {
-                element = findElementInShadowDOMAndIframes(iframeDocument, selector);
-                if (element) {
-                    return element; // Element found inside iframe
-                }
-            }
-        }
-    }
-    return null; // Element not found
-};
+# The finder is part of the page helper library registered on every browser context (see page_helpers.FIND_ELEMENT_JS),
+# action code only binds it instead of shipping its source on every call. Documents without the library throw
+# HELPERS_MISSING, which call_with_element_finder answers by installing it and evaluating again.
+FIND_ELEMENT_IN_SHADOW_DOM = f"""
+const findElementInShadowDOMAndIframes = (parent, selector) => {{
+    if (!window.__hercules) {{
+        throw new Error('{HELPERS_MISSING}');
+    }}
+    return window.__hercules.findElementInShadowDOMAndIframes(parent, selector);
+}};
 """
 
 TEMPLATES = {"FIND_ELEMENT_IN_SHADOW_DOM": FIND_ELEMENT_IN_SHADOW_DOM}
@@ -102,3 +70,20 @@ def get_js_with_element_finder(action_js_code: str) -> str:
         return action_js_code.replace(pattern, TEMPLATES["FIND_ELEMENT_IN_SHADOW_DOM"])
     else:
         return action_js_code
+
+
+async def call_with_element_finder(target: Union[Page, Frame], action_js_code: str, arg: Any = None, handle: bool = False) -> Any:
+    """
+    Evaluate action code that uses findElementInShadowDOMAndIframes, installing the page helper library first in
+    documents that do not have it.
+
+    Args:
+        target: The page or frame to evaluate the action code in
+        action_js_code: JavaScript code that uses findElementInShadowDOMAndIframes
+        arg: The single argument passed to the action code
+        handle: Return a JSHandle (evaluate_handle) instead of the value
+
+    Returns:
+        The value, or handle, returned by the action code
+    """
+    return await evaluate_with_page_helpers(target, get_js_with_element_finder(action_js_code), arg, handle=handle)
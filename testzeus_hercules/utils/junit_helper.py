@@ -8,6 +8,7 @@ from junitparser import Failure, JUnitXml, Property, TestCase, TestSuite
 from junitparser.junitparser import Properties, SystemOut
 from testzeus_hercules.config import get_global_conf
 from testzeus_hercules.telemetry import EventData, EventType, add_event
+from testzeus_hercules.utils.shard_helper import merge_junit_files
 
 
 def flatten_dict(d: Dict[str, Any], parent_key: str = "", sep: str = ".") -> Dict[str, Any]:
@@ -72,6 +73,7 @@ class JUnitXMLGenerator:
         json_data: Dict[str, Any],
         execution_time: float,
         cost_metric: Dict[str, Any],
+        llm_cache_metrics: Dict[str, Any] = None,
     ) -> None:
         """
         Add a test case to the test suite.
@@ -82,6 +84,7 @@ class JUnitXMLGenerator:
             json_data (Dict[str, Any]): The JSON data containing test details.
             execution_time (float): The execution time of the test case.
             cost_metric (Dict[str, Any]): The cost metrics associated with the test case.
+            llm_cache_metrics (Dict[str, Any]): Hits, misses and hit rate of the LLM cache during the test case.
         """
         test_case = TestCase(name=scenario, classname=feature, time=execution_time)
 
@@ -152,6 +155,9 @@ class JUnitXMLGenerator:
                     if k == "total_tokens":
                         self.total_token_used += int(v)
 
+        for k, v in (llm_cache_metrics or {}).items():
+            test_props.add_property(Property(name=f"llm_cache.{k}", value=str(v)))
+
         self.total_time += float(execution_time)
         self.suite.add_testcase(test_case)
 
@@ -185,52 +191,17 @@ class JUnitXMLGenerator:
         os.unlink(tmp_path)
 
     @staticmethod
-    async def merge_junit_xml(files: List[str], output_file: str) -> None:
+    async def merge_junit_xml(files: List[str], output_file: str, keep_input_files: bool = False) -> None:
         """
         Merge multiple JUnit XML files into one asynchronously.
 
         Args:
             files (List[str]): List of file paths to JUnit XML files.
             output_file (str): Path to the output merged JUnit XML file.
+            keep_input_files (bool): Keep the input files even when not in debug mode.
         """
-        merged_xml = JUnitXml()
-        suite_dict: Dict[str, TestSuite] = {}
-
-        for file in files:
-            xml = JUnitXml.fromfile(file)
-            for suite in xml:
-                suite_name = suite.name
-                if suite_name in suite_dict:
-                    existing_suite = suite_dict[suite_name]
-                    for testcase in suite:
-                        existing_suite.add_testcase(testcase)
-                    existing_suite.time = float(existing_suite.time or 0.0) + float(suite.time or 0.0)
-
-                    for prop in suite.properties():
-                        is_existing_prop = False
-                        for existing_prop in existing_suite.properties():
-                            if existing_prop.name.strip() == prop.name.strip():
-                                try:
-                                    existing_value = float(existing_prop.value)
-                                    new_value = float(prop.value)
-                                    existing_prop.value = existing_value + new_value
-                                except ValueError:
-                                    pass
-                                is_existing_prop = True
-
-                        existing_suite.update_statistics()
-
-                        if not is_existing_prop:
-                            existing_suite.add_property(name=prop.name, value=prop.value)
-                else:
-                    suite_dict[suite_name] = suite
-
-            # delete the files of individual test cases
-            if os.path.exists(file) and get_global_conf().get_mode() not in ["debug"]:
-                os.remove(file)
-
-        for suite in suite_dict.values():
-            merged_xml.add_testsuite(suite)
+        delete_input_files = not keep_input_files and get_global_conf().get_mode() not in ["debug"]
+        merged_xml = merge_junit_files(files)
 
         # Write merged XML to temp file first
         with tempfile.NamedTemporaryFile(mode="w", delete=False) as tmp:
@@ -246,7 +217,7 @@ class JUnitXMLGenerator:
         os.unlink(tmp_path)
 
         # Delete individual test files if not in debug mode
-        if get_global_conf().get_mode() not in ["debug"]:
+        if delete_input_files:
             for file in files:
                 if os.path.exists(file):
                     os.remove(file)
@@ -266,6 +237,7 @@ async def build_junit_xml(
     logs_path: str = None,
     network_logs_path: str = None,
     planner_thoughts_path: str = None,
+    llm_cache_metrics: Dict[str, Any] = None,
 ) -> str:
     """
     Build a JUnit XML file from test data.
@@ -276,6 +248,7 @@ async def build_junit_xml(
         cost_metric (Dict[str, Any]): The cost metrics associated with the test case.
         feature (str): The feature name.
         scenario (str): The scenario name.
+        llm_cache_metrics (Dict[str, Any]): Hits, misses and hit rate of the LLM cache during the scenario.
 
     Returns:
         str: The path to the generated JUnit XML file.
@@ -296,7 +269,7 @@ async def build_junit_xml(
         logs_path,
         planner_thoughts_path,
     )
-    generator.add_test_case(scenario, feature, json_data, execution_time, cost_metric)
+    generator.add_test_case(scenario, feature, json_data, execution_time, cost_metric, llm_cache_metrics)
     await generator.write_xml(file_path)
     return file_path
 
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import traceback
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.utils.logger import logger
+
+# Unix timestamps in seconds, milliseconds, microseconds or nanoseconds, of the years around now
+_EPOCH_CANDIDATE = re.compile(r"\b1\d{9}(?:\d{3}){0,3}\b")
+_EPOCH_PAST = 5 * 365 * 86400
+_EPOCH_FUTURE = 365 * 86400
+
+
+def _epoch_timestamp(match: re.Match) -> str:
+    # order numbers, phone numbers and record ids have the same shape: only values that are a date near now are blanked
+    digits = match.group()
+    seconds = int(digits) / 10 ** (len(digits) - 10)
+    now = time.time()
+    return "<timestamp>" if now - _EPOCH_PAST <= seconds <= now + _EPOCH_FUTURE else digits
+
+
+# Parts of tool outputs and page text that change between runs without the page state changing
+_VOLATILE_PATTERNS: Tuple[Tuple[re.Pattern, Union[str, Callable[[re.Match], str]]], ...] = (
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE), "<uuid>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"), "<datetime>"),
+    (_EPOCH_CANDIDATE, _epoch_timestamp),
+    (re.compile(r"\s+"), " "),
+)
+# Request parameters describing the model's tools rather than the conversation
+_TOOL_PARAMS = ("tools", "functions", "tool_choice", "function_call")
+# Rows of the cache touched between two eviction passes
+_EVICTION_INTERVAL = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    model TEXT,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at);
+"""
+
+
+def normalize_observation(text: str) -> str:
+    """Blank out the ids, timestamps and whitespace of a tool output or DOM snapshot that vary from run to run."""
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def _digest(value: Any) -> str:
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def build_cache_key(request: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Content address of an LLM request: the model, the prompt, the tool schema and the normalized tool outputs and
+    DOM snapshots the conversation carries, plus the remaining sampling parameters.
+
+    Args:
+        request (Dict[str, Any]): The request parameters, as serialized by autogen for its cache key.
+
+    Returns:
+        Tuple[str, str]: The key and the model it was built for.
+    """
+    request = dict(request)
+    model = str(request.pop("model", ""))
+    messages: List[Dict[str, Any]] = request.pop("messages", []) or []
+    tools = {name: request.pop(name) for name in _TOOL_PARAMS if name in request}
+
+    prompt: List[Any] = []
+    observations: List[str] = []
+    for message in messages:
+        content = message.get("content")
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        if message.get("role") in ("tool", "function"):
+            observations.append(normalize_observation(content))
+            prompt.append({"role": message.get("role"), "name": message.get("name")})
+        else:
+            prompt.append(
+                {
+                    "role": message.get("role"),
+                    "name": message.get("name"),
+                    "content": re.sub(r"\s+", " ", content).strip(),
+                    "tool_calls": [{"function": call.get("function")} for call in message.get("tool_calls") or [] if isinstance(call, dict)],
+                }
+            )
+
+    parts = {
+        "model": model,
+        "prompt": _digest(prompt),
+        "tools": _digest(tools),
+        "observations": _digest(observations),
+        "params": _digest(request),
+    }
+    return _digest(parts), model
+
+
+class LLMResponseCache:
+    """
+    SQLite backed cache of LLM responses, usable wherever autogen accepts a cache (initiate_chat, nested chats).
+
+    Entries are content addressed with build_cache_key instead of autogen's raw request string, so a rerun hits the
+    cache as long as the model, prompt, tools and the normalized page state are the same. Entries are scoped to a
+    namespace (one per project), expire after max_age seconds, and the least recently used ones are evicted once the
+    namespace holds more than max_bytes. Hits and misses are counted for the run metrics.
+    """
+
+    def __init__(self, path: str, namespace: str, max_age: float = 0, max_bytes: int = 0) -> None:
+        """
+        Args:
+            path (str): Path of the SQLite database, shared by all namespaces.
+            namespace (str): Namespace of the entries, e.g. the project name.
+            max_age (float): Seconds after which an entry expires, 0 to keep entries forever.
+            max_bytes (int): Maximum size of the namespace's entries, 0 for no limit.
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._evict(connection)
+        return self._connection
+
+    def _key(self, key: str) -> Tuple[str, str]:
+        try:
+            return build_cache_key(json.loads(key))
+        except (TypeError, ValueError):
+            return _digest(key), ""
+
+    def get(self, key: str, default: Optional[Any] = None) -> Optional[Any]:
+        """Return the cached response of the request serialized in key, or default."""
+        cache_key, _ = self._key(key)
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute("SELECT value, created_at FROM llm_cache WHERE namespace = ? AND key = ?", (self.namespace, cache_key)).fetchone()
+                if row is not None and self.max_age and time.time() - row[1] > self.max_age:
+                    connection.execute("DELETE FROM llm_cache WHERE namespace = ? AND key = ?", (self.namespace, cache_key))
+                    self.evicted += 1
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return default
+                connection.execute(
+                    "UPDATE llm_cache SET accessed_at = ?, hits = hits + 1 WHERE namespace = ? AND key = ?",
+                    (time.time(), self.namespace, cache_key),
+                )
+            self.hits += 1
+            return pickle.loads(row[0])
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to read LLM cache {self.path}: {e}")
+            return default
+
+    def set(self, key: str, value: Any) -> None:
+        """Store the response of the request serialized in key."""
+        cache_key, model = self._key(key)
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            now = time.time()
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO llm_cache (namespace, key, model, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self.namespace, cache_key, model, blob, len(blob), now, now),
+                )
+                self.writes += 1
+                self._writes_since_eviction += 1
+                if self._writes_since_eviction >= _EVICTION_INTERVAL:
+                    self._evict(connection)
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to write LLM cache {self.path}: {e}")
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Drop the expired entries of the namespace, then the least recently used ones above max_bytes."""
+        self._writes_since_eviction = 0
+        if self.max_age:
+            cursor = connection.execute("DELETE FROM llm_cache WHERE namespace = ? AND created_at < ?", (self.namespace, time.time() - self.max_age))
+            self.evicted += max(cursor.rowcount, 0)
+        if self.max_bytes:
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+            if total > self.max_bytes:
+                rows = connection.execute("SELECT key, size FROM llm_cache WHERE namespace = ? ORDER BY accessed_at", (self.namespace,)).fetchall()
+                stale = []
+                for cache_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((self.namespace, cache_key))
+                    total -= size
+                connection.executemany("DELETE FROM llm_cache WHERE namespace = ? AND key = ?", stale)
+                self.evicted += len(stale)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hits, misses and hit rate since the last reset_metrics()."""
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "writes": self.writes,
+            "evicted": self.evicted,
+        }
+
+    def reset_metrics(self) -> None:
+        self.hits = self.misses = self.writes = self.evicted = 0
+
+    def close(self) -> None:
+        # autogen closes the cache when a chat ends, nested chats keep using it: the connection is reopened on demand
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __enter__(self) -> "LLMResponseCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def create_llm_cache() -> Optional[LLMResponseCache]:
+    """Create the LLM cache configured for the project, None when LLM_CACHE is disabled."""
+    config = get_global_conf()
+    if not config.should_use_llm_cache():
+        return None
+    return LLMResponseCache(
+        config.get_llm_cache_path(),
+        config.get_llm_cache_namespace(),
+        max_age=config.get_llm_cache_max_age_days() * 86400,
+        max_bytes=int(config.get_llm_cache_max_mb() * 1024 * 1024),
+    )
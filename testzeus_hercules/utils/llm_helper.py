@@ -1,5 +1,6 @@
 import copy
 import json
+import os
 import tempfile
 from typing import Any, Dict, List, Optional, Union
 
@@ -23,6 +24,9 @@ from testzeus_hercules.utils.response_parser import parse_response
 DEFAULT_LMM_SYS_MSG = """You are a helpful AI assistant."""
 DEFAULT_MODEL = "gpt-4o"
 
+# converted autogen config lists, keyed by the JSON of the raw model config
+_autogen_config_cache: Dict[str, list[dict[str, Any]]] = {}
+
 
 class MultimodalConversableAgent(ConversableAgent):
     DEFAULT_CONFIG = {
@@ -144,18 +148,27 @@ def convert_model_config_to_autogen_format(
 ) -> list[dict[str, Any]]:
     """Convert model configuration to Autogen format.
 
+    The conversion is done once per distinct model configuration and process,
+    callers get their own copy of the cached result.
+
     Args:
         model_config: Raw model configuration dictionary
 
     Returns:
         List of configuration dictionaries in Autogen format
     """
-    env_var: list[dict[str, str]] = [model_config]
-    with tempfile.NamedTemporaryFile(delete=False, mode="w") as temp:
-        json.dump(env_var, temp)
-        temp_file_path = temp.name
+    cache_key = json.dumps(model_config, sort_keys=True, default=str)
+    if cache_key not in _autogen_config_cache:
+        env_var: list[dict[str, str]] = [model_config]
+        with tempfile.NamedTemporaryFile(delete=False, mode="w") as temp:
+            json.dump(env_var, temp)
+            temp_file_path = temp.name
+        try:
+            _autogen_config_cache[cache_key] = autogen.config_list_from_json(env_or_file=temp_file_path)
+        finally:
+            os.unlink(temp_file_path)
 
-    return autogen.config_list_from_json(env_or_file=temp_file_path)
+    return copy.deepcopy(_autogen_config_cache[cache_key])
 
 
 def is_agent_planner_termination_message(x: dict[str, str], final_response_callback: callable = None) -> bool:
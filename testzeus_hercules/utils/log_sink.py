@@ -0,0 +1,154 @@
+import asyncio
+import gzip
+import json
+import os
+import time
+import traceback
+from typing import IO, Any, Dict, List, Optional
+
+from testzeus_hercules.utils.logger import logger
+
+LOG_SINK_BATCH_SIZE = 256
+LOG_SINK_COMPRESSIONS = ("none", "gzip", "zstd")
+_COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _open_zstd(path: str) -> IO[bytes]:
+    import zstandard
+
+    return zstandard.open(path, "ab")
+
+
+class AsyncLogSink:
+    """
+    Buffered JSON lines writer for high volume capture logs (network requests, console messages).
+
+    write() only enqueues the entry on a bounded queue, a single writer task drains it in batches and serializes and
+    appends each batch in one worker thread hop, so lines keep their order and the file stays open between batches.
+    When the queue is full new entries are dropped and counted instead of slowing the browser callbacks down.
+    """
+
+    def __init__(self, path: str, compression: str = "none", max_bytes: int = 0, max_queue_size: int = 10000) -> None:
+        """
+        Args:
+            path (str): Path of the log file, the compression suffix (.gz, .zst) is appended when compressing.
+            compression (str): 'none', 'gzip' or 'zstd'.
+            max_bytes (int): Rotate the file once this many uncompressed bytes were written to it, 0 disables rotation.
+            max_queue_size (int): Maximum number of entries waiting to be written.
+        """
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                logger.warning("zstandard is not installed, capture logs are compressed with gzip instead")
+                compression = "gzip"
+        self.compression = compression if compression in LOG_SINK_COMPRESSIONS else "none"
+        self.path = path + _COMPRESSION_SUFFIXES[self.compression]
+        self._max_bytes = max_bytes
+        self._max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._file: Optional[IO[bytes]] = None
+        self._file_bytes = 0
+        self._rotations = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_time = 0.0
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        task = self._writer_task
+        if self._queue is None or task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+            self._writer_task = asyncio.ensure_future(self._run_writer(self._queue))
+        return self._queue
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Enqueue a log entry, never blocks. Must be called from the event loop thread."""
+        queue = self._ensure_writer()
+        try:
+            queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            if self.dropped == 0:
+                logger.warning(f"Capture log queue of {self.path} is full, dropping entries")
+            self.dropped += 1
+
+    async def _run_writer(self, queue: asyncio.Queue) -> None:
+        while True:
+            entry = await queue.get()
+            batch: List[Dict[str, Any]] = []
+            closing = entry is None
+            if not closing:
+                batch.append(entry)
+            while not closing and len(batch) < LOG_SINK_BATCH_SIZE and not queue.empty():
+                entry = queue.get_nowait()
+                if entry is None:
+                    closing = True
+                else:
+                    batch.append(entry)
+
+            if batch:
+                start = time.perf_counter()
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                    self.written += len(batch)
+                    self.batches += 1
+                except Exception as e:
+
+                    traceback.print_exc()
+                    logger.error(f"Failed to write capture log {self.path}: {e}")
+                self.write_time += time.perf_counter() - start
+
+            if closing:
+                await asyncio.to_thread(self._close_file)
+                return
+
+    def _open_file(self) -> IO[bytes]:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file_bytes = os.path.getsize(self.path) if self.compression == "none" and os.path.exists(self.path) else 0
+        if self.compression == "gzip":
+            return gzip.open(self.path, "ab")
+        if self.compression == "zstd":
+            return _open_zstd(self.path)
+        return open(self.path, "ab")
+
+    def _close_file(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self._close_file()
+        self._rotations += 1
+        base, suffix = self.path, _COMPRESSION_SUFFIXES[self.compression]
+        if suffix:
+            base = base[: -len(suffix)]
+        root, ext = os.path.splitext(base)
+        rotated = f"{root}.{self._rotations}{ext}{suffix}"
+        while os.path.exists(rotated):
+            self._rotations += 1
+            rotated = f"{root}.{self._rotations}{ext}{suffix}"
+        os.replace(self.path, rotated)
+        logger.debug(f"Rotated capture log {self.path} to {rotated}")
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in batch).encode("utf-8")
+        if self._file is None:
+            self._file = self._open_file()
+        if self._max_bytes and self._file_bytes and self._file_bytes + len(data) > self._max_bytes:
+            self._rotate()
+            self._file = self._open_file()
+        self._file.write(data)
+        self._file.flush()
+        self._file_bytes += len(data)
+
+    async def close(self) -> None:
+        """Write every pending entry, close the file and log the capture overhead. The sink can be written to again."""
+        if self._writer_task is None or self._queue is None:
+            return
+        if not self._writer_task.done() and self._writer_task.get_loop() is asyncio.get_running_loop():
+            await self._queue.put(None)
+            await self._writer_task
+        self._writer_task = None
+        self._queue = None
+        logger.info(f"Capture log {self.path}: {self.written} entries in {self.batches} batches, {self.dropped} dropped, {self.write_time:.3f}s spent writing")
@@ -0,0 +1,273 @@
+import asyncio
+import json
+import os
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from playwright.async_api import Page
+from testzeus_hercules.utils.artifact_writer import get_artifact_writer
+from testzeus_hercules.utils.logger import logger
+
+RELEVANT_RESOURCE_TYPES = frozenset(
+    {
+        "document",
+        "stylesheet",
+        "image",
+        "font",
+        "script",
+        "iframe",
+    }
+)
+RELEVANT_CONTENT_TYPES = (
+    "text/html",
+    "text/css",
+    "application/javascript",
+    "image/",
+    "font/",
+    "application/json",
+)
+STREAMING_CONTENT_TYPES = (
+    "streaming",
+    "video",
+    "audio",
+    "webm",
+    "mp4",
+    "event-stream",
+    "websocket",
+    "protobuf",
+)
+MAX_RELEVANT_CONTENT_LENGTH = 5 * 1024 * 1024
+
+DEFAULT_IGNORED_URL_PATTERNS = (
+    "analytics",
+    "tracking",
+    "telemetry",
+    "beacon",
+    "metrics",
+    "doubleclick",
+    "adsystem",
+    "adserver",
+    "advertising",
+    "facebook.com/plugins",
+    "platform.twitter",
+    "linkedin.com/embed",
+    "livechat",
+    "zendesk",
+    "intercom",
+    "crisp.chat",
+    "hotjar",
+    "push-notifications",
+    "onesignal",
+    "pushwoosh",
+    "heartbeat",
+    "ping",
+    "alive",
+    "webrtc",
+    "rtmp://",
+    "wss://",
+    "cloudfront.net",
+    "fastly.net",
+)
+
+NETWORK_IDLE_STATS_FILE = "network_idle_stats.ndjson"
+
+
+@lru_cache(maxsize=32)
+def compile_url_patterns(patterns: Tuple[str, ...]) -> Pattern[str]:
+    """
+    Compile URL substrings into a single regex, so a request URL is matched in one scan instead of one substring
+    search per pattern.
+
+    Args:
+        patterns (Tuple[str, ...]): Lower case URL substrings.
+
+    Returns:
+        Pattern[str]: Regex matching any URL that contains one of the patterns.
+    """
+    unique = sorted({p for p in patterns if p}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(p) for p in unique))
+
+
+def compile_ignored_url_patterns(extra_patterns: Tuple[str, ...] = ()) -> Pattern[str]:
+    """
+    Compile the URL substrings ignored by the network idle wait: the built-in ones and the project specific ones.
+
+    Args:
+        extra_patterns (Tuple[str, ...]): Additional lower case substrings configured for the project.
+
+    Returns:
+        Pattern[str]: Regex matching any URL that contains one of the patterns.
+    """
+    return compile_url_patterns(DEFAULT_IGNORED_URL_PATTERNS + tuple(extra_patterns))
+
+
+class NetworkIdleDetector:
+    """
+    Event driven network idle detection for a page.
+
+    Relevant requests are tracked from the request, response and requestfailed events. Whenever nothing is pending,
+    a timer of quiet_time seconds is armed and any new request cancels it, so the wait ends as soon as the network has
+    been quiet long enough, or after max_wait seconds.
+    """
+
+    def __init__(self, page: Page, quiet_time: float, max_wait: float, ignored_url_pattern: Pattern[str]) -> None:
+        self._page = page
+        self._quiet_time = quiet_time
+        self._max_wait = max_wait
+        self._ignored_url_pattern = ignored_url_pattern
+        self._loop = asyncio.get_running_loop()
+        self._idle = asyncio.Event()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._pending: Dict[Any, float] = {}
+        self._last_activity = self._loop.time()
+        self._tracked = 0
+        self._failed = 0
+        self._started: Optional[float] = None
+        self._listening = False
+
+    def _is_relevant_request(self, request: Any) -> bool:
+        if request.resource_type not in RELEVANT_RESOURCE_TYPES:
+            return False
+        url = request.url.lower()
+        if url.startswith(("data:", "blob:")):
+            return False
+        if self._ignored_url_pattern.search(url):
+            return False
+        headers = request.headers
+        if headers.get("purpose") == "prefetch" or headers.get("sec-fetch-dest") in ("video", "audio"):
+            return False
+        return True
+
+    def _arm(self, activity: bool) -> None:
+        """Restart the quiet period on network activity, and schedule the idle signal when nothing is pending."""
+        now = self._loop.time()
+        if activity:
+            self._last_activity = now
+        self._idle.clear()
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            self._timer = self._loop.call_later(max(0.0, self._last_activity + self._quiet_time - now), self._idle.set)
+
+    def _on_request(self, request: Any) -> None:
+        if not self._is_relevant_request(request):
+            return
+        self._pending[request] = time.perf_counter()
+        self._tracked += 1
+        self._arm(activity=True)
+
+    def _on_response(self, response: Any) -> None:
+        request = response.request
+        if self._pending.pop(request, None) is None:
+            return
+        # streaming, unrelated or very large responses end the request without counting as activity
+        content_type = response.headers.get("content-type", "").lower()
+        content_length = response.headers.get("content-length") or ""
+        activity = (
+            not any(t in content_type for t in STREAMING_CONTENT_TYPES)
+            and any(ct in content_type for ct in RELEVANT_CONTENT_TYPES)
+            and not (content_length.isdigit() and int(content_length) > MAX_RELEVANT_CONTENT_LENGTH)
+        )
+        self._arm(activity=activity)
+
+    def _on_request_failed(self, request: Any) -> None:
+        if self._pending.pop(request, None) is None:
+            return
+        self._failed += 1
+        self._arm(activity=True)
+
+    def start(self) -> None:
+        """Start tracking requests, e.g. before an action whose requests should be waited for."""
+        if self._started is not None:
+            return
+        self._started = time.perf_counter()
+        self._last_activity = self._loop.time()
+        self._listening = True
+        self._page.on("request", self._on_request)
+        self._page.on("response", self._on_response)
+        self._page.on("requestfailed", self._on_request_failed)
+        self._arm(activity=False)
+
+    def stop(self) -> None:
+        """Stop tracking requests."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if not self._listening:
+            return
+        self._listening = False
+        self._page.remove_listener("request", self._on_request)
+        self._page.remove_listener("response", self._on_response)
+        self._page.remove_listener("requestfailed", self._on_request_failed)
+
+    async def wait(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait until the network is idle, at most max_wait seconds since tracking started.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait from now instead, e.g. after an action that was tracked.
+
+        Returns:
+            Dict[str, Any]: Stats of the wait: duration, whether idle was reached, and the requests still pending.
+        """
+        self.start()
+        start = self._started
+        if timeout is None:
+            timeout = max(0.0, self._max_wait - (time.perf_counter() - start))
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            idle = True
+        except asyncio.TimeoutError:
+            idle = False
+        finally:
+            self.stop()
+
+        end = time.perf_counter()
+        return {
+            "timestamp": time.time(),
+            "page_url": self._page.url,
+            "waited": round(end - start, 3),
+            "idle": idle,
+            "quiet_time": self._quiet_time,
+            "max_wait": self._max_wait,
+            "tracked_requests": self._tracked,
+            "failed_requests": self._failed,
+            "blocking_requests": [{"url": request.url, "resource_type": request.resource_type, "pending_for": round(end - started, 3)} for request, started in self._pending.items()],
+        }
+
+
+async def wait_for_network_idle(
+    page: Page,
+    quiet_time: float,
+    max_wait: float,
+    extra_ignored_patterns: Iterable[str] = (),
+    stats_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Wait until the page had no relevant pending request for quiet_time seconds, at most max_wait seconds.
+
+    Args:
+        page (Page): The page to observe.
+        quiet_time (float): Seconds without relevant network activity considered idle.
+        max_wait (float): Maximum seconds to wait.
+        extra_ignored_patterns (Iterable[str]): Project specific URL substrings to ignore on top of the defaults.
+        stats_dir (Optional[str]): Folder to append the stats of this wait to, None to skip writing them.
+
+    Returns:
+        Dict[str, Any]: Stats of the wait, see NetworkIdleDetector.wait.
+    """
+    pattern = compile_ignored_url_patterns(tuple(p.lower() for p in extra_ignored_patterns))
+    stats = await NetworkIdleDetector(page, quiet_time, max_wait, pattern).wait()
+
+    if stats["idle"]:
+        logger.debug(f"Network stabilized for {quiet_time}s after waiting {stats['waited']}s")
+    else:
+        blocking: List[str] = [request["url"] for request in stats["blocking_requests"]]
+        logger.debug(f"Network timeout after {max_wait}s with {len(blocking)} pending requests: {blocking[:5]}")
+
+    if stats_dir:
+        await get_artifact_writer().append_line_async(os.path.join(stats_dir, NETWORK_IDLE_STATS_FILE), json.dumps(stats, ensure_ascii=False))
+    return stats
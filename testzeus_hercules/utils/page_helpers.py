@@ -0,0 +1,1612 @@
+from typing import Any, Union
+
+from playwright.async_api import BrowserContext, ElementHandle, Error, Frame, Page
+from testzeus_hercules.utils.logger import logger
+
+# Message of the error thrown in a document the helper library was not installed in
+HELPERS_MISSING = "HERCULES_PAGE_HELPERS_MISSING"
+
+# Numbers the interactive elements with 'md', see get_detailed_accessibility_tree.__inject_attributes
+INJECT_ATTRIBUTES_JS = """(incremental) => {
+            // md -> element of this pass, published as window.__hercules_md_elements (md -> WeakRef) for O(1) lookups;
+            // also lets a cloned element get its own md instead of sharing the md of its original
+            const mdElements = new Map();
+            const keepMd = (element) => {
+                if (!incremental) {
+                    return null;
+                }
+                const md = element.getAttribute('md');
+                if (!md) {
+                    return null;
+                }
+                const owner = mdElements.get(md);
+                if (owner && owner !== element && owner.isConnected) {
+                    return null;
+                }
+                return md;
+            };
+
+            // A recursive function to handle elements in DOM, shadow DOM, and iframes
+            const processElements = (elements, idCounter) => {
+                elements.forEach(element => {
+                    // If the element has a shadowRoot, process its children too
+                    if (element.shadowRoot) {
+                        idCounter = processElements(element.shadowRoot.querySelectorAll('*'), idCounter);
+                    }
+
+                    // If the element is an iframe, process its contentDocument if accessible
+                    if (element.tagName.toLowerCase() === 'iframe') {
+                        let iframeDocument;
+                        try {
+                            // Access the iframe's document if it's same-origin
+                            iframeDocument = element.contentDocument || element.contentWindow.document;
+                        } catch (e) {
+                            // Cannot access cross-origin iframe; skip to the next element
+                            return;
+                        }
+                        if (iframeDocument) {
+                            const iframeElements = iframeDocument.querySelectorAll('*');
+                            idCounter = processElements(iframeElements, idCounter);
+                        }
+                    }
+
+                    // Check if the element is interactive (buttons, inputs, etc.)
+                    if (isInteractiveElement(element)) {
+                        const origAriaAttribute = element.getAttribute('aria-keyshortcuts');
+                        const md = keepMd(element) || `${++idCounter}`;
+                        element.setAttribute('md', md);
+                        element.setAttribute('aria-keyshortcuts', md);
+                        mdElements.set(md, element);
+
+                        // Preserve the original aria-keyshortcuts if it exists
+                        if (origAriaAttribute) {
+                            element.setAttribute('orig-aria-keyshortcuts', origAriaAttribute);
+                        }
+                    }
+                });
+                return idCounter;
+            };
+            function isInteractiveElement(element) {
+                // Immediately return false for body tag
+                if (element.tagName.toLowerCase() === 'body') {
+                    return false;
+                }
+
+                // Base interactive elements and roles
+                const interactiveElements = new Set([
+                    'a', 'button', 'details', 'embed', 'input', 'label',
+                    'menu', 'menuitem', 'object', 'select', 'textarea', 'summary'
+                ]);
+
+                const interactiveRoles = new Set([
+                    'button', 'menu', 'menuitem', 'link', 'checkbox', 'radio',
+                    'slider', 'tab', 'tabpanel', 'textbox', 'combobox', 'grid',
+                    'listbox', 'option', 'progressbar', 'scrollbar', 'searchbox',
+                    'switch', 'tree', 'treeitem', 'spinbutton', 'tooltip', 'a-button-inner', 'a-dropdown-button', 'click', 
+                    'menuitemcheckbox', 'menuitemradio', 'a-button-text', 'button-text', 'button-icon', 'button-icon-only', 'button-text-icon-only', 'dropdown', 'combobox'
+                ]);
+
+                const tagName = element.tagName.toLowerCase();
+                const role = element.getAttribute('role');
+                const ariaRole = element.getAttribute('aria-role');
+                const tabIndex = element.getAttribute('tabindex');
+
+                // Add check for specific class
+                const hasAddressInputClass = element.classList.contains('address-input__container__input');
+
+                // Basic role/attribute checks
+                const hasInteractiveRole = hasAddressInputClass ||
+                    interactiveElements.has(tagName) ||
+                    interactiveRoles.has(role) ||
+                    interactiveRoles.has(ariaRole) ||
+                    (tabIndex !== null && tabIndex !== '-1' && element.parentElement?.tagName.toLowerCase() !== 'body') ||
+                    element.getAttribute('data-action') === 'a-dropdown-select' ||
+                    element.getAttribute('data-action') === 'a-dropdown-button';
+
+                if (hasInteractiveRole) return true;
+
+                // Get computed style
+                const style = window.getComputedStyle(element);
+
+                if (
+                    style.cursor === 'pointer' || 
+                    style.cursor === 'hand' ||
+                    style.cursor === 'move' ||
+                    style.cursor === 'grab' ||
+                    style.cursor === 'grabbing'
+                ) {
+                    return true;
+                }
+
+                // Check for event listeners
+                const hasClickHandler = element.onclick !== null ||
+                    element.getAttribute('onclick') !== null ||
+                    element.hasAttribute('ng-click') ||
+                    element.hasAttribute('@click') ||
+                    element.hasAttribute('v-on:click');
+
+                // Helper function to safely get event listeners
+                function getEventListeners(el) {
+                    try {
+                        // Try to get listeners using Chrome DevTools API
+                        return window.getEventListeners?.(el) || {};
+                    } catch (e) {
+                        // Fallback: check for common event properties
+                        const listeners = {};
+
+                        // List of common event types to check
+                        const eventTypes = [
+                            'click', 'mousedown', 'mouseup',
+                            'touchstart', 'touchend',
+                            'keydown', 'keyup', 'focus', 'blur'
+                        ];
+
+                        for (const type of eventTypes) {
+                            const handler = el[`on${type}`];
+                            if (handler) {
+                                listeners[type] = [{
+                                    listener: handler,
+                                    useCapture: false
+                                }];
+                            }
+                        }
+
+                        return listeners;
+                    }
+                }
+
+                // Check for click-related events on the element itself
+                const listeners = getEventListeners(element);
+                const hasClickListeners = listeners && (
+                    listeners.click?.length > 0 ||
+                    listeners.mousedown?.length > 0 ||
+                    listeners.mouseup?.length > 0 ||
+                    listeners.touchstart?.length > 0 ||
+                    listeners.touchend?.length > 0
+                );
+
+                // Check for ARIA properties that suggest interactivity
+                const hasAriaProps = element.hasAttribute('aria-expanded') ||
+                    element.hasAttribute('aria-pressed') ||
+                    element.hasAttribute('aria-selected') ||
+                    element.hasAttribute('aria-checked');
+
+                // Check for form-related functionality
+                const isFormRelated = element.form !== undefined ||
+                    element.hasAttribute('contenteditable') ||
+                    style.userSelect !== 'none';
+
+                // Check if element is draggable
+                const isDraggable = element.draggable ||
+                    element.getAttribute('draggable') === 'true';
+
+                // Additional check to prevent body from being marked as interactive
+                if (element.tagName.toLowerCase() === 'body' || element.parentElement?.tagName.toLowerCase() === 'body') {
+                    return false;
+                }
+
+                return hasAriaProps ||
+                    // hasClickStyling ||
+                    hasClickHandler ||
+                    hasClickListeners ||
+                    // isFormRelated ||
+                    isDraggable;
+            }
+
+            // Helper function to determine if an element is interactive
+            // const isInteractiveElement = (element) => {
+            //     const interactiveTags = ['button', 'a', 'input', 'select', 'textarea'];
+            //     return interactiveTags.includes(element.tagName.toLowerCase()) || element.hasAttribute('tabindex');
+            // };
+
+            const publishIndex = () => {
+                window.__hercules_md_elements = new Map([...mdElements].map(([md, element]) => [md, new WeakRef(element)]));
+            };
+
+            if (!incremental) {
+                // Start processing the DOM
+                const allElements = document.querySelectorAll('*');
+                let id = processElements(allElements, 0);
+                publishIndex();
+
+                return id;
+            }
+
+            // Parent of a node across shadow root and same-origin iframe boundaries
+            const parentAcross = (node) => {
+                if (node.parentElement) {
+                    return node.parentElement;
+                }
+                const parent = node.parentNode;
+                if (parent && parent.host) {
+                    return parent.host;
+                }
+                const view = (node.ownerDocument || node).defaultView;
+                try {
+                    return view && view.frameElement ? view.frameElement : null;
+                } catch (e) {
+                    return null;
+                }
+            };
+
+            // Focused element, through shadow roots and same-origin iframes
+            const deepActiveElement = () => {
+                let active = document.activeElement;
+                while (active) {
+                    let inner = null;
+                    if (active.shadowRoot) {
+                        inner = active.shadowRoot.activeElement;
+                    } else if (active.tagName === 'IFRAME') {
+                        try {
+                            inner = active.contentDocument ? active.contentDocument.activeElement : null;
+                        } catch (e) {
+                            inner = null;
+                        }
+                    }
+                    if (!inner || inner === active) {
+                        return active;
+                    }
+                    active = inner;
+                }
+                return null;
+            };
+
+            // Map the dirty nodes recorded by the mutation observer to the elements whose subtree changed
+            const state = window.__hercules_snapshot;
+            const dirty = window.__hercules_dirty_nodes;
+            if (dirty) {
+                // Focus moves leave no mutation record: the element focused now and the one focused at the last snapshot are refreshed
+                const active = deepActiveElement();
+                for (const element of [window.__hercules_last_active, active]) {
+                    if (element && element.isConnected && !['BODY', 'HTML'].includes(element.tagName)) {
+                        dirty.add(element);
+                    }
+                }
+                window.__hercules_last_active = active;
+            }
+            let roots = null;
+            if (state && dirty && state.url === location.href && dirty.size <= 500) {
+                const candidates = new Set();
+                roots = [];
+                for (const node of dirty) {
+                    let element = null;
+                    if (node.nodeType === Node.ELEMENT_NODE) {
+                        element = node;
+                    } else if (node.host) {
+                        element = node.host;
+                    } else if (node.nodeType === Node.DOCUMENT_NODE) {
+                        element = node === document ? null : parentAcross(node);
+                    } else {
+                        element = node.parentElement;
+                    }
+                    if (!element) {
+                        // The document itself changed, rebuild everything
+                        roots = null;
+                        break;
+                    }
+                    if (element.isConnected) {
+                        candidates.add(element);
+                    }
+                }
+                if (roots) {
+                    for (const element of candidates) {
+                        let ancestor = parentAcross(element);
+                        while (ancestor && !candidates.has(ancestor)) {
+                            ancestor = parentAcross(ancestor);
+                        }
+                        if (!ancestor) {
+                            roots.push(element);
+                        }
+                    }
+                }
+            }
+            if (dirty) {
+                dirty.clear();
+            }
+            window.__hercules_snapshot_roots = roots;
+
+            let id = window.__hercules_last_md || 0;
+            if (roots === null) {
+                id = processElements(document.querySelectorAll('*'), id);
+            } else {
+                for (const [md, ref] of window.__hercules_md_elements || []) {
+                    const element = ref.deref();
+                    if (element && element.isConnected) {
+                        mdElements.set(md, element);
+                    }
+                }
+                for (const root of roots) {
+                    id = processElements([root, ...root.querySelectorAll('*')], id);
+                }
+            }
+            window.__hercules_last_md = id;
+            publishIndex();
+
+            return id;
+        };
+        """
+
+# DOM attributes of a batch of elements by 'md', see get_detailed_accessibility_tree.fetch_elements_attributes
+FETCH_ELEMENTS_ATTRIBUTES_JS = """
+    (input_params) => {
+        const requests = input_params.requests;
+        const attributes = input_params.attributes;
+        const backup_attributes = input_params.backup_attributes;
+        const tags_to_ignore = input_params.tags_to_ignore;
+        const ids_to_ignore = input_params.ids_to_ignore;
+
+        // Index every element carrying an md once, across DOM, shadow DOMs, and same-origin iframes,
+        // instead of searching the whole document again for each md
+        const elementsByMd = new Map();
+        const indexElements = (parent) => {
+            for (const el of parent.querySelectorAll('*')) {
+                const md = el.getAttribute('md');
+                if (md !== null && !elementsByMd.has(md)) {
+                    elementsByMd.set(md, el);
+                }
+                // Check for shadow DOM
+                if (el.shadowRoot) {
+                    indexElements(el.shadowRoot);
+                }
+                // Check for iframes
+                if (el.tagName.toLowerCase() === 'iframe') {
+                    let iframeDocument;
+                    try {
+                        iframeDocument = el.contentDocument || el.contentWindow.document;
+                    } catch (e) {
+                        // Cannot access cross-origin iframe; skip to the next element
+                        continue;
+                    }
+                    if (iframeDocument) {
+                        indexElements(iframeDocument);
+                    }
+                }
+            }
+        };
+
+        // Helper function to search for an element by id across DOM, shadow DOMs, and iframes
+        const findElementById = (parent, id) => {
+            const element = parent.getElementById ? parent.getElementById(id) : parent.querySelector(`[id="${CSS.escape(id)}"]`);
+            if (element) {
+                return element;
+            }
+            for (const el of parent.querySelectorAll('*')) {
+                if (el.shadowRoot) {
+                    const shadowElement = findElementById(el.shadowRoot, id);
+                    if (shadowElement) {
+                        return shadowElement;
+                    }
+                }
+                if (el.tagName.toLowerCase() === 'iframe') {
+                    let iframeDocument;
+                    try {
+                        iframeDocument = el.contentDocument || el.contentWindow.document;
+                    } catch (e) {
+                        continue;
+                    }
+                    if (iframeDocument) {
+                        const iframeElement = findElementById(iframeDocument, id);
+                        if (iframeElement) {
+                            return iframeElement;
+                        }
+                    }
+                }
+            }
+            return null;
+        };
+
+        // The md -> element index of __inject_attributes answers most lookups; otherwise a single lookup is
+        // cheaper with querySelector, and a local index only pays off for a batch or a miss
+        let indexed = false;
+        const findElementByMd = (md) => {
+            const ref = window.__hercules_md_elements ? window.__hercules_md_elements.get(`${md}`) : null;
+            const indexedElement = ref ? ref.deref() : null;
+            if (indexedElement && indexedElement.isConnected && indexedElement.getAttribute('md') === `${md}`) {
+                return indexedElement;
+            }
+            if (!indexed && requests.length === 1) {
+                const element = document.querySelector(`[md="${md}"]`);
+                if (element) {
+                    return element;
+                }
+            }
+            if (!indexed) {
+                indexElements(document);
+                indexed = true;
+            }
+            return elementsByMd.get(`${md}`);
+        };
+
+        const getElementAttributes = (md, should_fetch_inner_text) => {
+            const element = findElementByMd(md);
+
+            if (!element) {
+                console.log(`No element found with md: ${md}`);
+                return null;
+            }
+
+            if (ids_to_ignore.includes(element.id)) {
+                console.log(`Ignoring element with id: ${element.id}`, element);
+                return null;
+            }
+
+            if (tags_to_ignore.includes(element.tagName.toLowerCase()) || element.tagName.toLowerCase() === "option") {
+                return null;
+            }
+
+            let attributes_to_values = {
+                'tag': element.tagName.toLowerCase() // Always include the tag name
+            };
+
+            if (element.hasAttribute('aria-describedby')) {
+                const describedbyId = element.getAttribute('aria-describedby');
+                const describedElement = findElementById(document, describedbyId);
+                if (describedElement) {
+                    attributes_to_values['tooltip'] = describedElement.innerText || describedElement.textContent;
+                }
+            }
+
+            if (element.tagName.toLowerCase() === 'input') {
+                attributes_to_values['tag_type'] = element.type;
+            } else if (element.tagName.toLowerCase() === 'select') {
+                attributes_to_values["md"] = element.getAttribute('md');
+                attributes_to_values["role"] = "combobox";
+                attributes_to_values["options"] = [];
+
+                for (const option of element.options) {
+                    let option_attributes_to_values = {
+                        "md": option.getAttribute('md'),
+                        "text": option.text,
+                        "value": option.value,
+                        "selected": option.selected
+                    };
+                    attributes_to_values["options"].push(option_attributes_to_values);
+                }
+                return attributes_to_values;
+            }
+
+            for (const attribute of attributes) {
+                let value = element.getAttribute(attribute);
+
+                if (value) {
+                    attributes_to_values[attribute] = value;
+                }
+            }
+
+            if (should_fetch_inner_text && element.innerText) {
+                attributes_to_values['description'] = element.innerText;
+            }
+
+            let role = element.getAttribute('role');
+            if (role === 'listbox' || element.tagName.toLowerCase() === 'ul') {
+                let children = element.children;
+                let attributes_to_include = ['md', 'role', 'aria-label', 'value'];
+                attributes_to_values["additional_info"] = [];
+
+                for (const child of children) {
+                    let children_attributes_to_values = {};
+
+                    for (let attr of child.attributes) {
+                        if (attributes_to_include.includes(attr.name)) {
+                            children_attributes_to_values[attr.name] = attr.value;
+                        }
+                    }
+
+                    attributes_to_values["additional_info"].push(children_attributes_to_values);
+                }
+            }
+
+            const minimalKeys = ['tag', 'md'];
+            const hasMoreThanMinimalKeys = Object.keys(attributes_to_values).length > minimalKeys.length;
+
+            if (!hasMoreThanMinimalKeys) {
+                for (const backupAttribute of backup_attributes) {
+                    let value = element.getAttribute(backupAttribute);
+                    if (value) {
+                        attributes_to_values[backupAttribute] = value;
+                    }
+                }
+
+                if (Object.keys(attributes_to_values).length <= minimalKeys.length) {
+                    if (element.tagName.toLowerCase() === 'button') {
+                        attributes_to_values["md"] = element.getAttribute('md');
+                        attributes_to_values["role"] = "button";
+                        attributes_to_values["additional_info"] = [];
+                        let children = element.children;
+                        let attributes_to_exclude = ['width', 'height', 'path', 'class', 'viewBox', 'md'];
+
+                        if (element.innerText.trim() === '') {
+                            for (const child of children) {
+                                let children_attributes_to_values = {};
+
+                                for (let attr of child.attributes) {
+                                    if (!attributes_to_exclude.includes(attr.name)) {
+                                        children_attributes_to_values[attr.name] = attr.value;
+                                    }
+                                }
+
+                                attributes_to_values["additional_info"].push(children_attributes_to_values);
+                            }
+                            console.log("Button with no text and no attributes: ", attributes_to_values);
+                            return attributes_to_values;
+                        }
+                    }
+
+                    return null;
+                }
+            }
+
+            return attributes_to_values;
+        };
+
+        // One result per request, in request order; a failing element does not fail the whole batch
+        return requests.map(([md, should_fetch_inner_text]) => {
+            try {
+                return getElementAttributes(md, should_fetch_inner_text);
+            } catch (e) {
+                console.log(`Failed to fetch DOM info for md: ${md}`, e);
+                return null;
+            }
+        });
+    }
+"""
+
+# Accessibility tree of the page, full or incremental, see get_detailed_accessibility_tree.do_get_accessibility_info
+ACCESSIBILITY_TREE_JS = """
+            (incremental) => {
+                // Snapshot of the page kept between calls: element -> {node, level}, node -> parent node, node -> element
+                const newSnapshot = () => ({
+                    url: location.href,
+                    tree: null,
+                    nodes: new WeakMap(),
+                    parents: new WeakMap(),
+                    elements: new WeakMap()
+                });
+                let snapshot = newSnapshot();
+
+                const requiredAriaAttributesByRole = {
+                    'alert': [],
+                    'button': [],
+                    'checkbox': ['aria-checked'],
+                    'combobox': ['aria-expanded', 'aria-controls'],
+                    'dialog': [],
+                    'gridcell': [],
+                    'link': [],
+                    'listbox': ['aria-multiselectable'],
+                    'menuitemcheckbox': ['aria-checked'],
+                    'menuitemradio': ['aria-checked'],
+                    'option': ['aria-selected'],
+                    'progressbar': ['aria-valuenow'],
+                    'radio': ['aria-checked'],
+                    'scrollbar': ['aria-controls', 'aria-valuenow', 'aria-valuemin', 'aria-valuemax', 'aria-orientation'],
+                    'searchbox': [],
+                    'slider': ['aria-valuenow', 'aria-valuemin', 'aria-valuemax', 'aria-orientation'],
+                    'spinbutton': ['aria-valuenow', 'aria-valuemin', 'aria-valuemax'],
+                    'tab': ['aria-selected'],
+                    'tabpanel': [],
+                    'textbox': ['aria-multiline'],
+                    'treeitem': ['aria-expanded']
+                };
+
+                function isElementHidden(element) {
+                    const style = window.getComputedStyle(element);
+                    return (
+                        style.display === 'none' ||
+                        style.visibility === 'hidden' ||
+                        element.getAttribute('aria-hidden') === 'true'
+                    );
+                }
+
+                function getAccessibleName(element) {
+                    try {
+                        // Chromium-based accessibility API
+                        if (window.getComputedAccessibleNode) {
+                            const accessibilityInfo = window.getComputedAccessibleNode(element);
+                            console.log('accessibilityInfo:', accessibilityInfo);
+                            if (accessibilityInfo?.name) {
+                                return cleanName(accessibilityInfo.name);
+                            }
+                        }
+                    } catch (error) {
+                        console.warn("Chromium accessibility API failed, falling back to manual method:", error);
+                    }
+
+                    // Existing manual accessibility extraction
+                    let name = element.getAttribute('aria-label');
+                    if (name) return cleanName(name);
+
+                    const labelledby = element.getAttribute('aria-labelledby');
+                    if (labelledby) {
+                        const labelElement = document.getElementById(labelledby);
+                        if (labelElement) return cleanName(labelElement.innerText);
+                    }
+
+                    if (element.alt) return cleanName(element.alt);
+                    if (element.title) return cleanName(element.title);
+                    if (element.placeholder) return cleanName(element.placeholder);
+
+                    if (
+                        element.value &&
+                        (element.tagName.toLowerCase() === 'input' || element.tagName.toLowerCase() === 'textarea')
+                    ) {
+                        return cleanName(element.value);
+                    }
+
+                    if (element.innerText) return cleanName(element.innerText);
+                    return '';
+                }
+
+                function cleanName(name) {
+                    if (typeof name !== 'string') {
+                        console.warn('Expected a string, but received:', name);
+                        return '';
+                    }
+                    const firstLine = name.split('\\n')[0];
+                    return firstLine.trim();
+                }
+
+                function getRole(element) {
+                    const role = element.getAttribute('role');
+                    if (role) return role;
+
+                    const tagName = element.tagName.toLowerCase();
+                    if (tagName === 'button') return 'button';
+                    if (tagName === 'a' && element.hasAttribute('href')) return 'link';
+                    if (tagName === 'input') {
+                        const type = element.type.toLowerCase();
+                        switch (type) {
+                            case 'button':
+                            case 'submit':
+                            case 'reset':
+                            case 'image':
+                                return 'button';
+                            case 'checkbox':
+                                return 'checkbox';
+                            case 'radio':
+                                return 'radio';
+                            case 'range':
+                                return 'slider';
+                            case 'number':
+                                return 'spinbutton';
+                            case 'search':
+                                return 'searchbox';
+                            case 'file':
+                                return 'button';
+                            case 'color':
+                            case 'date':
+                            case 'datetime-local':
+                            case 'month':
+                            case 'time':
+                            case 'week':
+                                return 'combobox';
+                            case 'email':
+                            case 'tel':
+                            case 'url':
+                            case 'password':
+                            case 'text':
+                                return 'textbox';
+                            case 'hidden':
+                                return '';
+                            default:
+                                return 'textbox';
+                        }
+                    }
+
+                    if (tagName === 'select') return 'listbox';
+                    if (tagName === 'textarea') return 'textbox';
+                    return '';
+                }
+
+                function getRequiredAriaAttributes(element) {
+                    const role = getRole(element);
+                    return requiredAriaAttributesByRole[role] || [];
+                }
+
+                function processElement(element, level) {
+                    if (isElementHidden(element)) return null;
+
+                    const node = {};
+
+                    const md = element.getAttribute('md');
+                    if (md) node.md = md;
+
+                    node.tag = element.tagName.toLowerCase();
+
+                    const role = getRole(element);
+                    if (role) node.role = role;
+
+                    const name = getAccessibleName(element);
+                    if (name) node.name = name;
+
+                    const title = element.getAttribute('title');
+                    if (title) node.title = cleanName(title);
+
+                    if (level) node.level = level;
+
+                    node.children = [];
+
+                    if (element.shadowRoot) {
+                        for (const child of element.shadowRoot.children) {
+                            const childNode = processElement(child, level + 1);
+                            if (childNode) {
+                                node.children.push(childNode);
+                                snapshot.parents.set(childNode, node);
+                            }
+                        }
+                    }
+
+                    for (const child of element.children) {
+                        if (child.tagName.toLowerCase() === 'iframe') {
+                            try {
+                                const iframeDoc = child.contentDocument || child.contentWindow.document;
+                                if (iframeDoc && iframeDoc.body) {
+                                    const iframeTree = generateAccessibilityTree(iframeDoc.body, level + 1);
+                                    if (iframeTree) {
+                                        const iframeNode = {
+                                            tag: 'iframe',
+                                            role: 'document',
+                                            level: level + 1,
+                                            children: [iframeTree]
+                                        };
+                                        const iframeMd = child.getAttribute('md');
+                                        if (iframeMd) iframeNode.md = iframeMd;
+                                        node.children.push(iframeNode);
+                                        snapshot.parents.set(iframeTree, iframeNode);
+                                        snapshot.parents.set(iframeNode, node);
+                                    }
+                                }
+                            } catch (e) {
+                                // Handle cross-origin policy restrictions
+                            }
+                        } else {
+                            const childNode = processElement(child, level + 1);
+                            if (childNode) {
+                                node.children.push(childNode);
+                                snapshot.parents.set(childNode, node);
+                            }
+                        }
+                    }
+
+                    if (!node.md && !node.name && node.children.length === 0 && !node.role) {
+                        return null;
+                    }
+
+                    const requiredAriaAttrs = getRequiredAriaAttributes(element);
+                    for (const attr of requiredAriaAttrs) {
+                        if (!element.hasAttribute(attr)) {
+                            // Handle missing required ARIA attribute warning
+                        }
+                    }
+
+                    snapshot.nodes.set(element, { node, level });
+                    snapshot.elements.set(node, element);
+                    return node;
+                }
+
+                function generateAccessibilityTree(rootElement, level) {
+                    return processElement(rootElement || document.body, level || 1);
+                }
+
+                // Parent of a node across shadow root and same-origin iframe boundaries
+                function parentAcross(node) {
+                    if (node.parentElement) return node.parentElement;
+                    const parent = node.parentNode;
+                    if (parent && parent.host) return parent.host;
+                    const view = (node.ownerDocument || node).defaultView;
+                    try {
+                        return view && view.frameElement ? view.frameElement : null;
+                    } catch (e) {
+                        return null;
+                    }
+                }
+
+                // Whether a node recorded in the snapshot is still part of its tree
+                function isCurrent(node) {
+                    for (let current = node; current !== snapshot.tree; ) {
+                        const parent = snapshot.parents.get(current);
+                        if (!parent || parent.children.indexOf(current) === -1) return false;
+                        current = parent;
+                    }
+                    return true;
+                }
+
+                // Recompute only the subtrees under the dirty roots found by the md injection
+                function refreshSnapshot(previous, roots) {
+                    snapshot = previous;
+                    const targets = new Set();
+                    for (const root of roots) {
+                        let element = root;
+                        while (element && !(snapshot.nodes.has(element) && isCurrent(snapshot.nodes.get(element).node))) {
+                            element = parentAcross(element);
+                        }
+                        if (!element) return null;
+                        targets.add(element);
+                    }
+
+                    const renamed = new Set();
+                    for (const element of targets) {
+                        let ancestor = parentAcross(element);
+                        while (ancestor && !targets.has(ancestor)) {
+                            ancestor = parentAcross(ancestor);
+                        }
+                        if (ancestor) continue;
+
+                        const { node: oldNode, level } = snapshot.nodes.get(element);
+                        const parent = snapshot.parents.get(oldNode);
+                        const freshNode = processElement(element, level);
+                        if (!parent) {
+                            // The root itself changed
+                            snapshot.tree = freshNode;
+                            continue;
+                        }
+                        const index = parent.children.indexOf(oldNode);
+                        if (index === -1) continue;
+                        if (freshNode) {
+                            parent.children[index] = freshNode;
+                            snapshot.parents.set(freshNode, parent);
+                        } else {
+                            parent.children.splice(index, 1);
+                            snapshot.nodes.delete(element);
+                        }
+
+                        // Accessible names of the ancestors can come from the text of the changed subtree
+                        for (let current = parent; current && !renamed.has(current); current = snapshot.parents.get(current)) {
+                            renamed.add(current);
+                            const ancestorElement = snapshot.elements.get(current);
+                            if (!ancestorElement) continue;
+                            const name = getAccessibleName(ancestorElement);
+                            if (name) current.name = name;
+                            else delete current.name;
+                        }
+                    }
+                    return targets.size;
+                }
+
+                const previous = window.__hercules_snapshot;
+                const roots = window.__hercules_snapshot_roots;
+                window.__hercules_snapshot_roots = null;
+                if (incremental && previous && roots && previous.url === location.href) {
+                    const refreshed = refreshSnapshot(previous, roots);
+                    if (refreshed !== null) {
+                        return { tree: snapshot.tree, refreshed };
+                    }
+                }
+
+                snapshot = newSnapshot();
+                snapshot.tree = generateAccessibilityTree();
+                window.__hercules_snapshot = incremental ? snapshot : undefined;
+                return { tree: snapshot.tree, refreshed: null };
+            }
+    """
+
+# Restores the original 'aria-keyshortcuts' after a snapshot
+CLEANUP_DOM_JS = """() => {
+            // Recursive function to process elements in DOM, shadow DOM, and iframes
+            const processElements = (parent) => {
+                // Select all elements with the 'md' attribute in the current parent (regular DOM or shadow DOM)
+                const allElements = parent.querySelectorAll('*[md]');
+
+                // Iterate through each element and process its attributes
+                allElements.forEach(element => {
+                    element.removeAttribute('aria-keyshortcuts');
+                    const origAriaLabel = element.getAttribute('orig-aria-keyshortcuts');
+                    if (origAriaLabel) {
+                        element.setAttribute('aria-keyshortcuts', origAriaLabel);
+                        element.removeAttribute('orig-aria-keyshortcuts');
+                    }
+
+                    // Check if the element has a shadow DOM and recursively process its shadow root
+                    if (element.shadowRoot) {
+                        processElements(element.shadowRoot); // Process elements inside shadow DOM
+                    }
+
+                    // Check if the element is an iframe and process its content
+                    if (element.tagName.toLowerCase() === 'iframe') {
+                        let iframeDocument;
+                        try {
+                            // Access the iframe's document if it's same-origin
+                            iframeDocument = element.contentDocument || element.contentWindow.document;
+                        } catch (e) {
+                            // Cannot access cross-origin iframe; skip to the next element
+                            return;
+                        }
+                        if (iframeDocument) {
+                            processElements(iframeDocument); // Process elements inside the iframe
+                        }
+                    }
+                });
+            };
+
+            // Start the process with the regular DOM (document)
+            processElements(document);
+        };
+
+    """
+
+# Text content of the page without overlays, scripts and styles, see get_page_text.get_filtered_text_content
+FILTERED_TEXT_CONTENT_JS = """
+        () => {
+        const selectorsToFilter = ['#hercules-overlay'];
+        const originalStyles = [];
+
+        /**
+        * Hide elements by setting their visibility to "hidden".
+        */
+        function hideElements(root, selector) {
+            if (!root) return;
+            const elements = root.querySelectorAll(selector);
+            elements.forEach(element => {
+            originalStyles.push({
+                element,
+                originalStyle: element.style.visibility
+            });
+            element.style.visibility = 'hidden';
+            });
+        }
+
+        /**
+        * Recursively hide elements in shadow DOM.
+        */
+        function processElementsInShadowDOM(root, selector) {
+            if (!root) return;
+            hideElements(root, selector);
+
+            const allNodes = root.querySelectorAll('*');
+            allNodes.forEach(node => {
+            if (node.shadowRoot) {
+                processElementsInShadowDOM(node.shadowRoot, selector);
+            }
+            });
+        }
+
+        /**
+        * Recursively hide elements in iframes.
+        */
+        function processElementsInIframes(root, selector) {
+            if (!root) return;
+            const iframes = root.querySelectorAll('iframe');
+            iframes.forEach(iframe => {
+            try {
+                const iframeDoc = iframe.contentDocument;
+                if (iframeDoc) {
+                processElementsInShadowDOM(iframeDoc, selector);
+                processElementsInIframes(iframeDoc, selector);
+                }
+            } catch (err) {
+                console.log('Error accessing iframe content:', err);
+            }
+            });
+        }
+
+        /**
+        * Create a TreeWalker that:
+        * - Visits text nodes and element nodes
+        * - Skips (<script> and <style>) elements entirely
+        */
+        function createSkippingTreeWalker(root) {
+            return document.createTreeWalker(
+            root,
+            NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
+            {
+                acceptNode(node) {
+                if (node.nodeType === Node.ELEMENT_NODE) {
+                    const tag = node.tagName.toLowerCase();
+                    if (tag === 'script' || tag === 'style') {
+                    return NodeFilter.FILTER_REJECT; // skip <script> / <style>
+                    }
+                }
+                return NodeFilter.FILTER_ACCEPT;
+                }
+            }
+            );
+        }
+
+        /**
+        * Gets text by walking the DOM, but skipping <script> and <style>.
+        * Also recursively checks for shadow roots and iframes.
+        */
+        function getTextSkippingScriptsStyles(root) {
+            if (!root) return '';
+
+            let textContent = '';
+            const walker = createSkippingTreeWalker(root);
+
+            while (walker.nextNode()) {
+            const node = walker.currentNode;
+            
+            // If it's a text node, accumulate text
+            if (node.nodeType === Node.TEXT_NODE) {
+                textContent += node.nodeValue;
+            }
+            // If it has a shadowRoot, recurse
+            else if (node.shadowRoot) {
+                textContent += getTextSkippingScriptsStyles(node.shadowRoot);
+            }
+            }
+
+            return textContent;
+        }
+
+        /**
+        * Recursively gather text from iframes, also skipping <script> & <style>.
+        */
+        function getTextFromIframes(root) {
+            if (!root) return '';
+            let iframeText = '';
+
+            const iframes = root.querySelectorAll('iframe');
+            iframes.forEach(iframe => {
+            try {
+                const iframeDoc = iframe.contentDocument;
+                if (iframeDoc) {
+                // Grab text from iframe body, docElement, plus nested iframes
+                iframeText += getTextSkippingScriptsStyles(iframeDoc.body);
+                iframeText += getTextSkippingScriptsStyles(iframeDoc.documentElement);
+                iframeText += getTextFromIframes(iframeDoc);
+                }
+            } catch (err) {
+                console.log('Error accessing iframe content:', err);
+            }
+            });
+
+            return iframeText;
+        }
+
+        /**
+        * Collect alt texts for images (this part can remain simpler, as alt text
+        * won't appear in <script> or <style> tags anyway).
+        */
+        function getAltTextsFromShadowDOM(root) {
+            if (!root) return [];
+            let altTexts = Array.from(root.querySelectorAll('img')).map(img => img.alt);
+
+            const allNodes = root.querySelectorAll('*');
+            allNodes.forEach(node => {
+            if (node.shadowRoot) {
+                altTexts = altTexts.concat(getAltTextsFromShadowDOM(node.shadowRoot));
+            }
+            });
+            return altTexts;
+        }
+
+        function getAltTextsFromIframes(root) {
+            if (!root) return [];
+            let iframeAltTexts = [];
+
+            const iframes = root.querySelectorAll('iframe');
+            iframes.forEach(iframe => {
+            try {
+                const iframeDoc = iframe.contentDocument;
+                if (iframeDoc) {
+                iframeAltTexts = iframeAltTexts.concat(getAltTextsFromShadowDOM(iframeDoc));
+                iframeAltTexts = iframeAltTexts.concat(getAltTextsFromIframes(iframeDoc));
+                }
+            } catch (err) {
+                console.log('Error accessing iframe content:', err);
+            }
+            });
+
+            return iframeAltTexts;
+        }
+
+        // 1) Hide overlays
+        selectorsToFilter.forEach(selector => {
+            processElementsInShadowDOM(document, selector);
+            processElementsInIframes(document, selector);
+        });
+
+        // 2) Collect text from the main document
+        let textContent = getTextSkippingScriptsStyles(document.body);
+        textContent += getTextSkippingScriptsStyles(document.documentElement);
+
+        // 3) Collect text from iframes
+        textContent += getTextFromIframes(document);
+
+        // 4) Collect alt texts
+        let altTexts = getAltTextsFromShadowDOM(document);
+        altTexts = altTexts.concat(getAltTextsFromIframes(document));
+        const altTextsString = 'Other Alt Texts in the page: ' + altTexts.join(' ');
+
+        // 5) Restore hidden overlays
+        originalStyles.forEach(entry => {
+            entry.element.style.visibility = entry.originalStyle;
+        });
+
+        // 6) Return final text
+        textContent = textContent + ' ' + altTextsString;
+
+        // Optional: sanitize whitespace, if needed
+        // const sanitizeString = (input) => input.replace(/\s+/g, ' ');
+        // textContent = sanitizeString(textContent);
+
+        return textContent;
+        }
+    """
+
+# DOM mutation observer feeding dom_mutation_change_detected and the snapshot dirty set
+ADD_MUTATION_OBSERVER_JS = """
+        () => {
+            console.log('Adding a mutation observer for DOM changes');
+
+            // Nodes changed since the last accessibility snapshot, consumed by get_detailed_accessibility_tree
+            window.__hercules_dirty_nodes = window.__hercules_dirty_nodes || new Set();
+            // Keep the md -> element index built by __inject_attributes in line with nodes moved or removed by the page
+            const updateMdIndex = (mutation) => {
+                const index = window.__hercules_md_elements;
+                if (!index) {
+                    return;
+                }
+                for (const node of mutation.removedNodes) {
+                    if (node.nodeType !== Node.ELEMENT_NODE || node.isConnected) continue;
+                    for (const element of [node, ...node.querySelectorAll('[md]')]) {
+                        const md = element.getAttribute('md');
+                        const ref = md ? index.get(md) : null;
+                        if (ref && ref.deref() === element) {
+                            index.delete(md);
+                        }
+                    }
+                }
+                for (const node of mutation.addedNodes) {
+                    if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                    for (const element of [node, ...node.querySelectorAll('[md]')]) {
+                        const md = element.getAttribute('md');
+                        const owner = md && index.has(md) ? index.get(md).deref() : null;
+                        if (md && !(owner && owner.isConnected)) {
+                            index.set(md, new WeakRef(element));
+                        }
+                    }
+                }
+            };
+            const snapshotAttributes = ['class', 'style', 'hidden', 'role', 'aria-hidden', 'aria-label', 'aria-labelledby', 'title', 'alt', 'placeholder', 'value', 'disabled', 'tabindex'];
+            // Typing, fill() and framework controlled inputs change the value and checked properties, which leave no mutation record
+            const markFormControl = (event) => {
+                const target = event.composedPath ? event.composedPath()[0] : event.target;
+                if (target && target.nodeType === Node.ELEMENT_NODE) {
+                    window.__hercules_dirty_nodes.add(target);
+                }
+            };
+
+            const observeMutations = (root) => {
+                root.addEventListener('input', markFormControl, true);
+                root.addEventListener('change', markFormControl, true);
+                new MutationObserver((mutationsList, observer) => {
+                    let changes_detected = [];
+                    for (let mutation of mutationsList) {
+                        const dirtyNode = mutation.type === 'characterData' ? mutation.target.parentNode : mutation.target;
+                        if (dirtyNode && !(dirtyNode.closest && dirtyNode.closest('#agentDriveAutoOverlay'))) {
+                            window.__hercules_dirty_nodes.add(dirtyNode);
+                        }
+                        if (mutation.type === 'childList') {
+                            updateMdIndex(mutation);
+                            let allAddedNodes = mutation.addedNodes;
+                            for (let node of allAddedNodes) {
+                                if (node.tagName && !['SCRIPT', 'NOSCRIPT', 'STYLE'].includes(node.tagName.toUpperCase()) && !node.closest('#agentDriveAutoOverlay')) {
+                                    let visibility = true;
+                                    let content = node.innerText ? node.innerText.trim() : '';
+                                    if (visibility && content) {
+                                        changes_detected.push({ tag: node.tagName, content: content });
+                                    }
+                                    // If the added node has a shadow DOM, observe it as well
+                                    if (node.shadowRoot) {
+                                        observeMutations(node.shadowRoot);
+                                    }
+                                    // If the added node is an iframe, and same-origin, observe its document
+                                    if (node.tagName.toLowerCase() === 'iframe') {
+                                        let iframeDocument;
+                                        try {
+                                            iframeDocument = node.contentDocument || node.contentWindow.document;
+                                        } catch (e) {
+                                            // Cannot access cross-origin iframe; skip to the next node
+                                            continue;
+                                        }
+                                        if (iframeDocument) {
+                                            observeMutations(iframeDocument);
+                                        }
+                                    }
+                                }
+                            }
+                        } else if (mutation.type === 'characterData') {
+                            let node = mutation.target;
+                            if (
+                                node.parentNode &&
+                                node.parentNode.tagName &&
+                                !['SCRIPT', 'NOSCRIPT', 'STYLE'].includes(node.parentNode.tagName.toUpperCase()) &&
+                                !node.parentNode.closest('#agentDriveAutoOverlay')
+                            ) {
+                                let visibility = true;
+                                let content = node.data.trim();
+                                if (visibility && content && window.getComputedStyle(node.parentNode).display !== 'none') {
+                                    if (!changes_detected.some(change => change.content.includes(content))) {
+                                        changes_detected.push({ tag: node.parentNode.tagName, content: content });
+                                    }
+                                }
+                            }
+                        }
+                    }
+                    if (changes_detected.length > 0) {
+                        window.dom_mutation_change_detected(JSON.stringify(changes_detected));
+                    }
+                }).observe(root, { subtree: true, childList: true, characterData: true, attributes: true, attributeFilter: snapshotAttributes });
+            };
+
+            // Start observing the regular document (DOM)
+            observeMutations(document);
+
+            // Optionally, if there are known shadow roots or iframes, start observing them immediately
+            document.querySelectorAll('*').forEach(el => {
+                if (el.shadowRoot) {
+                    observeMutations(el.shadowRoot);
+                }
+                if (el.tagName && el.tagName.toLowerCase() === 'iframe') {
+                    let iframeDocument;
+                    try {
+                        iframeDocument = el.contentDocument || el.contentWindow.document;
+                    } catch (e) {
+                        // Cannot access cross-origin iframe; skip to the next element
+                        return;
+                    }
+                    if (iframeDocument) {
+                        observeMutations(iframeDocument);
+                    }
+                }
+            });
+        }
+"""
+
+# XPath of an element, see BrowserLogger.get_alternative_selectors
+GET_XPATH_JS = """(element) => {
+                try {
+                    const getXPath = (elm) => {
+                        if (!elm || !elm.nodeType) return null;
+                        
+                        const segs = [];
+                        while (elm && elm.nodeType === 1) {
+                            if (elm.hasAttribute('id')) {
+                                segs.unshift(`//*[@id="${elm.getAttribute('id')}"]`);
+                                return segs.join('/');
+                            } else {
+                                let sib = elm;
+                                let nth = 1;
+                                for (sib = sib.previousSibling; sib; sib = sib.previousSibling) {
+                                    if (sib.nodeType === 1 && sib.tagName === elm.tagName) nth++;
+                                }
+                                segs.unshift(elm.tagName.toLowerCase() + '[' + nth + ']');
+                            }
+                            elm = elm.parentNode;
+                        }
+                        return segs.length ? '/' + segs.join('/') : null;
+                    };
+                    return getXPath(element);
+                } catch (error) {
+                    console.error('XPath generation error:', error);
+                    return null;
+                }
+            }"""
+
+# ARIA selector of an element, see BrowserLogger.get_alternative_selectors
+GET_ARIA_SELECTOR_JS = """(element) => {
+                try {
+                    if (!element || !element.nodeType) return null;
+                    
+                    if (element.getAttribute('role')) {
+                        return `[role="${element.getAttribute('role')}"]`;
+                    }
+                    if (element.getAttribute('aria-label')) {
+                        return `[aria-label="${element.getAttribute('aria-label')}"]`;
+                    }
+                    return null;
+                } catch (error) {
+                    console.error('ARIA selector generation error:', error);
+                    return null;
+                }
+            }"""
+
+# Everything the tools log about an element in one round trip, see dom_helper.introspect_element: the tag, the
+# attributes of the outer HTML and of the interaction log, the XPath, ARIA and CSS alternatives and the bounding box
+INTROSPECT_ELEMENT_JS = """(element) => {
+    const attributeNames = [
+        'id', 'name', 'aria-label', 'placeholder', 'href', 'src', 'aria-autocomplete', 'role', 'type',
+        'data-testid', 'value', 'selected', 'aria-labelledby', 'aria-describedby', 'aria-haspopup', 'title',
+        'aria-controls', 'class'
+    ];
+    const attributes = {};
+    for (const name of attributeNames) {
+        const value = element.getAttribute(name);
+        if (value) {
+            attributes[name] = value;
+        }
+    }
+
+    const getCssSelector = (elm) => {
+        const segs = [];
+        while (elm && elm.nodeType === 1) {
+            const root = elm.getRootNode();
+            if (elm.id && root.querySelectorAll('#' + CSS.escape(elm.id)).length === 1) {
+                segs.unshift('#' + CSS.escape(elm.id));
+                break;
+            }
+            let seg = elm.tagName.toLowerCase();
+            const parent = elm.parentElement;
+            if (parent) {
+                const sameTag = Array.from(parent.children).filter((sib) => sib.tagName === elm.tagName);
+                if (sameTag.length > 1) {
+                    seg += ':nth-of-type(' + (sameTag.indexOf(elm) + 1) + ')';
+                }
+            }
+            segs.unshift(seg);
+            elm = parent;
+        }
+        return segs.length ? segs.join(' > ') : null;
+    };
+
+    let css = null;
+    try {
+        css = getCssSelector(element);
+    } catch (error) {
+        console.error('CSS selector generation error:', error);
+    }
+    const rect = element.getBoundingClientRect();
+    return {
+        tag: element.tagName.toLowerCase(),
+        type: typeof element.type === 'string' ? element.type : '',
+        attributes,
+        xpath: window.__hercules.getXPath(element),
+        aria: window.__hercules.getAriaSelector(element),
+        css,
+        boundingBox: { x: rect.x, y: rect.y, width: rect.width, height: rect.height }
+    };
+}"""
+
+# Element lookup across shadow roots and same-origin iframes, see js_helper.get_js_with_element_finder
+FIND_ELEMENT_JS = """
+// Resolve an [md='...'] selector through the md -> element index built by __inject_attributes
+const findElementByMdIndex = (selector) => {
+    const match = /^\\[md=(['"]?)(\\d+)\\1\\]$/.exec(selector.trim());
+    if (!match || !window.__hercules_md_elements) {
+        return null;
+    }
+    const md = match[2];
+    const ref = window.__hercules_md_elements.get(md);
+    const element = ref ? ref.deref() : null;
+    if (element && element.isConnected && element.getAttribute('md') === md) {
+        return element;
+    }
+    window.__hercules_md_elements.delete(md);
+    return null;
+};
+
+const findElementInShadowDOMAndIframes = (parent, selector) => {
+    if (parent === document) {
+        const indexedElement = findElementByMdIndex(selector);
+        if (indexedElement) {
+            return indexedElement;
+        }
+    }
+
+    // Try to find the element in the current context
+    let element = parent.querySelector(selector);
+    if (element) {
+        return element; // Element found in the current context
+    }
+
+    // Search inside shadow DOMs and iframes
+    const elements = parent.querySelectorAll('*');
+    for (const el of elements) {
+        // Search inside shadow DOMs
+        if (el.shadowRoot) {
+            element = findElementInShadowDOMAndIframes(el.shadowRoot, selector);
+            if (element) {
+                return element; // Element found in shadow DOM
+            }
+        }
+        // Search inside iframes
+        if (el.tagName.toLowerCase() === 'iframe') {
+            let iframeDocument;
+            try {
+                // Access the iframe's document if it's same-origin
+                iframeDocument = el.contentDocument || el.contentWindow.document;
+            } catch (e) {
+                // Cannot access cross-origin iframe; skip to the next element
+                continue;
+            }
+            if (iframeDocument) {
+                element = findElementInShadowDOMAndIframes(iframeDocument, selector);
+                if (element) {
+                    return element; // Element found inside iframe
+                }
+            }
+        }
+    }
+    return null; // Element not found
+};
+"""
+
+# Starts counting DOM mutations of the document before an action, see page_settle.wait_until_settled
+SETTLE_START_JS = """() => {
+    if (window.__hercules_settle) {
+        window.__hercules_settle.observer.disconnect();
+    }
+    const state = { last: performance.now(), mutations: 0, observer: null };
+    state.observer = new MutationObserver((records) => {
+        state.last = performance.now();
+        state.mutations += records.length;
+    });
+    state.observer.observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+    window.__hercules_settle = state;
+}"""
+
+# Resolves once the document had no mutation for quietMs, or after timeoutMs; a document that was not tracked yet
+# (e.g. the action navigated) starts being tracked now
+WAIT_FOR_DOM_QUIET_JS = """({ quietMs, timeoutMs }) => {
+    if (!window.__hercules_settle) {
+        window.__hercules.settleStart();
+    }
+    const state = window.__hercules_settle;
+    const start = performance.now();
+    return new Promise((resolve) => {
+        const check = () => {
+            const now = performance.now();
+            const quietFor = now - state.last;
+            if (quietFor >= quietMs || now - start >= timeoutMs) {
+                state.observer.disconnect();
+                if (window.__hercules_settle === state) {
+                    delete window.__hercules_settle;
+                }
+                resolve({ quiet: quietFor >= quietMs, mutations: state.mutations });
+                return;
+            }
+            setTimeout(check, Math.min(quietMs - quietFor, timeoutMs - (now - start)));
+        };
+        check();
+    });
+}"""
+
+
+def _function_source(js: str) -> str:
+    return js.strip().rstrip(";")
+
+
+# The library, registered once per browser context with add_init_script so that it exists in every document and
+# frame before any page script runs; tools then only send the name of the helper and its arguments
+PAGE_HELPERS_JS = (
+    """
+(() => {
+    if (window.__hercules) {
+        return;
+    }
+"""
+    + FIND_ELEMENT_JS
+    + """
+    window.__hercules = {
+        injectAttributes: """
+    + _function_source(INJECT_ATTRIBUTES_JS)
+    + """,
+        fetchElementsAttributes: """
+    + _function_source(FETCH_ELEMENTS_ATTRIBUTES_JS)
+    + """,
+        accessibilityTree: """
+    + _function_source(ACCESSIBILITY_TREE_JS)
+    + """,
+        cleanupDom: """
+    + _function_source(CLEANUP_DOM_JS)
+    + """,
+        filteredTextContent: """
+    + _function_source(FILTERED_TEXT_CONTENT_JS)
+    + """,
+        addMutationObserver: """
+    + _function_source(ADD_MUTATION_OBSERVER_JS)
+    + """,
+        getXPath: """
+    + _function_source(GET_XPATH_JS)
+    + """,
+        getAriaSelector: """
+    + _function_source(GET_ARIA_SELECTOR_JS)
+    + """,
+        introspectElement: """
+    + _function_source(INTROSPECT_ELEMENT_JS)
+    + """,
+        settleStart: """
+    + _function_source(SETTLE_START_JS)
+    + """,
+        waitForDomQuiet: """
+    + _function_source(WAIT_FOR_DOM_QUIET_JS)
+    + """,
+        findElementByMdIndex,
+        findElementInShadowDOMAndIframes
+    };
+})();
+"""
+)
+
+CALL_PAGE_HELPER_JS = f"""async ([name, arg]) => {{
+    if (!window.__hercules) {{
+        throw new Error('{HELPERS_MISSING}');
+    }}
+    return await window.__hercules[name](arg);
+}}"""
+
+CALL_ELEMENT_HELPER_JS = f"""async (element, name) => {{
+    if (!window.__hercules) {{
+        throw new Error('{HELPERS_MISSING}');
+    }}
+    return await window.__hercules[name](element);
+}}"""
+
+
+async def install_page_helpers(context: BrowserContext) -> None:
+    """
+    Register the window.__hercules helper library for every document the context will load, and install it in the
+    documents that are already open.
+
+    Args:
+        context (BrowserContext): The browser context to register the library in.
+    """
+    await context.add_init_script(script=PAGE_HELPERS_JS)
+    for page in context.pages:
+        for frame in page.frames:
+            try:
+                await frame.evaluate(PAGE_HELPERS_JS)
+            except Error as e:
+                logger.debug(f"Failed to install page helpers in frame {frame.url}: {e}")
+
+
+async def evaluate_with_page_helpers(target: Union[Page, Frame], expression: str, arg: Any = None, handle: bool = False) -> Any:
+    """
+    Evaluate an expression using window.__hercules, installing the library first in documents created before it was
+    registered. The expression reports a missing library by throwing HELPERS_MISSING.
+
+    Args:
+        target (Union[Page, Frame]): The page or frame to evaluate the expression in.
+        expression (str): The JavaScript function to evaluate.
+        arg (Any): The single argument passed to the function.
+        handle (bool): Return a JSHandle (evaluate_handle) instead of the value.
+
+    Returns:
+        Any: The value, or handle, returned by the function.
+    """
+    evaluate = target.evaluate_handle if handle else target.evaluate
+    try:
+        return await evaluate(expression, arg)
+    except Error as e:
+        if HELPERS_MISSING not in str(e):
+            raise
+    logger.debug("Installing page helpers before evaluating")
+    await target.evaluate(PAGE_HELPERS_JS)
+    return await evaluate(expression, arg)
+
+
+async def call_page_helper(target: Union[Page, Frame], name: str, arg: Any = None) -> Any:
+    """
+    Call a window.__hercules helper, installing the library first in documents created before it was registered.
+
+    Args:
+        target (Union[Page, Frame]): The page or frame to run the helper in.
+        name (str): Name of the helper, e.g. 'injectAttributes'.
+        arg (Any): The single argument passed to the helper.
+
+    Returns:
+        Any: The value returned by the helper.
+    """
+    return await evaluate_with_page_helpers(target, CALL_PAGE_HELPER_JS, [name, arg])
+
+
+async def call_element_helper(element: ElementHandle, name: str) -> Any:
+    """
+    Call a window.__hercules helper taking an element, in the frame the element belongs to.
+
+    Args:
+        element (ElementHandle): The element passed to the helper.
+        name (str): Name of the helper, e.g. 'getXPath'.
+
+    Returns:
+        Any: The value returned by the helper.
+    """
+    try:
+        return await element.evaluate(CALL_ELEMENT_HELPER_JS, name)
+    except Error as e:
+        if HELPERS_MISSING not in str(e):
+            raise
+    frame = await element.owner_frame()
+    if frame is not None:
+        await frame.evaluate(PAGE_HELPERS_JS)
+    return await element.evaluate(CALL_ELEMENT_HELPER_JS, name)
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from playwright.async_api import Page
+from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.network_idle import (
+    NetworkIdleDetector,
+    compile_ignored_url_patterns,
+)
+from testzeus_hercules.utils.page_helpers import call_page_helper
+
+
+async def wait_for_dom_quiet(page: Page, quiet_time: Optional[float] = None, max_wait: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Wait until the DOM of the page had no mutation for quiet_time seconds, at most max_wait seconds.
+
+    Args:
+        page (Page): The page to observe.
+        quiet_time (Optional[float]): Seconds without mutation considered settled, SETTLE_QUIET_TIME by default.
+        max_wait (Optional[float]): Maximum seconds to wait, SETTLE_MAX_TIME by default.
+
+    Returns:
+        Dict[str, Any]: {"quiet": bool, "mutations": int} as reported by the page.
+    """
+    config = get_global_conf()
+    quiet_time = config.get_settle_quiet_time() if quiet_time is None else quiet_time
+    max_wait = config.get_settle_max_time() if max_wait is None else max_wait
+    deadline = time.perf_counter() + max_wait
+
+    # the action may have navigated, the new document is tracked from its first evaluation on
+    for _ in range(2):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        arg = {"quietMs": quiet_time * 1000, "timeoutMs": remaining * 1000}
+        try:
+            return await asyncio.wait_for(call_page_helper(page, "waitForDomQuiet", arg), timeout=remaining + 0.5)
+        except asyncio.TimeoutError:
+            break
+        except Exception as e:
+            logger.debug(f"DOM quiet check interrupted, retrying in the current document: {e}")
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=max(remaining, 0.001) * 1000)
+            except Exception:
+                break
+    return {"quiet": False, "mutations": -1}
+
+
+@asynccontextmanager
+async def wait_until_settled(page: Page, quiet_time: Optional[float] = None, max_wait: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Track the DOM mutations and requests caused by the action run in the block, and on exit wait until the page
+    settled: no DOM mutation and no relevant request in flight for quiet_time seconds, at most max_wait seconds.
+
+    With ADAPTIVE_SETTLE disabled the block is followed by the fixed REACTION_DELAY_TIME sleep instead.
+
+        async with wait_until_settled(page):
+            result = await do_click(page, selector, wait_before_execution, type_of_click)
+
+    Args:
+        page (Page): The page the action runs on.
+        quiet_time (Optional[float]): Seconds of quiet considered settled, SETTLE_QUIET_TIME by default.
+        max_wait (Optional[float]): Maximum seconds to wait after the action, SETTLE_MAX_TIME by default.
+
+    Yields:
+        Dict[str, Any]: Filled with the settle stats once the block exited.
+    """
+    config = get_global_conf()
+    stats: Dict[str, Any] = {}
+    if not config.should_use_adaptive_settle():
+        yield stats
+        await asyncio.sleep(config.get_delay_time())
+        return
+
+    quiet_time = config.get_settle_quiet_time() if quiet_time is None else quiet_time
+    max_wait = config.get_settle_max_time() if max_wait is None else max_wait
+    network = NetworkIdleDetector(
+        page,
+        quiet_time,
+        max_wait,
+        compile_ignored_url_patterns(tuple(config.get_network_idle_ignored_url_patterns())),
+    )
+    network.start()
+    try:
+        await call_page_helper(page, "settleStart")
+    except Exception as e:
+        logger.debug(f"Failed to start DOM settle tracking: {e}")
+
+    try:
+        yield stats
+    except BaseException:
+        network.stop()
+        raise
+
+    start = time.perf_counter()
+    network_stats, dom_stats = await asyncio.gather(network.wait(timeout=max_wait), wait_for_dom_quiet(page, quiet_time, max_wait))
+    stats.update(
+        {
+            "waited": round(time.perf_counter() - start, 3),
+            "dom_quiet": dom_stats.get("quiet", False),
+            "mutations": dom_stats.get("mutations", -1),
+            "network_idle": network_stats["idle"],
+            "pending_requests": [request["url"] for request in network_stats["blocking_requests"]],
+        }
+    )
+    logger.debug(f"Page settle: {stats}")
@@ -0,0 +1,142 @@
+import json
+import os
+import traceback
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Response, Route
+from testzeus_hercules.utils.logger import logger
+from testzeus_hercules.utils.network_idle import (
+    DEFAULT_IGNORED_URL_PATTERNS,
+    compile_url_patterns,
+)
+
+BLOCKED_REQUESTS_REPORT_FILE = "blocked_requests.json"
+
+
+class ResourceBlockingPolicy:
+    """
+    Route policy aborting requests a scenario does not need, applied once per browser context.
+
+    Requests are blocked by resource type, by URL substring (the same list the network idle wait ignores, plus project
+    specific ones) and by declared response size. Requests the policy lets through fall back to the routes registered
+    before it (HAR replay) or to the network, they are never fetched by the policy itself. The policy counts what it
+    blocked for the per-scenario report.
+
+    The size is only known once the response headers arrived, when the body is already on its way: a URL whose response
+    declared a Content-Length above max_response_bytes is blocked from its next request on, e.g. when a later page of
+    the scenario loads the same video or bundle again.
+    """
+
+    def __init__(self, resource_types: Iterable[str] = (), url_patterns: Iterable[str] = (), max_response_bytes: int = 0) -> None:
+        """
+        Args:
+            resource_types (Iterable[str]): Playwright resource types to block, e.g. image, font, media.
+            url_patterns (Iterable[str]): URL substrings to block, 'default' expands to the built-in analytics, ads and
+                chat widget list.
+            max_response_bytes (int): Block the URLs whose response declared a larger Content-Length, 0 disables the
+                size check.
+        """
+        self.resource_types = frozenset(t for t in resource_types if t)
+        patterns = []
+        for pattern in url_patterns:
+            if pattern == "default":
+                patterns.extend(DEFAULT_IGNORED_URL_PATTERNS)
+            elif pattern:
+                patterns.append(pattern)
+        self.url_pattern = compile_url_patterns(tuple(p.lower() for p in patterns)) if patterns else None
+        self.max_response_bytes = max_response_bytes
+        self.oversized_urls: Dict[str, int] = {}
+        self.blocked_requests = 0
+        self.blocked_bytes = 0
+        self.by_reason: Counter = Counter()
+        self.by_resource_type: Counter = Counter()
+        self.by_host: Counter = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.resource_types or self.url_pattern or self.max_response_bytes)
+
+    @staticmethod
+    def _is_main_document(request: Any) -> bool:
+        if request.resource_type != "document":
+            return False
+        try:
+            return request.frame.parent_frame is None
+        except Exception:
+            return True
+
+    def _block_reason(self, request: Any) -> Optional[str]:
+        # the page under test is never blocked, ad and widget iframes are
+        if self._is_main_document(request):
+            return None
+        if request.resource_type in self.resource_types:
+            return "resource_type"
+        if self.url_pattern and self.url_pattern.search(request.url.lower()):
+            return "url_pattern"
+        if request.url in self.oversized_urls:
+            return "size"
+        return None
+
+    def _record(self, request: Any, reason: str, size: int = 0) -> None:
+        self.blocked_requests += 1
+        self.blocked_bytes += size
+        self.by_reason[reason] += 1
+        self.by_resource_type[request.resource_type] += 1
+        self.by_host[urlsplit(request.url).hostname or ""] += 1
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        reason = self._block_reason(request)
+        if reason:
+            self._record(request, reason, self.oversized_urls.get(request.url, 0))
+            await route.abort("blockedbyclient")
+            return
+        await route.fallback()
+
+    def _on_response(self, response: Response) -> None:
+        """Remember the URLs whose response declared a Content-Length above max_response_bytes, from the headers only."""
+        request = response.request
+        if request.resource_type == "document" or request.url in self.oversized_urls:
+            return
+        content_length = response.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_response_bytes:
+            self.oversized_urls[request.url] = int(content_length)
+            logger.debug(f"Blocking the next requests of {request.url}, its response declared {content_length} bytes")
+
+    async def apply(self, context: BrowserContext, size_check: bool = True) -> None:
+        """
+        Register the policy on every request of the context.
+
+        Args:
+            context (BrowserContext): The browser context to apply the policy to.
+            size_check (bool): False when responses are served from elsewhere (HAR replay) and cost no download.
+        """
+        if not size_check:
+            self.max_response_bytes = 0
+        await context.route("**/*", self.handle)
+        if self.max_response_bytes:
+            context.on("response", self._on_response)
+        logger.info(f"Resource blocking enabled: types={sorted(self.resource_types)}, url patterns={'yes' if self.url_pattern else 'no'}, max response bytes={self.max_response_bytes or 'unlimited'}")
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "blocked_requests": self.blocked_requests,
+            "blocked_bytes": self.blocked_bytes,
+            "by_reason": dict(self.by_reason),
+            "by_resource_type": dict(self.by_resource_type),
+            "by_host": dict(self.by_host.most_common()),
+        }
+
+    def write_report(self, proof_path: str) -> None:
+        """Write the blocked requests report of the scenario to the proofs folder."""
+        try:
+            report_file = os.path.join(proof_path, BLOCKED_REQUESTS_REPORT_FILE)
+            with open(report_file, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2, ensure_ascii=False)
+            logger.info(f"Blocked {self.blocked_requests} requests ({self.blocked_bytes} bytes known), see {report_file}")
+        except Exception as e:
+
+            traceback.print_exc()
+            logger.error(f"Failed to write blocked requests report: {e}")
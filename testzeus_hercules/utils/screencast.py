@@ -0,0 +1,176 @@
+import asyncio
+import base64
+import json
+import os
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from playwright.async_api import CDPSession, Page
+from testzeus_hercules.utils.artifact_writer import get_artifact_writer
+from testzeus_hercules.utils.logger import logger
+
+SCREENCAST_INDEX_FILE = "screencast_index.ndjson"
+
+
+class ScreencastRecorder:
+    """
+    Chromium screencast of the pages of a browser context, kept in an in-memory ring buffer.
+
+    Every page streams JPEG frames over CDP (Page.startScreencast). A frame is acknowledged only 1/fps seconds after
+    it arrived, so the browser never encodes more than fps frames per second, and it only sends a frame when the page
+    repainted. Frames are written to disk only around the moments that matter: mark() persists the frames of the last
+    action_window seconds and the current frame of the page, persist_buffer() the whole buffer, e.g. on failure.
+    screencast_index.ndjson maps every mark to its frames.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fps: float = 2.0,
+        max_width: int = 1280,
+        max_height: int = 720,
+        quality: int = 80,
+        buffer_seconds: float = 60.0,
+        action_window: float = 2.0,
+    ) -> None:
+        """
+        Args:
+            directory (str): Folder the persisted frames and the index are written to.
+            fps (float): Maximum frames per second per page.
+            max_width (int): Maximum width of the frames, the browser scales them down.
+            max_height (int): Maximum height of the frames.
+            quality (int): JPEG quality of the frames, 1 to 100.
+            buffer_seconds (float): Seconds of frames (at fps) kept in memory.
+            action_window (float): Seconds of frames before a mark that are persisted with it.
+        """
+        self.directory = directory
+        self._ack_delay = 1.0 / fps if fps > 0 else 0.0
+        self._params = {"format": "jpeg", "quality": quality, "maxWidth": max_width, "maxHeight": max_height}
+        self._frames: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(max(fps, 1) * buffer_seconds)))
+        self._action_window = action_window
+        self._sessions: Dict[Page, CDPSession] = {}
+        self._page_ids: Dict[Page, int] = {}
+        self._latest: Dict[Page, Dict[str, Any]] = {}
+        self._writes: Set[asyncio.Future] = set()
+        self._seq = 0
+        self._page_count = 0
+        self.received = 0
+        self.written = 0
+        self.written_bytes = 0
+
+    async def attach(self, page: Page) -> bool:
+        """Start streaming the frames of the page, once per page. Returns whether the page is streaming."""
+        if page in self._sessions:
+            return True
+        if page.is_closed():
+            return False
+        try:
+            session = await page.context.new_cdp_session(page)
+            self._sessions[page] = session
+            if page not in self._page_ids:
+                self._page_count += 1
+                self._page_ids[page] = self._page_count
+            session.on("Page.screencastFrame", lambda params: self._on_frame(page, session, params))
+            page.on("close", lambda _: self._detach(page))
+            await session.send("Page.startScreencast", self._params)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to start the screencast of {page.url}: {e}")
+            self._sessions.pop(page, None)
+            return False
+
+    def _detach(self, page: Page) -> None:
+        self._sessions.pop(page, None)
+        self._latest.pop(page, None)
+
+    async def _ack(self, session: CDPSession, session_id: int) -> None:
+        try:
+            await session.send("Page.screencastFrameAck", {"sessionId": session_id})
+        except Exception as e:
+            logger.debug(f"Screencast frame ack failed: {e}")
+
+    def _on_frame(self, page: Page, session: CDPSession, params: Dict[str, Any]) -> None:
+        # the next frame is only sent after the ack, delaying it caps the frame rate at the source
+        asyncio.get_running_loop().call_later(self._ack_delay, lambda: asyncio.ensure_future(self._ack(session, params["sessionId"])))
+        self._seq += 1
+        self.received += 1
+        frame = {
+            "seq": self._seq,
+            "timestamp": time.time(),
+            "page": self._page_ids.get(page, 0),
+            "url": page.url,
+            "data": params["data"],
+        }
+        self._frames.append(frame)
+        self._latest[page] = frame
+
+    def _persist(self, frames: List[Dict[str, Any]], entry: Dict[str, Any]) -> None:
+        """Name the frames not written yet, write them in the background and index them under the entry."""
+        items: List[Tuple[str, str]] = []
+        for frame in frames:
+            if "file" not in frame:
+                frame["file"] = f"frame_{frame['page']}_{frame['seq']:06d}.jpg"
+                items.append((os.path.join(self.directory, frame["file"]), frame["data"]))
+        entry["frames"] = [{"file": f["file"], "timestamp": f["timestamp"], "url": f["url"]} for f in frames]
+        get_artifact_writer().append_line(os.path.join(self.directory, SCREENCAST_INDEX_FILE), json.dumps(entry, ensure_ascii=False))
+        if items:
+            write = asyncio.ensure_future(asyncio.to_thread(self._write_frames, items))
+            self._writes.add(write)
+            write.add_done_callback(self._writes.discard)
+
+    def _write_frames(self, items: List[Tuple[str, str]]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        for path, data in items:
+            try:
+                content = base64.b64decode(data)
+                with open(path, "wb") as f:
+                    f.write(content)
+                self.written += 1
+                self.written_bytes += len(content)
+            except Exception as e:
+
+                traceback.print_exc()
+                logger.error(f"Failed to write screencast frame {path}: {e}")
+
+    async def mark(self, page: Page, name: str) -> Optional[bytes]:
+        """
+        Persist the frames of the page around this moment: those of the last action_window seconds and the current one.
+
+        Args:
+            page (Page): The page the action runs on.
+            name (str): Name of the moment, e.g. 'click_start'.
+
+        Returns:
+            Optional[bytes]: The current frame of the page as JPEG, None if the page has not streamed a frame yet.
+        """
+        await self.attach(page)
+        latest = self._latest.get(page)
+        if latest is None:
+            return None
+        now = time.time()
+        page_id = self._page_ids.get(page)
+        frames = [f for f in self._frames if f["page"] == page_id and f["timestamp"] >= now - self._action_window and "file" not in f]
+        if all(frame is not latest for frame in frames):
+            frames.append(latest)
+        self._persist(frames, {"mark": name, "timestamp": now})
+        return base64.b64decode(latest["data"])
+
+    def persist_buffer(self, reason: str) -> None:
+        """Persist every frame still in the buffer, e.g. when the scenario failed."""
+        frames = list(self._frames)
+        if frames:
+            self._persist(frames, {"mark": reason, "timestamp": time.time()})
+            logger.info(f"Persisting {len(frames)} buffered screencast frames ({reason})")
+
+    async def close(self) -> None:
+        """Wait for the pending frame writes and log the stats. Streaming restarts on the next attach."""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        if self.received:
+            logger.info(f"Screencast: {self.received} frames received, {self.written} written ({self.written_bytes} bytes) to {self.directory}")
+        self._sessions.clear()
+        self._page_ids.clear()
+        self._latest.clear()
+        self._frames.clear()
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import traceback
+from io import BytesIO
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, features
+from testzeus_hercules.utils.artifact_writer import get_artifact_writer
+from testzeus_hercules.utils.logger import logger
+
+SCREENSHOT_FORMATS = ("png", "jpeg", "webp")
+SCREENSHOT_DEDUP_MODES = ("off", "identical", "perceptual")
+SCREENSHOT_INDEX_FILE = "screenshots_index.ndjson"
+_EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+# difference hash of a 17x16 grayscale thumbnail, 256 bits
+_FINGERPRINT_SIZE = 16
+
+
+def _fingerprint(image: Image.Image) -> int:
+    """Difference hash of the image: one bit per horizontally adjacent pixel pair of a small grayscale thumbnail."""
+    thumbnail = image.convert("L").resize((_FINGERPRINT_SIZE + 1, _FINGERPRINT_SIZE), Image.Resampling.BILINEAR)
+    pixels = list(thumbnail.getdata())
+    bits = 0
+    for row in range(_FINGERPRINT_SIZE):
+        offset = row * (_FINGERPRINT_SIZE + 1)
+        for col in range(_FINGERPRINT_SIZE):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+class ScreenshotWriter:
+    """
+    Background encoder and writer for the proof screenshots of a browser context.
+
+    submit() only enqueues the PNG bytes captured by the browser, a single writer task processes the shots in order in
+    a worker thread: shots identical to the previous one (byte for byte, or by their difference hash in 'perceptual'
+    mode) are recorded in the index instead of being written again, the others are re-encoded to the configured format
+    and written. Every shot, written or skipped, gets a line in screenshots_index.ndjson.
+    """
+
+    def __init__(self, image_format: str = "png", quality: int = 80, dedup: str = "identical", max_queue_size: int = 32) -> None:
+        """
+        Args:
+            image_format (str): 'png' (written as captured), 'jpeg' or 'webp'.
+            quality (int): Quality of the jpeg and webp encodings, 1 to 100.
+            dedup (str): 'off', 'identical' (skip byte identical shots) or 'perceptual' (also skip shots that look
+                the same).
+            max_queue_size (int): Maximum number of shots waiting to be written before submit() waits.
+        """
+        if image_format == "webp" and not features.check("webp"):
+            logger.warning("Pillow was built without WebP support, screenshots are written as jpeg instead")
+            image_format = "jpeg"
+        self.image_format = image_format if image_format in SCREENSHOT_FORMATS else "png"
+        self.quality = min(max(quality, 1), 100)
+        self.dedup = dedup if dedup in SCREENSHOT_DEDUP_MODES else "identical"
+        self._max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._last_digest: Optional[bytes] = None
+        self._last_fingerprint: Optional[int] = None
+        self._last_file: Optional[str] = None
+        self.written = 0
+        self.duplicates = 0
+        self.captured_bytes = 0
+        self.written_bytes = 0
+        self.write_time = 0.0
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        task = self._writer_task
+        if self._queue is None or task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+            self._writer_task = asyncio.ensure_future(self._run_writer(self._queue))
+        return self._queue
+
+    async def submit(self, path: str, png_bytes: bytes) -> None:
+        """
+        Queue a screenshot for writing, waiting only while max_queue_size shots are already pending.
+
+        Args:
+            path (str): Path of the screenshot without extension, the extension of the format is appended.
+            png_bytes (bytes): The screenshot as captured by the browser.
+        """
+        await self._ensure_writer().put((path, png_bytes, time.time()))
+
+    async def _run_writer(self, queue: asyncio.Queue) -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._process, *item)
+            except Exception as e:
+
+                traceback.print_exc()
+                logger.error(f"Failed to write screenshot {item[0]}: {e}")
+            self.write_time += time.perf_counter() - start
+
+    def _duplicate_reason(self, png_bytes: bytes) -> Tuple[Optional[str], bytes, Optional[Image.Image], Optional[int]]:
+        digest = hashlib.sha1(png_bytes).digest()
+        if self.dedup == "off":
+            return None, digest, None, None
+        if digest == self._last_digest:
+            return "identical", digest, None, None
+        if self.dedup != "perceptual":
+            return None, digest, None, None
+        image = Image.open(BytesIO(png_bytes))
+        fingerprint = _fingerprint(image)
+        if fingerprint == self._last_fingerprint:
+            return "perceptual", digest, image, fingerprint
+        return None, digest, image, fingerprint
+
+    def _process(self, path: str, png_bytes: bytes, timestamp: float) -> None:
+        self.captured_bytes += len(png_bytes)
+        reason, digest, image, fingerprint = self._duplicate_reason(png_bytes)
+        entry: Dict[str, Any] = {"timestamp": timestamp, "name": os.path.basename(path)}
+
+        if reason and self._last_file:
+            self.duplicates += 1
+            entry.update({"file": self._last_file, "duplicate": reason})
+        else:
+            file_path = path + _EXTENSIONS[self.image_format]
+            if self.image_format == "png":
+                data = png_bytes
+            else:
+                image = image or Image.open(BytesIO(png_bytes))
+                output = BytesIO()
+                if self.image_format == "jpeg":
+                    image.convert("RGB").save(output, format="JPEG", quality=self.quality, optimize=True)
+                else:
+                    image.save(output, format="WEBP", quality=self.quality)
+                data = output.getvalue()
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            with open(file_path, "wb") as f:
+                f.write(data)
+            self.written += 1
+            self.written_bytes += len(data)
+            self._last_file = os.path.basename(file_path)
+            self._last_digest = digest
+            self._last_fingerprint = fingerprint
+            entry.update({"file": self._last_file, "bytes": len(data)})
+
+        index_path = os.path.join(os.path.dirname(path), SCREENSHOT_INDEX_FILE)
+        get_artifact_writer().append_line(index_path, json.dumps(entry, ensure_ascii=False))
+
+    async def close(self) -> None:
+        """Write every pending screenshot and log the capture stats. The writer can be submitted to again."""
+        if self._writer_task is None or self._queue is None:
+            return
+        if not self._writer_task.done() and self._writer_task.get_loop() is asyncio.get_running_loop():
+            await self._queue.put(None)
+            await self._writer_task
+        self._writer_task = None
+        self._queue = None
+        logger.info(
+            f"Screenshots: {self.written} written ({self.written_bytes} bytes as {self.image_format}), "
+            f"{self.duplicates} duplicates skipped, {self.captured_bytes} bytes captured, {self.write_time:.3f}s spent writing"
+        )
@@ -1,9 +1,13 @@
 import asyncio
 import inspect
+import json
 from typing import Any
 
 from autogen import Agent  # type: ignore
 from autogen import UserProxyAgent  # type: ignore
+from testzeus_hercules.config import get_global_conf
+from testzeus_hercules.core.browser_logger import get_browser_logger
+from testzeus_hercules.core.tools.tool_registry import is_read_only_call
 
 
 class UserProxyAgent_SequentialFunctionExecution(UserProxyAgent):
@@ -12,6 +16,14 @@ class UserProxyAgent_SequentialFunctionExecution(UserProxyAgent):
         super().__init__(*args, **kwargs)  # type: ignore
         # position = 2 allows termination check to be called earlier, this helps detect loops.
         self.register_reply(Agent, UserProxyAgent_SequentialFunctionExecution.sequential_generate_tool_calls_reply, position=2)  # type: ignore
+        # registered last so that it comes first: async chats await the tools on their loop and never reach the sync
+        # reply above, sync chats skip it
+        self.register_reply(
+            Agent,
+            UserProxyAgent_SequentialFunctionExecution.a_sequential_generate_tool_calls_reply,
+            position=2,
+            ignore_async_in_sync_chat=True,
+        )  # type: ignore
 
     def sequential_generate_tool_calls_reply(  # type: ignore
         self,
@@ -19,7 +31,7 @@ class UserProxyAgent_SequentialFunctionExecution(UserProxyAgent):
         sender: Agent | None = None,
         config: Any | None = None,
     ) -> tuple[bool, dict[str, Any] | None]:
-        """Generate a reply using tool call."""
+        """Generate a reply using tool call. Only used in sync chats, async chats use a_sequential_generate_tool_calls_reply."""
         if config is None:
             config = self
         if messages is None:
@@ -31,6 +43,7 @@ class UserProxyAgent_SequentialFunctionExecution(UserProxyAgent):
             function_call = tool_call.get("function", {})  # type: ignore
             func = self._function_map.get(function_call.get("name", None), None)  # type: ignore
             func_return = None
+            is_success = False
             if inspect.iscoroutinefunction(func):  # type: ignore
                 try:
                     # get the running loop if it was already created
@@ -41,42 +54,110 @@ class UserProxyAgent_SequentialFunctionExecution(UserProxyAgent):
                     loop = asyncio.new_event_loop()
                     close_loop = True
                 if not skip_flag:
-                    _, func_return = loop.run_until_complete(self.a_execute_function(function_call))  # type: ignore
+                    is_success, func_return = loop.run_until_complete(self.a_execute_function(function_call))  # type: ignore
                     if close_loop:
                         loop.close()
             else:
                 if not skip_flag:
-                    _, func_return = self.execute_function(function_call)  # type: ignore
-            if func_return is None:  # type: ignore
-                if skip_flag:
-                    content = (
-                        "VERY IMPORTANT: This function could not be executed since previous function resulted in a Task change the state. You must get current state and repeat the function if needed."
-                    )
-                else:
-                    content = ""
+                    is_success, func_return = self.execute_function(function_call)  # type: ignore
+            tool_call_response, skip_flag = self._tool_call_response(tool_call, func_return, is_success, skip_flag)
+            tool_returns.append(tool_call_response)  # type: ignore
+
+        return self._tool_calls_reply(tool_returns)
+
+    async def a_sequential_generate_tool_calls_reply(  # type: ignore
+        self,
+        messages: list[dict] | None = None,  # type: ignore
+        sender: Agent | None = None,
+        config: Any | None = None,
+    ) -> tuple[bool, dict[str, Any] | None]:
+        """
+        Generate a reply using tool call, awaiting the coroutine tools on the running event loop.
+
+        Consecutive calls of tools declared read-only run concurrently, the others one after the other. Responses keep
+        the order of the calls.
+        """
+        if config is None:
+            config = self
+        if messages is None:
+            messages = self._oai_messages[sender]  # type: ignore
+        message = messages[-1]  # type: ignore
+        tool_calls = message.get("tool_calls", [])  # type: ignore
+        tool_returns = []
+        skip_flag: bool = False
+        index = 0
+        while index < len(tool_calls):
+            if skip_flag:
+                tool_call_response, skip_flag = self._tool_call_response(tool_calls[index], None, False, skip_flag)
+                tool_returns.append(tool_call_response)  # type: ignore
+                index += 1
+                continue
+
+            batch = [tool_calls[index]]
+            if self._is_read_only(tool_calls[index]):
+                while index + len(batch) < len(tool_calls) and self._is_read_only(tool_calls[index + len(batch)]):
+                    batch.append(tool_calls[index + len(batch)])
+            if len(batch) == 1:
+                results = [await self.a_execute_function(batch[0].get("function", {}))]  # type: ignore
             else:
-                content = func_return.get("content", "")  # type: ignore
+                results = await asyncio.gather(*(self.a_execute_function(tool_call.get("function", {})) for tool_call in batch))  # type: ignore
+            for tool_call, (is_success, func_return) in zip(batch, results):
+                tool_call_response, skip_flag = self._tool_call_response(tool_call, func_return, is_success, skip_flag)
+                tool_returns.append(tool_call_response)  # type: ignore
+            index += len(batch)
 
-            if content is None:
-                content = ""
+        return self._tool_calls_reply(tool_returns)
 
-            if "as a consequence of this action" in content.lower():  # type: ignore
-                skip_flag = True
+    def _is_read_only(self, tool_call: dict[str, Any]) -> bool:
+        function_call = tool_call.get("function", {})
+        try:
+            arguments = json.loads(function_call.get("arguments") or "{}")
+        except (TypeError, ValueError):
+            return False
+        return isinstance(arguments, dict) and is_read_only_call(function_call.get("name", ""), arguments)
 
-            tool_call_id = tool_call.get("id", None)  # type: ignore
-            if tool_call_id is not None:
-                tool_call_response = {  # type: ignore
-                    "tool_call_id": tool_call_id,
-                    "role": "tool",
-                    "content": content,
-                }
+    def _tool_call_response(
+        self,
+        tool_call: dict[str, Any],
+        func_return: dict[str, Any] | None,
+        is_success: bool,
+        skip_flag: bool,
+    ) -> tuple[dict[str, Any], bool]:
+        """Build the response to a tool call. Returns it with whether the next tool calls of the message are skipped."""
+        if func_return is None:  # type: ignore
+            if skip_flag:
+                content = (
+                    "VERY IMPORTANT: This function could not be executed since previous function resulted in a Task change the state. You must get current state and repeat the function if needed."
+                )
             else:
-                tool_call_response = {  # type: ignore
-                    "role": "tool",
-                    "content": content,
-                }
-            tool_returns.append(tool_call_response)  # type: ignore
+                content = ""
+        else:
+            content = func_return.get("content", "")  # type: ignore
+
+        if content is None:
+            content = ""
+
+        if func_return is not None:
+            self._log_tool_call(tool_call.get("function", {}), content, is_success)
 
+        if "as a consequence of this action" in content.lower():  # type: ignore
+            skip_flag = True
+
+        tool_call_id = tool_call.get("id", None)  # type: ignore
+        if tool_call_id is not None:
+            tool_call_response = {  # type: ignore
+                "tool_call_id": tool_call_id,
+                "role": "tool",
+                "content": content,
+            }
+        else:
+            tool_call_response = {  # type: ignore
+                "role": "tool",
+                "content": content,
+            }
+        return tool_call_response, skip_flag
+
+    def _tool_calls_reply(self, tool_returns: list[dict[str, Any]]) -> tuple[bool, dict[str, Any] | None]:
         if tool_returns:
             return True, {
                 "role": "tool",
@@ -84,3 +165,18 @@ class UserProxyAgent_SequentialFunctionExecution(UserProxyAgent):
                 "content": "\n\n".join([self._str_for_tool_response(tool_return) for tool_return in tool_returns]),  # type: ignore
             }
         return False, None
+
+    def _log_tool_call(self, function_call: dict[str, Any], content: str, is_success: bool) -> None:
+        """Log the executed tool call to interaction_logs.ndjson, the trace replayed by core/trace_replay.py."""
+        arguments = function_call.get("arguments", "")
+        try:
+            arguments = json.loads(arguments) if arguments else {}
+        except (TypeError, ValueError):
+            pass
+        get_browser_logger(get_global_conf().get_proof_path()).log_tool_call(
+            agent_type=self.name,
+            tool_name=function_call.get("name", ""),
+            arguments=arguments,
+            result=content,
+            success=is_success,
+        )
@@ -0,0 +1,232 @@
+import glob
+import json
+import os
+import re
+import statistics
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from junitparser import JUnitXml, TestSuite
+from testzeus_hercules.utils.logger import logger
+
+T = TypeVar("T")
+
+DEFAULT_WEIGHT = 1.0
+
+
+def scenario_key(feature: str, scenario: str) -> str:
+    """Key of a scenario in the durations file, scenarios of different features may share a name."""
+    return f"{feature}::{scenario}"
+
+
+def load_durations(durations_file: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Load historical durations recorded by record_durations.
+
+    Args:
+        durations_file (Optional[str]): Path to the durations JSON file.
+
+    Returns:
+        Dict[str, Dict[str, float]]: {"testcases": {scenario_key: seconds}, "suites": {name: seconds}}, empty when unavailable.
+    """
+    durations: Dict[str, Dict[str, float]] = {"testcases": {}, "suites": {}}
+    if not durations_file or not os.path.exists(durations_file):
+        return durations
+    try:
+        with open(durations_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for key in durations:
+            durations[key] = {str(name): float(value) for name, value in data.get(key, {}).items()}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Failed to load shard durations from {durations_file}: {e}")
+    return durations
+
+
+def record_durations(junit_file: str, durations_file: str) -> None:
+    """
+    Update the durations file with the testcase and suite times of a (merged) JUnit XML file.
+
+    Args:
+        junit_file (str): Path to the JUnit XML file.
+        durations_file (str): Path to the durations JSON file, created if missing.
+    """
+    durations = load_durations(durations_file)
+    for suite in JUnitXml.fromfile(junit_file):
+        durations["suites"][suite.name] = float(suite.time or 0.0)
+        for testcase in suite:
+            durations["testcases"][scenario_key(testcase.classname or suite.name, testcase.name)] = float(testcase.time or 0.0)
+
+    base_dir = os.path.dirname(durations_file)
+    if base_dir:
+        os.makedirs(base_dir, exist_ok=True)
+    with open(durations_file, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    logger.info(f"Shard durations recorded in: {durations_file}")
+
+
+def select_shard(items: List[T], name_of: Callable[[T], str], weight_of: Callable[[T], Optional[float]], shard_index: int, shard_total: int) -> List[T]:
+    """
+    Return the items that belong to shard shard_index out of shard_total.
+
+    Items are assigned greedily, heaviest first, to the least loaded shard, ties broken by name and
+    shard number, so every machine computes the same partition from the same input. Items without a
+    known weight get the median of the known weights, which degrades to round robin without history.
+
+    Args:
+        items (List[T]): Items to partition, e.g. scenarios or test directories.
+        name_of (Callable[[T], str]): Stable name of an item.
+        weight_of (Callable[[T], Optional[float]]): Historical duration of an item, None if unknown.
+        shard_index (int): Zero based index of the shard to select.
+        shard_total (int): Total number of shards.
+
+    Returns:
+        List[T]: Items of the selected shard, in their original order.
+    """
+    if shard_total < 1 or not 0 <= shard_index < shard_total:
+        raise ValueError(f"Invalid shard {shard_index} of {shard_total}, shard index must be in [0, shard total)")
+    if shard_total == 1:
+        return list(items)
+
+    weights = [weight_of(item) for item in items]
+    known = [weight for weight in weights if weight is not None and weight > 0]
+    default_weight = statistics.median(known) if known else DEFAULT_WEIGHT
+    weights = [weight if weight is not None and weight > 0 else default_weight for weight in weights]
+
+    order = sorted(range(len(items)), key=lambda i: (-weights[i], name_of(items[i]), i))
+    loads = [0.0] * shard_total
+    selected: List[int] = []
+    for i in order:
+        shard = min(range(shard_total), key=lambda s: (loads[s], s))
+        loads[shard] += weights[i]
+        if shard == shard_index:
+            selected.append(i)
+
+    logger.info(f"Shard {shard_index} of {shard_total}: {len(selected)} of {len(items)} items, estimated load {loads[shard_index]:.2f}")
+    return [items[i] for i in sorted(selected)]
+
+
+def select_scenarios_for_shard(list_of_feats: List[Dict[str, str]], shard_index: int, shard_total: int, durations_file: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Select the scenarios returned by process_feature_file that this shard should run.
+
+    Args:
+        list_of_feats (List[Dict[str, str]]): Entries with feature, scenario and output_file.
+        shard_index (int): Zero based index of this shard.
+        shard_total (int): Total number of shards.
+        durations_file (Optional[str]): Historical durations used to balance the shards.
+
+    Returns:
+        List[Dict[str, str]]: Entries of this shard, in feature file order.
+    """
+    testcases = load_durations(durations_file)["testcases"]
+    return select_shard(
+        list_of_feats,
+        name_of=lambda feat: scenario_key(feat["feature"], feat["scenario"]),
+        weight_of=lambda feat: testcases.get(scenario_key(feat["feature"], feat["scenario"])),
+        shard_index=shard_index,
+        shard_total=shard_total,
+    )
+
+
+def _feature_name_of_test_dir(test_dir: str) -> Optional[str]:
+    feature_file = os.path.join(test_dir, "input", f"{os.path.basename(test_dir)}.feature")
+    try:
+        with open(feature_file, "r", encoding="utf-8") as f:
+            match = re.search(r"Feature:(.*)", f.read())
+    except OSError:
+        return None
+    return match.group(1).strip() if match else None
+
+
+def select_test_dirs_for_shard(test_dirs: List[str], shard_index: int, shard_total: int, durations_file: Optional[str] = None) -> List[str]:
+    """
+    Select the bulk test directories this shard should run.
+
+    A directory is weighted by the recorded time of the suite of its feature file.
+
+    Args:
+        test_dirs (List[str]): Paths of the test directories.
+        shard_index (int): Zero based index of this shard.
+        shard_total (int): Total number of shards.
+        durations_file (Optional[str]): Historical durations used to balance the shards.
+
+    Returns:
+        List[str]: Test directories of this shard, in their original order.
+    """
+    suites = load_durations(durations_file)["suites"]
+
+    def weight_of(test_dir: str) -> Optional[float]:
+        feature_name = _feature_name_of_test_dir(test_dir)
+        return suites.get(feature_name) if feature_name else None
+
+    return select_shard(
+        test_dirs,
+        name_of=os.path.basename,
+        weight_of=weight_of,
+        shard_index=shard_index,
+        shard_total=shard_total,
+    )
+
+
+def get_shard_suffix(shard_index: int, shard_total: int) -> str:
+    """Return the result file suffix of a shard, empty when not sharding."""
+    if shard_total <= 1:
+        return ""
+    return f".shard-{shard_index}-of-{shard_total}"
+
+
+def expand_result_files(patterns: List[str]) -> List[str]:
+    """Expand file names and glob patterns into a sorted, de-duplicated list of existing files."""
+    files: List[str] = []
+    for pattern in patterns:
+        matches = glob.glob(pattern) if any(ch in pattern for ch in "*?[") else [pattern]
+        for match in matches:
+            if os.path.isfile(match) and match not in files:
+                files.append(match)
+    return sorted(files)
+
+
+def merge_junit_files(files: List[str]) -> JUnitXml:
+    """
+    Merge JUnit XML files: suites of the same name are combined, their times and numeric properties summed.
+
+    Args:
+        files (List[str]): Paths of the JUnit XML files, in the order their test cases should appear.
+
+    Returns:
+        JUnitXml: The merged results.
+    """
+    merged_xml = JUnitXml()
+    suite_dict: Dict[str, TestSuite] = {}
+
+    for file in files:
+        xml = JUnitXml.fromfile(file)
+        for suite in xml:
+            suite_name = suite.name
+            if suite_name in suite_dict:
+                existing_suite = suite_dict[suite_name]
+                for testcase in suite:
+                    existing_suite.add_testcase(testcase)
+                existing_suite.time = float(existing_suite.time or 0.0) + float(suite.time or 0.0)
+
+                for prop in suite.properties():
+                    is_existing_prop = False
+                    for existing_prop in existing_suite.properties():
+                        if existing_prop.name.strip() == prop.name.strip():
+                            try:
+                                existing_value = float(existing_prop.value)
+                                new_value = float(prop.value)
+                                existing_prop.value = existing_value + new_value
+                            except ValueError:
+                                pass
+                            is_existing_prop = True
+
+                    existing_suite.update_statistics()
+
+                    if not is_existing_prop:
+                        existing_suite.add_property(name=prop.name, value=prop.value)
+            else:
+                suite_dict[suite_name] = suite
+
+    for suite in suite_dict.values():
+        merged_xml.add_testsuite(suite)
+    return merged_xml